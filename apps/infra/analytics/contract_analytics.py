@@ -7,13 +7,31 @@ This module provides functions to analyze contract interactions with blockchain
 - Fee generation analytics
 - User interaction patterns with contracts
 - Contract interacting addresses
+
+Transaction counts, values, fees and unique users (estimated from HyperLogLog
+sketches) come from the per-day rows of standardized.contract_daily_stats:
+whole days come from the rollup and only the partial days at the window edges
+are aggregated from standardized.transactions. Interacting addresses are a
+keyed read of the cumulative standardized.interaction_edges. Top users, user segments and
+method distributions need each sender and function, so they are aggregated
+from the contract's transactions.
 """
 
 import polars as pl
-from analytics.helpers import _apply_time_window_filter
+import pyarrow as pa
+from analytics.helpers import (
+    _apply_time_window_filter,
+    _load_interaction_edges,
+    _window_day_filters,
+)
 from config.logging_config import get_logger
 from db.iceberg import load_table
-from utils.blockchain import normalize_address, normalize_address_with_prefix
+from db.partitioning import address_bucket_filter
+from pipelines.standardized.contract_daily_stats import aggregate_daily_stats
+from pipelines.standardized.interaction_edges import LOOKUP_CONTRACT
+from pyiceberg.expressions import And, EqualTo
+from utils.blockchain import normalize_address_with_prefix
+from utils.hll import estimate, merge_sketches
 
 logger = get_logger(__name__)
 
@@ -23,51 +41,36 @@ def _calculate_basic_metrics(query):
     Calculate basic metrics for contract analytics.
 
     Args:
-        query: Polars DataFrame with transaction data
+        query: Polars DataFrame with contract daily stats rows
 
     Returns:
         dict: Basic metrics including unique_users, transaction_count, total_fees_eth, total_value_eth
     """
     try:
-        # Calculate basic metrics
-        unique_users = query.select(pl.col("from_normalized").n_unique()).item()
-        transaction_count = len(query)
+        # Calculate basic metrics; unique users merge the days' sketches
+        unique_users = estimate(merge_sketches(query["users_sketch"]))
+        transaction_count = int(query.select(pl.sum("tx_count")).item())
 
-        # Calculate gas fees
+        # Fees and values are exact wei decimals: sum them before converting
         query = query.with_columns(
             [
-                # Convert gas_used and gas_price to numeric values
-                pl.col("gas_used")
-                .cast(pl.Float64)
-                .fill_null(0)
-                .alias("gas_used_float"),
-                pl.col("gas_price")
-                .cast(pl.Float64)
-                .fill_null(0)
-                .alias("gas_price_float"),
-                # Convert value to numeric
-                pl.col("value").cast(pl.Float64).fill_null(0).alias("value_float"),
-            ]
-        )
-
-        # Calculate fee in ETH and value in ETH
-        query = query.with_columns(
-            [
-                (pl.col("gas_used_float") * pl.col("gas_price_float") / 1e18).alias(
+                (pl.col("total_fees").cast(pl.Float64).fill_null(0) / 1e18).alias(
                     "fee_eth"
                 ),
-                (pl.col("value_float") / 1e18).alias("value_eth"),
+                (pl.col("total_value").cast(pl.Float64).fill_null(0) / 1e18).alias(
+                    "value_eth"
+                ),
             ]
         )
 
-        total_fees = query.select(pl.sum("fee_eth")).item()
-        total_value = query.select(pl.sum("value_eth")).item()
+        total_fees = query.select(pl.sum("total_fees")).item()
+        total_value = query.select(pl.sum("total_value")).item()
 
         return {
             "unique_users": unique_users,
             "transaction_count": transaction_count,
-            "total_fees_eth": float(total_fees) if total_fees else 0,
-            "total_value_eth": float(total_value) if total_value else 0,
+            "total_fees_eth": float(total_fees) / 1e18 if total_fees else 0,
+            "total_value_eth": float(total_value) / 1e18 if total_value else 0,
         }, query
     except Exception as e:
         logger.error(f"Error calculating basic metrics: {e}")
@@ -84,7 +87,7 @@ def _analyze_daily_activity(query):
     Analyze daily activity patterns for contract analytics.
 
     Args:
-        query: Polars DataFrame with transaction data (must include fee_eth and value_eth columns)
+        query: Polars DataFrame with contract daily stats rows (must include fee_eth and value_eth columns)
 
     Returns:
         list: Daily activity data as list of dictionaries
@@ -95,12 +98,22 @@ def _analyze_daily_activity(query):
             query.group_by("block_date")
             .agg(
                 [
-                    pl.count().alias("tx_count"),
-                    pl.n_unique("from_normalized").alias("unique_users"),
+                    pl.sum("tx_count").alias("tx_count"),
+                    pl.col("users_sketch"),
                     pl.sum("value_eth").alias("total_value_eth"),
                     pl.sum("fee_eth").alias("total_fees_eth"),
                 ]
             )
+            .with_columns(
+                # Unique users of a day: the union of its sketches
+                pl.col("users_sketch")
+                .map_elements(
+                    lambda sketches: estimate(merge_sketches(sketches)),
+                    return_dtype=pl.Int64,
+                )
+                .alias("unique_users")
+            )
+            .drop("users_sketch")
             .sort("block_date")
         )
 
@@ -115,7 +128,7 @@ def _analyze_top_users(query):
     Analyze top users for contract analytics.
 
     Args:
-        query: Polars DataFrame with transaction data (must include value_eth column)
+        query: Polars DataFrame with contract activity rows (must include value_eth column)
 
     Returns:
         list: Top users data as list of dictionaries
@@ -125,9 +138,9 @@ def _analyze_top_users(query):
             query.group_by("from_normalized")
             .agg(
                 [
-                    pl.count().alias("tx_count"),
+                    pl.sum("tx_count").alias("tx_count"),
                     pl.sum("value_eth").alias("total_value_eth"),
-                    pl.first("from").alias("from_address"),
+                    pl.first("from_address").alias("from_address"),
                 ]
             )
             .sort("tx_count", descending=True)
@@ -184,7 +197,7 @@ def _analyze_method_distribution(query):
     Analyze method distribution for contract analytics.
 
     Args:
-        query: Polars DataFrame with transaction data
+        query: Polars DataFrame with contract activity rows
 
     Returns:
         list: Method distribution data as list of dictionaries including:
@@ -200,12 +213,14 @@ def _analyze_method_distribution(query):
 
         # Group by function name and aggregate both count and unique addresses
         method_distribution = (
-            query.select(["function_name", "from", "from_normalized"])
+            query.select(
+                ["function_name", "from_address", "from_normalized", "tx_count"]
+            )
             .group_by("function_name")
             .agg(
                 [
-                    pl.count().alias("call_count"),
-                    pl.col("from").unique().alias("unique_addresses"),
+                    pl.sum("tx_count").alias("call_count"),
+                    pl.col("from_address").unique().alias("unique_addresses"),
                     pl.col("from_normalized").n_unique().alias("unique_address_count"),
                 ]
             )
@@ -238,7 +253,7 @@ def _analyze_user_segments(query):
     Analyze user segments for contract analytics.
 
     Args:
-        query: Polars DataFrame with transaction data
+        query: Polars DataFrame with contract activity rows
 
     Returns:
         list: User segments data as list of dictionaries
@@ -248,7 +263,7 @@ def _analyze_user_segments(query):
         # For this, we'll check if users have multiple transactions
         user_segments = (
             query.group_by("from_normalized")
-            .agg(pl.count().alias("tx_count"))
+            .agg(pl.sum("tx_count").alias("tx_count"))
             .with_columns(
                 pl.when(pl.col("tx_count") == 1)
                 .then(pl.lit("single_interaction"))
@@ -265,7 +280,9 @@ def _analyze_user_segments(query):
         return []
 
 
-def _load_and_filter_transactions(catalog, chain_id, contract_address, time_window):
+def _load_and_filter_transactions(
+    catalog, chain_id, contract_address, time_window, row_filter=None
+):
     """
     Common logic for loading and filtering transaction data.
 
@@ -274,15 +291,16 @@ def _load_and_filter_transactions(catalog, chain_id, contract_address, time_wind
         chain_id: Chain ID (e.g., 1 for Ethereum mainnet)
         contract_address: Contract address to analyze
         time_window: Time window string ('24h', '48h', '7d', etc.) or None for all time
+        row_filter: Optional extra scan filter (e.g. on block_date)
 
     Returns:
         filtered_query: Polars DataFrame with transaction data
     """
     try:
-        # Load transactions table
-        table = load_table(catalog, "raw", "transactions")
+        # Load the typed transactions table
+        table = load_table(catalog, "standardized", "transactions")
         if not table:
-            logger.error("Failed to load transactions table")
+            logger.error("Failed to load standardized transactions table")
             return None, None, None
 
         # Apply time window filter
@@ -290,34 +308,35 @@ def _load_and_filter_transactions(catalog, chain_id, contract_address, time_wind
             table, chain_id, time_window
         )
 
-        # Convert and normalize addresses
-        arrow_table = query.to_arrow()
-        transactions_pl = pl.from_arrow(arrow_table)
-
-        # Log the number of transactions loaded
+        normalized_contract_with_prefix = normalize_address_with_prefix(
+            contract_address
+        )
         logger.info(
-            f"Loaded {len(transactions_pl)} transactions for chain_id {chain_id}"
+            f"Using normalized contract with prefix for filtering: {normalized_contract_with_prefix}"
         )
 
-        normalized_contract = normalize_address(contract_address)
-        normalized_contract_with_prefix = normalize_address_with_prefix(
-            contract_address
+        # Addresses are stored lowercase, so the contract filter is pushed into
+        # the scan, where it prunes files on the "to" column statistics and,
+        # on bucketed tables, whole partitions of other address buckets
+        query = query.filter(EqualTo("to", normalized_contract_with_prefix))
+        bucket_filter = address_bucket_filter(
+            table, "to", normalized_contract_with_prefix
         )
+        if bucket_filter is not None:
+            query = query.filter(bucket_filter)
+        if row_filter is not None:
+            query = query.filter(row_filter)
+        transactions_pl = pl.from_arrow(query.to_arrow())
 
-        logger.info(f"Normalized contract address: {normalized_contract}")
+        # Log the number of transactions loaded
         logger.info(
-            f"Using normalized contract with prefix for filtering: {normalized_contract_with_prefix}"
+            f"Loaded {len(transactions_pl)} transactions for chain_id {chain_id}"
         )
 
-        # Apply address normalization
         query = transactions_pl.with_columns(
             [
-                pl.col("from")
-                .map_elements(lambda x: x.lower() if x else "", return_dtype=pl.Utf8)
-                .alias("from_normalized"),
-                pl.col("to")
-                .map_elements(lambda x: x.lower() if x else "", return_dtype=pl.Utf8)
-                .alias("to_normalized"),
+                pl.col("from").fill_null("").alias("from_normalized"),
+                pl.col("to").fill_null("").alias("to_normalized"),
             ]
         )
 
@@ -331,9 +350,6 @@ def _load_and_filter_transactions(catalog, chain_id, contract_address, time_wind
             )
             logger.info(f"Applied time filter: {start_time} to {end_time}")
 
-        # Filter by contract address (transactions sent to the contract)
-        query = query.filter(pl.col("to_normalized") == normalized_contract_with_prefix)
-
         # Log the number of transactions after filtering
         tx_count = len(query)
         logger.info(
@@ -347,6 +363,151 @@ def _load_and_filter_transactions(catalog, chain_id, contract_address, time_wind
         return None, None, None
 
 
+def _load_contract_daily_stats(catalog, chain_id, contract_address, time_window):
+    """
+    Load a contract's daily stats rows within a time window.
+
+    Days entirely inside the window are read from the contract daily stats
+    rollup. The partial days at its edges (the current day and, for a
+    windowed query, the first day) are aggregated from the transactions
+    filtered on block time, so results match a scan of the transactions.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Chain ID (e.g., 1 for Ethereum mainnet)
+        contract_address: Contract address to analyze
+        time_window: Time window string ('24h', '48h', '7d', etc.) or None for all time
+
+    Returns:
+        Polars DataFrame of contract_daily_stats rows, or None on failure
+    """
+    try:
+        table = load_table(catalog, "standardized", "contract_daily_stats")
+        if not table:
+            logger.error("Failed to load contract daily stats table")
+            return None
+
+        query, start_time, end_time = _apply_time_window_filter(
+            table, chain_id, time_window
+        )
+        whole_days, edge_days = _window_day_filters(start_time, end_time)
+
+        contract = normalize_address_with_prefix(contract_address)
+        stats = query.filter(
+            And(EqualTo("contract_address", contract), whole_days)
+        ).to_arrow()
+
+        transactions = _load_and_filter_transactions(
+            catalog, chain_id, contract_address, time_window, edge_days
+        )
+        if transactions is None:
+            return None
+        edge_stats = aggregate_daily_stats(transactions.to_arrow())
+
+        logger.info(
+            f"Loaded {len(stats)} rollup and {len(edge_stats)} edge-day stats rows"
+        )
+        return pl.from_arrow(
+            pa.concat_tables(
+                [stats, edge_stats.select(stats.schema.names).cast(stats.schema)]
+            )
+        )
+
+    except Exception as e:
+        logger.error(f"Error loading contract daily stats: {e}")
+        return None
+
+
+def _load_contract_activity(catalog, chain_id, contract_address, time_window):
+    """
+    Load a contract's activity rows within a time window.
+
+    The rows, one per (sender, function), are aggregated from the contract's
+    transactions filtered on block time; the scan is pruned to the contract
+    by its address bucket and the file statistics of the "to" column.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Chain ID (e.g., 1 for Ethereum mainnet)
+        contract_address: Contract address to analyze
+        time_window: Time window string ('24h', '48h', '7d', etc.) or None for all time
+
+    Returns:
+        Polars DataFrame with from_address, from_normalized, function_name,
+        tx_count, total_value, value_eth, first_time and last_time columns,
+        or None on failure
+    """
+    try:
+        transactions = _load_and_filter_transactions(
+            catalog, chain_id, contract_address, time_window
+        )
+        if transactions is None:
+            return None
+
+        activity = (
+            transactions.group_by("from", "function_name")
+            .agg(
+                [
+                    pl.len().alias("tx_count"),
+                    pl.sum("value").alias("total_value"),
+                    pl.min("block_time").alias("first_time"),
+                    pl.max("block_time").alias("last_time"),
+                ]
+            )
+            .rename({"from": "from_address"})
+        )
+        logger.info(f"Aggregated {len(activity)} contract activity rows")
+        return activity.with_columns(
+            [
+                pl.col("from_address").fill_null("").alias("from_normalized"),
+                (pl.col("total_value").cast(pl.Float64).fill_null(0) / 1e18).alias(
+                    "value_eth"
+                ),
+            ]
+        )
+
+    except Exception as e:
+        logger.error(f"Error loading contract activity: {e}")
+        return None
+
+
+def _load_contract_edges(catalog, chain_id, contract_address, time_window):
+    """
+    Load the interaction edges into a contract within a time window.
+
+    The edges are a keyed read of the contract lookup copy of the cumulative
+    interaction edges; see _load_interaction_edges() for how a time window is
+    applied.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Chain ID (e.g., 1 for Ethereum mainnet)
+        contract_address: Contract address to analyze
+        time_window: Time window string ('24h', '48h', '7d', etc.) or None for all time
+
+    Returns:
+        Polars DataFrame of interaction_edges rows with an address_normalized
+        column, or None on failure
+    """
+    try:
+        contract = normalize_address_with_prefix(contract_address)
+        edges = _load_interaction_edges(
+            catalog, chain_id, contract, [LOOKUP_CONTRACT], time_window
+        )
+        if edges is None:
+            logger.error("Failed to load interaction edges tables")
+            return None
+
+        logger.info(f"Loaded {len(edges)} interaction edges")
+        return pl.from_arrow(edges).with_columns(
+            pl.col("address").fill_null("").alias("address_normalized")
+        )
+
+    except Exception as e:
+        logger.error(f"Error loading contract interaction edges: {e}")
+        return None
+
+
 def get_contract_summary(catalog, chain_id, contract_address, time_window=None):
     """
     Get comprehensive analytics for a contract address.
@@ -366,8 +527,8 @@ def get_contract_summary(catalog, chain_id, contract_address, time_window=None):
             - method_distribution: Distribution of function calls (if available)
     """
     try:
-        # Use the common helper function to load and filter transactions
-        query = _load_and_filter_transactions(
+        # Load the contract daily stats rows of the window
+        query = _load_contract_daily_stats(
             catalog, chain_id, contract_address, time_window
         )
 
@@ -375,8 +536,7 @@ def get_contract_summary(catalog, chain_id, contract_address, time_window=None):
             return None
 
         # Check if we have any transactions
-        tx_count = len(query)
-        if tx_count == 0:
+        if len(query) == 0:
             logger.warning(f"No transactions found for contract {contract_address}")
             return {
                 "basic_metrics": {
@@ -397,9 +557,16 @@ def get_contract_summary(catalog, chain_id, contract_address, time_window=None):
         # Calculate analytics using extracted functions
         basic_metrics, processed_query = _calculate_basic_metrics(query)
         daily_activity = _analyze_daily_activity(processed_query)
-        top_users = _analyze_top_users(processed_query)
-        method_distribution = _analyze_method_distribution(processed_query)
-        user_segments = _analyze_user_segments(processed_query)
+
+        # Per-user analytics need the sender and function of each transaction
+        activity = _load_contract_activity(
+            catalog, chain_id, contract_address, time_window
+        )
+        if activity is None:
+            return None
+        top_users = _analyze_top_users(activity)
+        method_distribution = _analyze_method_distribution(activity)
+        user_segments = _analyze_user_segments(activity)
 
         return {
             "basic_metrics": basic_metrics,
@@ -448,29 +615,33 @@ def get_contract_addresses_interactions(
                 - total_value: Total value transferred to the contract
     """
     try:
-        # Use the common helper function to load and filter transactions
-        query = _load_and_filter_transactions(
-            catalog, chain_id, contract_address, time_window
-        )
-
-        if query is None:
-            return None
-
-        # Filter by function name if provided
         if function_name:
-            if "function_name" in query.columns:
-                query = query.filter(
-                    pl.col("function_name").fill_null("Unknown") == function_name
-                )
-                logger.info(f"Applied function filter: {function_name}")
-            else:
-                logger.warning(
-                    "function_name column not found in transactions data, ignoring function filter"
-                )
+            # Edges have no function, so filtered lookups use the activity rows
+            activity = _load_contract_activity(
+                catalog, chain_id, contract_address, time_window
+            )
+            if activity is None:
+                return None
+            query = activity.filter(
+                pl.col("function_name").fill_null("Unknown") == function_name
+            ).select(
+                pl.col("from_address").alias("address"),
+                pl.col("from_normalized").alias("address_normalized"),
+                pl.col("tx_count").alias("count"),
+                pl.col("first_time").alias("first_seen"),
+                pl.col("last_time").alias("last_seen"),
+                pl.col("total_value").alias("value"),
+            )
+            logger.info(f"Applied function filter: {function_name}")
+        else:
+            query = _load_contract_edges(
+                catalog, chain_id, contract_address, time_window
+            )
+            if query is None:
+                return None
 
         # Check if we have any transactions after filtering
-        tx_count = len(query)
-        if tx_count == 0:
+        if len(query) == 0:
             logger.warning(f"No transactions found for contract {contract_address}")
             return {
                 "contract_address": contract_address,
@@ -482,20 +653,9 @@ def get_contract_addresses_interactions(
                 "addresses": [],
             }
 
-        # Convert value to numeric
-        query = query.with_columns(
-            [
-                pl.col("value").cast(pl.Float64).fill_null(0).alias("value_float"),
-                pl.col("block_time").cast(pl.Datetime).alias("block_time_dt"),
-            ]
-        )
-
-        # Calculate value in ETH
-        query = query.with_columns([(pl.col("value_float") / 1e18).alias("value_eth")])
-
         # Calculate total unique addresses
         total_unique_addresses = query.select(
-            pl.col("from_normalized").n_unique()
+            pl.col("address_normalized").n_unique()
         ).item()
         logger.info(
             f"Found {total_unique_addresses} unique addresses interacting with contract"
@@ -503,13 +663,14 @@ def get_contract_addresses_interactions(
 
         # Group by address and calculate metrics
         address_metrics = (
-            query.group_by("from", "from_normalized")
+            query.group_by("address", "address_normalized")
             .agg(
                 [
-                    pl.count().alias("tx_count"),
-                    pl.min("block_time_dt").alias("first_interaction"),
-                    pl.max("block_time_dt").alias("last_interaction"),
-                    pl.sum("value_eth").alias("total_value_eth"),
+                    pl.sum("count").alias("tx_count"),
+                    pl.min("first_seen").alias("first_interaction"),
+                    pl.max("last_seen").alias("last_interaction"),
+                    # Exact wei sum, converted to ETH once per address
+                    (pl.sum("value").cast(pl.Float64) / 1e18).alias("total_value_eth"),
                 ]
             )
             .sort("tx_count", descending=True)
@@ -532,7 +693,7 @@ def get_contract_addresses_interactions(
                         row = address_metrics_paginated.row(i, named=True)
                         address_list.append(
                             {
-                                "address": row.get("from", ""),
+                                "address": row.get("address", ""),
                                 "tx_count": int(row.get("tx_count", 0)),
                                 "first_interaction": str(
                                     row.get("first_interaction", "")
@@ -585,8 +746,8 @@ def get_contract_function_distribution(
             - functions: List of function distribution data matching MethodDistribution model
     """
     try:
-        # Use the common helper function to load and filter transactions
-        query = _load_and_filter_transactions(
+        # Load the contract activity rows of the window
+        query = _load_contract_activity(
             catalog, chain_id, contract_address, time_window
         )
 
@@ -594,8 +755,7 @@ def get_contract_function_distribution(
             return None
 
         # Check if we have any transactions
-        tx_count = len(query)
-        if tx_count == 0:
+        if len(query) == 0:
             logger.warning(f"No transactions found for contract {contract_address}")
             return {
                 "contract_address": contract_address,
@@ -1,19 +1,38 @@
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.compute as pc
 from pyiceberg.expressions import (
     And,
     EqualTo,
+    GreaterThan,
     GreaterThanOrEqual,
+    In,
+    LessThan,
     LessThanOrEqual,
+    Or,
     Reference,
     literal,
 )
 
+from db.iceberg import cached_scan, load_table
+from db.partitioning import address_bucket_filter
 from models import TimePeriod
+from pipelines.standardized.interaction_edges import (
+    LOOKUP_ADDRESS,
+    aggregate_interaction_edges,
+    edge_lookup_filter,
+    select_edges,
+)
 
 
 def _apply_time_window_filter(table, chain_id, time_window):
     """
     Apply time window filtering to an Iceberg table scan.
 
+    The scan plans its files through the planning cache, so repeated queries
+    on an unchanged snapshot skip reading the manifests.
+
     Returns:
         Tuple of (filtered_query, start_time, end_time)
     """
@@ -29,7 +48,7 @@ def _apply_time_window_filter(table, chain_id, time_window):
     end_date = end_time.date() if end_time else None
 
     # Build query
-    query = table.scan()
+    query = cached_scan(table)
 
     # Filter by chain_id
     chain_id_ref = Reference("chain_id")
@@ -44,3 +63,118 @@ def _apply_time_window_filter(table, chain_id, time_window):
         query = query.filter(date_filter)
 
     return query, start_time, end_time
+
+
+def _window_day_filters(start_time, end_time):
+    """
+    Split a time window into whole days and partial edge days.
+
+    Whole days can be answered from daily rollups; the edge days (the first
+    and last day of a window, or the current day without one) are only partly
+    inside it and must be aggregated from transactions filtered on block time.
+
+    Returns:
+        Tuple of (whole_days_filter, edge_days_filter) on block_date
+    """
+    if start_time and end_time:
+        first_day = start_time.date().isoformat()
+        last_day = end_time.date().isoformat()
+        whole_days = And(
+            GreaterThan("block_date", first_day), LessThan("block_date", last_day)
+        )
+        edge_days = In("block_date", {first_day, last_day})
+    else:
+        today = date.today().isoformat()
+        whole_days = LessThan("block_date", today)
+        edge_days = GreaterThanOrEqual("block_date", today)
+
+    return whole_days, edge_days
+
+
+def _load_interaction_edges(catalog, chain_id, address, lookups, time_window):
+    """
+    Load the interaction edges of an address within a time window.
+
+    Edges are cumulative, read with a keyed scan of the lookup copies. Within
+    a time window, an edge whose first and last transaction are both inside
+    it is used as stored and an edge entirely outside it is dropped. Edges
+    active both inside and outside the window are recomputed from the
+    window's transactions with their counterparties, a scan pruned on the
+    sorted "to" column.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Chain ID (e.g., 1 for Ethereum mainnet)
+        address: Lowercase 0x-prefixed address
+        lookups: LOOKUP_ADDRESS for the edges the address sent and/or
+            LOOKUP_CONTRACT for the edges it received
+        time_window: Time window string ('24h', '48h', '7d', etc.) or None for all time
+
+    Returns:
+        PyArrow table of interaction_edges rows, or None if a table is missing
+    """
+    table = load_table(catalog, "standardized", "interaction_edges")
+    if not table:
+        return None
+
+    lookup_filter = edge_lookup_filter(lookups[0], address)
+    for lookup in lookups[1:]:
+        lookup_filter = Or(lookup_filter, edge_lookup_filter(lookup, address))
+    edges = (
+        cached_scan(table)
+        .filter(And(EqualTo("chain_id", chain_id), lookup_filter))
+        .to_arrow()
+    )
+    if not time_window:
+        return edges
+
+    start_time, end_time = TimePeriod.from_string(time_window).to_datetime_range()
+    first_seen, last_seen = edges["first_seen"], edges["last_seen"]
+    start = pa.scalar(start_time, first_seen.type)
+    end = pa.scalar(end_time, last_seen.type)
+    inside = pc.and_(pc.greater_equal(first_seen, start), pc.less_equal(last_seen, end))
+    overlapping = pc.and_(
+        pc.less_equal(first_seen, end), pc.greater_equal(last_seen, start)
+    )
+    straddling = edges.filter(pc.and_(overlapping, pc.invert(inside)))
+    edges = edges.filter(inside)
+    if straddling.num_rows == 0:
+        return edges
+
+    transactions_table = load_table(catalog, "standardized", "transactions")
+    if not transactions_table:
+        return None
+    query, _, _ = _apply_time_window_filter(transactions_table, chain_id, time_window)
+
+    recomputed = []
+    for lookup in lookups:
+        copy = select_edges(straddling, lookup, address)
+        if copy.num_rows == 0:
+            continue
+        # Sent edges: the counterparties are the recipients, received edges:
+        # the address is the recipient
+        if lookup == LOOKUP_ADDRESS:
+            counterparties = set(copy["contract"].to_pylist())
+            row_filter = And(EqualTo("from", address), In("to", counterparties))
+        else:
+            counterparties = set(copy["address"].to_pylist())
+            row_filter = And(EqualTo("to", address), In("from", counterparties))
+            bucket_filter = address_bucket_filter(transactions_table, "to", address)
+            if bucket_filter is not None:
+                row_filter = And(row_filter, bucket_filter)
+
+        transactions = query.filter(row_filter).to_arrow()
+        block_time = transactions["block_time"]
+        transactions = transactions.filter(
+            pc.and_(
+                pc.greater_equal(block_time, pa.scalar(start_time, block_time.type)),
+                pc.less_equal(block_time, pa.scalar(end_time, block_time.type)),
+            )
+        )
+        recomputed.append(
+            select_edges(aggregate_interaction_edges(transactions), lookup, address)
+        )
+
+    return pa.concat_tables(
+        [edges] + [r.select(edges.schema.names).cast(edges.schema) for r in recomputed]
+    )
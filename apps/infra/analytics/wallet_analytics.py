@@ -6,24 +6,64 @@ This module provides functions to analyze wallet interactions with blockchain da
 - Wallet contract interactions
 - Transaction patterns
 - Contract usage analytics for specific wallets
+
+Interactions are read from the cumulative standardized.interaction_edges;
+only edges active both inside and outside a time window are recomputed from
+standardized.transactions.
 """
 
 import polars as pl
-from analytics.helpers import _apply_time_window_filter
+from analytics.helpers import _load_interaction_edges
 from config.logging_config import get_logger
-from db.iceberg import load_table
+from pipelines.standardized.interaction_edges import LOOKUP_ADDRESS, LOOKUP_CONTRACT
 from static.contracts import get_contract_info
 from utils.blockchain import normalize_address, normalize_address_with_prefix
 
 logger = get_logger(__name__)
 
 
-def _get_wallet_transactions(query, normalized_wallet_with_prefix, wallet_address):
+def _load_wallet_edges(catalog, chain_id, wallet_address, time_window):
+    """
+    Load the interaction edges a wallet sent or received within a time window.
+
+    Both directions are keyed reads of the cumulative interaction edges; see
+    _load_interaction_edges() for how a time window is applied.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Chain ID (e.g., 1 for Ethereum mainnet)
+        wallet_address: Lowercase 0x-prefixed wallet address
+        time_window: Time window string ('24h', '48h', '7d', etc.) or None for all time
+
+    Returns:
+        Polars DataFrame of interaction_edges rows, or None on failure
+    """
+    try:
+        edges = _load_interaction_edges(
+            catalog,
+            chain_id,
+            wallet_address,
+            [LOOKUP_ADDRESS, LOOKUP_CONTRACT],
+            time_window,
+        )
+        if edges is None:
+            logger.error("Failed to load interaction edges tables")
+            return None
+
+        logger.info(f"Loaded {len(edges)} interaction edges")
+        return pl.from_arrow(edges)
+
+    except Exception as e:
+        logger.error(f"Error loading wallet interaction edges: {e}")
+        return None
+
+
+def _get_wallet_transactions(edges, normalized_wallet_with_prefix, wallet_address):
     """
-    Get incoming and outgoing transactions for the wallet.
+    Get incoming and outgoing interactions for the wallet.
 
     Args:
-        query: Polars DataFrame with normalized transaction data
+        edges: Polars DataFrame of the wallet's interaction edges
         normalized_wallet_with_prefix: Normalized wallet address with 0x prefix
         wallet_address: Original wallet address for logging
 
@@ -31,55 +71,46 @@ def _get_wallet_transactions(query, normalized_wallet_with_prefix, wallet_addres
         tuple: (all_interactions DataFrame, total_interactions count) or (None, 0) if no transactions
     """
     try:
-        # We need to consider both:
-        # 1. Transactions where the wallet is the sender (from field)
-        # 2. Transactions where the wallet is the recipient (to field)
-
-        # First, find transactions initiated by the wallet
-        outgoing_txs = query.filter(
-            pl.col("from_normalized") == normalized_wallet_with_prefix
+        # Edges sent by the wallet: the counterparty is the recipient
+        outgoing = edges.filter(
+            (pl.col("lookup") == LOOKUP_ADDRESS)
+            & (pl.col("address") == normalized_wallet_with_prefix)
+        ).select(
+            pl.col("contract").alias("contract_address"),
+            pl.lit("outgoing").alias("direction"),
+            "chain_id",
+            "count",
+            "first_seen",
+            "last_seen",
         )
-        outgoing_count = len(outgoing_txs)
         logger.info(
-            f"Found {outgoing_count} outgoing transactions from wallet {normalized_wallet_with_prefix}"
+            f"Found {outgoing['count'].sum()} outgoing transactions from wallet {normalized_wallet_with_prefix}"
         )
 
-        # Then, find transactions where the wallet received funds
-        incoming_txs = query.filter(
-            pl.col("to_normalized") == normalized_wallet_with_prefix
+        # Edges received by the wallet: the counterparty is the sender
+        incoming = edges.filter(
+            (pl.col("lookup") == LOOKUP_CONTRACT)
+            & (pl.col("contract") == normalized_wallet_with_prefix)
+        ).select(
+            pl.col("address").alias("contract_address"),
+            pl.lit("incoming").alias("direction"),
+            "chain_id",
+            "count",
+            "first_seen",
+            "last_seen",
         )
-        incoming_count = len(incoming_txs)
         logger.info(
-            f"Found {incoming_count} incoming transactions to wallet {normalized_wallet_with_prefix}"
+            f"Found {incoming['count'].sum()} incoming transactions to wallet {normalized_wallet_with_prefix}"
         )
 
         # Combine both types of interactions
-        all_interactions = pl.concat(
-            [
-                # For outgoing transactions, the contract is in the 'to' field
-                outgoing_txs.select(
-                    pl.col("to").alias("contract_address"),
-                    pl.col("to_normalized").alias("contract_address_normalized"),
-                    pl.lit("outgoing").alias("direction"),
-                    pl.col("chain_id"),
-                    pl.col("block_time"),
-                    pl.col("hash"),
-                    pl.col("value"),
-                ),
-                # For incoming transactions, the contract is in the 'from' field
-                incoming_txs.select(
-                    pl.col("from").alias("contract_address"),
-                    pl.col("from_normalized").alias("contract_address_normalized"),
-                    pl.lit("incoming").alias("direction"),
-                    pl.col("chain_id"),
-                    pl.col("block_time"),
-                    pl.col("hash"),
-                    pl.col("value"),
-                ),
-            ]
+        all_interactions = pl.concat([outgoing, incoming]).with_columns(
+            pl.col("contract_address")
+            .fill_null("")
+            .alias("contract_address_normalized")
         )
 
-        total_interactions = len(all_interactions)
+        total_interactions = int(all_interactions["count"].sum())
         logger.info(f"Total interactions (incoming + outgoing): {total_interactions}")
 
         if total_interactions == 0:
@@ -196,78 +227,22 @@ def get_wallet_contract_interactions(
         - 'total_transaction_count': Total number of transactions
     """
     try:
-        # Load transactions table
-        table = load_table(catalog, "raw", "transactions")
-        if not table:
-            logger.error("Failed to load transactions table")
-            return None
-
-        # Apply time window filter using helper function
-        query, start_time, end_time = _apply_time_window_filter(
-            table, chain_id, time_window
-        )
-
-        # Convert to polars DataFrame - using correct conversion method
-        arrow_table = query.to_arrow()
-        transactions_pl = pl.from_arrow(arrow_table)
-
-        # Log the number of transactions loaded
-        logger.info(
-            f"Loaded {len(transactions_pl)} transactions for chain_id {chain_id}"
-        )
-
-        # Check if we have any data
-        if len(transactions_pl) == 0:
-            logger.warning(f"No transactions found for chain_id {chain_id}")
-            return {
-                "interactions": pl.DataFrame(
-                    {
-                        "contract_address": [],
-                        "contract_address_normalized": [],
-                        "interaction_count": [],
-                        "chain_id": [],
-                        "contract_name": [],
-                        "contract_category": [],
-                        "dapp": [],
-                    }
-                ).with_columns(pl.lit(0).alias("total_count")),
-                "first_transaction": None,
-                "last_transaction": None,
-                "total_transaction_count": 0,
-            }
-
         # Normalize the wallet address
         normalized_wallet = normalize_address(wallet_address)
         logger.info(f"Normalized wallet address: {normalized_wallet}")
 
-        # For filtering, we need the address with 0x prefix
+        # Edges store lowercase addresses with the 0x prefix
         normalized_wallet_with_prefix = normalize_address_with_prefix(wallet_address)
         logger.info(
             f"Using normalized wallet with prefix for filtering: {normalized_wallet_with_prefix}"
         )
 
-        # Normalize addresses in the dataframe for comparison
-        # Keep the 0x prefix for proper matching with blockchain data
-        query = transactions_pl.with_columns(
-            [
-                pl.col("from")
-                .map_elements(lambda x: x.lower() if x else "", return_dtype=pl.Utf8)
-                .alias("from_normalized"),
-                pl.col("to")
-                .map_elements(lambda x: x.lower() if x else "", return_dtype=pl.Utf8)
-                .alias("to_normalized"),
-            ]
+        # Load the wallet's interaction edges of the window
+        query = _load_wallet_edges(
+            catalog, chain_id, normalized_wallet_with_prefix, time_window
         )
-
-        # Further refine time filtering if needed using block_time for more precise filtering
-        if start_time and end_time:
-            query = query.with_columns(
-                pl.col("block_time").cast(pl.Datetime).alias("ts")
-            )
-            query = query.filter(
-                (pl.col("ts") >= start_time) & (pl.col("ts") <= end_time)
-            )
-            logger.info(f"Applied time filter: {start_time} to {end_time}")
+        if query is None:
+            return None
 
         # Get wallet transactions using extracted helper function
         all_interactions, total_interactions = _get_wallet_transactions(
@@ -296,16 +271,11 @@ def get_wallet_contract_interactions(
         first_transaction = None
         last_transaction = None
 
-        # Convert block_time to datetime and find min/max
-        all_interactions_with_time = all_interactions.with_columns(
-            pl.col("block_time").cast(pl.Datetime).alias("timestamp")
-        )
-
         # Get the earliest and latest transaction times
-        time_stats = all_interactions_with_time.select(
+        time_stats = all_interactions.select(
             [
-                pl.col("timestamp").min().alias("first_tx"),
-                pl.col("timestamp").max().alias("last_tx"),
+                pl.col("first_seen").min().alias("first_tx"),
+                pl.col("last_seen").max().alias("last_tx"),
             ]
         )
 
@@ -325,7 +295,7 @@ def get_wallet_contract_interactions(
         result = (
             all_interactions.group_by("contract_address", "contract_address_normalized")
             .agg(
-                pl.count().alias("interaction_count"),
+                pl.sum("count").alias("interaction_count"),
                 pl.first("chain_id").alias("chain_id"),
                 pl.col("direction").n_unique().alias("direction_count"),
                 pl.first("direction").alias("primary_direction"),
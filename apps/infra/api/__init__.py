@@ -11,6 +11,10 @@ from api.routes.wallet import router as wallet_router
 from config.aws_config import initialize_catalog
 from config.logging_config import get_logger
 from config.redis_config import redis_manager
+from db.file_cache import start_file_cache_warmup
+from db.maintenance import start_scheduled_maintenance
+from db.writer import iceberg_writer
+from jobs import progress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -43,11 +47,32 @@ async def lifespan(app: FastAPI):
         logger.warning("Redis connection failed - caching will be unavailable")
         # Don't fail startup if Redis is unavailable, just log warning
 
+    # Start the Iceberg writer so table I/O runs off the event loop
+    await iceberg_writer.start()
+
+    # Start scheduled table maintenance (disabled unless an interval is configured)
+    maintenance_task = start_scheduled_maintenance(catalog)
+
+    # Download recent partitions of hot tables into the local data file cache
+    warmup_task = start_file_cache_warmup(catalog)
+
     yield
 
     # Cleanup on shutdown
     logger.info("Shutting down API...")
 
+    if maintenance_task:
+        maintenance_task.cancel()
+    if warmup_task:
+        warmup_task.cancel()
+
+    # Let in-flight Iceberg writes finish
+    await iceberg_writer.stop()
+
+    # Close task event streams' shared subscription
+    if progress.progress_broker is not None:
+        await progress.progress_broker.stop()
+
     # Close Redis connection
     if hasattr(app.state, "redis_manager"):
         await app.state.redis_manager.disconnect()
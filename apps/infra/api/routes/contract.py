@@ -254,7 +254,7 @@ async def create_contract(request: ContractCreateRequest, catalog=Depends(get_ca
     contract_address = request.contract_address.lower()
 
     # Check if contract exists
-    contracts_table = load_table(catalog, "standardized", "contracts")
+    contracts_table = load_table(catalog, "standardized", "contracts", refresh=True)
     if not contracts_table:
         raise HTTPException(status_code=500, detail="Failed to load contracts table")
 
@@ -363,7 +363,7 @@ async def update_contract(
         raise HTTPException(status_code=404, detail="Contract not found")
 
     # Load contracts table
-    contracts_table = load_table(catalog, "standardized", "contracts")
+    contracts_table = load_table(catalog, "standardized", "contracts", refresh=True)
     if not contracts_table:
         raise HTTPException(status_code=500, detail="Failed to load contracts table")
 
@@ -4,31 +4,54 @@ ETL API Routes
 This module defines FastAPI routes for ETL operations.
 """
 
+import asyncio
+import json
 import os
 import uuid
+from dataclasses import asdict
 from typing import Optional, List
-from datetime import datetime, timezone
+from datetime import datetime
 
-from api.dependencies import get_catalog
 from config.logging_config import get_logger
-from config.redis_config import get_redis_manager, generate_task_status_key
-from db.iceberg import load_table, reorder_records
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from pipelines.raw.cursor import (
-    get_cursor,
-    update_cursor,
-    calculate_time_based_start_block,
+from config.redis_config import (
+    get_redis_manager,
+    generate_sync_checkpoint_key,
+    generate_task_status_key,
+)
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from jobs.backfill import get_backfill_scheduler
+from jobs.handlers import (
+    DECODE_CALLS,
+    IMPORT_ADDRESSES,
+    SYNC_TOKEN_TRANSFERS,
+    SYNC_TRANSACTIONS,
+    enqueue_transactions_standardization,
+    update_task_status,
+)
+from jobs.progress import get_progress_broker, is_terminal_event
+from jobs.queue import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    STATUS_COMPLETED,
+    STATUS_DEAD,
+    get_job_queue,
 )
-from pipelines.raw.transactions import load_transactions_with_safety
 from pipelines.raw.contract_address_import import (
     ContractAddressImporter,
 )
-from providers.etherscan import EtherscanProvider, FetchMode, TimePeriod
+from pipelines.raw.finality import resolve_finalized_block
+from pipelines.raw.user_index import ContractUserIndex
+from providers.etherscan import EtherscanProvider, TimePeriod
 from pydantic import BaseModel, Field, constr
-from utils.blockchain import is_valid_address, extract_block_range
+from utils.blockchain import is_valid_address
 
 logger = get_logger(__name__)
 
+# Seconds between keep-alive comments on idle event streams
+EVENT_KEEPALIVE_SECONDS = 15
+
 # Create router
 router = APIRouter(prefix="/api/v1/etl", tags=["etl"])
 
@@ -120,70 +143,128 @@ class UniqueAddressesResponse(BaseModel):
     from_cache: bool = False
 
 
-# Task status model
-class TaskStatus(BaseModel):
+# Request model for decoding contract calls
+class DecodeCallsRequest(BaseModel):
+    contract_address: constr(min_length=40, max_length=42) = Field(
+        ..., description="Contract whose calls to decode"
+    )
+    chain_id: int = Field(
+        8453, description="Blockchain ID (1=Ethereum, 8453=Base, etc.)"
+    )
+    start_block: Optional[int] = Field(
+        None,
+        description=(
+            "First block to re-decode. Defaults to the partitions changed since "
+            "the last run"
+        ),
+    )
+
+
+# Response model for call decoding jobs
+class DecodeCallsResponse(BaseModel):
+    status: str
+    message: str
     task_id: str
-    status: str  # "running", "completed", "failed"
+    contract_address: str
+    chain_id: int
+
+
+# Request model for syncing ERC-20 token transfers
+class SyncTokenTransfersRequest(BaseModel):
+    token_address: constr(min_length=40, max_length=42) = Field(
+        ..., description="ERC-20 token whose transfers to sync"
+    )
+    chain_id: int = Field(
+        8453, description="Blockchain ID (1=Ethereum, 8453=Base, etc.)"
+    )
+    mode: str = Field(
+        "incremental", description="Transfer logs sync mode: 'full' or 'incremental'"
+    )
+
+
+# Response model for token transfer sync jobs
+class SyncTokenTransfersResponse(BaseModel):
+    status: str
     message: str
-    created_at: datetime
-    completed_at: Optional[datetime] = None
-    result: Optional[dict] = None
-    error: Optional[str] = None
+    task_id: str
+    token_address: str
+    chain_id: int
+    mode: str
 
 
-async def _initialize_etl_tables(catalog, task_id):
-    """Initialize and load required tables for ETL."""
-    transactions_table = load_table(catalog, "raw", "transactions")
-    cursor_table = load_table(catalog, "raw", "cursor")
+# Response model for transactions conversion jobs
+class StandardizeTransactionsResponse(BaseModel):
+    status: str
+    message: str
+    task_id: str
 
-    if not transactions_table or not cursor_table:
-        logger.error(f"Task {task_id}: Failed to load tables")
-        return None, None
 
-    return transactions_table, cursor_table
+# Response model for contract user counts
+class ContractUserCountResponse(BaseModel):
+    contract_address: str
+    chain_id: int
+    unique_users: int  # HyperLogLog estimate over all indexed history
+    indexed_users: int  # Users held in the recency index
+    start_block: Optional[int] = None
+    end_block: Optional[int] = None
 
 
-async def _determine_fetch_mode(
-    cursor_table, chain_id, address, mode, time_period, task_id
-):
-    """Determine fetch mode and starting block for incremental sync."""
-    # Get last block number for incremental mode
-    last_block_number = None
-    period = None
+# Request model for historical backfills
+class BackfillRequest(BaseModel):
+    address: constr(min_length=40, max_length=42) = Field(
+        ..., description="Contract address whose history to backfill"
+    )
+    chain_id: int = Field(
+        8453, description="Blockchain ID (1=Ethereum, 8453=Base, etc.)"
+    )
+    start_block: int = Field(
+        0, ge=0, description="First block to backfill (e.g. the deployment block)"
+    )
+    weight: float = Field(
+        1.0,
+        gt=0,
+        le=100,
+        description="Share of the background Etherscan budget relative to other backfills",
+    )
+    priority: str = Field(
+        "normal",
+        description="Backfill priority: 'high', 'normal' or 'low'. Lower priorities "
+        "only get units while no higher-priority backfill has work left",
+    )
 
-    if mode == "full":
-        fetch_mode = FetchMode.FULL_REFRESH
-    elif mode == "time_range":
-        fetch_mode = FetchMode.TIME_RANGE
-        period = (
-            TimePeriod.from_string(time_period) if time_period else TimePeriod.DAYS_7
-        )
-    else:
-        fetch_mode = FetchMode.INCREMENTAL
-
-    if fetch_mode == FetchMode.INCREMENTAL:
-        cursor_data = get_cursor(cursor_table, chain_id, address)
-        if cursor_data is not None:
-            try:
-                # cursor_data is now a tuple (start_block, end_block)
-                _, end_block = cursor_data
-                last_block_number = int(end_block)
-                logger.info(
-                    f"Task {task_id}: Starting from block {last_block_number} (incremental mode)"
-                )
-            except (ValueError, TypeError):
-                logger.warning(
-                    f"Task {task_id}: Invalid block number in cursor: {cursor_data}"
-                )
-                last_block_number = None
-                fetch_mode = FetchMode.FULL_REFRESH
-        else:
-            logger.info(f"Task {task_id}: No cursor found, using full refresh mode")
-            fetch_mode = FetchMode.FULL_REFRESH
-    elif fetch_mode == FetchMode.TIME_RANGE:
-        logger.info(f"Task {task_id}: Using time-range mode ({period.value})")
 
-    return fetch_mode, last_block_number, period
+# Response model for backfill progress
+class BackfillProgressResponse(BaseModel):
+    backfill_id: str
+    chain_id: int
+    address: str
+    status: str  # "running", "completed", "failed"
+    weight: float
+    priority: int
+    start_block: int
+    end_block: int
+    blocks_total: int
+    blocks_done: int
+    percent_complete: float
+    rows: int
+    pages: int
+    units_done: int
+    units_pending: int
+    units_in_flight: int
+    failed_ranges: List[List[int]] = []
+    created_at: datetime
+    updated_at: datetime
+
+
+# Task status model
+class TaskStatus(BaseModel):
+    task_id: str
+    status: str  # "running", "completed", "failed"
+    message: str
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
 
 
 async def _check_running_task(
@@ -267,358 +348,12 @@ async def _check_running_task(
         return None
 
 
-async def _update_task_status(
-    redis_manager,
-    task_id: str,
-    status: str,
-    message: str,
-    result: Optional[dict] = None,
-    error: Optional[str] = None,
-    metadata: Optional[dict] = None,
-):
-    """Update task status in Redis."""
-    try:
-        task_key = generate_task_status_key(task_id)
-        task_data = {
-            "task_id": task_id,
-            "status": status,
-            "message": message,
-            "created_at": datetime.now().isoformat(),
-            "completed_at": (
-                datetime.now().isoformat()
-                if status in ["completed", "failed"]
-                else None
-            ),
-            "result": result,
-            "error": error,
-            "metadata": metadata or {},  # Store request parameters and other metadata
-        }
-
-        await redis_manager.set_json(task_key, task_data, ex=86400)  # 24 hour TTL
-        logger.info(f"Updated task {task_id} status to {status}")
-
-    except Exception as e:
-        logger.error(f"Failed to update task status for {task_id}: {e}")
-
-
-# Background task to import contract addresses
-async def import_contract_addresses_task(
-    catalog,
-    contract_address: str,
-    chain_id: int,
-    user_limit: int,
-    cache_ttl: int,
-    task_id: str,
-):
-    """
-    Background task to import unique addresses that have interacted with a contract.
-
-    Uses a decoupled approach:
-    1. Fast address extraction and immediate caching for quick API response
-    2. Separate database persistence that doesn't block the user
-
-    Args:
-        catalog: Iceberg catalog from app.state
-        contract_address: Contract address to analyze
-        chain_id: Blockchain ID
-        user_limit: Maximum number of unique addresses to return
-        cache_ttl: Cache time-to-live in seconds
-        task_id: Task identifier for tracking
-    """
-    redis_manager = await get_redis_manager()
-
-    # Store task metadata including request parameters
-    task_metadata = {
-        "contract_address": contract_address,
-        "chain_id": chain_id,
-        "user_limit": user_limit,
-        "cache_ttl": cache_ttl,
-    }
-
-    try:
-        logger.info(
-            f"Starting unique addresses extraction task {task_id} "
-            f"for {contract_address} on chain {chain_id}, limit: {user_limit}"
-        )
-
-        # Task status is already set to "running" by the endpoint
-        # Update status to indicate we're proceeding with the import
-        await _update_task_status(
-            redis_manager,
-            task_id,
-            "running",
-            f"Proceeding with address import for {contract_address}",
-            metadata=task_metadata,
-        )
-
-        # Get Etherscan API key
-        etherscan_api_key = os.getenv("ETHERSCAN_API_KEY")
-        if not etherscan_api_key:
-            error_msg = "ETHERSCAN_API_KEY not set"
-            logger.error(f"Task {task_id}: {error_msg}")
-            await _update_task_status(
-                redis_manager,
-                task_id,
-                "failed",
-                error_msg,
-                error=error_msg,
-                metadata=task_metadata,
-            )
-            return
-
-        # Initialize providers
-        etherscan_provider = EtherscanProvider(api_key=etherscan_api_key)
-        extractor = ContractAddressImporter(redis_manager, etherscan_provider)
-
-        # Check if we have cached results first
-        cached_result = await extractor.get_cached_result(chain_id, contract_address)
-        if cached_result:
-            logger.info(
-                f"Task {task_id}: Found cached result with {cached_result.total_addresses} addresses"
-            )
-
-            result_data = {
-                "addresses": cached_result.addresses,
-                "total_addresses": cached_result.total_addresses,
-                "blocks_processed": cached_result.blocks_processed,
-                "transactions_processed": cached_result.transactions_processed,
-                "start_block": cached_result.start_block,
-                "end_block": cached_result.end_block,
-                "last_updated": cached_result.last_updated.isoformat(),
-                "expires_at": (
-                    cached_result.expires_at.isoformat()
-                    if cached_result.expires_at
-                    else None
-                ),
-                "from_cache": True,
-            }
-
-            await _update_task_status(
-                redis_manager,
-                task_id,
-                "completed",
-                f"Retrieved {cached_result.total_addresses} unique addresses from cache",
-                result=result_data,
-                metadata=task_metadata,
-            )
-            return
-
-        # PHASE 1: Fast address extraction (no database blocking)
-        logger.info(f"Task {task_id}: Starting fast address extraction phase")
-        result = await extractor.import_addresses_fast(
-            chain_id=chain_id,
-            contract_address=contract_address,
-            user_limit=user_limit,
-            task_id=task_id,
-        )
-
-        # PHASE 2: Immediate caching for fast API response
-        logger.info(f"Task {task_id}: Caching results for immediate availability")
-        cache_success = await extractor.cache_result(
-            chain_id, contract_address, result, cache_ttl
-        )
-
-        if not cache_success:
-            logger.warning(f"Task {task_id}: Failed to cache results")
-
-        # Calculate expires_at based on cache_ttl
-        expires_at_timestamp = datetime.now(timezone.utc).timestamp() + cache_ttl
-        expires_at_iso = datetime.fromtimestamp(
-            expires_at_timestamp, tz=timezone.utc
-        ).isoformat()
-
-        # Prepare result data for API response
-        result_data = {
-            "addresses": result.addresses,
-            "total_addresses": result.total_addresses,
-            "blocks_processed": result.blocks_processed,
-            "transactions_processed": result.transactions_processed,
-            "start_block": result.start_block,
-            "end_block": result.end_block,
-            "last_updated": result.last_updated.isoformat(),
-            "expires_at": expires_at_iso,
-            "from_cache": False,
-        }
-
-        # Update task status to completed (API can respond immediately)
-        await _update_task_status(
-            redis_manager,
-            task_id,
-            "completed",
-            f"Imported {result.total_addresses} unique addresses successfully",
-            result=result_data,
-            metadata=task_metadata,
-        )
-
-        logger.info(
-            f"Task {task_id}: Address extraction completed successfully. "
-            f"Found {result.total_addresses} addresses from {result.transactions_processed} transactions"
-        )
-
-        # PHASE 3: Background database persistence (non-blocking)
-        logger.info(f"Task {task_id}: Starting background database persistence")
-        try:
-            db_success = await extractor.persist_to_database(
-                catalog, result, chain_id, contract_address, task_id
-            )
-
-            if db_success:
-                logger.info(
-                    f"Task {task_id}: Database persistence completed successfully"
-                )
-            else:
-                logger.warning(
-                    f"Task {task_id}: Database persistence failed, but results are cached"
-                )
-
-        except Exception as db_error:
-            # Database errors don't fail the overall task since results are already cached
-            logger.error(f"Task {task_id}: Database persistence error: {db_error}")
-            logger.info(
-                f"Task {task_id}: Results remain available from cache despite database error"
-            )
-
-    except Exception as e:
-        error_msg = f"Error in contract address import task: {e}"
-        logger.error(f"Task {task_id}: {error_msg}")
-        await _update_task_status(
-            redis_manager,
-            task_id,
-            "failed",
-            error_msg,
-            error=str(e),
-            metadata=task_metadata,
-        )
-
-
-# Background task to sync transactions
-async def sync_transactions_task(
-    catalog,
-    address: str,
-    chain_id: int,
-    mode: str,
-    time_period: Optional[str],
-    task_id: str,
-):
-    """
-    Background task to sync transactions for a contract or wallet address.
-
-    Args:
-        catalog: Iceberg catalog from app.state
-        address: Contract or wallet address
-        chain_id: Blockchain ID
-        mode: Sync mode ('full', 'incremental', or 'time_range')
-        time_period: Time period for time_range mode
-        task_id: Task identifier for tracking
-    """
-    try:
-        logger.info(
-            f"Starting sync task {task_id} for {address} on chain {chain_id}, mode: {mode}"
-        )
-
-        transactions_table, cursor_table = await _initialize_etl_tables(
-            catalog, task_id
-        )
-        if not transactions_table:
-            return
-
-        fetch_mode, last_block_number, period = await _determine_fetch_mode(
-            cursor_table, chain_id, address, mode, time_period, task_id
-        )
-
-        # Fetch transactions from Etherscan
-        etherscan_api_key = os.getenv("ETHERSCAN_API_KEY")
-        if not etherscan_api_key:
-            logger.error(f"Task {task_id}: ETHERSCAN_API_KEY not set")
-            return
-
-        etherscan_provider = EtherscanProvider(api_key=etherscan_api_key)
-        transactions = await etherscan_provider.get_all_transactions(
-            address=address,
-            chain_id=chain_id,
-            mode=fetch_mode,
-            last_block_number=last_block_number,
-            time_period=period,
-        )
-
-        if not transactions:
-            logger.info(f"Task {task_id}: No transactions found")
-            return
-
-        logger.info(f"Task {task_id}: Retrieved {len(transactions)} transactions")
-
-        # Get highest block number
-        highest_block_number = None
-        lowest_block_number = None
-        if transactions:
-            try:
-                lowest_block_number, highest_block_number = extract_block_range(
-                    transactions
-                )
-                if lowest_block_number is not None and highest_block_number is not None:
-                    logger.info(
-                        f"Task {task_id}: Block range: {lowest_block_number} to {highest_block_number}"
-                    )
-            except Exception as e:
-                logger.error(f"Task {task_id}: Error determining block numbers: {e}")
-
-        # Process and insert data using consolidated safety function
-        schema = transactions_table.schema()
-        transactions = reorder_records(transactions, schema)
-
-        # Use the consolidated function with automatic overlap detection
-        success = load_transactions_with_safety(
-            catalog, "raw", chain_id, address, transactions
-        )
-
-        if not success:
-            logger.error(f"Task {task_id}: Failed to load transaction data")
-            return
-
-        # Update cursor
-        if highest_block_number is not None:
-            logger.info(
-                f"Task {task_id}: Updating cursor to block {highest_block_number}"
-            )
-
-            # Calculate start_block based on fetch mode
-            start_block = None
-            if fetch_mode == FetchMode.FULL_REFRESH:
-                start_block = "0"  # From genesis
-            elif fetch_mode == FetchMode.TIME_RANGE:
-                # Calculate time-based start block using the new flexible function
-                start_block = await calculate_time_based_start_block(
-                    chain_id, period, f"Task {task_id}"
-                )
-            # For incremental mode, let update_cursor use previous end_block as start_block
-
-            await update_cursor(
-                catalog,
-                "raw",
-                chain_id,
-                address,
-                highest_block_number,
-                start_block=start_block,
-            )
-
-        logger.info(
-            f"Task {task_id}: Sync completed successfully, {len(transactions)} transactions processed"
-        )
-
-    except Exception as e:
-        logger.error(f"Task {task_id}: Error in sync task: {e}")
-
-
 @router.post("/addresses/import", response_model=UniqueAddressesResponse)
-async def extract_unique_addresses(
-    request: ExtractUniqueAddressesRequest,
-    background_tasks: BackgroundTasks,
-    catalog=Depends(get_catalog),
-):
+async def extract_unique_addresses(request: ExtractUniqueAddressesRequest):
     """
     Import unique addresses that have interacted with a smart contract.
 
-    This endpoint starts a background task to:
+    This endpoint enqueues a job for the ETL workers to:
     1. Fetch transactions from the contract address
     2. Import unique addresses (from + to fields)
     3. Store raw transaction data in raw.transactions table
@@ -699,6 +434,32 @@ async def extract_unique_addresses(
         logger.warning(f"Error checking cache for {contract_address}: {e}")
         # Continue with background task if cache check fails
 
+    # Answer from the contract's user index when it already holds enough users
+    try:
+        indexed_result = await ContractAddressImporter(
+            redis_manager, None
+        ).get_indexed_result(request.chain_id, contract_address, request.user_limit)
+        if indexed_result and indexed_result.total_addresses >= request.user_limit:
+            logger.info(f"Returning indexed users for {contract_address}")
+            return UniqueAddressesResponse(
+                status="completed",
+                message="Retrieved addresses from the contract user index",
+                task_id=None,
+                contract_address=contract_address,
+                chain_id=request.chain_id,
+                user_limit=request.user_limit,
+                addresses=indexed_result.addresses,
+                total_addresses=indexed_result.total_addresses,
+                blocks_processed=indexed_result.blocks_processed,
+                transactions_processed=0,
+                start_block=indexed_result.start_block,
+                end_block=indexed_result.end_block,
+                last_updated=indexed_result.last_updated,
+                from_cache=True,
+            )
+    except Exception as e:
+        logger.warning(f"Error checking user index for {contract_address}: {e}")
+
     # Double-check for running tasks after cache check to handle race conditions
     try:
         running_task_id = await _check_running_task(
@@ -728,7 +489,7 @@ async def extract_unique_addresses(
         "cache_ttl": request.cache_ttl,
     }
 
-    await _update_task_status(
+    await update_task_status(
         redis_manager,
         task_id,
         "running",
@@ -736,21 +497,29 @@ async def extract_unique_addresses(
         metadata=task_metadata,
     )
 
-    # Start background task
-    background_tasks.add_task(
-        import_contract_addresses_task,
-        catalog,
-        contract_address=contract_address,
-        chain_id=request.chain_id,
-        user_limit=request.user_limit,
-        cache_ttl=request.cache_ttl,
-        task_id=task_id,
+    # Hand the import to the workers; the task ID doubles as the job ID
+    job_queue = await get_job_queue()
+    job_id = await job_queue.enqueue(
+        IMPORT_ADDRESSES,
+        task_metadata,
+        priority=PRIORITY_HIGH,
+        job_id=task_id,
     )
+    if job_id is None:
+        await update_task_status(
+            redis_manager,
+            task_id,
+            "failed",
+            "Failed to enqueue address import",
+            error="Job queue unavailable",
+            metadata=task_metadata,
+        )
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
 
     # Return immediate response
     return UniqueAddressesResponse(
         status="started",
-        message="Address import started in the background",
+        message="Address import queued for the ETL workers",
         task_id=task_id,
         contract_address=contract_address,
         chain_id=request.chain_id,
@@ -854,17 +623,43 @@ async def get_unique_addresses_status(task_id: str):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get(
+    "/addresses/{contract_address}/count", response_model=ContractUserCountResponse
+)
+async def count_unique_addresses(contract_address: str, chain_id: int = 8453):
+    """
+    Count the unique addresses that have interacted with a contract.
+
+    Answered from the contract's Redis user index, which syncs and address
+    imports maintain as they ingest transactions.
+    """
+    if not is_valid_address(contract_address, chain_id):
+        raise HTTPException(status_code=400, detail="Invalid contract address")
+
+    contract_address = contract_address.lower()
+    redis_manager = await get_redis_manager()
+    counts = await ContractUserIndex(redis_manager).count_users(
+        chain_id, contract_address
+    )
+    if counts is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No indexed users for this contract; run a sync or address import first",
+        )
+
+    return ContractUserCountResponse(
+        contract_address=contract_address, chain_id=chain_id, **counts
+    )
+
+
 @router.post("/sync", response_model=SyncStatusResponse)
-async def sync_transactions(
-    request: SyncTransactionsRequest,
-    background_tasks: BackgroundTasks,
-    catalog=Depends(get_catalog),
-):
+async def sync_transactions(request: SyncTransactionsRequest):
     """
     Sync transactions for a contract or wallet address.
 
-    This endpoint starts a background task to fetch transactions from Etherscan
-    and store them in the raw.transactions table.
+    This endpoint enqueues a job for the ETL workers to fetch transactions from
+    Etherscan and store them in the raw.transactions table. While a sync for the
+    same address is queued or running, its task ID is returned instead.
     """
     # Validate address
     if not is_valid_address(request.address, request.chain_id):
@@ -890,46 +685,304 @@ async def sync_transactions(
     # Normalize address
     address = request.address.lower()
 
-    task_id = str(uuid.uuid4())
+    # One sync per address at a time; they share a checkpoint
+    job_queue = await get_job_queue()
+    task_id = await job_queue.enqueue(
+        SYNC_TRANSACTIONS,
+        {
+            "address": address,
+            "chain_id": request.chain_id,
+            "mode": request.mode,
+            "time_period": request.time_period,
+        },
+        priority=PRIORITY_NORMAL,
+        dedupe_key=f"sync:{request.chain_id}:{address}",
+    )
+    if task_id is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
 
-    # Start background task
-    background_tasks.add_task(
-        sync_transactions_task,
-        catalog,
+    # Return immediate response
+    return SyncStatusResponse(
+        status="queued",
+        message="Transaction sync queued for the ETL workers",
+        task_id=task_id,
         address=address,
         chain_id=request.chain_id,
         mode=request.mode,
-        time_period=request.time_period,
+    )
+
+
+@router.post("/decode", response_model=DecodeCallsResponse)
+async def decode_contract_calls(request: DecodeCallsRequest):
+    """
+    Decode the call arguments of a contract's synced transactions.
+
+    Enqueues a job that decodes standardized.transactions calldata with the
+    contract's ABI from standardized.contracts into standardized.decoded_calls.
+    Sync the contract's transactions and add its ABI first; calls are decoded
+    once the standardized conversion has picked up the synced blocks.
+    """
+    if not is_valid_address(request.contract_address, request.chain_id):
+        raise HTTPException(status_code=400, detail="Invalid contract address")
+
+    contract_address = request.contract_address.lower()
+    job_queue = await get_job_queue()
+    task_id = await job_queue.enqueue(
+        DECODE_CALLS,
+        {
+            "chain_id": request.chain_id,
+            "contract_address": contract_address,
+            "start_block": request.start_block,
+        },
+        priority=PRIORITY_LOW,
+        dedupe_key=f"decode:{request.chain_id}:{contract_address}",
+    )
+    if task_id is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    return DecodeCallsResponse(
+        status="queued",
+        message="Call decoding queued for the ETL workers",
         task_id=task_id,
+        contract_address=contract_address,
+        chain_id=request.chain_id,
     )
 
-    # Return immediate response
-    return SyncStatusResponse(
-        status="started",
-        message="Transaction sync started in the background",
+
+@router.post("/token-transfers", response_model=SyncTokenTransfersResponse)
+async def sync_token_transfers(request: SyncTokenTransfersRequest):
+    """
+    Sync the ERC-20 transfers of a token.
+
+    Enqueues a job that syncs the token's Transfer logs into raw.logs and
+    decodes the new ones into standardized.token_transfers.
+    """
+    if not is_valid_address(request.token_address, request.chain_id):
+        raise HTTPException(status_code=400, detail="Invalid token address")
+    if request.mode not in ("full", "incremental"):
+        raise HTTPException(
+            status_code=400, detail="Mode must be 'full' or 'incremental'"
+        )
+
+    token_address = request.token_address.lower()
+    job_queue = await get_job_queue()
+    task_id = await job_queue.enqueue(
+        SYNC_TOKEN_TRANSFERS,
+        {
+            "chain_id": request.chain_id,
+            "token_address": token_address,
+            "mode": request.mode,
+        },
+        priority=PRIORITY_NORMAL,
+        dedupe_key=f"token_transfers:{request.chain_id}:{token_address}",
+    )
+    if task_id is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    return SyncTokenTransfersResponse(
+        status="queued",
+        message="Token transfers sync queued for the ETL workers",
         task_id=task_id,
-        address=address,
+        token_address=token_address,
         chain_id=request.chain_id,
         mode=request.mode,
     )
 
 
+@router.post(
+    "/transactions/standardize", response_model=StandardizeTransactionsResponse
+)
+async def standardize_transactions():
+    """
+    Convert new raw.transactions data into standardized.transactions.
+
+    Syncs queue this job themselves; use this endpoint for a first conversion
+    of existing data. Only partitions changed since the last conversion are
+    rewritten.
+    """
+    task_id = await enqueue_transactions_standardization()
+    if task_id is None:
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+    return StandardizeTransactionsResponse(
+        status="queued",
+        message="Transactions conversion queued for the ETL workers",
+        task_id=task_id,
+    )
+
+
+@router.post("/backfill", response_model=BackfillProgressResponse)
+async def start_backfill(request: BackfillRequest):
+    """
+    Backfill a contract's transaction history in the background.
+
+    Splits the history up to the finality frontier into block-range units
+    that the ETL workers run at low priority, sharing a fixed Etherscan
+    budget fairly with other backfills by weight. Use this instead of a full
+    sync when onboarding contracts; the task ID for progress events is the
+    returned backfill_id. A running backfill for the address is returned as is.
+    """
+    if not is_valid_address(request.address, request.chain_id):
+        raise HTTPException(status_code=400, detail="Invalid contract address")
+
+    priorities = {
+        "high": PRIORITY_HIGH,
+        "normal": PRIORITY_NORMAL,
+        "low": PRIORITY_LOW,
+    }
+    if request.priority not in priorities:
+        raise HTTPException(
+            status_code=400, detail="Priority must be 'high', 'normal' or 'low'"
+        )
+
+    etherscan_api_key = os.getenv("ETHERSCAN_API_KEY")
+    if not etherscan_api_key:
+        raise HTTPException(status_code=500, detail="ETHERSCAN_API_KEY not set")
+
+    end_block = await resolve_finalized_block(
+        EtherscanProvider(api_key=etherscan_api_key), request.chain_id
+    )
+    if end_block is None:
+        raise HTTPException(status_code=503, detail="Latest block unavailable")
+    if request.start_block > end_block:
+        raise HTTPException(
+            status_code=400,
+            detail=f"start_block is past the finalized block {end_block}",
+        )
+
+    scheduler = await get_backfill_scheduler(await get_job_queue())
+    progress = await scheduler.start(
+        request.chain_id,
+        request.address.lower(),
+        request.start_block,
+        end_block,
+        weight=request.weight,
+        priority=priorities[request.priority],
+    )
+    if progress is None:
+        raise HTTPException(status_code=503, detail="Backfill scheduler unavailable")
+    return BackfillProgressResponse(**progress)
+
+
+@router.get("/backfill/{chain_id}/{address}", response_model=BackfillProgressResponse)
+async def get_backfill_progress(chain_id: int, address: str):
+    """Get the progress of a contract's backfill."""
+    scheduler = await get_backfill_scheduler(await get_job_queue())
+    progress = await scheduler.get_progress(chain_id, address)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Backfill not found")
+    return BackfillProgressResponse(**progress)
+
+
 @router.get("/sync/{task_id}", response_model=SyncStatusResponse)
-async def get_sync_status(task_id: str, catalog=Depends(get_catalog)):
+async def get_sync_status(task_id: str):
     """
     Get the status of a sync task.
+
+    Reads the task's job record; while the sync runs, the transaction count
+    comes from its checkpoint, which is updated after every committed chunk.
+    """
+    job_queue = await get_job_queue()
+    job = await job_queue.get_job(task_id)
+    if job is None or job.job_type != SYNC_TRANSACTIONS:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    payload = job.payload
+    transactions_count = (job.result or {}).get("rows_committed")
+    if transactions_count is None:
+        checkpoint = await job_queue.redis_manager.get_json(
+            generate_sync_checkpoint_key(payload["chain_id"], payload["address"])
+        )
+        if checkpoint and checkpoint.get("task_id") == task_id:
+            transactions_count = checkpoint.get("rows_committed")
+
+    if job.status == STATUS_COMPLETED:
+        message = "Transaction sync completed"
+    elif job.status == STATUS_DEAD:
+        message = f"Transaction sync failed: {job.last_error}"
+    elif job.last_error:
+        message = f"Transaction sync attempt {job.attempts} failed: {job.last_error}"
+    else:
+        message = f"Transaction sync {job.status}"
+
+    return SyncStatusResponse(
+        status=job.status,
+        message=message,
+        task_id=task_id,
+        address=payload["address"],
+        chain_id=payload["chain_id"],
+        mode=payload["mode"],
+        transactions_count=transactions_count,
+    )
+
+
+def _format_event(event: dict) -> str:
+    """Format an event dictionary as a server-sent event."""
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@router.get("/tasks/{task_id}/events")
+async def stream_task_events(task_id: str, request: Request):
+    """
+    Stream a task's progress as server-sent events.
+
+    Works for sync, address import and backfill tasks on any worker: events
+    are fed by Redis pub/sub. The stream opens with a snapshot of the job
+    record and task status, then pushes status, job and progress events (pages
+    fetched, addresses found, blocks covered, rows committed) until the job
+    completes or is dead-lettered, or a backfill reports its final status.
     """
-    # Query task status from database/cache
-    # Return actual status, progress, and completion details
-    # For now, you could store task status in a simple in-memory dict
-    # or use Redis/database for persistence
-
-    # Example implementation:
-    # task_status = get_task_status_from_store(task_id)
-    # if not task_status:
-    #     raise HTTPException(status_code=404, detail="Task not found")
-    # return task_status
-
-    raise HTTPException(
-        status_code=501, detail="Task status tracking not implemented yet"
+    broker = await get_progress_broker()
+    # Subscribe before the snapshot so no event falls between the two
+    queue = broker.subscribe(task_id)
+    try:
+        job = await (await get_job_queue()).get_job(task_id)
+        task_status = await broker.redis_manager.get_json(
+            generate_task_status_key(task_id)
+        )
+    except Exception:
+        broker.unsubscribe(task_id, queue)
+        raise
+    if job is None and task_status is None:
+        broker.unsubscribe(task_id, queue)
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    snapshot = {
+        "task_id": task_id,
+        "event": "snapshot",
+        "timestamp": datetime.now().isoformat(),
+        "job": asdict(job) if job else None,
+        "task_status": task_status,
+    }
+    # Tasks that finished before the request only get their snapshot
+    finished = (
+        job is not None and is_terminal_event({"event": "job", "status": job.status})
+    ) or (
+        task_status is not None
+        and is_terminal_event({"event": "status", **task_status})
+    )
+
+    async def events():
+        try:
+            yield _format_event(snapshot)
+            if finished:
+                return
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=EVENT_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_event(event)
+                if is_terminal_event(event):
+                    return
+        finally:
+            broker.unsubscribe(task_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
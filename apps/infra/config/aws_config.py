@@ -4,13 +4,14 @@ AWS Utilities
 
 This module provides functions for AWS integration:
 - Account ID retrieval
-- Iceberg catalog initialization
+- Iceberg catalog initialization, reading data files through the local file cache
 """
 
 import traceback
 
 import boto3
 from config.logging_config import get_logger
+from db.file_cache import file_cache_properties
 from pyiceberg.catalog import load_catalog
 
 # Create a logger for this module
@@ -61,6 +62,7 @@ def initialize_catalog(catalog_name, bucket_name, region):
                 "rest.sigv4-enabled": "true",
                 "rest.signing-name": "glue",
                 "rest.signing-region": region,
+                **file_cache_properties(),
             },
         )
         return rest_catalog
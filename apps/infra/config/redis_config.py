@@ -222,3 +222,86 @@ def generate_task_status_key(task_id: str) -> str:
         str: Redis key for task status
     """
     return f"task_status:{task_id}"
+
+
+def generate_sync_checkpoint_key(chain_id: int, address: str) -> str:
+    """
+    Generate a Redis key for a resumable sync checkpoint.
+
+    Args:
+        chain_id: Blockchain chain ID
+        address: Contract or wallet address being synced
+
+    Returns:
+        str: Redis key for the sync checkpoint
+    """
+    return f"sync_checkpoint:{chain_id}:{address.lower()}"
+
+
+def generate_contract_users_key(chain_id: int, contract_address: str) -> str:
+    """
+    Generate a Redis key for a contract's users sorted by last-seen block.
+
+    Args:
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+
+    Returns:
+        str: Redis key for the contract users sorted set
+    """
+    return f"contract_users:{chain_id}:{contract_address.lower()}"
+
+
+def generate_contract_users_hll_key(chain_id: int, contract_address: str) -> str:
+    """
+    Generate a Redis key for a contract's unique-user HyperLogLog.
+
+    Args:
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+
+    Returns:
+        str: Redis key for the contract users HyperLogLog
+    """
+    return f"contract_users_hll:{chain_id}:{contract_address.lower()}"
+
+
+def generate_contract_users_coverage_key(chain_id: int, contract_address: str) -> str:
+    """
+    Generate a Redis key for the block range a contract's user index covers.
+
+    Args:
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+
+    Returns:
+        str: Redis key for the contract users coverage hash
+    """
+    return f"contract_users_coverage:{chain_id}:{contract_address.lower()}"
+
+
+def generate_task_progress_channel(task_id: str) -> str:
+    """
+    Generate the Redis pub/sub channel for a task's progress events.
+
+    Args:
+        task_id: Task identifier
+
+    Returns:
+        str: Redis channel name for task progress
+    """
+    return f"task_progress:{task_id}"
+
+
+def generate_token_metadata_key(chain_id: int, token_address: str) -> str:
+    """
+    Generate a Redis key for a token's decimals and symbol.
+
+    Args:
+        chain_id: Blockchain chain ID
+        token_address: Token contract address
+
+    Returns:
+        str: Redis key for the token metadata
+    """
+    return f"token_metadata:{chain_id}:{token_address.lower()}"
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Iceberg Data File Cache
+
+This module keeps a read-through copy of Iceberg data files on local disk:
+- PyIceberg reads Parquet data files through CachingFileIO, which serves them
+  from the cache directory and downloads them on a miss. Committed data files
+  are never modified, so a cached copy never goes stale
+- The cache is opt-in: it is off unless ICEBERG_FILE_CACHE_MAX_BYTES is set,
+  and is bounded by that size; least recently used files are evicted first, across all processes sharing the directory (their
+  files are picked up by a directory rescan every
+  ICEBERG_FILE_CACHE_RESCAN_SECONDS)
+- Every file is stored with its size and SHA-256 checksum and is verified the
+  first time a process reads it, outside the cache lock; corrupt copies are
+  downloaded again
+- Recent block_date partitions of hot tables can be downloaded at startup
+- Hit ratio and byte counters are available from get_file_cache_metrics()
+
+Manifests and metadata files are not cached, since PyIceberg already caches
+what it reads from them in memory.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+from config.logging_config import get_logger
+from db.iceberg import cached_scan, load_table
+from db.writer import PRIORITY_LOW, iceberg_writer
+from pyarrow.fs import FileSystemHandler, PyFileSystem
+from pyiceberg.expressions import EqualTo
+from pyiceberg.io.pyarrow import PyArrowFileIO
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Cache location and size bound (0, the default, disables the cache)
+FILE_CACHE_DIR = os.getenv("ICEBERG_FILE_CACHE_DIR") or os.path.join(
+    tempfile.gettempdir(), "suite-iceberg-file-cache"
+)
+FILE_CACHE_MAX_BYTES = int(os.getenv("ICEBERG_FILE_CACHE_MAX_BYTES", "0"))
+# Seconds between rescans of the directory for files of other processes
+FILE_CACHE_RESCAN_SECONDS = float(os.getenv("ICEBERG_FILE_CACHE_RESCAN_SECONDS", "60"))
+
+# Startup warm-up: tables and number of recent days of partitions to download
+DEFAULT_WARM_TABLES = "standardized.transactions,standardized.contract_daily_stats"
+WARM_DAYS = int(os.getenv("ICEBERG_FILE_CACHE_WARM_DAYS", "7"))
+# Share of the cache the warm-up may fill, leaving room for request traffic
+WARM_FRACTION = 0.5
+
+# Remote schemes whose data files are cached; local files are read directly
+CACHED_SCHEMES = {"s3", "s3a", "s3n", "gs", "gcs", "oss", "hdfs", "viewfs"}
+DATA_FILE_SUFFIX = ".parquet"
+
+_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+@dataclass
+class FileCacheMetrics:
+    """Counters for the data file cache."""
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0  # Reads of files too large to cache or failed downloads
+    evictions: int = 0
+    checksum_failures: int = 0
+    bytes_served: int = 0  # Bytes of data files opened from the cache
+    bytes_downloaded: int = 0
+    warmed_files: int = 0
+
+
+class DataFileCache:
+    """Size-bounded LRU cache of immutable data files in a local directory."""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.metrics = FileCacheMetrics()
+        # Cached files by key digest, least recently used first: digest -> size
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._reserved_bytes = 0  # Space held for downloads in progress
+        self._validated: set = set()
+        self._indexed = False
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+        self._download_locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _paths(self, digest: str):
+        directory = os.path.join(self.cache_dir, digest[:2])
+        base = os.path.join(directory, digest)
+        return directory, base + DATA_FILE_SUFFIX, base + ".json"
+
+    def _scan_directory(self):
+        """Rebuild the index from the cache directory (call with the lock held)."""
+        found = []
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for item in os.scandir(shard.path):
+                if not item.name.endswith(DATA_FILE_SUFFIX):
+                    continue
+                digest = item.name[: -len(DATA_FILE_SUFFIX)]
+                if not os.path.exists(self._paths(digest)[2]):
+                    # Interrupted write; the metadata is written first
+                    _remove(item.path)
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime, digest, stat.st_size))
+
+        found.sort()
+        self._entries = OrderedDict((digest, size) for _, digest, size in found)
+        self._total_bytes = sum(self._entries.values())
+        self._indexed = True
+        self._scanned_at = time.monotonic()
+
+    def _evict_for(self, incoming: int):
+        """Evict least recently used files until incoming bytes fit (lock held)."""
+        # Other processes sharing the directory add files too; rescanning on
+        # every miss of a full cache would walk the directory per download
+        if time.monotonic() - self._scanned_at >= FILE_CACHE_RESCAN_SECONDS:
+            self._scan_directory()
+        while (
+            self._entries
+            and self._total_bytes + self._reserved_bytes + incoming > self.max_bytes
+        ):
+            digest, size = self._entries.popitem(last=False)
+            _, data_path, meta_path = self._paths(digest)
+            _remove(data_path)
+            _remove(meta_path)
+            self._total_bytes -= size
+            self._validated.discard(digest)
+            self.metrics.evictions += 1
+
+    def _lookup(self, digest: str) -> Optional[str]:
+        """Local path of a valid cached file, or None (call without the lock)."""
+        _, data_path, meta_path = self._paths(digest)
+        with self._lock:
+            if not self._indexed:
+                self._scan_directory()
+            if digest not in self._entries:
+                if not os.path.exists(data_path):
+                    return None
+                # Cached by another process since the index was built
+                self._entries[digest] = os.path.getsize(data_path)
+                self._total_bytes += self._entries[digest]
+            validated = digest in self._validated
+
+        # Hashing a large file must not hold up every other reader of the cache
+        if not validated and not _verify(data_path, meta_path):
+            logger.warning(f"Cached data file {data_path} failed validation")
+            with self._lock:
+                self.metrics.checksum_failures += 1
+                # Unless a concurrent download already replaced the copy
+                if digest not in self._validated:
+                    self._drop(digest)
+            return None
+
+        with self._lock:
+            if digest not in self._entries:
+                # Evicted while it was verified
+                return None
+            self._validated.add(digest)
+            self._entries.move_to_end(digest)
+            try:
+                os.utime(data_path)
+            except FileNotFoundError:
+                # Evicted by another process
+                self._drop(digest)
+                return None
+            self.metrics.hits += 1
+            self.metrics.bytes_served += self._entries[digest]
+            return data_path
+
+    def _drop(self, digest: str):
+        _, data_path, meta_path = self._paths(digest)
+        _remove(data_path)
+        _remove(meta_path)
+        self._total_bytes -= self._entries.pop(digest, 0)
+        self._validated.discard(digest)
+
+    def _download(self, filesystem, path: str, key: str, digest: str) -> Optional[str]:
+        """Copy a remote file into the cache and return its local path."""
+        size = filesystem.get_file_info(path).size
+        if size is None or size > self.max_bytes:
+            return None
+
+        with self._lock:
+            self._evict_for(size)
+            # Without the lock, concurrent downloads would all fit the same space
+            self._reserved_bytes += size
+
+        directory, data_path, meta_path = self._paths(digest)
+        os.makedirs(directory, exist_ok=True)
+        checksum = hashlib.sha256()
+        written = 0
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out, filesystem.open_input_stream(path) as src:
+                while True:
+                    chunk = src.read(_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    checksum.update(chunk)
+                    out.write(chunk)
+                    written += len(chunk)
+            if written != size:
+                raise IOError(f"Downloaded {written} of {size} bytes of {key}")
+
+            _write_json(
+                meta_path, {"path": key, "size": size, "sha256": checksum.hexdigest()}
+            )
+            os.replace(tmp_path, data_path)
+        except BaseException:
+            _remove(tmp_path)
+            with self._lock:
+                self._reserved_bytes -= size
+            raise
+
+        with self._lock:
+            self._reserved_bytes -= size
+            self._total_bytes += size - self._entries.pop(digest, 0)
+            self._entries[digest] = size
+            self._validated.add(digest)
+            self.metrics.bytes_downloaded += size
+        return data_path
+
+    def fetch(self, filesystem, path: str, key: str) -> Optional[str]:
+        """
+        Get the local copy of a data file, downloading it on a miss.
+
+        Args:
+            filesystem: PyArrow filesystem the file is read from
+            path: Path of the file on that filesystem
+            key: Full location of the file, used as the cache key
+
+        Returns:
+            Local path of the cached copy, or None if it can't be cached
+        """
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        local_path = self._lookup(digest)
+        if local_path:
+            return local_path
+        with self._lock:
+            download_lock = self._download_locks.setdefault(digest, threading.Lock())
+
+        # One download per file; concurrent readers wait for it
+        with download_lock:
+            local_path = self._lookup(digest)
+            if local_path:
+                return local_path
+            with self._lock:
+                self.metrics.misses += 1
+            try:
+                local_path = self._download(filesystem, path, key, digest)
+            except Exception as e:
+                logger.warning(f"Error caching data file {key}: {e}")
+                logger.debug(traceback.format_exc())
+                local_path = None
+            finally:
+                with self._lock:
+                    self._download_locks.pop(digest, None)
+
+        with self._lock:
+            if local_path:
+                self.metrics.bytes_served += self._entries.get(digest, 0)
+            else:
+                self.metrics.bypassed += 1
+        return local_path
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = self.metrics
+            reads = metrics.hits + metrics.misses
+            return {
+                "enabled": self.enabled,
+                "hits": metrics.hits,
+                "misses": metrics.misses,
+                "bypassed": metrics.bypassed,
+                "evictions": metrics.evictions,
+                "checksum_failures": metrics.checksum_failures,
+                "bytes_served": metrics.bytes_served,
+                "bytes_downloaded": metrics.bytes_downloaded,
+                "warmed_files": metrics.warmed_files,
+                "cached_files": len(self._entries),
+                "cached_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_ratio": round(metrics.hits / reads, 4) if reads else 0,
+            }
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_json(path: str, data: dict):
+    """Write a JSON file atomically."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _verify(data_path: str, meta_path: str) -> bool:
+    """Check a cached file against its recorded size and SHA-256 checksum."""
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if os.path.getsize(data_path) != meta["size"]:
+            return False
+        checksum = hashlib.sha256()
+        with open(data_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                checksum.update(chunk)
+        return checksum.hexdigest() == meta["sha256"]
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+# Global cache instance shared by every CachingFileIO in the process
+file_cache = DataFileCache(FILE_CACHE_DIR, FILE_CACHE_MAX_BYTES)
+
+
+class _CachingHandler(FileSystemHandler):
+    """PyArrow filesystem handler serving data files from the file cache."""
+
+    def __init__(self, filesystem, scheme: str, cache: DataFileCache):
+        self.fs = filesystem
+        self.scheme = scheme
+        self.cache = cache
+
+    def open_input_file(self, path):
+        if path.endswith(DATA_FILE_SUFFIX):
+            local_path = self.cache.fetch(self.fs, path, f"{self.scheme}://{path}")
+            if local_path:
+                return pa.memory_map(local_path, "r")
+        return self.fs.open_input_file(path)
+
+    def get_type_name(self):
+        return f"cached-{self.fs.type_name}"
+
+    def normalize_path(self, path):
+        return self.fs.normalize_path(path)
+
+    def get_file_info(self, paths):
+        return self.fs.get_file_info(paths)
+
+    def get_file_info_selector(self, selector):
+        return self.fs.get_file_info(selector)
+
+    def create_dir(self, path, recursive):
+        self.fs.create_dir(path, recursive=recursive)
+
+    def delete_dir(self, path):
+        self.fs.delete_dir(path)
+
+    def delete_dir_contents(self, path, missing_dir_ok=False):
+        self.fs.delete_dir_contents(path, missing_dir_ok=missing_dir_ok)
+
+    def delete_root_dir_contents(self):
+        self.fs.delete_dir_contents("/", accept_root_dir=True)
+
+    def delete_file(self, path):
+        self.fs.delete_file(path)
+
+    def move(self, src, dest):
+        self.fs.move(src, dest)
+
+    def copy_file(self, src, dest):
+        self.fs.copy_file(src, dest)
+
+    def open_input_stream(self, path):
+        return self.fs.open_input_stream(path)
+
+    def open_output_stream(self, path, metadata):
+        return self.fs.open_output_stream(path, metadata=metadata)
+
+    def open_append_stream(self, path, metadata):
+        return self.fs.open_append_stream(path, metadata=metadata)
+
+    def __eq__(self, other):
+        return isinstance(other, _CachingHandler) and self.fs.equals(other.fs)
+
+    def __ne__(self, other):
+        return not self == other
+
+
+class CachingFileIO(PyArrowFileIO):
+    """
+    PyArrowFileIO that reads data files through the local file cache.
+
+    Enabled for a catalog with the "py-io-impl" property (see
+    file_cache_properties()). Writes and non-data reads go to the underlying
+    filesystem unchanged.
+    """
+
+    def __init__(self, properties=None):
+        super().__init__(properties=properties or {})
+        self._wrap_filesystems()
+
+    def _wrap_filesystems(self):
+        initialize_fs = self.fs_by_scheme
+
+        def caching_fs(scheme: str, netloc: Optional[str] = None):
+            filesystem = initialize_fs(scheme, netloc)
+            if scheme not in CACHED_SCHEMES or not file_cache.enabled:
+                return filesystem
+            return PyFileSystem(_CachingHandler(filesystem, scheme, file_cache))
+
+        self.fs_by_scheme = lru_cache(caching_fs)
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._wrap_filesystems()
+
+    def prefetch(self, location: str) -> bool:
+        """
+        Download a data file into the cache without reading it.
+
+        Args:
+            location: Full location of the data file
+
+        Returns:
+            bool: True if the file is cached, False otherwise
+        """
+        scheme, netloc, path = self.parse_location(location)
+        if scheme not in CACHED_SCHEMES or not file_cache.enabled:
+            return False
+        filesystem = self.fs_by_scheme(scheme, netloc)
+        handler = filesystem.handler
+        return handler.cache.fetch(handler.fs, path, f"{scheme}://{path}") is not None
+
+
+def file_cache_properties() -> Dict[str, str]:
+    """Catalog properties that route table reads through the file cache."""
+    if not file_cache.enabled:
+        return {}
+    return {"py-io-impl": f"{CachingFileIO.__module__}.{CachingFileIO.__name__}"}
+
+
+def get_file_cache_metrics() -> Dict[str, Any]:
+    """
+    Get data file cache metrics.
+
+    Returns:
+        Dict with hit and miss counts, bytes served from the cache and
+        downloaded, current cache size and the hit ratio
+    """
+    return file_cache.get_metrics()
+
+
+def get_warm_tables() -> List[str]:
+    """Tables to warm, from ICEBERG_FILE_CACHE_WARM_TABLES (comma-separated db.table)."""
+    tables = os.getenv("ICEBERG_FILE_CACHE_WARM_TABLES", DEFAULT_WARM_TABLES)
+    return [t.strip() for t in tables.split(",") if t.strip()]
+
+
+def warm_file_cache(catalog, days: int = WARM_DAYS) -> int:
+    """
+    Download the recent block_date partitions of the hot tables (synchronous).
+
+    Partitions are warmed newest day first and the warm-up stops once the
+    warmed files would fill WARM_FRACTION of the cache.
+
+    Args:
+        catalog: Iceberg catalog
+        days: Number of recent days of partitions to download
+
+    Returns:
+        Number of data files warmed
+    """
+    budget = int(file_cache.max_bytes * WARM_FRACTION)
+    today = date.today()
+    warmed = 0
+    warmed_bytes = 0
+
+    for qualified_name in get_warm_tables():
+        try:
+            database, table_name = qualified_name.split(".", 1)
+            table = load_table(catalog, database, table_name)
+            if not table or not isinstance(table.io, CachingFileIO):
+                continue
+            if "block_date" not in table.schema().column_names:
+                logger.warning(f"Not warming {qualified_name}: no block_date column")
+                continue
+
+            for offset in range(days):
+                day = (today - timedelta(days=offset)).isoformat()
+                for task in cached_scan(table, EqualTo("block_date", day)).plan_files():
+                    size = task.file.file_size_in_bytes
+                    if warmed_bytes + size > budget:
+                        logger.info(f"File cache warm-up stopped at {warmed} files")
+                        return warmed
+                    if table.io.prefetch(task.file.file_path):
+                        warmed += 1
+                        warmed_bytes += size
+                        file_cache.metrics.warmed_files += 1
+
+        except Exception as e:
+            logger.error(f"Error warming file cache for {qualified_name}: {e}")
+            logger.debug(traceback.format_exc())
+
+    logger.info(f"Warmed file cache with {warmed} data files ({warmed_bytes} bytes)")
+    return warmed
+
+
+def start_file_cache_warmup(catalog) -> Optional[asyncio.Task]:
+    """
+    Warm the file cache in the background, on the Iceberg writer at low priority.
+
+    Args:
+        catalog: Iceberg catalog
+
+    Returns:
+        The running asyncio task, or None if the cache or warm-up is disabled
+    """
+    if not file_cache.enabled or WARM_DAYS <= 0:
+        return None
+    logger.info(f"Warming file cache with the last {WARM_DAYS} days of partitions")
+    return asyncio.create_task(
+        iceberg_writer.run(warm_file_cache, catalog, priority=PRIORITY_LOW)
+    )
@@ -3,42 +3,326 @@
 Iceberg Base Operations
 
 This module provides base functions for interacting with Apache Iceberg tables:
-- Table loading
+- Table loading through a per-process table handle cache
+- Scans whose file planning is cached per snapshot and filter
 - Common read operations
-- Base write operations (append, overwrite, upsert)
+- Base write operations (append, overwrite, upsert, partition merge)
 """
 
+import os
+import threading
+import time
 import traceback
-from collections import OrderedDict
+import weakref
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any, Dict, List
 
 import pyarrow as pa
+import pyarrow.compute as pc
 from config.logging_config import get_logger
+from pyiceberg.expressions import AlwaysTrue, And, EqualTo, In, Or
 from pyiceberg.schema import Schema
+from pyiceberg.table import DataScan, FileScanTask, Table
 
 # Create a logger for this module
 logger = get_logger(__name__)
 
 
-def load_table(catalog, database, table_name):
+# Seconds a cached table handle is used before it is refreshed (0 disables the cache)
+TABLE_CACHE_TTL = float(os.getenv("ICEBERG_TABLE_CACHE_TTL", "30"))
+
+
+@dataclass
+class _CachedTable:
+    identifier: tuple
+    metadata: Any
+    metadata_location: str
+    io: Any
+    config: Dict[str, str]
+    loaded_at: float
+
+    @classmethod
+    def of(cls, table, loaded_at):
+        return cls(
+            table.name(),
+            table.metadata,
+            table.metadata_location,
+            table.io,
+            table.config,
+            loaded_at,
+        )
+
+
+@dataclass
+class TableCacheMetrics:
+    """Counters for the table handle cache."""
+
+    hits: int = 0
+    loads: int = 0  # Tables loaded from the catalog for the first time
+    refreshes: int = 0  # Metadata reloaded after the TTL expired
+    write_refreshes: int = 0  # Metadata reloaded for a commit
+    failures: int = 0
+
+
+# Cached table metadata per catalog, keyed by (database, table_name). Weak keys
+# drop a catalog's entries together with the catalog.
+_table_cache: "weakref.WeakKeyDictionary[Any, Dict[tuple, _CachedTable]]" = (
+    weakref.WeakKeyDictionary()
+)
+_table_cache_lock = threading.Lock()
+_table_cache_metrics = TableCacheMetrics()
+
+
+class _CachedTableHandle(Table):
+    """Table handle built from cached metadata that publishes its commits."""
+
+    def __init__(self, catalog, key, cached):
+        super().__init__(
+            cached.identifier,
+            cached.metadata,
+            cached.metadata_location,
+            cached.io,
+            catalog,
+            cached.config,
+        )
+        self._cache_key = key
+
+    def _do_commit(self, updates, requirements):
+        super()._do_commit(updates, requirements)
+        # Our own commits are visible to later load_table() calls right away
+        with _table_cache_lock:
+            tables = _table_cache.get(self.catalog)
+            cached = tables.get(self._cache_key) if tables is not None else None
+            if (
+                cached is not None
+                and self.metadata.last_updated_ms >= cached.metadata.last_updated_ms
+            ):
+                tables[self._cache_key] = _CachedTable.of(self, time.monotonic())
+
+
+def load_table(catalog, database, table_name, refresh=False):
     """
-    Load an Iceberg table.
+    Load an Iceberg table, reusing the cached metadata when it is fresh.
+
+    Every call returns its own handle, so a refresh or a commit by one caller
+    never changes the metadata under another caller's scan or commit. Commits
+    made through a returned handle update the cached metadata, so our own
+    writes are visible immediately; commits by other processes are picked up
+    when the metadata is reloaded after TABLE_CACHE_TTL seconds.
 
     Args:
         catalog: Iceberg catalog
         database: Database name
         table_name: Table name
+        refresh: Reload the metadata from the catalog before returning the
+            handle. Pass True before committing, so the commit builds on the
+            latest snapshot and doesn't conflict with commits from other
+            processes, and for reads that decide a write (cursors, resume
+            points), so they see what other processes committed
 
     Returns:
         Table object or None if loading fails
     """
+    key = (database, table_name)
+    now = time.monotonic()
+    with _table_cache_lock:
+        tables = _table_cache.setdefault(catalog, {})
+        cached = tables.get(key)
+        if (
+            cached is not None
+            and not refresh
+            and now - cached.loaded_at < TABLE_CACHE_TTL
+        ):
+            _table_cache_metrics.hits += 1
+            return _CachedTableHandle(catalog, key, cached)
+
     try:
         table = catalog.load_table(f"{database}.{table_name}")
-        logger.info(f"Table '{database}.{table_name}' loaded successfully")
-        return table
+        if cached is None:
+            logger.info(f"Table '{database}.{table_name}' loaded successfully")
     except Exception as e:
+        with _table_cache_lock:
+            _table_cache_metrics.failures += 1
+            _table_cache.get(catalog, {}).pop(key, None)
         logger.error(f"Error loading the table: {e}")
         return None
 
+    loaded = _CachedTable.of(table, time.monotonic())
+    with _table_cache_lock:
+        if cached is None:
+            _table_cache_metrics.loads += 1
+        elif refresh:
+            _table_cache_metrics.write_refreshes += 1
+        else:
+            _table_cache_metrics.refreshes += 1
+        tables = _table_cache.setdefault(catalog, {})
+        current = tables.get(key)
+        # Keep metadata a concurrent commit published while we were loading
+        if TABLE_CACHE_TTL > 0 and (
+            current is None
+            or loaded.metadata.last_updated_ms >= current.metadata.last_updated_ms
+        ):
+            tables[key] = loaded
+    return _CachedTableHandle(catalog, key, loaded)
+
+
+def invalidate_table(catalog, database=None, table_name=None):
+    """
+    Drop cached table handles so the next load_table() reads the catalog.
+
+    Args:
+        catalog: Iceberg catalog
+        database: Database name (None drops every handle of the catalog)
+        table_name: Table name (None drops every handle of the database)
+    """
+    with _table_cache_lock:
+        tables = _table_cache.get(catalog)
+        if not tables:
+            return
+        for key in list(tables):
+            if (database is None or key[0] == database) and (
+                table_name is None or key[1] == table_name
+            ):
+                del tables[key]
+
+
+def get_table_cache_metrics() -> Dict[str, Any]:
+    """
+    Get table handle cache metrics.
+
+    Returns:
+        Dictionary with cached handle count, hits, loads, refreshes and hit rate
+    """
+    with _table_cache_lock:
+        metrics = _table_cache_metrics
+        lookups = (
+            metrics.hits + metrics.loads + metrics.refreshes + metrics.write_refreshes
+        )
+        return {
+            "ttl_seconds": TABLE_CACHE_TTL,
+            "cached_tables": sum(len(tables) for tables in _table_cache.values()),
+            "hits": metrics.hits,
+            "loads": metrics.loads,
+            "refreshes": metrics.refreshes,
+            "write_refreshes": metrics.write_refreshes,
+            "failures": metrics.failures,
+            "hit_rate": round(metrics.hits / lookups, 4) if lookups else 0,
+        }
+
+
+# Scan plans kept in memory, least recently used evicted first
+PLAN_CACHE_SIZE = int(os.getenv("ICEBERG_PLAN_CACHE_SIZE", "256"))
+
+
+@dataclass
+class PlanCacheMetrics:
+    """Counters for the scan planning cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    planned_files: int = 0  # Files in the plans built on a miss
+
+
+_plan_cache: "OrderedDict[tuple, List[FileScanTask]]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+_plan_cache_metrics = PlanCacheMetrics()
+
+
+class CachedDataScan(DataScan):
+    """
+    DataScan that reuses the planned files of an identical earlier scan.
+
+    Planning reads the manifest list and every manifest that survives
+    partition pruning. A snapshot is immutable, so the plan for a snapshot,
+    schema, partition spec and filter never changes; it is kept in an LRU of
+    PLAN_CACHE_SIZE plans shared by all scans in the process. filter(),
+    select() and the other scan builders return CachedDataScans too.
+    """
+
+    def _plan_key(self, snapshot) -> tuple:
+        return (
+            self.table_metadata.table_uuid,
+            snapshot.snapshot_id,
+            self.table_metadata.current_schema_id,
+            self.table_metadata.default_spec_id,
+            repr(self.row_filter),
+            self.case_sensitive,
+            tuple(sorted(self.options.items())),
+        )
+
+    def plan_files(self) -> List[FileScanTask]:
+        """
+        Plan the files to read, from the cache when the same scan was planned.
+
+        Returns:
+            List of FileScanTasks
+        """
+        snapshot = self.snapshot()
+        if not snapshot or PLAN_CACHE_SIZE <= 0:
+            return list(super().plan_files())
+
+        key = self._plan_key(snapshot)
+        with _plan_cache_lock:
+            tasks = _plan_cache.get(key)
+            if tasks is not None:
+                _plan_cache.move_to_end(key)
+                _plan_cache_metrics.hits += 1
+                return list(tasks)
+
+        tasks = list(super().plan_files())
+        with _plan_cache_lock:
+            _plan_cache_metrics.misses += 1
+            _plan_cache_metrics.planned_files += len(tasks)
+            _plan_cache[key] = tasks
+            while len(_plan_cache) > PLAN_CACHE_SIZE:
+                _plan_cache.popitem(last=False)
+                _plan_cache_metrics.evictions += 1
+        return list(tasks)
+
+
+def cached_scan(table, row_filter=AlwaysTrue(), selected_fields=("*",)):
+    """
+    Start a scan of the table's current snapshot with cached file planning.
+
+    Args:
+        table: Iceberg table
+        row_filter: Row filter expression
+        selected_fields: Columns to read
+
+    Returns:
+        CachedDataScan that can be filtered and read like table.scan()
+    """
+    return CachedDataScan(
+        table_metadata=table.metadata,
+        io=table.io,
+        row_filter=row_filter,
+        selected_fields=selected_fields,
+    )
+
+
+def get_plan_cache_metrics() -> Dict[str, Any]:
+    """
+    Get scan planning cache metrics.
+
+    Returns:
+        Dictionary with cached plan count, hits, misses, evictions and hit rate
+    """
+    with _plan_cache_lock:
+        metrics = _plan_cache_metrics
+        lookups = metrics.hits + metrics.misses
+        return {
+            "max_plans": PLAN_CACHE_SIZE,
+            "cached_plans": len(_plan_cache),
+            "hits": metrics.hits,
+            "misses": metrics.misses,
+            "evictions": metrics.evictions,
+            "planned_files": metrics.planned_files,
+            "hit_rate": round(metrics.hits / lookups, 4) if lookups else 0,
+        }
+
 
 def reorder_records(data: list[dict], schema: Schema) -> list[dict]:
     """
@@ -55,18 +339,34 @@ def reorder_records(data: list[dict], schema: Schema) -> list[dict]:
     return [OrderedDict((k, row.get(k)) for k in field_names) for row in data]
 
 
+def to_arrow_table(data, schema):
+    """
+    Convert write input to a PyArrow table with the given schema.
+
+    Args:
+        data: List of dictionaries or a PyArrow table
+        schema: PyArrow schema of the table
+
+    Returns:
+        PyArrow table matching the schema
+    """
+    if isinstance(data, pa.Table):
+        return data.select(schema.names).cast(schema)
+    return pa.Table.from_pylist(data, schema=schema)
+
+
 def append_data(table, data, schema):
     """
     Append data to the Iceberg table with proper type conversion.
 
     Args:
         table: Iceberg table to append data to
-        data: List of dictionaries containing the data to append
+        data: List of dictionaries or PyArrow table containing the data to append
         schema: PyArrow schema of the table
     """
     try:
         # Create the table from arrays with the original schema
-        table_data = pa.Table.from_pylist(data, schema=schema)
+        table_data = to_arrow_table(data, schema)
         table.append(table_data)
         logger.info(f"Successfully appended {len(data)} records to table")
     except Exception as e:
@@ -80,12 +380,12 @@ def overwrite_data(table, data, schema):
 
     Args:
         table: Iceberg table to overwrite
-        data: List of dictionaries containing the data
+        data: List of dictionaries or PyArrow table containing the data
         schema: PyArrow schema of the table
     """
     try:
         # Create the table and overwrite
-        table_data = pa.Table.from_pylist(data, schema=schema)
+        table_data = to_arrow_table(data, schema)
         table.overwrite(table_data)
         logger.info(f"Successfully overwrote table with {len(data)} records")
     except Exception as e:
@@ -99,18 +399,136 @@ def upsert_data(table, data, schema, join_cols):
 
     Args:
         table: Iceberg table to upsert data into
-        data: List of dictionaries containing the data
+        data: List of dictionaries or PyArrow table containing the data
         schema: PyArrow schema of the table
         join_cols: List of column names to join on
+
+    Returns:
+        bool: True if successful, False otherwise
     """
     try:
         # Create the table and upsert
-        table_data = pa.Table.from_pylist(data, schema=schema)
+        table_data = to_arrow_table(data, schema)
         table.upsert(df=table_data, join_cols=join_cols)
         logger.info(f"Successfully upserted {len(data)} records to table")
+        return True
     except Exception as e:
         logger.error(f"Error upserting data: {e}")
         logger.debug(traceback.format_exc())
+        return False
+
+
+def build_partition_filter(table_data, partition_cols):
+    """
+    Build a row filter matching exactly the partitions present in an Arrow table.
+
+    The filter groups values by the leading partition columns and uses an IN
+    predicate on the last one, e.g. chain_id = 8453 AND block_date IN (...).
+
+    Args:
+        table_data: PyArrow table containing the partition columns
+        partition_cols: List of identity-partitioned column names
+
+    Returns:
+        BooleanExpression matching the touched partitions, or None if any
+        partition value is null (null partitions cannot be matched with IN)
+    """
+    partitions = (
+        table_data.select(partition_cols).group_by(partition_cols).aggregate([])
+    )
+    if partitions.num_rows == 0:
+        return None
+
+    *prefix_cols, last_col = partition_cols
+    grouped = defaultdict(set)
+    for row in partitions.to_pylist():
+        if any(row[col] is None for col in partition_cols):
+            return None
+        grouped[tuple(row[col] for col in prefix_cols)].add(row[last_col])
+
+    filters = []
+    for prefix, values in grouped.items():
+        predicate = (
+            In(last_col, values)
+            if len(values) > 1
+            else EqualTo(last_col, next(iter(values)))
+        )
+        for col, value in zip(prefix_cols, prefix):
+            predicate = And(EqualTo(col, value), predicate)
+        filters.append(predicate)
+
+    return reduce(Or, filters)
+
+
+def deduplicate_arrow(table_data, join_cols):
+    """
+    Deduplicate an Arrow table on the join columns, keeping the last occurrence.
+
+    Args:
+        table_data: PyArrow table to deduplicate
+        join_cols: List of column names identifying a row
+
+    Returns:
+        PyArrow table with one row per key, in first-occurrence order of the kept rows
+    """
+    order_col = "__row_order"
+    indexed = table_data.append_column(
+        order_col, pa.array(range(table_data.num_rows), type=pa.int64())
+    )
+    latest = indexed.group_by(join_cols, use_threads=False).aggregate(
+        [(order_col, "max")]
+    )
+    keep = pc.sort_indices(latest[f"{order_col}_max"])
+    return table_data.take(latest[f"{order_col}_max"].take(keep))
+
+
+def merge_partitions_data(table, data, schema, join_cols, partition_cols):
+    """
+    Merge data into the Iceberg table by rewriting only the partitions it touches.
+
+    Unlike upsert, which joins the batch against the whole table, this reads the
+    partitions present in the incoming batch, merges and deduplicates them in
+    Arrow (incoming rows win), and replaces those partitions with a single
+    partition-filtered overwrite. The cost scales with the batch, not the table.
+
+    Args:
+        table: Iceberg table to merge data into
+        data: List of dictionaries or PyArrow table containing the data
+        schema: PyArrow schema of the table
+        join_cols: List of column names to deduplicate on
+        partition_cols: List of identity-partitioned column names
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        incoming = to_arrow_table(data, schema)
+        if incoming.num_rows == 0:
+            return True
+
+        partition_filter = build_partition_filter(incoming, partition_cols)
+        if partition_filter is None:
+            logger.warning(
+                "Null partition values in batch, falling back to upsert for merge"
+            )
+            return upsert_data(table, data, schema, join_cols)
+
+        existing = table.scan(row_filter=partition_filter).to_arrow()
+        merged = deduplicate_arrow(
+            pa.concat_tables([existing.cast(incoming.schema), incoming]), join_cols
+        )
+
+        table.overwrite(merged, overwrite_filter=partition_filter)
+        logger.info(
+            f"Successfully merged {incoming.num_rows} records into "
+            f"{existing.num_rows} existing records of the touched partitions "
+            f"({merged.num_rows} after deduplication)"
+        )
+        return True
+    except Exception as e:
+        logger.error(f"Error merging partitions: {e}")
+        logger.debug(traceback.format_exc())
+        return False
 
 
 def read_table_data(table):
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Iceberg Table Maintenance
+
+This module keeps frequently appended Iceberg tables healthy:
+- Bin-packing small data files per partition toward a target file size
+- Expiring old snapshots and deleting files only they reference
+- Rewriting (merging) manifests so scan planning reads fewer files
+- Optionally pruning partitions older than a retention window
+- Rewriting partitions written under an older partition spec
+- Reporting file counts and scan-planning times before and after
+
+PyIceberg 0.9.1 has no built-in compaction, expiry or manifest rewrite, so these
+are built from the same snapshot producers PyIceberg uses for its own writes.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+import traceback
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from config.logging_config import get_logger
+from db.iceberg import load_table
+from db.partitioning import DEFAULT_SPEC_REWRITE_PARTITIONS, rewrite_to_current_spec
+from db.writer import PRIORITY_LOW, iceberg_writer
+from pyiceberg.expressions import AlwaysTrue, LessThan
+from pyiceberg.manifest import ManifestContent, ManifestEntryStatus
+from pyiceberg.table import TableProperties
+from pyiceberg.table.snapshots import Operation
+from pyiceberg.table.update import AssertRefSnapshotId, RemoveSnapshotsUpdate
+from pyiceberg.table.update.snapshot import _MergeAppendFiles
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Default maintenance configuration
+DEFAULT_TARGET_FILE_SIZE_BYTES = 128 * 1024 * 1024  # 128 MB
+DEFAULT_SMALL_FILE_RATIO = 0.75  # Files below 75% of target are compaction input
+DEFAULT_MIN_INPUT_FILES = 5  # Minimum small files in a partition before rewriting
+DEFAULT_SNAPSHOT_RETENTION_HOURS = 72
+DEFAULT_MIN_SNAPSHOTS_TO_KEEP = 5
+DEFAULT_MAINTENANCE_TABLES = "raw.transactions,raw.cursor,standardized.transactions"
+
+
+class _RewriteManifests(_MergeAppendFiles):
+    """Snapshot producer that adds no data and merges every existing manifest."""
+
+    def __init__(self, transaction, io, target_size_bytes: int):
+        super().__init__(
+            Operation.APPEND,
+            transaction,
+            io,
+            snapshot_properties={"maintenance": "manifest-rewrite"},
+        )
+        self._merge_enabled = True
+        self._min_count_to_merge = 2
+        self._target_size_bytes = target_size_bytes
+
+
+def collect_table_stats(
+    table, target_file_size_bytes: int = DEFAULT_TARGET_FILE_SIZE_BYTES
+) -> Dict[str, Any]:
+    """
+    Collect file, manifest and snapshot counts plus the time to plan a full scan.
+
+    Args:
+        table: Iceberg table
+        target_file_size_bytes: Target size used to count small files
+
+    Returns:
+        Dictionary of table statistics
+    """
+    table.refresh()
+    snapshot = table.current_snapshot()
+    files = table.inspect.files() if snapshot else None
+    sizes = files["file_size_in_bytes"].to_pylist() if files is not None else []
+    manifests = snapshot.manifests(table.io) if snapshot else []
+
+    start = time.perf_counter()
+    planned = sum(1 for _ in table.scan().plan_files()) if snapshot else 0
+    planning_seconds = time.perf_counter() - start
+
+    return {
+        "data_files": len(sizes),
+        "small_files": sum(
+            1
+            for size in sizes
+            if size < target_file_size_bytes * DEFAULT_SMALL_FILE_RATIO
+        ),
+        "total_bytes": sum(sizes),
+        "avg_file_bytes": int(sum(sizes) / len(sizes)) if sizes else 0,
+        "manifests": len(manifests),
+        "snapshots": len(table.metadata.snapshots),
+        "planned_tasks": planned,
+        "planning_seconds": round(planning_seconds, 4),
+    }
+
+
+def compact_data_files(
+    table,
+    target_file_size_bytes: int = DEFAULT_TARGET_FILE_SIZE_BYTES,
+    small_file_ratio: float = DEFAULT_SMALL_FILE_RATIO,
+    min_input_files: int = DEFAULT_MIN_INPUT_FILES,
+) -> Dict[str, int]:
+    """
+    Bin-pack small data files per partition toward a target file size.
+
+    Only files below `target_file_size_bytes * small_file_ratio` are rewritten;
+    large files are left in place. All rewrites are committed as one overwrite
+    snapshot that swaps the small files for the packed ones.
+
+    Args:
+        table: Iceberg table
+        target_file_size_bytes: Desired size of rewritten files
+        small_file_ratio: Fraction of the target below which a file is "small"
+        min_input_files: Minimum small files in a partition to bother rewriting
+
+    Returns:
+        Dictionary with partitions, files_removed and files_added counts
+    """
+    from pyiceberg.io.pyarrow import ArrowScan, _dataframe_to_data_files
+
+    result = {"partitions": 0, "files_removed": 0, "files_added": 0}
+    table.refresh()
+    if table.current_snapshot() is None:
+        return result
+
+    threshold = target_file_size_bytes * small_file_ratio
+    spec_id = table.spec().spec_id
+    by_partition = defaultdict(list)
+    for task in table.scan().plan_files():
+        # Files with delete files attached are left for a full rewrite, files
+        # of an older partition spec for rewrite_to_current_spec()
+        if task.file.spec_id != spec_id:
+            continue
+        if task.file.file_size_in_bytes < threshold and not task.delete_files:
+            key = (task.file.spec_id, tuple(task.file.partition))
+            by_partition[key].append(task)
+
+    # Write with the requested target so the writer splits along the same size
+    metadata = table.metadata.model_copy(
+        update={
+            "properties": {
+                **table.metadata.properties,
+                TableProperties.WRITE_TARGET_FILE_SIZE_BYTES: str(
+                    target_file_size_bytes
+                ),
+            }
+        }
+    )
+    commit_uuid = uuid.uuid4()
+    counter = itertools.count(0)
+    replaced = []
+
+    for tasks in by_partition.values():
+        if len(tasks) < min_input_files:
+            continue
+
+        # First-fit decreasing keeps each bin near the target size
+        bins: List[List] = []
+        bin_sizes: List[int] = []
+        for task in sorted(
+            tasks, key=lambda t: t.file.file_size_in_bytes, reverse=True
+        ):
+            size = task.file.file_size_in_bytes
+            for i, bin_size in enumerate(bin_sizes):
+                if bin_size + size <= target_file_size_bytes:
+                    bins[i].append(task)
+                    bin_sizes[i] += size
+                    break
+            else:
+                bins.append([task])
+                bin_sizes.append(size)
+
+        for bin_tasks in bins:
+            if len(bin_tasks) < 2:
+                continue
+            data = ArrowScan(
+                table_metadata=table.metadata,
+                io=table.io,
+                projected_schema=table.schema(),
+                row_filter=AlwaysTrue(),
+            ).to_table(tasks=bin_tasks)
+            new_files = list(
+                _dataframe_to_data_files(
+                    table_metadata=metadata,
+                    df=data,
+                    io=table.io,
+                    write_uuid=commit_uuid,
+                    counter=counter,
+                )
+            )
+            replaced.append(([task.file for task in bin_tasks], new_files))
+        result["partitions"] += 1
+
+    if not replaced:
+        return result
+
+    with table.transaction() as tx:
+        with tx.update_snapshot(
+            snapshot_properties={"maintenance": "compaction"}
+        ).overwrite(commit_uuid=commit_uuid) as overwrite:
+            for old_files, new_files in replaced:
+                for data_file in old_files:
+                    overwrite.delete_data_file(data_file)
+                for data_file in new_files:
+                    overwrite.append_data_file(data_file)
+                result["files_removed"] += len(old_files)
+                result["files_added"] += len(new_files)
+
+    logger.info(
+        f"Compacted {result['files_removed']} small files into "
+        f"{result['files_added']} across {result['partitions']} partitions"
+    )
+    return result
+
+
+def _reachable_files(table, snapshots) -> Dict[str, set]:
+    """Collect manifest lists, manifests and data files reachable from snapshots."""
+    reachable = {"manifest_lists": set(), "manifests": set(), "data_files": set()}
+    for snapshot in snapshots:
+        reachable["manifest_lists"].add(snapshot.manifest_list)
+        for manifest in snapshot.manifests(table.io):
+            if manifest.manifest_path in reachable["manifests"]:
+                continue
+            reachable["manifests"].add(manifest.manifest_path)
+            for entry in manifest.fetch_manifest_entry(table.io, discard_deleted=False):
+                if entry.status != ManifestEntryStatus.DELETED:
+                    reachable["data_files"].add(entry.data_file.file_path)
+    return reachable
+
+
+def expire_snapshots(
+    table,
+    older_than: Optional[datetime] = None,
+    retain_last: int = DEFAULT_MIN_SNAPSHOTS_TO_KEEP,
+    delete_files: bool = True,
+) -> Dict[str, int]:
+    """
+    Expire snapshots older than a cutoff, always keeping the most recent ones.
+
+    Snapshots referenced by a branch or tag are never expired. With delete_files,
+    data files, manifests and manifest lists that only expired snapshots
+    reference are removed from storage as well.
+
+    Args:
+        table: Iceberg table
+        older_than: Expire snapshots committed before this time
+        retain_last: Number of most recent snapshots to keep regardless of age
+        delete_files: Whether to delete files no longer reachable
+
+    Returns:
+        Dictionary with snapshots_expired and files_deleted counts
+    """
+    result = {"snapshots_expired": 0, "files_deleted": 0}
+    table.refresh()
+    older_than = older_than or datetime.now() - timedelta(
+        hours=DEFAULT_SNAPSHOT_RETENTION_HOURS
+    )
+    cutoff_ms = int(older_than.timestamp() * 1000)
+
+    snapshots = sorted(table.metadata.snapshots, key=lambda s: s.timestamp_ms)
+    protected = {ref.snapshot_id for ref in table.metadata.refs.values()}
+    protected.update(s.snapshot_id for s in snapshots[-retain_last:])
+
+    expired = [
+        s
+        for s in snapshots
+        if s.timestamp_ms < cutoff_ms and s.snapshot_id not in protected
+    ]
+    if not expired:
+        return result
+
+    retained = [s for s in snapshots if s not in expired]
+    if delete_files:
+        keep = _reachable_files(table, retained)
+        drop = _reachable_files(table, expired)
+
+    with table.transaction() as tx:
+        tx._apply(
+            (RemoveSnapshotsUpdate(snapshot_ids=[s.snapshot_id for s in expired]),),
+            (
+                AssertRefSnapshotId(
+                    snapshot_id=table.metadata.current_snapshot_id, ref="main"
+                ),
+            ),
+        )
+    result["snapshots_expired"] = len(expired)
+
+    if delete_files:
+        for kind in ("data_files", "manifests", "manifest_lists"):
+            for path in drop[kind] - keep[kind]:
+                try:
+                    table.io.delete(path)
+                    result["files_deleted"] += 1
+                except Exception as e:
+                    logger.warning(f"Could not delete expired file {path}: {e}")
+
+    logger.info(
+        f"Expired {result['snapshots_expired']} snapshots, "
+        f"deleted {result['files_deleted']} unreachable files"
+    )
+    return result
+
+
+def rewrite_manifests(
+    table, target_manifest_size_bytes: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Merge the current snapshot's data manifests into fewer, larger ones.
+
+    Args:
+        table: Iceberg table
+        target_manifest_size_bytes: Target manifest size (defaults to table property)
+
+    Returns:
+        Dictionary with manifests_before and manifests_after counts
+    """
+    table.refresh()
+    snapshot = table.current_snapshot()
+    if snapshot is None:
+        return {"manifests_before": 0, "manifests_after": 0}
+
+    manifests = snapshot.manifests(table.io)
+    before = len(manifests)
+    data_manifests = [m for m in manifests if m.content == ManifestContent.DATA]
+    if len(data_manifests) < 2:
+        return {"manifests_before": before, "manifests_after": before}
+
+    target = target_manifest_size_bytes or int(
+        table.metadata.properties.get(
+            TableProperties.MANIFEST_TARGET_SIZE_BYTES,
+            TableProperties.MANIFEST_TARGET_SIZE_BYTES_DEFAULT,
+        )
+    )
+    with table.transaction() as tx:
+        with _RewriteManifests(tx, table.io, target):
+            pass
+
+    table.refresh()
+    after = len(table.current_snapshot().manifests(table.io))
+    logger.info(f"Rewrote manifests: {before} -> {after}")
+    return {"manifests_before": before, "manifests_after": after}
+
+
+def prune_partitions(
+    table, retention_days: int, date_column: str = "block_date"
+) -> Dict[str, Any]:
+    """
+    Delete rows in partitions older than a retention window.
+
+    Tables without the date column (such as raw.cursor) are left untouched.
+
+    Args:
+        table: Iceberg table
+        retention_days: Number of days of data to keep
+        date_column: Date partition column (ISO date strings or dates)
+
+    Returns:
+        Dictionary with the cutoff date and deleted file count, or with a
+        skipped reason if the table has no date column
+    """
+    if date_column not in table.schema().column_names:
+        logger.info(f"Not pruning {'.'.join(table.name())}: no {date_column} column")
+        return {"skipped": f"no {date_column} column"}
+
+    cutoff = (datetime.now() - timedelta(days=retention_days)).date()
+    field = table.schema().find_field(date_column)
+    value = cutoff.isoformat() if str(field.field_type) == "string" else cutoff
+
+    table.refresh()
+    files_before = len(table.inspect.files()) if table.current_snapshot() else 0
+    table.delete(delete_filter=LessThan(date_column, value))
+    files_after = len(table.inspect.files()) if table.current_snapshot() else 0
+
+    logger.info(f"Pruned partitions with {date_column} < {cutoff}")
+    return {"cutoff": str(cutoff), "files_deleted": files_before - files_after}
+
+
+def maintain_table(
+    catalog,
+    database: str,
+    table_name: str,
+    compact: bool = True,
+    expire: bool = True,
+    rewrite: bool = True,
+    retention_days: Optional[int] = None,
+    rewrite_partitions: Optional[int] = DEFAULT_SPEC_REWRITE_PARTITIONS,
+    target_file_size_bytes: int = DEFAULT_TARGET_FILE_SIZE_BYTES,
+    snapshot_retention_hours: int = DEFAULT_SNAPSHOT_RETENTION_HOURS,
+    min_snapshots_to_keep: int = DEFAULT_MIN_SNAPSHOTS_TO_KEEP,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run the maintenance steps on one table and report before/after stats.
+
+    Steps run in order: prune, rewrite to the current partition spec, compact,
+    expire, rewrite manifests.
+
+    Args:
+        catalog: Iceberg catalog
+        database: Database name
+        table_name: Table name
+        compact: Whether to bin-pack small files
+        expire: Whether to expire old snapshots
+        rewrite: Whether to merge manifests
+        retention_days: Prune partitions older than this many days (None to skip)
+        rewrite_partitions: Old-spec partitions to rewrite per run (0 to skip,
+            None for all)
+        target_file_size_bytes: Target size for compacted files
+        snapshot_retention_hours: Age after which snapshots are expired
+        min_snapshots_to_keep: Recent snapshots always kept
+
+    Returns:
+        Maintenance report, or None if the table could not be maintained
+    """
+    table = load_table(catalog, database, table_name, refresh=True)
+    if table is None:
+        return None
+
+    try:
+        report = {"table": f"{database}.{table_name}"}
+        report["before"] = collect_table_stats(table, target_file_size_bytes)
+
+        if retention_days is not None:
+            report["prune"] = prune_partitions(table, retention_days)
+        if rewrite_partitions != 0:
+            report["spec_rewrite"] = rewrite_to_current_spec(table, rewrite_partitions)
+        if compact:
+            report["compaction"] = compact_data_files(table, target_file_size_bytes)
+        if expire:
+            report["expiry"] = expire_snapshots(
+                table,
+                older_than=datetime.now() - timedelta(hours=snapshot_retention_hours),
+                retain_last=min_snapshots_to_keep,
+            )
+        if rewrite:
+            report["manifests"] = rewrite_manifests(table)
+
+        report["after"] = collect_table_stats(table, target_file_size_bytes)
+        logger.info(
+            f"Maintenance of {report['table']}: "
+            f"files {report['before']['data_files']} -> {report['after']['data_files']}, "
+            f"manifests {report['before']['manifests']} -> {report['after']['manifests']}, "
+            f"planning {report['before']['planning_seconds']}s -> "
+            f"{report['after']['planning_seconds']}s"
+        )
+        return report
+
+    except Exception as e:
+        logger.error(f"Error maintaining table {database}.{table_name}: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+
+def get_maintenance_tables() -> List[str]:
+    """Tables to maintain, from ICEBERG_MAINTENANCE_TABLES (comma-separated db.table)."""
+    tables = os.getenv("ICEBERG_MAINTENANCE_TABLES", DEFAULT_MAINTENANCE_TABLES)
+    return [t.strip() for t in tables.split(",") if t.strip()]
+
+
+async def run_maintenance_loop(catalog, interval_hours: float):
+    """
+    Periodically maintain the configured tables until cancelled.
+
+    Each table is maintained on the Iceberg writer at low priority, so the event
+    loop stays responsive and request-path I/O goes first.
+
+    Args:
+        catalog: Iceberg catalog
+        interval_hours: Hours between maintenance runs
+    """
+    retention = os.getenv("ICEBERG_RETENTION_DAYS")
+    retention_days = int(retention) if retention else None
+
+    while True:
+        for qualified_name in get_maintenance_tables():
+            database, table_name = qualified_name.split(".", 1)
+            await iceberg_writer.run(
+                maintain_table,
+                catalog,
+                database,
+                table_name,
+                retention_days=retention_days,
+                priority=PRIORITY_LOW,
+            )
+        await asyncio.sleep(interval_hours * 3600)
+
+
+def start_scheduled_maintenance(catalog) -> Optional[asyncio.Task]:
+    """
+    Start the maintenance loop if ICEBERG_MAINTENANCE_INTERVAL_HOURS is set.
+
+    Args:
+        catalog: Iceberg catalog
+
+    Returns:
+        The running asyncio task, or None if scheduling is disabled
+    """
+    interval = float(os.getenv("ICEBERG_MAINTENANCE_INTERVAL_HOURS", "0"))
+    if interval <= 0:
+        return None
+    logger.info(f"Scheduling Iceberg table maintenance every {interval}h")
+    return asyncio.create_task(run_maintenance_loop(catalog, interval))
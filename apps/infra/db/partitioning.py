@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Address Bucket Partitioning
+
+Hashed address partitions for tables looked up by contract address:
+- add_address_buckets(): Schema and partition spec evolution adding an integer
+  `<column>_bucket` column with an identity partition on it
+- with_address_buckets(): Fills the bucket columns of a batch before a write
+- address_bucket_filter(): Scan predicate pruning files on an address's bucket
+- rewrite_to_current_spec(): Rewrites partitions whose files were written
+  under an older partition spec (run by table maintenance in the background)
+
+PyIceberg 0.9.1 only writes bucket() transforms with pyiceberg-core installed,
+and merge_partitions_data() handles identity partitions only, so the bucket is
+a stored column: the low 64 bits of the address modulo the bucket count.
+Addresses are keccak-derived, so their low bits are uniformly distributed.
+The bucket count is kept in a table property; tables without it are written
+and scanned exactly as before.
+"""
+
+import traceback
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from pyiceberg.expressions import AlwaysTrue, And, EqualTo, IsNull, Or
+from pyiceberg.transforms import IdentityTransform
+from pyiceberg.types import DateType, IntegerType
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Table property holding the bucket count of an address column
+BUCKETS_PROPERTY_PREFIX = "suite.address-buckets."
+
+# Default bucket count for contract address partitions
+DEFAULT_ADDRESS_BUCKETS = 16
+
+# Partitions rewritten to the current spec per maintenance run
+DEFAULT_SPEC_REWRITE_PARTITIONS = 50
+
+
+def bucket_column(column: str) -> str:
+    """Name of the bucket column of an address column."""
+    return f"{column}_bucket"
+
+
+def get_address_buckets(table) -> Dict[str, int]:
+    """
+    Get the bucketed address columns of a table.
+
+    Args:
+        table: Iceberg table
+
+    Returns:
+        Dictionary of address column to bucket count (empty if none)
+    """
+    return {
+        key[len(BUCKETS_PROPERTY_PREFIX) :]: int(value)
+        for key, value in table.properties.items()
+        if key.startswith(BUCKETS_PROPERTY_PREFIX)
+    }
+
+
+def address_bucket(address: Optional[str], buckets: int) -> int:
+    """
+    Bucket of an address: its low 64 bits modulo the bucket count.
+
+    Args:
+        address: 0x-prefixed address (missing or invalid addresses go to 0)
+        buckets: Bucket count
+
+    Returns:
+        Bucket number in [0, buckets)
+    """
+    try:
+        return int(address[-16:], 16) % buckets if address else 0
+    except ValueError:
+        return 0
+
+
+def with_address_buckets(
+    table, data: Union[List[Dict], pa.Table]
+) -> Union[List[Dict], pa.Table]:
+    """
+    Fill the bucket columns of a batch for the table's bucketed address columns.
+
+    Args:
+        table: Iceberg table the batch is written to
+        data: List of dictionaries or PyArrow table
+
+    Returns:
+        The batch with bucket columns (unchanged if the table has none)
+    """
+    for column, buckets in get_address_buckets(table).items():
+        name = bucket_column(column)
+        if isinstance(data, pa.Table):
+            # Batches hold few distinct addresses: hash each one once
+            encoded = pc.dictionary_encode(data[column]).combine_chunks()
+            codes = pa.array(
+                [
+                    address_bucket(address, buckets)
+                    for address in encoded.dictionary.to_pylist()
+                ],
+                pa.int32(),
+            )
+            values = pc.fill_null(pc.take(codes, encoded.indices), 0)
+            if name in data.column_names:
+                data = data.set_column(data.schema.get_field_index(name), name, values)
+            else:
+                data = data.append_column(name, values)
+        else:
+            data = [
+                {**row, name: address_bucket(row.get(column), buckets)} for row in data
+            ]
+    return data
+
+
+def address_bucket_filter(table, column: str, address: str):
+    """
+    Build a scan predicate selecting the bucket of an address.
+
+    Rows written before the bucket column existed read it as null, so they
+    are kept until rewrite_to_current_spec() has rewritten them; files of
+    other buckets are pruned from the partition values.
+
+    Args:
+        table: Iceberg table
+        column: Address column (e.g. "to")
+        address: Address looked up
+
+    Returns:
+        BooleanExpression, or None if the column is not bucketed
+    """
+    buckets = get_address_buckets(table).get(column)
+    if not buckets:
+        return None
+
+    name = bucket_column(column)
+    return Or(EqualTo(name, address_bucket(address, buckets)), IsNull(name))
+
+
+def add_address_buckets(
+    table, column: str = "to", buckets: int = DEFAULT_ADDRESS_BUCKETS
+) -> bool:
+    """
+    Evolve a table to partition on the bucket of an address column.
+
+    Adds the `<column>_bucket` int column, an identity partition field on it
+    and the bucket count property in one commit. Existing files keep their old
+    spec until rewrite_to_current_spec() rewrites them.
+
+    Args:
+        table: Iceberg table
+        column: Address column to bucket
+        buckets: Bucket count
+
+    Returns:
+        bool: True if the table is bucketed on the column with this count
+    """
+    try:
+        existing = get_address_buckets(table).get(column)
+        if existing == buckets:
+            logger.info(f"Table is already bucketed on {column} ({buckets} buckets)")
+            return True
+        if existing:
+            logger.error(
+                f"Table is bucketed on {column} with {existing} buckets; "
+                f"changing the count needs a new column"
+            )
+            return False
+
+        name = bucket_column(column)
+        with table.transaction() as tx:
+            with tx.update_schema() as update:
+                update.add_column(name, IntegerType(), doc=f"Bucket of {column}")
+            with tx.update_spec() as update:
+                update.add_identity(name)
+            tx.set_properties({f"{BUCKETS_PROPERTY_PREFIX}{column}": str(buckets)})
+
+        logger.info(f"Partitioned table on {name} ({buckets} buckets)")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error adding address buckets on {column}: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+
+def _spec_partition_filter(table, spec, partition):
+    """Row filter matching one partition of an identity-partitioned spec."""
+    predicate = AlwaysTrue()
+    schema = table.schema()
+    for position, field in enumerate(spec.fields):
+        if not isinstance(field.transform, IdentityTransform):
+            return None
+        name = schema.find_column_name(field.source_id)
+        value = partition[position]
+        if value is None:
+            term = IsNull(name)
+        else:
+            if isinstance(schema.find_type(field.source_id), DateType):
+                value = (date(1970, 1, 1) + timedelta(days=value)).isoformat()
+            term = EqualTo(name, value)
+        predicate = term if isinstance(predicate, AlwaysTrue) else And(predicate, term)
+    return predicate
+
+
+def rewrite_to_current_spec(
+    table, max_partitions: Optional[int] = DEFAULT_SPEC_REWRITE_PARTITIONS
+) -> Dict[str, int]:
+    """
+    Rewrite partitions holding files written under an older partition spec.
+
+    Each old partition is read, given its bucket columns and overwritten in
+    its own commit, so the rewrite can stop and resume at any partition.
+
+    Args:
+        table: Iceberg table
+        max_partitions: Partitions to rewrite in this call (None for all)
+
+    Returns:
+        Dictionary with partitions, files_rewritten and partitions_remaining
+    """
+    result = {"partitions": 0, "files_rewritten": 0, "partitions_remaining": 0}
+    table.refresh()
+    if table.current_snapshot() is None:
+        return result
+
+    spec_id = table.spec().spec_id
+    old_files = defaultdict(int)
+    for task in table.scan().plan_files():
+        if task.file.spec_id != spec_id:
+            old_files[(task.file.spec_id, tuple(task.file.partition))] += 1
+
+    specs = table.specs()
+    pending = list(old_files.items())
+    for (old_spec_id, partition), files in pending[:max_partitions]:
+        row_filter = _spec_partition_filter(table, specs[old_spec_id], partition)
+        if row_filter is None:
+            logger.warning(f"Cannot rewrite non-identity partition spec {old_spec_id}")
+            continue
+
+        schema = table.schema().as_arrow()
+        data = with_address_buckets(table, table.scan(row_filter=row_filter).to_arrow())
+        table.overwrite(
+            data.select(schema.names).cast(schema),
+            overwrite_filter=row_filter,
+            snapshot_properties={"maintenance": "spec-rewrite"},
+        )
+        result["partitions"] += 1
+        result["files_rewritten"] += files
+
+    result["partitions_remaining"] = len(pending) - result["partitions"]
+    if result["partitions"]:
+        logger.info(
+            f"Rewrote {result['partitions']} partitions ({result['files_rewritten']} "
+            f"files) to spec {spec_id}, {result['partitions_remaining']} remaining"
+        )
+    return result
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Iceberg Writer Executor
+
+PyIceberg and PyArrow calls are synchronous; run from a coroutine they freeze the
+event loop for the whole commit. This module runs that work off the loop:
+- A bounded thread pool that executes catalog and table I/O
+- A priority queue in front of it, so cursor reads and API-facing work go ahead
+  of bulk loads and background persistence
+- Awaitable futures for every submitted call
+- Metrics on queue depth, queue wait and execution time
+
+Usage:
+    result = await iceberg_writer.run(load_table, catalog, "raw", "transactions")
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from config.logging_config import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Job priorities (lower runs first)
+PRIORITY_HIGH = 0  # Cursor and table lookups on the request path
+PRIORITY_NORMAL = 5  # Sync and import loads
+PRIORITY_LOW = 10  # Background persistence and maintenance
+
+# Priority of the markers that stop the dispatchers, after every queued job
+_PRIORITY_STOP = PRIORITY_LOW + 1
+
+
+@dataclass(order=True)
+class _WriterJob:
+    priority: int
+    sequence: int
+    fn: Optional[Callable] = field(compare=False)  # None stops a dispatcher
+    args: tuple = field(compare=False)
+    kwargs: dict = field(compare=False)
+    future: Optional[asyncio.Future] = field(compare=False)
+    submitted_at: float = field(compare=False, default_factory=time.perf_counter)
+
+
+@dataclass
+class WriterMetrics:
+    """Counters for the writer executor."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    max_queue_depth: int = 0
+    total_wait_seconds: float = 0.0  # Time jobs spent queued
+    total_run_seconds: float = 0.0  # Time jobs spent executing
+    max_wait_seconds: float = 0.0
+
+
+class IcebergWriter:
+    """
+    Bounded, prioritized executor for synchronous Iceberg I/O.
+
+    Jobs are queued by priority and dispatched to a fixed-size thread pool.
+    The queue itself is bounded: when it is full, submitters wait, which
+    pushes back on producers instead of piling up pending writes.
+    """
+
+    # Configuration constants
+    MAX_WORKERS = int(os.getenv("ICEBERG_WRITER_THREADS", "4"))
+    MAX_QUEUE_SIZE = int(os.getenv("ICEBERG_WRITER_QUEUE_SIZE", "100"))
+
+    def __init__(self):
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.queue: Optional[asyncio.PriorityQueue] = None
+        self.dispatchers = []
+        self.metrics = WriterMetrics()
+        self.in_flight = 0
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def started(self) -> bool:
+        return self.executor is not None
+
+    async def start(self):
+        """Start the thread pool and dispatchers on the running event loop."""
+        if self.started and self._loop is asyncio.get_running_loop():
+            return
+        if self.executor:
+            # Started under a previous event loop (e.g. repeated asyncio.run in scripts)
+            self.executor.shutdown(wait=False)
+        self._loop = asyncio.get_running_loop()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix="iceberg-writer"
+        )
+        self.queue = asyncio.PriorityQueue(maxsize=self.MAX_QUEUE_SIZE)
+        self.dispatchers = [
+            asyncio.create_task(self._dispatch()) for _ in range(self.MAX_WORKERS)
+        ]
+        logger.info(
+            f"Iceberg writer started with {self.MAX_WORKERS} threads "
+            f"(queue size {self.MAX_QUEUE_SIZE})"
+        )
+
+    async def stop(self):
+        """
+        Fail queued jobs, let running jobs finish, then stop the dispatchers.
+
+        Running jobs are not cancelled, so their callers still get a result.
+        """
+        if not self.started:
+            return
+
+        # Fail jobs that never got to run
+        while not self.queue.empty():
+            job = self.queue.get_nowait()
+            if not job.future.done():
+                job.future.set_exception(RuntimeError("Iceberg writer stopped"))
+
+        # Each dispatcher exits on a marker once its running job is resolved
+        for _ in self.dispatchers:
+            await self.queue.put(
+                _WriterJob(_PRIORITY_STOP, next(self._sequence), None, (), {}, None)
+            )
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+
+        await asyncio.to_thread(self.executor.shutdown, wait=True)
+        self.executor = None
+        self.dispatchers = []
+        logger.info("Iceberg writer stopped")
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            if job.fn is None:
+                return
+            if job.future.cancelled():
+                continue
+
+            wait = time.perf_counter() - job.submitted_at
+            self.metrics.total_wait_seconds += wait
+            self.metrics.max_wait_seconds = max(self.metrics.max_wait_seconds, wait)
+            self.in_flight += 1
+            start = time.perf_counter()
+            try:
+                result = await loop.run_in_executor(
+                    self.executor, lambda: job.fn(*job.args, **job.kwargs)
+                )
+                self.metrics.completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            except Exception as e:
+                self.metrics.failed += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                self.in_flight -= 1
+                self.metrics.total_run_seconds += time.perf_counter() - start
+
+    async def submit(
+        self, fn: Callable, *args, priority: int = PRIORITY_NORMAL, **kwargs
+    ) -> asyncio.Future:
+        """
+        Queue a synchronous call and return a future for its result.
+
+        Waits for room if the queue is full.
+
+        Args:
+            fn: Synchronous function performing catalog or table I/O
+            *args: Positional arguments for fn
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            asyncio.Future resolving to fn's return value
+        """
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        job = _WriterJob(priority, next(self._sequence), fn, args, kwargs, future)
+        await self.queue.put(job)
+        self.metrics.submitted += 1
+        self.metrics.max_queue_depth = max(
+            self.metrics.max_queue_depth, self.queue.qsize()
+        )
+        return future
+
+    async def run(
+        self, fn: Callable, *args, priority: int = PRIORITY_NORMAL, **kwargs
+    ) -> Any:
+        """
+        Run a synchronous call on the writer pool and await its result.
+
+        Args:
+            fn: Synchronous function performing catalog or table I/O
+            *args: Positional arguments for fn
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            fn's return value (exceptions are re-raised)
+        """
+        return await await_future(
+            await self.submit(fn, *args, priority=priority, **kwargs)
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get executor metrics.
+
+        Returns:
+            Dictionary with queue depth, in-flight jobs, counts and timings
+        """
+        finished = self.metrics.completed + self.metrics.failed
+        return {
+            "started": self.started,
+            "threads": self.MAX_WORKERS,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.metrics.max_queue_depth,
+            "in_flight": self.in_flight,
+            "submitted": self.metrics.submitted,
+            "completed": self.metrics.completed,
+            "failed": self.metrics.failed,
+            "avg_wait_seconds": (
+                round(self.metrics.total_wait_seconds / finished, 4) if finished else 0
+            ),
+            "max_wait_seconds": round(self.metrics.max_wait_seconds, 4),
+            "avg_run_seconds": (
+                round(self.metrics.total_run_seconds / finished, 4) if finished else 0
+            ),
+        }
+
+
+async def await_future(future: asyncio.Future) -> Any:
+    """Await a writer future without cancelling the job if the caller times out."""
+    return await asyncio.shield(future)
+
+
+# Global Iceberg writer instance
+iceberg_writer = IcebergWriter()
+
+
+async def get_iceberg_writer() -> IcebergWriter:
+    """
+    Get the global Iceberg writer, starting it if needed.
+
+    Returns:
+        IcebergWriter: Running writer executor
+    """
+    await iceberg_writer.start()
+    return iceberg_writer
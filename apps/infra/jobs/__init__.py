@@ -0,0 +1,23 @@
+"""
+Job queue package
+
+Redis-backed ETL job queue and the workers that run it.
+"""
+
+from jobs.queue import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    Job,
+    JobQueue,
+    get_job_queue,
+)
+
+__all__ = [
+    "PRIORITY_HIGH",
+    "PRIORITY_LOW",
+    "PRIORITY_NORMAL",
+    "Job",
+    "JobQueue",
+    "get_job_queue",
+]
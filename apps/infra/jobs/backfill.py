@@ -0,0 +1,883 @@
+"""
+Historical Backfill Orchestrator
+
+Onboards contract history as many small jobs instead of one FULL_REFRESH sync
+per contract, so background backfills share the Etherscan budget fairly and
+never crowd out interactive work.
+
+Architecture:
+- Work units: Each backfill splits [start_block, end_block] into block ranges
+  of BACKFILL_UNIT_BLOCKS. A unit fetches at most BACKFILL_UNIT_PAGES pages;
+  a denser range hands its remainder back as a new unit, so every unit stays
+  short whatever the contract's activity
+- Weighted fair share: Backfills are ordered by priority, then by virtual time
+  (Etherscan pages consumed divided by weight). The next unit always comes
+  from the backfill furthest behind its share; a new backfill starts at the
+  current virtual clock instead of catching up on past usage
+- Dispatch: Claiming a unit (Lua script) and releasing it are atomic in Redis,
+  so API processes and workers can all dispatch. At most
+  BACKFILL_MAX_IN_FLIGHT units are queued or running at once, and units run
+  as PRIORITY_LOW jobs, leaving the remaining worker slots to interactive syncs.
+  Workers also dispatch every BACKFILL_DISPATCH_INTERVAL seconds, which
+  reclaims units whose jobs died without releasing them
+- Quota: Every unit page draws from a shared Redis token bucket of
+  BACKFILL_REQUESTS_PER_SECOND, keeping background work under a fixed share
+  of the Etherscan rate limit
+- Progress: Blocks, rows, pages and units per backfill live in a Redis hash
+  and are published as progress events on the backfill's task channel. The
+  backfill also keeps a task status, so its ID works as a task ID for the
+  task event stream, which ends with the final status event
+
+Backfill ranges end at the finality frontier. When the last unit finishes, the
+address cursor and user index coverage are extended over the backfilled range
+and incremental syncs take over from there.
+"""
+
+import asyncio
+import os
+import time
+import traceback
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+from config.logging_config import get_logger
+from config.redis_config import (
+    RedisManager,
+    generate_task_status_key,
+    get_redis_manager,
+)
+from db.iceberg import load_table
+from db.writer import PRIORITY_HIGH, PRIORITY_NORMAL, iceberg_writer
+from jobs.progress import publish_progress
+from jobs.queue import PRIORITY_LOW, STATUS_COMPLETED, STATUS_DEAD, JobQueue
+from pipelines.raw.cursor import get_cursor, update_cursor
+from pipelines.raw.transactions import load_transactions_with_safety
+from pipelines.raw.user_index import ContractUserIndex
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Job type of a backfill work unit
+BACKFILL_RANGE = "backfill_range"
+
+# Backfill statuses
+BACKFILL_RUNNING = "running"
+BACKFILL_COMPLETED = "completed"
+BACKFILL_FAILED = "failed"
+
+# Work unit sizing
+BACKFILL_UNIT_BLOCKS = int(os.getenv("BACKFILL_UNIT_BLOCKS", "1000000"))
+BACKFILL_UNIT_PAGES = int(os.getenv("BACKFILL_UNIT_PAGES", "5"))
+
+# Background budget: units queued or running at once, Etherscan requests per second
+BACKFILL_MAX_IN_FLIGHT = int(os.getenv("BACKFILL_MAX_IN_FLIGHT", "2"))
+BACKFILL_REQUESTS_PER_SECOND = float(os.getenv("BACKFILL_REQUESTS_PER_SECOND", "2"))
+BACKFILL_REQUEST_BURST = int(os.getenv("BACKFILL_REQUEST_BURST", "2"))
+
+# Seconds between dispatch rounds run by every worker, so units released by
+# reconcile are re-dispatched even when no unit handler finishes
+BACKFILL_DISPATCH_INTERVAL = float(os.getenv("BACKFILL_DISPATCH_INTERVAL", "60"))
+
+# Units claimed this long ago without a live job are released by reconcile
+_ORPHAN_AFTER_MS = 60_000
+
+# Priority band width in the ready score; wider than any virtual time
+_PRIORITY_BAND = 10**9
+
+_KEY_PREFIX = "backfill:"
+
+# Pop the next range of the backfill furthest behind its fair share and charge
+# it the estimated unit cost.
+# KEYS: ready, inflight, units, vclock
+# ARGV: max_in_flight, now_ms, unit_id, key_prefix, estimated_pages, band
+_CLAIM_SCRIPT = """
+if redis.call('ZCARD', KEYS[2]) >= tonumber(ARGV[1]) then
+    return false
+end
+while true do
+    local top = redis.call('ZRANGE', KEYS[1], 0, 0)
+    if #top == 0 then
+        return false
+    end
+    local id = top[1]
+    local state = ARGV[4] .. 'state:' .. id
+    local ranges = ARGV[4] .. 'ranges:' .. id
+    local unit = redis.call('LPOP', ranges)
+    if unit then
+        local weight = tonumber(redis.call('HGET', state, 'weight'))
+        local priority = tonumber(redis.call('HGET', state, 'priority'))
+        local start_vtime = tonumber(redis.call('HGET', state, 'vtime'))
+        redis.call('SET', KEYS[4], start_vtime)
+        local vtime = tonumber(
+            redis.call('HINCRBYFLOAT', state, 'vtime', tonumber(ARGV[5]) / weight)
+        )
+        if redis.call('LLEN', ranges) > 0 then
+            redis.call('ZADD', KEYS[1], priority * tonumber(ARGV[6]) + vtime, id)
+        else
+            redis.call('ZREM', KEYS[1], id)
+        end
+        redis.call('HINCRBY', state, 'inflight', 1)
+        redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+        redis.call('HSET', KEYS[3], ARGV[3], id .. '|' .. unit)
+        return {id, unit}
+    end
+    redis.call('ZREM', KEYS[1], id)
+end
+"""
+
+# Return a unit: record its progress, settle its cost, requeue any remainder
+# and report whether the backfill is done. Releasing twice is a no-op.
+# KEYS: ready, inflight, units
+# ARGV: unit_id, key_prefix, pages, estimated_pages, rows, blocks, remainder,
+#       failed_range, band, now
+_RELEASE_SCRIPT = """
+local unit = redis.call('HGET', KEYS[3], ARGV[1])
+if not unit then
+    return false
+end
+local id = string.match(unit, '^(.+)|')
+redis.call('HDEL', KEYS[3], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+
+local state = ARGV[2] .. 'state:' .. id
+local ranges = ARGV[2] .. 'ranges:' .. id
+local weight = tonumber(redis.call('HGET', state, 'weight'))
+local priority = tonumber(redis.call('HGET', state, 'priority'))
+local vtime = tonumber(redis.call(
+    'HINCRBYFLOAT', state, 'vtime',
+    (tonumber(ARGV[3]) - tonumber(ARGV[4])) / weight
+))
+redis.call('HINCRBY', state, 'pages', ARGV[3])
+redis.call('HINCRBY', state, 'rows', ARGV[5])
+redis.call('HINCRBY', state, 'blocks_done', ARGV[6])
+redis.call('HINCRBY', state, 'units_done', 1)
+local inflight = redis.call('HINCRBY', state, 'inflight', -1)
+if ARGV[7] ~= '' then
+    redis.call('LPUSH', ranges, ARGV[7])
+end
+if ARGV[8] ~= '' then
+    redis.call('RPUSH', ARGV[2] .. 'failed:' .. id, ARGV[8])
+end
+redis.call('HSET', state, 'updated_at', ARGV[10])
+
+if redis.call('LLEN', ranges) > 0 then
+    redis.call('ZADD', KEYS[1], priority * tonumber(ARGV[9]) + vtime, id)
+    return {id, 0}
+end
+if inflight > 0 then
+    return {id, 0}
+end
+local status = 'completed'
+if redis.call('LLEN', ARGV[2] .. 'failed:' .. id) > 0 then
+    status = 'failed'
+end
+redis.call('HSET', state, 'status', status)
+return {id, 1}
+"""
+
+# Token bucket shared by every backfill unit.
+# KEYS: bucket  ARGV: rate_per_second, burst, now_ms
+# Returns milliseconds to wait, 0 when a token was taken
+_QUOTA_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(now - ts, 0) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 60000)
+return wait
+"""
+
+
+def backfill_id(chain_id: int, address: str) -> str:
+    """Identifier of an address's backfill, also its progress task ID."""
+    return f"{chain_id}:{address.lower()}"
+
+
+def split_block_range(
+    start_block: int, end_block: int, unit_blocks: int = BACKFILL_UNIT_BLOCKS
+) -> List[Tuple[int, int]]:
+    """
+    Split an inclusive block range into work unit ranges.
+
+    Args:
+        start_block: First block
+        end_block: Last block
+        unit_blocks: Blocks per unit
+
+    Returns:
+        Ascending list of inclusive (start, end) ranges
+    """
+    return [
+        (start, min(start + unit_blocks - 1, end_block))
+        for start in range(start_block, end_block + 1, unit_blocks)
+    ]
+
+
+def _format_range(start_block: int, end_block: int) -> str:
+    return f"{start_block}:{end_block}"
+
+
+def _parse_range(value: str) -> Tuple[int, int]:
+    start_block, end_block = value.split(":")
+    return int(start_block), int(end_block)
+
+
+class RequestQuota:
+    """Redis token bucket limiting background Etherscan requests across workers."""
+
+    def __init__(
+        self,
+        redis_manager: RedisManager,
+        rate: float = BACKFILL_REQUESTS_PER_SECOND,
+        burst: int = BACKFILL_REQUEST_BURST,
+        name: str = "backfill",
+    ):
+        """
+        Initialize the quota.
+
+        Args:
+            redis_manager: Redis manager holding the bucket
+            rate: Requests per second across all workers
+            burst: Requests allowed at once after an idle period
+            name: Bucket name; quotas with different names are independent
+        """
+        self.redis_manager = redis_manager
+        self.rate = rate
+        self.burst = burst
+        self.key = f"quota:{name}"
+        self._script = None
+
+    async def acquire(self):
+        """Wait until a request fits in the quota, then take it."""
+        if not self.redis_manager.connected:
+            await self.redis_manager.connect()
+        if self._script is None:
+            self._script = self.redis_manager.client.register_script(_QUOTA_SCRIPT)
+        while True:
+            wait_ms = await self._script(
+                keys=[self.key],
+                args=[self.rate, self.burst, int(time.time() * 1000)],
+            )
+            if not wait_ms:
+                return
+            await asyncio.sleep(wait_ms / 1000)
+
+
+class BackfillScheduler:
+    """
+    Fair-share scheduler of historical backfills.
+
+    All state lives in Redis, so the API starts backfills and reports progress
+    while workers claim and release units, on any node.
+    """
+
+    # Configuration constants
+    FINISHED_TTL = 7 * 86400  # Keep finished backfill state for a week
+
+    def __init__(
+        self,
+        redis_manager: RedisManager,
+        job_queue: JobQueue,
+        max_in_flight: int = BACKFILL_MAX_IN_FLIGHT,
+        unit_blocks: int = BACKFILL_UNIT_BLOCKS,
+        unit_pages: int = BACKFILL_UNIT_PAGES,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            redis_manager: Redis manager used for all scheduler state
+            job_queue: Queue the work units are enqueued on
+            max_in_flight: Units queued or running at once across all backfills
+            unit_blocks: Blocks per unit when a backfill is planned
+            unit_pages: Etherscan pages a unit fetches at most
+        """
+        self.redis_manager = redis_manager
+        self.job_queue = job_queue
+        self.max_in_flight = max_in_flight
+        self.unit_blocks = unit_blocks
+        self.unit_pages = unit_pages
+        self.ready_key = f"{_KEY_PREFIX}ready"
+        self.inflight_key = f"{_KEY_PREFIX}inflight"
+        self.units_key = f"{_KEY_PREFIX}units"
+        self.vclock_key = f"{_KEY_PREFIX}vclock"
+        self._claim_script = None
+        self._release_script = None
+
+    def _state_key(self, backfill: str) -> str:
+        return f"{_KEY_PREFIX}state:{backfill}"
+
+    def _ranges_key(self, backfill: str) -> str:
+        return f"{_KEY_PREFIX}ranges:{backfill}"
+
+    def _failed_key(self, backfill: str) -> str:
+        return f"{_KEY_PREFIX}failed:{backfill}"
+
+    async def _client(self):
+        if not self.redis_manager.connected:
+            await self.redis_manager.connect()
+        return self.redis_manager.client
+
+    async def start(
+        self,
+        chain_id: int,
+        address: str,
+        start_block: int,
+        end_block: int,
+        weight: float = 1.0,
+        priority: int = PRIORITY_NORMAL,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Plan a backfill and dispatch its first units.
+
+        A backfill already running for the address is left as is.
+
+        Args:
+            chain_id: Blockchain chain ID
+            address: Contract address
+            start_block: First block to backfill
+            end_block: Last block to backfill (at or below the finality frontier)
+            weight: Share of the background budget relative to other backfills
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW; a backfill
+                only gets units while no higher-priority backfill has ranges left
+
+        Returns:
+            Backfill progress, or None on error
+        """
+        address = address.lower()
+        backfill = backfill_id(chain_id, address)
+        try:
+            client = await self._client()
+            state_key = self._state_key(backfill)
+            if await client.hget(state_key, "status") == BACKFILL_RUNNING:
+                logger.info(f"Backfill {backfill} already running, not restarting")
+                return await self.get_progress(chain_id, address)
+
+            ranges = split_block_range(start_block, end_block, self.unit_blocks)
+            vclock = float(await client.get(self.vclock_key) or 0)
+            now = datetime.now().isoformat()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(
+                    state_key, self._ranges_key(backfill), self._failed_key(backfill)
+                )
+                pipe.hset(
+                    state_key,
+                    mapping={
+                        "chain_id": chain_id,
+                        "address": address,
+                        "status": BACKFILL_RUNNING,
+                        "weight": weight,
+                        "priority": priority,
+                        "start_block": start_block,
+                        "end_block": end_block,
+                        "blocks_total": max(end_block - start_block + 1, 0),
+                        "blocks_done": 0,
+                        "rows": 0,
+                        "pages": 0,
+                        "units_done": 0,
+                        "inflight": 0,
+                        "vtime": vclock,
+                        "created_at": now,
+                        "updated_at": now,
+                    },
+                )
+                if ranges:
+                    pipe.rpush(
+                        self._ranges_key(backfill),
+                        *[_format_range(start, end) for start, end in ranges],
+                    )
+                    pipe.zadd(
+                        self.ready_key, {backfill: priority * _PRIORITY_BAND + vclock}
+                    )
+                else:
+                    pipe.hset(state_key, "status", BACKFILL_COMPLETED)
+                await pipe.execute()
+
+            logger.info(
+                f"Planned backfill {backfill}: blocks {start_block}-{end_block} in "
+                f"{len(ranges)} units (weight {weight}, priority {priority})"
+            )
+            await self._set_task_status(
+                backfill,
+                BACKFILL_RUNNING if ranges else BACKFILL_COMPLETED,
+                f"Backfilling blocks {start_block}-{end_block} of {address}",
+            )
+            await self.dispatch()
+            return await self.get_progress(chain_id, address)
+
+        except Exception as e:
+            logger.error(f"Error starting backfill {backfill}: {e}")
+            logger.debug(traceback.format_exc())
+            return None
+
+    async def dispatch(self) -> int:
+        """
+        Enqueue units while the in-flight budget allows, fairest backfill first.
+
+        Returns:
+            Number of units enqueued
+        """
+        dispatched = 0
+        try:
+            client = await self._client()
+            if self._claim_script is None:
+                self._claim_script = client.register_script(_CLAIM_SCRIPT)
+            await self.reconcile()
+
+            while True:
+                unit_id = str(uuid.uuid4())
+                claimed = await self._claim_script(
+                    keys=[
+                        self.ready_key,
+                        self.inflight_key,
+                        self.units_key,
+                        self.vclock_key,
+                    ],
+                    args=[
+                        self.max_in_flight,
+                        int(time.time() * 1000),
+                        unit_id,
+                        _KEY_PREFIX,
+                        self.unit_pages,
+                        _PRIORITY_BAND,
+                    ],
+                )
+                if not claimed:
+                    return dispatched
+
+                backfill, unit = claimed
+                chain_id, address = backfill.split(":", 1)
+                start_block, end_block = _parse_range(unit)
+                job_id = await self.job_queue.enqueue(
+                    BACKFILL_RANGE,
+                    {
+                        "chain_id": int(chain_id),
+                        "address": address,
+                        "start_block": start_block,
+                        "end_block": end_block,
+                    },
+                    priority=PRIORITY_LOW,
+                    job_id=unit_id,
+                )
+                if job_id is None:
+                    # Hand the range back untouched and try again on the next dispatch
+                    await self.release(
+                        unit_id, 0, 0, 0, remainder=(start_block, end_block)
+                    )
+                    return dispatched
+                dispatched += 1
+                logger.debug(
+                    f"Dispatched backfill {backfill} blocks {start_block}-{end_block}"
+                )
+
+        except Exception as e:
+            logger.error(f"Error dispatching backfill units: {e}")
+            logger.debug(traceback.format_exc())
+            return dispatched
+
+    async def release(
+        self,
+        unit_id: str,
+        pages: int,
+        rows: int,
+        blocks: int,
+        remainder: Optional[Tuple[int, int]] = None,
+        failed_range: Optional[Tuple[int, int]] = None,
+    ) -> Optional[Tuple[str, bool]]:
+        """
+        Return a finished or failed unit to its backfill.
+
+        Args:
+            unit_id: Unit (job) identifier
+            pages: Etherscan pages the unit fetched
+            rows: Rows the unit loaded
+            blocks: Blocks the unit fully covered
+            remainder: Range left over when the unit hit its page limit
+            failed_range: Range given up on after the unit's last attempt
+
+        Returns:
+            Tuple of (backfill ID, finished), or None if the unit was already
+            released or on error
+        """
+        try:
+            client = await self._client()
+            if self._release_script is None:
+                self._release_script = client.register_script(_RELEASE_SCRIPT)
+            released = await self._release_script(
+                keys=[self.ready_key, self.inflight_key, self.units_key],
+                args=[
+                    unit_id,
+                    _KEY_PREFIX,
+                    pages,
+                    self.unit_pages,
+                    rows,
+                    blocks,
+                    _format_range(*remainder) if remainder else "",
+                    _format_range(*failed_range) if failed_range else "",
+                    _PRIORITY_BAND,
+                    datetime.now().isoformat(),
+                ],
+            )
+            if not released:
+                return None
+            backfill, finished = released
+            return backfill, bool(finished)
+
+        except Exception as e:
+            logger.error(f"Error releasing backfill unit {unit_id}: {e}")
+            logger.debug(traceback.format_exc())
+            return None
+
+    async def reconcile(self) -> int:
+        """
+        Release units whose job is gone, so lost workers don't leak the budget.
+
+        A unit is orphaned when its job was dead-lettered without the handler
+        releasing it (e.g. the worker crashed on every attempt) or its record
+        expired. Its range is recorded as failed.
+
+        Returns:
+            Number of units released
+        """
+        client = await self._client()
+        cutoff = int(time.time() * 1000) - _ORPHAN_AFTER_MS
+        released = 0
+        for unit_id in await client.zrangebyscore(self.inflight_key, "-inf", cutoff):
+            job = await self.job_queue.get_job(unit_id)
+            if job is not None and job.status not in (STATUS_COMPLETED, STATUS_DEAD):
+                continue
+            unit = await client.hget(self.units_key, unit_id)
+            if unit is None:
+                continue
+
+            logger.warning(f"Releasing orphaned backfill unit {unit_id} ({unit})")
+            outcome = await self.release(
+                unit_id, 0, 0, 0, failed_range=_parse_range(unit.split("|")[1])
+            )
+            if outcome and outcome[1]:
+                await self._close(outcome[0])
+            released += 1
+        return released
+
+    async def get_progress(
+        self, chain_id: int, address: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the progress of an address's backfill.
+
+        Args:
+            chain_id: Blockchain chain ID
+            address: Contract address
+
+        Returns:
+            Progress dictionary, or None if the address was never backfilled
+        """
+        backfill = backfill_id(chain_id, address)
+        client = await self._client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._state_key(backfill))
+            pipe.llen(self._ranges_key(backfill))
+            pipe.lrange(self._failed_key(backfill), 0, -1)
+            state, units_pending, failed = await pipe.execute()
+        if not state:
+            return None
+
+        blocks_total = int(state["blocks_total"])
+        blocks_done = int(state["blocks_done"])
+        return {
+            "backfill_id": backfill,
+            "chain_id": int(state["chain_id"]),
+            "address": state["address"],
+            "status": state["status"],
+            "weight": float(state["weight"]),
+            "priority": int(state["priority"]),
+            "start_block": int(state["start_block"]),
+            "end_block": int(state["end_block"]),
+            "blocks_total": blocks_total,
+            "blocks_done": blocks_done,
+            "percent_complete": (
+                round(100 * blocks_done / blocks_total, 2) if blocks_total else 100.0
+            ),
+            "rows": int(state["rows"]),
+            "pages": int(state["pages"]),
+            "units_done": int(state["units_done"]),
+            "units_pending": units_pending,
+            "units_in_flight": int(state["inflight"]),
+            "failed_ranges": [list(_parse_range(value)) for value in failed],
+            "created_at": state["created_at"],
+            "updated_at": state["updated_at"],
+        }
+
+    async def _close(self, backfill: str) -> Optional[Dict[str, Any]]:
+        """Expire a finished backfill's state and report a failed one."""
+        client = await self._client()
+        await client.expire(self._state_key(backfill), self.FINISHED_TTL)
+        await client.expire(self._failed_key(backfill), self.FINISHED_TTL)
+
+        chain_id, address = backfill.split(":", 1)
+        progress = await self.get_progress(int(chain_id), address)
+        if progress is not None and progress["status"] == BACKFILL_FAILED:
+            await self._set_task_status(
+                backfill,
+                BACKFILL_FAILED,
+                f"Backfill of {address} finished with "
+                f"{len(progress['failed_ranges'])} failed ranges",
+                result=progress,
+            )
+        return progress
+
+    async def _set_task_status(
+        self,
+        backfill: str,
+        status: str,
+        message: str,
+        result: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Store a backfill's task status and publish it as a status event.
+
+        Completed and failed statuses are final: the event ends the backfill's
+        task event stream.
+        """
+        final = status != BACKFILL_RUNNING
+        chain_id, address = backfill.split(":", 1)
+        now = datetime.now().isoformat()
+        await self.redis_manager.set_json(
+            generate_task_status_key(backfill),
+            {
+                "task_id": backfill,
+                "status": status,
+                "message": message,
+                "created_at": now,
+                "completed_at": now if final else None,
+                "result": result,
+                "error": None,
+                "final": final,
+                "metadata": {
+                    "type": "backfill",
+                    "chain_id": int(chain_id),
+                    "address": address,
+                },
+            },
+            # A running backfill may outlive any fixed TTL
+            ex=self.FINISHED_TTL if final else None,
+        )
+        await publish_progress(
+            self.redis_manager,
+            backfill,
+            "status",
+            status=status,
+            message=message,
+            result=result,
+            final=final,
+        )
+
+    async def finish(self, catalog, chain_id: int, address: str) -> bool:
+        """
+        Extend the cursor and user index coverage over a completed backfill.
+
+        Only a backfill without failed ranges covers its whole block range;
+        a failed one keeps the cursor as it was, so a sync or a new backfill
+        fills the gaps.
+
+        Args:
+            catalog: Iceberg catalog
+            chain_id: Blockchain chain ID
+            address: Contract address
+
+        Returns:
+            bool: True if the cursor was extended
+        """
+        backfill = backfill_id(chain_id, address)
+        progress = await self._close(backfill)
+        if progress is None or progress["status"] != BACKFILL_COMPLETED:
+            return False
+
+        cursor_table = await iceberg_writer.run(
+            load_table, catalog, "raw", "cursor", refresh=True, priority=PRIORITY_HIGH
+        )
+        cursor = (
+            await iceberg_writer.run(
+                get_cursor, cursor_table, chain_id, address, priority=PRIORITY_HIGH
+            )
+            if cursor_table
+            else None
+        )
+        # Incremental syncs may already have moved the cursor past the backfill
+        end_block = progress["end_block"]
+        if cursor is not None:
+            end_block = max(end_block, int(cursor[1]))
+        updated = await update_cursor(
+            catalog,
+            "raw",
+            chain_id,
+            address,
+            end_block,
+            start_block=progress["start_block"],
+        )
+
+        await ContractUserIndex(self.redis_manager).record(
+            chain_id, address, [], progress["start_block"], progress["end_block"]
+        )
+        await self._set_task_status(
+            backfill,
+            BACKFILL_COMPLETED,
+            f"Backfilled {progress['rows']} transactions of {address}",
+            result=progress,
+        )
+        logger.info(
+            f"Backfill {backfill} complete: {progress['rows']} rows in "
+            f"{progress['units_done']} units, {progress['pages']} pages"
+        )
+        return bool(updated)
+
+
+async def run_backfill_unit(
+    catalog,
+    provider,
+    quota: RequestQuota,
+    chain_id: int,
+    address: str,
+    start_block: int,
+    end_block: int,
+    max_pages: int = BACKFILL_UNIT_PAGES,
+    force_upsert: bool = False,
+) -> Dict[str, Any]:
+    """
+    Fetch and load one backfill work unit.
+
+    Pages stop at max_pages. The rows of the last page's final block may be
+    cut off by the page limit, so they are left to the remainder, which
+    starts at that block.
+
+    Args:
+        catalog: Iceberg catalog
+        provider: EtherscanProvider instance
+        quota: Background request quota every page is drawn from
+        chain_id: Blockchain chain ID
+        address: Contract address
+        start_block: First block of the unit
+        end_block: Last block of the unit
+        max_pages: Etherscan pages fetched at most
+        force_upsert: Merge instead of append (set when retrying a unit that
+            may have loaded before failing)
+
+    Returns:
+        Dictionary with pages, rows, blocks (fully covered) and remainder
+        ((start, end) or None)
+
+    Raises:
+        FetchInterruptedError: If a page fails
+        RuntimeError: If loading fails
+    """
+    table = await iceberg_writer.run(
+        load_table, catalog, "raw", "transactions", priority=PRIORITY_HIGH
+    )
+    if table is None:
+        raise RuntimeError("Failed to load transactions table")
+    schema = table.schema().as_arrow()
+
+    batches = provider.account.iter_transaction_batches(
+        address, chain_id, start_block, end_block
+    )
+    transactions = []
+    pages = 0
+    remainder = None
+    covered_through = end_block
+    while True:
+        await quota.acquire()
+        try:
+            batch = await batches.__anext__()
+        except StopAsyncIteration:
+            break
+        pages += 1
+        transactions.extend(batch.transactions)
+
+        if batch.next_block is not None and pages >= max_pages:
+            cut = batch.last_block_number
+            if cut > start_block:
+                transactions = [
+                    tx for tx in transactions if int(tx["block_number"]) < cut
+                ]
+                covered_through = cut - 1
+            else:
+                # One block fills every page; keep it whole and move past it
+                covered_through = cut
+            if covered_through < end_block:
+                remainder = (covered_through + 1, end_block)
+            break
+    await batches.aclose()
+
+    rows = pa.Table.from_pylist(transactions, schema=schema)
+    if rows.num_rows:
+        loaded = await iceberg_writer.run(
+            load_transactions_with_safety,
+            catalog,
+            "raw",
+            chain_id,
+            address,
+            rows,
+            force_upsert=force_upsert,
+            priority=PRIORITY_NORMAL,
+        )
+        if not loaded:
+            raise RuntimeError(
+                f"Failed to load backfill blocks {start_block}-{covered_through}"
+            )
+        # Users only; coverage is extended once the whole backfill is done
+        await ContractUserIndex(quota.redis_manager).record(
+            chain_id, address, rows, None, None
+        )
+
+    return {
+        "pages": pages,
+        "rows": rows.num_rows,
+        "blocks": covered_through - start_block + 1,
+        "remainder": remainder,
+    }
+
+
+async def get_backfill_scheduler(job_queue: Optional[JobQueue] = None):
+    """
+    Get a backfill scheduler on the global Redis manager.
+
+    Args:
+        job_queue: Queue for work units (default: the etl queue)
+
+    Returns:
+        BackfillScheduler: Scheduler backed by the connected Redis manager
+    """
+    redis_manager = await get_redis_manager()
+    return BackfillScheduler(redis_manager, job_queue or JobQueue(redis_manager, "etl"))
+
+
+async def run_backfill_dispatch_loop(
+    scheduler: BackfillScheduler, interval: float = BACKFILL_DISPATCH_INTERVAL
+):
+    """
+    Periodically reconcile and dispatch backfill units until cancelled.
+
+    Dispatch otherwise only runs when a backfill starts or a unit finishes, so
+    without this loop units lost to crashed workers would stall every backfill.
+
+    Args:
+        scheduler: Backfill scheduler to dispatch with
+        interval: Seconds between dispatch rounds
+    """
+    while True:
+        await asyncio.sleep(interval)
+        dispatched = await scheduler.dispatch()
+        if dispatched:
+            logger.info(f"Periodic backfill dispatch enqueued {dispatched} units")
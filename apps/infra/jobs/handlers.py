@@ -0,0 +1,627 @@
+"""
+ETL Job Handlers
+
+Work executed by job queue workers, keyed by job type:
+- sync_transactions: Checkpointed transaction sync for an address
+- import_addresses: Unique address import for a contract
+- decode_calls: Calldata decoding of a contract's transactions
+- sync_token_transfers: ERC-20 Transfer log sync and transfer decoding for a token
+- standardize_transactions: Incremental raw → standardized.transactions
+  conversion, queued after every successful sync
+- backfill_range: One block-range work unit of a historical backfill, after
+  which the backfill scheduler dispatches the next fair-share unit
+
+Handlers take the catalog and the leased Job and return a JSON-serializable
+result. Raising marks the attempt as failed so the queue retries it; a retried
+sync resumes from its checkpoint.
+"""
+
+import os
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Optional
+
+from config.logging_config import get_logger
+from config.redis_config import generate_task_status_key, get_redis_manager
+from db.iceberg import load_table
+from db.writer import PRIORITY_HIGH, iceberg_writer
+from jobs.backfill import (
+    BACKFILL_RANGE,
+    RequestQuota,
+    get_backfill_scheduler,
+    run_backfill_unit,
+)
+from jobs.progress import publish_progress
+from jobs.queue import PRIORITY_LOW, Job, get_job_queue
+from pipelines.raw.contract_address_import import ContractAddressImporter
+from pipelines.raw.cursor import get_cursor
+from pipelines.raw.sync import run_checkpointed_sync
+from pipelines.standardized.decoded_calls import run_call_decoding
+from pipelines.standardized.token_transfers import run_token_transfers_sync
+from pipelines.standardized.transactions import run_transactions_standardization
+from providers.etherscan import EtherscanProvider, FetchMode, TimePeriod
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Job types
+SYNC_TRANSACTIONS = "sync_transactions"
+IMPORT_ADDRESSES = "import_addresses"
+DECODE_CALLS = "decode_calls"
+SYNC_TOKEN_TRANSFERS = "sync_token_transfers"
+STANDARDIZE_TRANSACTIONS = "standardize_transactions"
+
+
+async def _initialize_etl_tables(catalog, task_id):
+    """Initialize and load required tables for ETL."""
+    transactions_table = await iceberg_writer.run(
+        load_table, catalog, "raw", "transactions", priority=PRIORITY_HIGH
+    )
+    cursor_table = await iceberg_writer.run(
+        load_table, catalog, "raw", "cursor", refresh=True, priority=PRIORITY_HIGH
+    )
+
+    if not transactions_table or not cursor_table:
+        logger.error(f"Task {task_id}: Failed to load tables")
+        return None, None
+
+    return transactions_table, cursor_table
+
+
+async def _determine_fetch_mode(
+    cursor_table, chain_id, address, mode, time_period, task_id
+):
+    """Determine fetch mode and starting block for incremental sync."""
+    # Get last block number for incremental mode
+    last_block_number = None
+    period = None
+
+    if mode == "full":
+        fetch_mode = FetchMode.FULL_REFRESH
+    elif mode == "time_range":
+        fetch_mode = FetchMode.TIME_RANGE
+        period = (
+            TimePeriod.from_string(time_period) if time_period else TimePeriod.DAYS_7
+        )
+    else:
+        fetch_mode = FetchMode.INCREMENTAL
+
+    if fetch_mode == FetchMode.INCREMENTAL:
+        cursor_data = await iceberg_writer.run(
+            get_cursor, cursor_table, chain_id, address, priority=PRIORITY_HIGH
+        )
+        if cursor_data is not None:
+            try:
+                # cursor_data is now a tuple (start_block, end_block)
+                _, end_block = cursor_data
+                last_block_number = int(end_block)
+                logger.info(
+                    f"Task {task_id}: Starting from block {last_block_number} (incremental mode)"
+                )
+            except (ValueError, TypeError):
+                logger.warning(
+                    f"Task {task_id}: Invalid block number in cursor: {cursor_data}"
+                )
+                last_block_number = None
+                fetch_mode = FetchMode.FULL_REFRESH
+        else:
+            logger.info(f"Task {task_id}: No cursor found, using full refresh mode")
+            fetch_mode = FetchMode.FULL_REFRESH
+    elif fetch_mode == FetchMode.TIME_RANGE:
+        logger.info(f"Task {task_id}: Using time-range mode ({period.value})")
+
+    return fetch_mode, last_block_number, period
+
+
+async def update_task_status(
+    redis_manager,
+    task_id: str,
+    status: str,
+    message: str,
+    result: Optional[dict] = None,
+    error: Optional[str] = None,
+    metadata: Optional[dict] = None,
+):
+    """Update task status in Redis."""
+    try:
+        task_key = generate_task_status_key(task_id)
+        task_data = {
+            "task_id": task_id,
+            "status": status,
+            "message": message,
+            "created_at": datetime.now().isoformat(),
+            "completed_at": (
+                datetime.now().isoformat()
+                if status in ["completed", "failed"]
+                else None
+            ),
+            "result": result,
+            "error": error,
+            "metadata": metadata or {},  # Store request parameters and other metadata
+        }
+
+        await redis_manager.set_json(task_key, task_data, ex=86400)  # 24 hour TTL
+        logger.info(f"Updated task {task_id} status to {status}")
+        await publish_progress(
+            redis_manager,
+            task_id,
+            "status",
+            status=status,
+            message=message,
+            result=result,
+            error=error,
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to update task status for {task_id}: {e}")
+
+
+async def import_contract_addresses_task(
+    catalog,
+    contract_address: str,
+    chain_id: int,
+    user_limit: int,
+    cache_ttl: int,
+    task_id: str,
+) -> Optional[dict]:
+    """
+    Import unique addresses that have interacted with a contract.
+
+    Uses a decoupled approach:
+    1. Cached result from Redis, or the durable standardized.contract_users copy
+       when Redis misses
+    2. Otherwise fast address extraction (or an incremental refresh of an
+       expired result) and immediate caching for quick API response
+    3. Separate database persistence that doesn't block the user
+
+    Args:
+        catalog: Iceberg catalog from app.state
+        contract_address: Contract address to analyze
+        chain_id: Blockchain ID
+        user_limit: Maximum number of unique addresses to return
+        cache_ttl: Cache time-to-live in seconds
+        task_id: Task identifier for tracking
+
+    Returns:
+        Result data stored on the task status
+
+    Raises:
+        RuntimeError: If the import fails (the task status is set to failed first)
+    """
+    redis_manager = await get_redis_manager()
+
+    # Store task metadata including request parameters
+    task_metadata = {
+        "contract_address": contract_address,
+        "chain_id": chain_id,
+        "user_limit": user_limit,
+        "cache_ttl": cache_ttl,
+    }
+
+    try:
+        logger.info(
+            f"Starting unique addresses extraction task {task_id} "
+            f"for {contract_address} on chain {chain_id}, limit: {user_limit}"
+        )
+
+        # Task status is already set to "running" by the endpoint
+        # Update status to indicate we're proceeding with the import
+        await update_task_status(
+            redis_manager,
+            task_id,
+            "running",
+            f"Proceeding with address import for {contract_address}",
+            metadata=task_metadata,
+        )
+
+        # Get Etherscan API key
+        etherscan_api_key = os.getenv("ETHERSCAN_API_KEY")
+        if not etherscan_api_key:
+            raise RuntimeError("ETHERSCAN_API_KEY not set")
+
+        # Initialize providers
+        etherscan_provider = EtherscanProvider(api_key=etherscan_api_key)
+        extractor = ContractAddressImporter(redis_manager, etherscan_provider)
+
+        # Check if we have cached results first: Redis, then the durable table
+        cached_result = await extractor.get_cached_result(chain_id, contract_address)
+        stale_result = None
+        if not cached_result:
+            stale_result = await extractor.get_cached_result(
+                chain_id, contract_address, allow_stale=True
+            )
+        if not cached_result and not stale_result:
+            persisted_result = await extractor.get_persisted_result(
+                catalog, chain_id, contract_address, cache_ttl
+            )
+            if persisted_result:
+                remaining = (
+                    persisted_result.expires_at - datetime.now(timezone.utc)
+                ).total_seconds()
+                if remaining > 0:
+                    logger.info(f"Task {task_id}: Restoring stored result to cache")
+                    await extractor.cache_result(
+                        chain_id, contract_address, persisted_result, int(remaining)
+                    )
+                    cached_result = persisted_result
+                else:
+                    stale_result = persisted_result
+
+        if cached_result:
+            logger.info(
+                f"Task {task_id}: Found cached result with {cached_result.total_addresses} addresses"
+            )
+
+            result_data = {
+                "addresses": cached_result.addresses,
+                "total_addresses": cached_result.total_addresses,
+                "blocks_processed": cached_result.blocks_processed,
+                "transactions_processed": cached_result.transactions_processed,
+                "start_block": cached_result.start_block,
+                "end_block": cached_result.end_block,
+                "last_updated": cached_result.last_updated.isoformat(),
+                "expires_at": (
+                    cached_result.expires_at.isoformat()
+                    if cached_result.expires_at
+                    else None
+                ),
+                "from_cache": True,
+            }
+
+            await update_task_status(
+                redis_manager,
+                task_id,
+                "completed",
+                f"Retrieved {cached_result.total_addresses} unique addresses from cache",
+                result=result_data,
+                metadata=task_metadata,
+            )
+            return result_data
+
+        # PHASE 1: Fast address extraction (no database blocking). An expired
+        # result only needs the blocks after its end_block
+        if stale_result:
+            logger.info(f"Task {task_id}: Refreshing expired cached result")
+            result = await extractor.refresh_addresses(
+                chain_id=chain_id,
+                contract_address=contract_address,
+                cached=stale_result,
+                user_limit=user_limit,
+                task_id=task_id,
+            )
+        else:
+            logger.info(f"Task {task_id}: Starting fast address extraction phase")
+            result = await extractor.import_addresses_fast(
+                chain_id=chain_id,
+                contract_address=contract_address,
+                user_limit=user_limit,
+                task_id=task_id,
+            )
+
+        # PHASE 2: Immediate caching for fast API response
+        logger.info(f"Task {task_id}: Caching results for immediate availability")
+        cache_success = await extractor.cache_result(
+            chain_id, contract_address, result, cache_ttl
+        )
+
+        if not cache_success:
+            logger.warning(f"Task {task_id}: Failed to cache results")
+
+        # Calculate expires_at based on cache_ttl
+        expires_at_timestamp = datetime.now(timezone.utc).timestamp() + cache_ttl
+        expires_at_iso = datetime.fromtimestamp(
+            expires_at_timestamp, tz=timezone.utc
+        ).isoformat()
+
+        # Prepare result data for API response
+        result_data = {
+            "addresses": result.addresses,
+            "total_addresses": result.total_addresses,
+            "blocks_processed": result.blocks_processed,
+            "transactions_processed": result.transactions_processed,
+            "start_block": result.start_block,
+            "end_block": result.end_block,
+            "last_updated": result.last_updated.isoformat(),
+            "expires_at": expires_at_iso,
+            "from_cache": False,
+        }
+
+        # Update task status to completed (API can respond immediately)
+        await update_task_status(
+            redis_manager,
+            task_id,
+            "completed",
+            f"Imported {result.total_addresses} unique addresses successfully",
+            result=result_data,
+            metadata=task_metadata,
+        )
+
+        logger.info(
+            f"Task {task_id}: Address extraction completed successfully. "
+            f"Found {result.total_addresses} addresses from {result.transactions_processed} transactions"
+        )
+
+        # PHASE 3: Background database persistence (non-blocking)
+        logger.info(f"Task {task_id}: Starting background database persistence")
+        try:
+            # Durable copy of the result, read when Redis misses
+            if not await extractor.persist_result(
+                catalog, chain_id, contract_address, result
+            ):
+                logger.warning(
+                    f"Task {task_id}: Failed to store result in standardized.contract_users"
+                )
+
+            db_success = await extractor.persist_to_database(
+                catalog, result, chain_id, contract_address, task_id
+            )
+
+            if db_success:
+                logger.info(
+                    f"Task {task_id}: Database persistence completed successfully"
+                )
+                # Analytics read standardized.transactions
+                if not await enqueue_transactions_standardization():
+                    logger.warning(
+                        f"Task {task_id}: Failed to queue transactions conversion"
+                    )
+            else:
+                logger.warning(
+                    f"Task {task_id}: Database persistence failed, but results are cached"
+                )
+
+        except Exception as db_error:
+            # Database errors don't fail the overall task since results are already cached
+            logger.error(f"Task {task_id}: Database persistence error: {db_error}")
+            logger.info(
+                f"Task {task_id}: Results remain available from cache despite database error"
+            )
+
+        return result_data
+
+    except Exception as e:
+        error_msg = f"Error in contract address import task: {e}"
+        logger.error(f"Task {task_id}: {error_msg}")
+        await update_task_status(
+            redis_manager,
+            task_id,
+            "failed",
+            error_msg,
+            error=str(e),
+            metadata=task_metadata,
+        )
+        raise RuntimeError(error_msg) from e
+
+
+async def sync_transactions_task(
+    catalog,
+    address: str,
+    chain_id: int,
+    mode: str,
+    time_period: Optional[str],
+    task_id: str,
+) -> dict:
+    """
+    Sync transactions for a contract or wallet address.
+
+    Args:
+        catalog: Iceberg catalog from app.state
+        address: Contract or wallet address
+        chain_id: Blockchain ID
+        mode: Sync mode ('full', 'incremental', or 'time_range')
+        time_period: Time period for time_range mode
+        task_id: Task identifier for tracking
+
+    Returns:
+        Summary of the committed sync
+
+    Raises:
+        RuntimeError: If the sync fails; committed progress stays checkpointed,
+            so a retry resumes where this attempt stopped
+    """
+    logger.info(
+        f"Starting sync task {task_id} for {address} on chain {chain_id}, mode: {mode}"
+    )
+
+    transactions_table, cursor_table = await _initialize_etl_tables(catalog, task_id)
+    if not transactions_table:
+        raise RuntimeError("Failed to load ETL tables")
+
+    fetch_mode, last_block_number, period = await _determine_fetch_mode(
+        cursor_table, chain_id, address, mode, time_period, task_id
+    )
+
+    # Fetch transactions from Etherscan
+    etherscan_api_key = os.getenv("ETHERSCAN_API_KEY")
+    if not etherscan_api_key:
+        raise RuntimeError("ETHERSCAN_API_KEY not set")
+
+    # Fetch and commit in checkpointed chunks so a failed or restarted
+    # sync resumes where it stopped instead of re-downloading every page
+    etherscan_provider = EtherscanProvider(api_key=etherscan_api_key)
+    redis_manager = await get_redis_manager()
+    result = await run_checkpointed_sync(
+        catalog,
+        etherscan_provider,
+        chain_id,
+        address,
+        fetch_mode,
+        last_block_number=last_block_number,
+        time_period=period,
+        redis_manager=redis_manager if redis_manager.connected else None,
+        task_id=task_id,
+    )
+
+    if result is None:
+        raise RuntimeError("Sync failed, committed progress is checkpointed")
+
+    logger.info(
+        f"Task {task_id}: Sync completed successfully, "
+        f"{result.rows_committed} transactions processed"
+        f"{' (resumed)' if result.resumed else ''}"
+    )
+    return {
+        "rows_committed": result.rows_committed,
+        "chunks_committed": result.chunks_committed,
+        "start_block": result.start_block,
+        "end_block": result.end_block,
+        "resumed": result.resumed,
+    }
+
+
+async def enqueue_transactions_standardization() -> Optional[str]:
+    """
+    Queue a standardize_transactions job.
+
+    The fixed dedupe key folds requests made while a conversion is queued into
+    that job. It is released once the job is leased, so a request made while a
+    conversion runs queues the next one and rows committed after the running
+    job's last plan are still converted.
+
+    Returns:
+        Job ID, or None if the queue is unavailable
+    """
+    job_queue = await get_job_queue()
+    return await job_queue.enqueue(
+        STANDARDIZE_TRANSACTIONS,
+        {},
+        priority=PRIORITY_LOW,
+        dedupe_key=STANDARDIZE_TRANSACTIONS,
+        dedupe_pending_only=True,
+    )
+
+
+async def handle_sync_transactions(catalog, job: Job) -> dict:
+    """Run a sync_transactions job, then queue the standardized conversion."""
+    result = await sync_transactions_task(catalog, task_id=job.job_id, **job.payload)
+    if result["rows_committed"] and not await enqueue_transactions_standardization():
+        logger.warning(f"Task {job.job_id}: Failed to queue transactions conversion")
+    return result
+
+
+async def handle_import_addresses(catalog, job: Job) -> Optional[dict]:
+    """Run an import_addresses job."""
+    return await import_contract_addresses_task(
+        catalog, task_id=job.job_id, **job.payload
+    )
+
+
+async def handle_decode_calls(catalog, job: Job) -> dict:
+    """Run a decode_calls job."""
+    result = await run_call_decoding(catalog, **job.payload)
+    if result is None:
+        raise RuntimeError("Call decoding failed")
+    return asdict(result)
+
+
+async def handle_sync_token_transfers(catalog, job: Job) -> dict:
+    """Run a sync_token_transfers job."""
+    etherscan_api_key = os.getenv("ETHERSCAN_API_KEY")
+    if not etherscan_api_key:
+        raise RuntimeError("ETHERSCAN_API_KEY not set")
+
+    redis_manager = await get_redis_manager()
+    result = await run_token_transfers_sync(
+        catalog,
+        EtherscanProvider(api_key=etherscan_api_key),
+        job.payload["chain_id"],
+        job.payload["token_address"],
+        mode=(
+            FetchMode.FULL_REFRESH
+            if job.payload.get("mode") == "full"
+            else FetchMode.INCREMENTAL
+        ),
+        redis_manager=redis_manager if redis_manager.connected else None,
+    )
+    if result is None:
+        raise RuntimeError("Token transfers sync failed, synced logs are committed")
+    return asdict(result)
+
+
+async def handle_standardize_transactions(catalog, job: Job) -> dict:
+    """Run a standardize_transactions job."""
+    result = await run_transactions_standardization(catalog)
+    if result is None:
+        raise RuntimeError("Transactions conversion failed")
+    return result
+
+
+async def handle_backfill_range(catalog, job: Job) -> dict:
+    """
+    Run a backfill_range job and return the unit to its backfill.
+
+    A unit that fails its last attempt is recorded as a failed range so the
+    backfill still finishes; either way the next units are dispatched.
+    """
+    etherscan_api_key = os.getenv("ETHERSCAN_API_KEY")
+    if not etherscan_api_key:
+        raise RuntimeError("ETHERSCAN_API_KEY not set")
+
+    payload = job.payload
+    scheduler = await get_backfill_scheduler()
+    try:
+        result = await run_backfill_unit(
+            catalog,
+            EtherscanProvider(api_key=etherscan_api_key),
+            RequestQuota(scheduler.redis_manager),
+            payload["chain_id"],
+            payload["address"],
+            payload["start_block"],
+            payload["end_block"],
+            max_pages=scheduler.unit_pages,
+            # An earlier attempt may have loaded the unit before failing
+            force_upsert=job.attempts > 1,
+        )
+    except Exception:
+        if job.attempts >= job.max_attempts:
+            released = await scheduler.release(
+                job.job_id,
+                0,
+                0,
+                0,
+                failed_range=(payload["start_block"], payload["end_block"]),
+            )
+            if released and released[1]:
+                await scheduler.finish(catalog, payload["chain_id"], payload["address"])
+            await scheduler.dispatch()
+        raise
+
+    released = await scheduler.release(
+        job.job_id,
+        result["pages"],
+        result["rows"],
+        result["blocks"],
+        remainder=result["remainder"],
+    )
+    if released:
+        backfill, finished = released
+        progress = await scheduler.get_progress(payload["chain_id"], payload["address"])
+        if progress:
+            await publish_progress(
+                scheduler.redis_manager,
+                backfill,
+                "progress",
+                phase="backfilling",
+                blocks_done=progress["blocks_done"],
+                blocks_total=progress["blocks_total"],
+                rows=progress["rows"],
+                units_pending=progress["units_pending"],
+            )
+        if finished:
+            await scheduler.finish(catalog, payload["chain_id"], payload["address"])
+    await scheduler.dispatch()
+
+    if result["rows"] and not await enqueue_transactions_standardization():
+        logger.warning(f"Task {job.job_id}: Failed to queue transactions conversion")
+    return result
+
+
+# Handler for each job type
+JOB_HANDLERS = {
+    SYNC_TRANSACTIONS: handle_sync_transactions,
+    IMPORT_ADDRESSES: handle_import_addresses,
+    DECODE_CALLS: handle_decode_calls,
+    SYNC_TOKEN_TRANSFERS: handle_sync_token_transfers,
+    STANDARDIZE_TRANSACTIONS: handle_standardize_transactions,
+    BACKFILL_RANGE: handle_backfill_range,
+}
@@ -0,0 +1,194 @@
+"""
+Task Progress Events
+
+Live progress for import and sync tasks over Redis pub/sub:
+- publish_progress(): Any process (API or worker) publishes a task event to
+  task_progress:{task_id}
+- ProgressBroker: Each API process holds one pattern subscription to all task
+  channels and fans events out to local per-task queues, so any number of
+  streaming clients share a single Redis connection
+
+Events are JSON objects with task_id, event, timestamp and event fields:
+- status: Task status change (running, completed, failed) with message/result;
+  backfill status events carry final=True once the backfill has finished
+- job: Job queue state change (queued, leased, retrying, completed, dead)
+- progress: Work done so far (pages, addresses, blocks, rows committed)
+"""
+
+import asyncio
+import json
+import traceback
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from config.logging_config import get_logger
+from config.redis_config import (
+    RedisManager,
+    generate_task_progress_channel,
+    get_redis_manager,
+)
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Job statuses after which a task emits no further events. A task status of
+# "failed" is not final: the job may still be retried.
+TERMINAL_JOB_STATUSES = {"completed", "dead"}
+
+
+async def publish_progress(
+    redis_manager: Optional[RedisManager], task_id: Optional[str], event: str, **data
+) -> bool:
+    """
+    Publish a task event. Never raises; progress is best effort.
+
+    Args:
+        redis_manager: Redis manager to publish with (None skips publishing)
+        task_id: Task identifier (None skips publishing)
+        event: Event type (status, job or progress)
+        **data: JSON-serializable event fields
+
+    Returns:
+        bool: True if the event was published
+    """
+    if redis_manager is None or not task_id:
+        return False
+    try:
+        if not redis_manager.connected:
+            await redis_manager.connect()
+        message = {
+            "task_id": task_id,
+            "event": event,
+            "timestamp": datetime.now().isoformat(),
+            **data,
+        }
+        await redis_manager.client.publish(
+            generate_task_progress_channel(task_id), json.dumps(message, default=str)
+        )
+        return True
+    except Exception as e:
+        logger.debug(f"Failed to publish {event} event for task {task_id}: {e}")
+        return False
+
+
+def is_terminal_event(event: Dict[str, Any]) -> bool:
+    """
+    Check whether an event ends a task's stream.
+
+    Args:
+        event: Event dictionary
+
+    Returns:
+        bool: True if the task's job has finished, or the event is a final
+            status (tasks without a job, such as backfills)
+    """
+    if event.get("event") == "status":
+        return bool(event.get("final"))
+    return event.get("event") == "job" and event.get("status") in TERMINAL_JOB_STATUSES
+
+
+class ProgressBroker:
+    """
+    Fans task events from one Redis pattern subscription out to local queues.
+
+    Subscriber queues are bounded; a client that falls behind loses its oldest
+    events rather than holding memory for the whole task.
+    """
+
+    # Configuration constants
+    QUEUE_SIZE = 100  # Events buffered per subscriber
+    RECONNECT_DELAY = 1.0  # Seconds between subscription attempts
+
+    def __init__(self, redis_manager: RedisManager):
+        self.redis_manager = redis_manager
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+        self._pattern = generate_task_progress_channel("*")
+
+    def start(self):
+        """Start the shared subscription on the running event loop."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop the shared subscription."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    def subscribe(self, task_id: str) -> asyncio.Queue:
+        """
+        Register a local queue for a task's events.
+
+        Args:
+            task_id: Task identifier
+
+        Returns:
+            asyncio.Queue receiving the task's event dictionaries
+        """
+        self.start()
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self.subscribers[task_id].add(queue)
+        return queue
+
+    def unsubscribe(self, task_id: str, queue: asyncio.Queue):
+        """Remove a queue registered with subscribe()."""
+        queues = self.subscribers.get(task_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[task_id]
+
+    def _dispatch(self, channel: str, data: str):
+        task_id = channel.split(":", 1)[1]
+        queues = self.subscribers.get(task_id)
+        if not queues:
+            return
+        event = json.loads(data)
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                if not self.redis_manager.connected:
+                    await self.redis_manager.connect()
+                pubsub = self.redis_manager.client.pubsub()
+                await pubsub.psubscribe(self._pattern)
+                logger.info(f"Subscribed to task progress ({self._pattern})")
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task progress subscription failed: {e}")
+                logger.debug(traceback.format_exc())
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                if pubsub is not None:
+                    await pubsub.aclose()
+
+
+# Global progress broker instance (created on first use)
+progress_broker: Optional[ProgressBroker] = None
+
+
+async def get_progress_broker() -> ProgressBroker:
+    """
+    Get the global progress broker on the global Redis manager.
+
+    Returns:
+        ProgressBroker: Broker with its subscription started
+    """
+    global progress_broker
+    if progress_broker is None:
+        progress_broker = ProgressBroker(await get_redis_manager())
+    progress_broker.start()
+    return progress_broker
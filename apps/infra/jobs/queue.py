@@ -0,0 +1,578 @@
+"""
+Redis Job Queue
+
+Durable job queue for ETL work, built on the shared RedisManager.
+
+Architecture:
+- pending (ZSET): Jobs ready to run, scored by priority then enqueue time
+- leased (ZSET): Jobs held by a worker, scored by lease deadline
+- delayed (ZSET): Failed jobs waiting for their retry backoff, scored by ready time
+- job records: One JSON document per job with status, attempts and result
+
+Semantics:
+- Enqueueing, leasing and settling are atomic (Lua scripts), so any number of
+  worker processes can share a queue
+- Each lease carries a token; complete, fail and extend only act while the
+  caller still holds the lease, so a worker whose lease expired cannot settle
+  a job another worker has picked up
+- A lease is a visibility timeout: if the worker does not complete or extend it
+  in time, the job becomes visible again and another worker picks it up
+- Failed jobs retry with exponential backoff until max_attempts, then go to the
+  dead-letter list
+- Optional dedupe keys make enqueue idempotent while a job is unfinished, or
+  only while it is pending (dedupe_pending_only), for jobs that must run again
+  when asked to during a run
+"""
+
+import json
+import time
+import traceback
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config.logging_config import get_logger
+from config.redis_config import RedisManager, get_redis_manager
+from jobs.progress import publish_progress
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Job priorities (lower runs first)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10
+
+# Job statuses
+STATUS_QUEUED = "queued"
+STATUS_LEASED = "leased"
+STATUS_RETRYING = "retrying"
+STATUS_COMPLETED = "completed"
+STATUS_DEAD = "dead"
+
+# Priority band width in the pending score; wider than any millisecond timestamp
+_PRIORITY_BAND = 10**13
+
+# Claim the dedupe key (if any), store the job record and make it pending in one
+# step, so a failed enqueue never leaves a dedupe key pointing at a missing job.
+# KEYS: dedupe, job, scores, pending  ARGV: job_id, record, ttl_s, score, use_dedupe
+_ENQUEUE_SCRIPT = """
+if ARGV[5] == '1' then
+    if not redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[3]) then
+        return redis.call('GET', KEYS[1])
+    end
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[4])
+redis.call('ZADD', KEYS[4], ARGV[4], ARGV[1])
+return ARGV[1]
+"""
+
+# Move due delayed jobs and expired leases back to pending, then lease the first one.
+# KEYS: pending, leased, delayed, scores, leases  ARGV: now_ms, lease_deadline_ms, token
+_LEASE_SCRIPT = """
+local function requeue(source, now)
+    local ids = redis.call('ZRANGEBYSCORE', source, '-inf', now)
+    for _, id in ipairs(ids) do
+        redis.call('ZREM', source, id)
+        local score = redis.call('HGET', KEYS[4], id)
+        if score then
+            redis.call('ZADD', KEYS[1], score, id)
+        end
+    end
+    return #ids
+end
+
+local expired = requeue(KEYS[2], ARGV[1])
+requeue(KEYS[3], ARGV[1])
+
+local popped = redis.call('ZPOPMIN', KEYS[1])
+if #popped == 0 then
+    return {false, expired}
+end
+redis.call('ZADD', KEYS[2], ARGV[2], popped[1])
+redis.call('HSET', KEYS[5], popped[1], ARGV[3])
+return {popped[1], expired}
+"""
+
+# Checks that a job is still leased under the caller's lease token.
+_HOLDS_LEASE = """
+local function holds_lease(leased, leases, id, token)
+    return redis.call('ZSCORE', leased, id) and redis.call('HGET', leases, id) == token
+end
+"""
+
+# Push a lease deadline out if the caller still holds the lease.
+# KEYS: leased, leases  ARGV: job_id, token, deadline_ms
+_EXTEND_SCRIPT = _HOLDS_LEASE + """
+if not holds_lease(KEYS[1], KEYS[2], ARGV[1], ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+# Release a dedupe key if it still points at the job.
+# KEYS: dedupe  ARGV: job_id
+_RELEASE_DEDUPE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+return 0
+"""
+
+# Complete, retry or dead-letter a job if the caller still holds the lease.
+# KEYS: leased, leases, job, pending, delayed, scores, dedupe, dead
+# ARGV: job_id, token, record, ttl_s, action, retry_at_ms, dead_limit
+_SETTLE_SCRIPT = _HOLDS_LEASE + """
+if not holds_lease(KEYS[1], KEYS[2], ARGV[1], ARGV[2]) then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('SET', KEYS[3], ARGV[3], 'EX', ARGV[4])
+if ARGV[5] == 'retry' then
+    redis.call('ZADD', KEYS[5], ARGV[6], ARGV[1])
+    return 1
+end
+redis.call('ZREM', KEYS[4], ARGV[1])
+redis.call('ZREM', KEYS[5], ARGV[1])
+redis.call('HDEL', KEYS[6], ARGV[1])
+if redis.call('GET', KEYS[7]) == ARGV[1] then
+    redis.call('DEL', KEYS[7])
+end
+if ARGV[5] == 'dead' then
+    redis.call('LPUSH', KEYS[8], ARGV[1])
+    redis.call('LTRIM', KEYS[8], 0, tonumber(ARGV[7]) - 1)
+end
+return 1
+"""
+
+
+@dataclass
+class Job:
+    """A queued unit of ETL work."""
+
+    job_id: str
+    job_type: str
+    payload: Dict[str, Any]
+    priority: int = PRIORITY_NORMAL
+    max_attempts: int = 3
+    attempts: int = 0
+    status: str = STATUS_QUEUED
+    dedupe_key: Optional[str] = None
+    dedupe_pending_only: bool = False
+    worker_id: Optional[str] = None
+    lease_token: Optional[str] = None
+    last_error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+class JobQueue:
+    """
+    Redis-backed job queue with leasing, retries, priorities and visibility timeouts.
+
+    All state lives in Redis, so API processes enqueue and any number of worker
+    processes on any node lease from the same queue.
+    """
+
+    # Configuration constants
+    DEFAULT_VISIBILITY_TIMEOUT = 300  # Seconds a lease lasts without extension
+    RETRY_BASE_DELAY = 5  # Seconds before the first retry, doubled per attempt
+    RETRY_MAX_DELAY = 600  # Cap on the retry backoff
+    JOB_TTL = 7 * 86400  # Keep job records for a week
+    DEAD_LETTER_LIMIT = 1000  # Dead jobs kept for inspection
+
+    def __init__(self, redis_manager: RedisManager, name: str = "etl"):
+        """
+        Initialize the queue.
+
+        Args:
+            redis_manager: Redis manager used for all queue state
+            name: Queue name; queues with different names are independent
+        """
+        self.redis_manager = redis_manager
+        self.name = name
+        self.pending_key = f"jobs:{name}:pending"
+        self.leased_key = f"jobs:{name}:leased"
+        self.delayed_key = f"jobs:{name}:delayed"
+        self.scores_key = f"jobs:{name}:scores"
+        self.dead_key = f"jobs:{name}:dead"
+        self.leases_key = f"jobs:{name}:leases"
+        self._scripts = {}
+
+    def _job_key(self, job_id: str) -> str:
+        return f"jobs:{self.name}:job:{job_id}"
+
+    def _dedupe_key(self, dedupe_key: str) -> str:
+        return f"jobs:{self.name}:dedupe:{dedupe_key}"
+
+    async def _client(self):
+        if not self.redis_manager.connected:
+            await self.redis_manager.connect()
+        return self.redis_manager.client
+
+    async def _run_script(self, source: str, keys, args):
+        client = await self._client()
+        if source not in self._scripts:
+            self._scripts[source] = client.register_script(source)
+        return await self._scripts[source](keys=keys, args=args)
+
+    def _record(self, job: Job) -> str:
+        job.updated_at = datetime.now().isoformat()
+        return json.dumps(asdict(job), default=str)
+
+    async def _save(self, job: Job):
+        job.updated_at = datetime.now().isoformat()
+        await self.redis_manager.set_json(
+            self._job_key(job.job_id), asdict(job), ex=self.JOB_TTL
+        )
+        await self._publish(job)
+
+    async def _publish(self, job: Job):
+        await publish_progress(
+            self.redis_manager,
+            job.job_id,
+            "job",
+            job_type=job.job_type,
+            status=job.status,
+            attempts=job.attempts,
+            worker_id=job.worker_id,
+            last_error=job.last_error,
+            result=job.result,
+        )
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        priority: int = PRIORITY_NORMAL,
+        max_attempts: int = 3,
+        job_id: Optional[str] = None,
+        dedupe_key: Optional[str] = None,
+        dedupe_pending_only: bool = False,
+    ) -> Optional[str]:
+        """
+        Add a job to the queue.
+
+        Args:
+            job_type: Handler name the worker dispatches on
+            payload: JSON-serializable job arguments
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+            max_attempts: Attempts before the job is dead-lettered
+            job_id: Job identifier (generated if not given)
+            dedupe_key: If set, return the unfinished job with the same key
+                instead of enqueueing a duplicate
+            dedupe_pending_only: Release the dedupe key when the job is leased,
+                so enqueues made while it runs queue a new job instead of being
+                absorbed by one that may have already read its inputs
+
+        Returns:
+            Job ID (existing one for a deduplicated enqueue), or None on error
+        """
+        try:
+            job = Job(
+                job_id=job_id or str(uuid.uuid4()),
+                job_type=job_type,
+                payload=payload,
+                priority=priority,
+                max_attempts=max_attempts,
+                dedupe_key=dedupe_key,
+                dedupe_pending_only=dedupe_pending_only,
+            )
+
+            score = priority * _PRIORITY_BAND + int(time.time() * 1000)
+            queued_id = await self._run_script(
+                _ENQUEUE_SCRIPT,
+                keys=[
+                    self._dedupe_key(dedupe_key or ""),
+                    self._job_key(job.job_id),
+                    self.scores_key,
+                    self.pending_key,
+                ],
+                args=[
+                    job.job_id,
+                    self._record(job),
+                    self.JOB_TTL,
+                    score,
+                    1 if dedupe_key else 0,
+                ],
+            )
+            if queued_id != job.job_id:
+                logger.info(
+                    f"Job for {dedupe_key} already queued as {queued_id}, not enqueueing"
+                )
+                return queued_id
+
+            await self._publish(job)
+
+            logger.info(
+                f"Enqueued {job_type} job {job.job_id} with priority {priority}"
+            )
+            return job.job_id
+
+        except Exception as e:
+            logger.error(f"Error enqueueing {job_type} job: {e}")
+            logger.debug(traceback.format_exc())
+            return None
+
+    async def lease(
+        self, worker_id: str, visibility_timeout: Optional[int] = None
+    ) -> Optional[Job]:
+        """
+        Lease the highest-priority ready job.
+
+        Expired leases and due retries are made visible again first.
+
+        Args:
+            worker_id: Identifier of the leasing worker
+            visibility_timeout: Seconds until the lease expires
+
+        Returns:
+            Leased Job, or None if nothing is ready
+        """
+        try:
+            timeout = visibility_timeout or self.DEFAULT_VISIBILITY_TIMEOUT
+            now_ms = int(time.time() * 1000)
+            token = str(uuid.uuid4())
+            job_id, expired = await self._run_script(
+                _LEASE_SCRIPT,
+                keys=[
+                    self.pending_key,
+                    self.leased_key,
+                    self.delayed_key,
+                    self.scores_key,
+                    self.leases_key,
+                ],
+                args=[now_ms, now_ms + timeout * 1000, token],
+            )
+            if expired:
+                logger.warning(f"Requeued {expired} jobs with expired leases")
+            if not job_id:
+                return None
+
+            data = await self.redis_manager.get_json(self._job_key(job_id))
+            if not data:
+                # Record expired or was removed; drop the orphaned id
+                logger.warning(f"Job {job_id} has no record, discarding")
+                await self._remove(job_id)
+                return None
+
+            job = Job(**data)
+            job.lease_token = token
+            if job.attempts >= job.max_attempts:
+                # Leases kept expiring (e.g. the worker crashed every time)
+                await self._dead_letter(job, job.last_error or "Lease expired")
+                return None
+
+            job.attempts += 1
+            job.status = STATUS_LEASED
+            job.worker_id = worker_id
+            await self._save(job)
+            if job.dedupe_key and job.dedupe_pending_only:
+                await self._run_script(
+                    _RELEASE_DEDUPE_SCRIPT,
+                    keys=[self._dedupe_key(job.dedupe_key)],
+                    args=[job.job_id],
+                )
+            return job
+
+        except Exception as e:
+            logger.error(f"Error leasing job from {self.name}: {e}")
+            logger.debug(traceback.format_exc())
+            return None
+
+    async def extend_lease(self, job: Job, visibility_timeout: int) -> bool:
+        """
+        Push a lease deadline out while the job is still being worked on.
+
+        Args:
+            job: Leased job
+            visibility_timeout: Seconds from now until the lease expires
+
+        Returns:
+            bool: True if the lease is still held and was extended
+        """
+        try:
+            deadline = int(time.time() * 1000) + visibility_timeout * 1000
+            # A lost lease must not be revived, even if the job was leased again
+            updated = await self._run_script(
+                _EXTEND_SCRIPT,
+                keys=[self.leased_key, self.leases_key],
+                args=[job.job_id, job.lease_token or "", deadline],
+            )
+            return bool(updated)
+        except Exception as e:
+            logger.error(f"Error extending lease for job {job.job_id}: {e}")
+            return False
+
+    async def _remove(self, job_id: str):
+        client = await self._client()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.leased_key, job_id)
+            pipe.zrem(self.pending_key, job_id)
+            pipe.zrem(self.delayed_key, job_id)
+            pipe.hdel(self.scores_key, job_id)
+            pipe.hdel(self.leases_key, job_id)
+            await pipe.execute()
+
+    async def _settle(self, job: Job, action: str, retry_at_ms: int = 0) -> bool:
+        """
+        Store a settled job record and move the job out of the lease atomically.
+
+        Returns:
+            bool: False if the caller no longer holds the lease
+        """
+        settled = await self._run_script(
+            _SETTLE_SCRIPT,
+            keys=[
+                self.leased_key,
+                self.leases_key,
+                self._job_key(job.job_id),
+                self.pending_key,
+                self.delayed_key,
+                self.scores_key,
+                self._dedupe_key(job.dedupe_key or ""),
+                self.dead_key,
+            ],
+            args=[
+                job.job_id,
+                job.lease_token or "",
+                self._record(job),
+                self.JOB_TTL,
+                action,
+                retry_at_ms,
+                self.DEAD_LETTER_LIMIT,
+            ],
+        )
+        if not settled:
+            logger.warning(
+                f"Job {job.job_id} ({job.job_type}) is no longer leased by "
+                f"{job.worker_id}, not marking it {job.status}"
+            )
+            return False
+        await self._publish(job)
+        return True
+
+    async def _dead_letter(self, job: Job, error: str) -> bool:
+        job.status = STATUS_DEAD
+        job.last_error = error
+        if not await self._settle(job, "dead"):
+            return False
+        logger.error(
+            f"Job {job.job_id} ({job.job_type}) dead-lettered after "
+            f"{job.attempts} attempts: {error}"
+        )
+        return True
+
+    async def complete(self, job: Job, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Mark a leased job as done.
+
+        Args:
+            job: Leased job
+            result: JSON-serializable result stored on the job record
+
+        Returns:
+            bool: True if successful, False if the lease was lost
+        """
+        try:
+            job.status = STATUS_COMPLETED
+            job.result = result
+            return await self._settle(job, "complete")
+        except Exception as e:
+            logger.error(f"Error completing job {job.job_id}: {e}")
+            logger.debug(traceback.format_exc())
+            return False
+
+    async def fail(self, job: Job, error: str) -> bool:
+        """
+        Record a failed attempt and schedule a retry or dead-letter the job.
+
+        Args:
+            job: Leased job
+            error: Error message of the failed attempt
+
+        Returns:
+            bool: True if the job will be retried, False if it was dead-lettered
+                or the lease was lost
+        """
+        try:
+            if job.attempts >= job.max_attempts:
+                await self._dead_letter(job, error)
+                return False
+
+            delay = min(
+                self.RETRY_BASE_DELAY * (2 ** (job.attempts - 1)), self.RETRY_MAX_DELAY
+            )
+            job.status = STATUS_RETRYING
+            job.last_error = error
+            retry_at_ms = int((time.time() + delay) * 1000)
+            if not await self._settle(job, "retry", retry_at_ms):
+                return False
+
+            logger.warning(
+                f"Job {job.job_id} ({job.job_type}) attempt {job.attempts}/"
+                f"{job.max_attempts} failed, retrying in {delay}s: {error}"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error failing job {job.job_id}: {e}")
+            logger.debug(traceback.format_exc())
+            return False
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job record.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Job, or None if not found
+        """
+        data = await self.redis_manager.get_json(self._job_key(job_id))
+        return Job(**data) if data else None
+
+    async def stats(self) -> Dict[str, int]:
+        """
+        Get queue depth by state.
+
+        Returns:
+            Dictionary with pending, leased, delayed and dead job counts
+        """
+        try:
+            client = await self._client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.zcard(self.pending_key)
+                pipe.zcard(self.leased_key)
+                pipe.zcard(self.delayed_key)
+                pipe.llen(self.dead_key)
+                pending, leased, delayed, dead = await pipe.execute()
+            return {
+                "pending": pending,
+                "leased": leased,
+                "delayed": delayed,
+                "dead": dead,
+            }
+        except Exception as e:
+            logger.error(f"Error reading stats for queue {self.name}: {e}")
+            return {}
+
+
+async def get_job_queue(name: str = "etl") -> JobQueue:
+    """
+    Get a job queue on the global Redis manager.
+
+    Args:
+        name: Queue name
+
+    Returns:
+        JobQueue: Queue backed by the connected Redis manager
+    """
+    return JobQueue(await get_redis_manager(), name)
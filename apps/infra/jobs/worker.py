@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+ETL Job Worker
+
+Standalone worker that leases jobs from the Redis job queue and runs them:
+1. Leases up to --concurrency jobs at a time per process
+2. Extends each lease while its job runs, so long syncs are not re-delivered;
+   a job whose lease is lost is cancelled and left to its new holder
+3. Completes, retries or dead-letters jobs based on the handler outcome
+4. Periodically dispatches backfill units, reclaiming units of lost jobs
+5. Drains running jobs on SIGINT/SIGTERM before exiting
+
+Run several processes per node with --processes; add nodes to scale ingest.
+
+Usage:
+    python -m jobs.worker [--processes N] [--concurrency N] [--queue NAME]
+                          [--visibility-timeout SECONDS] [--poll-interval SECONDS]
+
+Example:
+    python -m jobs.worker --processes 4 --concurrency 2
+
+Requirements:
+- Redis reachable at REDIS_URL
+- AWS credentials configured
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import traceback
+from typing import Dict, Optional, Set
+
+# Add parent directory to path when script is run directly
+if __name__ == "__main__":
+    parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    sys.path.insert(0, parent_dir)
+
+from config.aws_config import initialize_catalog
+from config.logging_config import get_logger
+from config.redis_config import redis_manager
+from db.writer import iceberg_writer
+from dotenv import load_dotenv
+from jobs.backfill import BackfillScheduler, run_backfill_dispatch_loop
+from jobs.handlers import JOB_HANDLERS
+from jobs.queue import Job, JobQueue
+from pipelines.standardized.decoded_calls import shutdown_decode_pool
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+
+class JobWorker:
+    """
+    Leases and runs jobs from one queue.
+
+    Each process runs one JobWorker; concurrency bounds how many jobs the
+    process runs at once.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        catalog,
+        handlers: Dict = None,
+        concurrency: int = 1,
+        visibility_timeout: int = JobQueue.DEFAULT_VISIBILITY_TIMEOUT,
+        poll_interval: float = 1.0,
+        worker_id: Optional[str] = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            queue: Job queue to lease from
+            catalog: Iceberg catalog passed to handlers
+            handlers: Handler per job type (default: JOB_HANDLERS)
+            concurrency: Maximum jobs running at once
+            visibility_timeout: Lease length in seconds, extended while a job runs
+            poll_interval: Seconds to wait when the queue is empty
+            worker_id: Worker identifier recorded on leased jobs
+        """
+        self.queue = queue
+        self.catalog = catalog
+        self.handlers = handlers if handlers is not None else JOB_HANDLERS
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.running: Set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop leasing new jobs; running jobs are allowed to finish."""
+        if not self._stopping.is_set():
+            logger.info(f"Worker {self.worker_id}: stopping, draining running jobs")
+        self._stopping.set()
+
+    async def _extend_lease(self, job: Job):
+        """Extend the lease while the job runs; returns once the lease is lost."""
+        # Extend well before the deadline so one slow round trip doesn't lose the lease
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            if not await self.queue.extend_lease(job, self.visibility_timeout):
+                logger.warning(
+                    f"Worker {self.worker_id}: lost lease on job {job.job_id}"
+                )
+                return
+
+    async def _execute(self, job: Job):
+        handler = self.handlers.get(job.job_type)
+        if handler is None:
+            await self.queue.fail(job, f"Unknown job type: {job.job_type}")
+            return
+
+        logger.info(
+            f"Worker {self.worker_id}: running {job.job_type} job {job.job_id} "
+            f"(attempt {job.attempts}/{job.max_attempts})"
+        )
+        work = asyncio.create_task(handler(self.catalog, job))
+        heartbeat = asyncio.create_task(self._extend_lease(job))
+        try:
+            await asyncio.wait({work, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if not work.done():
+                # The job may already be running elsewhere; stop our copy and
+                # leave settling it to the worker that holds the lease
+                work.cancel()
+                await asyncio.gather(work, return_exceptions=True)
+                logger.warning(
+                    f"Worker {self.worker_id}: cancelled job {job.job_id} "
+                    f"after losing its lease"
+                )
+                return
+
+            result = work.result()
+            await self.queue.complete(job, result)
+            logger.info(f"Worker {self.worker_id}: job {job.job_id} completed")
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id}: job {job.job_id} failed: {e}")
+            logger.debug(traceback.format_exc())
+            await self.queue.fail(job, str(e))
+        finally:
+            heartbeat.cancel()
+            if not work.done():
+                work.cancel()
+
+    async def run(self):
+        """Lease and run jobs until stop() is called, then drain."""
+        logger.info(
+            f"Worker {self.worker_id}: started on queue {self.queue.name} "
+            f"(concurrency {self.concurrency})"
+        )
+        while not self._stopping.is_set():
+            if len(self.running) >= self.concurrency:
+                await asyncio.wait(self.running, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            job = await self.queue.lease(self.worker_id, self.visibility_timeout)
+            if job is None:
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=self.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._execute(job))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+        if self.running:
+            await asyncio.gather(*self.running, return_exceptions=True)
+        logger.info(f"Worker {self.worker_id}: stopped")
+
+
+async def run_worker(args):
+    """Connect to Redis and the catalog, then run a worker until signalled."""
+    if not await redis_manager.connect():
+        logger.error("Redis is required for the job queue")
+        return 1
+
+    catalog = initialize_catalog(
+        os.getenv("ICEBERG_CATALOG", "s3tablescatalog"),
+        os.getenv("ICEBERG_BUCKET", "suite"),
+        os.getenv("AWS_DEFAULT_REGION", "ap-southeast-1"),
+    )
+    if not catalog:
+        logger.error("Failed to initialize Iceberg catalog")
+        await redis_manager.disconnect()
+        return 1
+
+    await iceberg_writer.start()
+    queue = JobQueue(redis_manager, args.queue)
+    backfill_dispatcher = asyncio.create_task(
+        run_backfill_dispatch_loop(BackfillScheduler(redis_manager, queue))
+    )
+    worker = JobWorker(
+        queue,
+        catalog,
+        concurrency=args.concurrency,
+        visibility_timeout=args.visibility_timeout,
+        poll_interval=args.poll_interval,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        backfill_dispatcher.cancel()
+        shutdown_decode_pool()
+        await iceberg_writer.stop()
+        await redis_manager.disconnect()
+    return 0
+
+
+def _worker_process(args):
+    sys.exit(asyncio.run(run_worker(args)))
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run ETL job queue workers")
+
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(os.getenv("ETL_WORKER_PROCESSES", "1")),
+        help="Worker processes to run on this node (default: 1)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("ETL_WORKER_CONCURRENCY", "1")),
+        help="Jobs run at once per process (default: 1)",
+    )
+    parser.add_argument(
+        "--queue", default="etl", help="Queue name to lease from (default: etl)"
+    )
+    parser.add_argument(
+        "--visibility-timeout",
+        type=int,
+        default=JobQueue.DEFAULT_VISIBILITY_TIMEOUT,
+        help="Lease length in seconds before an unacknowledged job is re-delivered "
+        f"(default: {JobQueue.DEFAULT_VISIBILITY_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds to wait when the queue is empty (default: 1.0)",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Run one worker inline, or spawn --processes worker processes."""
+    args = parse_arguments()
+    if args.processes <= 1:
+        sys.exit(asyncio.run(run_worker(args)))
+
+    logger.info(f"Starting {args.processes} worker processes")
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_process, args=(args,), name=f"etl-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+
+    for process in processes:
+        process.join()
+    sys.exit(max(process.exitcode or 0 for process in processes))
+
+
+if __name__ == "__main__":
+    main()
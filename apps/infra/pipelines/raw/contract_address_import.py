@@ -11,14 +11,21 @@ Architecture:
   * _initialize_tables(): Setup and validation of Iceberg tables
   * _get_cursor_info(): Retrieve cursor information for logging
   * _fetch_transaction_batches(): Core batch fetching with early stopping
-  * _store_transactions(): Safe transaction storage in Iceberg
+  * _fetch_transaction_windows(): Concurrent descending block windows, consumed
+    newest first so early stopping still keeps the most recent users
+  * _store_transactions(): Safe transaction storage in Iceberg (low priority on
+    the Iceberg writer, so persistence never blocks the event loop)
   * _update_import_cursor(): Cursor updates with proper block range handling
+  * _index_transactions(): Record fetched users in the Redis user index
+  * _report_progress(): Publish fetch progress for live task streams
   * import_addresses(): Main orchestration method
+  * refresh_addresses(): Incremental refresh of an expired cached result
 
 Configuration:
 - BATCH_SIZE: Transactions per API batch (default: 1000)
 - MAX_BATCHES: Maximum batches to prevent infinite loops (default: 50)
 - RATE_LIMIT_DELAY: Delay between API calls in seconds (default: 0.2)
+- SEARCH_WINDOWS: Block windows fetched concurrently (default: 4, 1 = sequential)
 - MIN_BLOCK_THRESHOLD: Stop if reaching early blockchain blocks (default: 1)
 
 Features:
@@ -26,13 +33,21 @@ Features:
 - Early stopping when user limit is reached
 - Descending order processing (most recent transactions first)
 - Comprehensive error handling and logging
-- Redis caching with configurable TTL
+- Redis caching with configurable TTL; expired results are kept for
+  STALE_RESULT_TTL and refreshed with only the blocks after their end_block
+- Durable copy of every result in standardized.contract_users, read when Redis
+  misses (Redis → table → Etherscan)
+- Per-contract Redis user index (recency ZSET + HyperLogLog) answers imports
+  without Etherscan when it covers enough users; only older history is fetched
 - Incremental cursor updates for proper block range tracking
 """
 
 import asyncio
+import os
+import time
+from collections import deque
 from typing import List, Dict, Set, Optional, Tuple
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 
 import aiohttp
@@ -40,13 +55,66 @@ from config.logging_config import get_logger
 from config.redis_config import RedisManager, generate_unique_addresses_key
 from pipelines.raw.cursor import get_cursor, update_cursor
 from pipelines.raw.transactions import load_transactions_with_safety
-from providers.etherscan import EtherscanProvider, FetchMode
+from pipelines.raw.user_index import ContractUserIndex
+from pipelines.standardized.contract_users import (
+    get_contract_users,
+    save_contract_users,
+)
+from providers.etherscan import EtherscanProvider, FetchInterruptedError, FetchMode
 from db.iceberg import load_table, reorder_records
+from db.writer import PRIORITY_HIGH, PRIORITY_LOW, iceberg_writer
+from jobs.progress import publish_progress
 from utils.blockchain import extract_block_range
 
 logger = get_logger(__name__)
 
 
+def discover_addresses(
+    transactions: List[Dict],
+    exclude_address: str,
+    known: Set[str],
+    limit: int,
+) -> Tuple[List[str], int]:
+    """
+    Find new addresses in a batch, stopping as soon as the limit is reached.
+
+    Each row's from and to addresses are lowercased and checked against the
+    known set in place, without building a per-row set or copying the known
+    addresses, so the cost only grows with the rows scanned and a small limit
+    reached in the first rows exits early.
+
+    Args:
+        transactions: Transactions in processing order (newest first)
+        exclude_address: Lowercase address to skip (the contract itself)
+        known: Addresses already collected
+        limit: Maximum number of new addresses to return
+
+    Returns:
+        Tuple of (new addresses in first-seen order, transactions consumed).
+        When the limit is hit, the consumed count stops at the transaction
+        holding the last returned address.
+    """
+    new_addresses: List[str] = []
+    if limit <= 0:
+        return new_addresses, 0
+
+    # Addresses returned so far join the excluded ones, so each is kept once
+    skip = {exclude_address, ""}
+    for row, tx in enumerate(transactions):
+        for address in (tx.get("from"), tx.get("to")):
+            if not address:
+                continue
+            address = address.lower()
+            if address in skip or address in known:
+                continue
+            skip.add(address)
+            new_addresses.append(address)
+            if len(new_addresses) == limit:
+                return new_addresses, row + 1
+
+    return new_addresses, len(transactions)
+
+
 @dataclass
 class ContractAddressImportResult:
     """Result data class for contract address import."""
@@ -75,15 +143,23 @@ class ContractAddressImporter:
     MAX_BATCHES = 50  # Maximum batches to prevent infinite loops
     RATE_LIMIT_DELAY = 0.2  # Delay between API calls in seconds
     MIN_BLOCK_THRESHOLD = 1  # Stop if we reach this early in blockchain history
+    # Block windows in flight at once (1 = sequential paging)
+    SEARCH_WINDOWS = int(os.getenv("ADDRESS_IMPORT_WINDOWS", "4"))
+    MAX_WINDOW_GROWTH = 8  # Max factor a window grows by over the previous one
+    STALE_RESULT_TTL = 7 * 86400  # Expired results kept for incremental refresh
 
     def __init__(
         self, redis_manager: RedisManager, etherscan_provider: EtherscanProvider
     ):
         self.redis = redis_manager
         self.etherscan = etherscan_provider
+        self.user_index = ContractUserIndex(redis_manager)
         self.unique_addresses: Set[str] = set()
         self.processed_blocks = 0
         self.processed_transactions = 0
+        self._pages_fetched = 0
+        self._request_lock = asyncio.Lock()
+        self._last_request_at = 0.0
 
     def extract_addresses_from_transactions(self, transactions: List[Dict]) -> Set[str]:
         """
@@ -128,33 +204,27 @@ class ContractAddressImporter:
         if not transactions:
             return False
 
-        # Transactions are already in descending order from the API call
-
-        contract_addr_lower = contract_address.lower()
-
-        for tx in transactions:
-            self.processed_transactions += 1
-
-            # Extract addresses from this transaction
-            tx_addresses = self.extract_addresses_from_transactions([tx])
-
-            # Remove contract address from the set (we want users, not the contract)
-            tx_addresses.discard(contract_addr_lower)
-
-            # Add new addresses to our unique set
-            new_addresses = tx_addresses - self.unique_addresses
-            self.unique_addresses.update(new_addresses)
+        # Transactions are already in descending order from the API call,
+        # so the first addresses found are the most recent users
+        new_addresses, consumed = discover_addresses(
+            transactions,
+            contract_address.lower(),
+            self.unique_addresses,
+            user_limit - len(self.unique_addresses),
+        )
+        self.unique_addresses.update(new_addresses)
+        self.processed_transactions += consumed
 
-            if len(new_addresses) > 0:
-                logger.debug(
-                    f"Block {tx.get('block_number')}: Found {len(new_addresses)} new addresses. "
-                    f"Total unique: {len(self.unique_addresses)}"
-                )
+        if new_addresses:
+            logger.debug(
+                f"Found {len(new_addresses)} new addresses in {consumed} transactions. "
+                f"Total unique: {len(self.unique_addresses)}"
+            )
 
-            # Check if we've reached the limit
-            if len(self.unique_addresses) >= user_limit:
-                logger.info(f"Reached user limit of {user_limit} unique addresses")
-                return True
+        # Check if we've reached the limit
+        if len(self.unique_addresses) >= user_limit:
+            logger.info(f"Reached user limit of {user_limit} unique addresses")
+            return True
 
         return False
 
@@ -175,8 +245,12 @@ class ContractAddressImporter:
             return None, None
 
         try:
-            transactions_table = load_table(catalog, "raw", "transactions")
-            cursor_table = load_table(catalog, "raw", "cursor")
+            transactions_table = await iceberg_writer.run(
+                load_table, catalog, "raw", "transactions", priority=PRIORITY_HIGH
+            )
+            cursor_table = await iceberg_writer.run(
+                load_table, catalog, "raw", "cursor", priority=PRIORITY_HIGH
+            )
 
             if not transactions_table or not cursor_table:
                 logger.error(f"Task {task_id}: Failed to load tables")
@@ -206,7 +280,13 @@ class ContractAddressImporter:
             return None
 
         try:
-            cursor_data = get_cursor(cursor_table, chain_id, contract_address)
+            cursor_data = await iceberg_writer.run(
+                get_cursor,
+                cursor_table,
+                chain_id,
+                contract_address,
+                priority=PRIORITY_HIGH,
+            )
             if cursor_data:
                 _, end_block = cursor_data
                 last_processed_block = int(end_block)
@@ -220,7 +300,349 @@ class ContractAddressImporter:
         return None
 
     async def _fetch_transaction_batches(
-        self, contract_address: str, chain_id: int, user_limit: int, task_id: str
+        self,
+        contract_address: str,
+        chain_id: int,
+        user_limit: int,
+        task_id: str,
+        before_block: Optional[int] = None,
+        after_block: Optional[int] = None,
+    ) -> Tuple[List[Dict], Optional[int], Optional[int], bool]:
+        """
+        Fetch transactions newest first until the user limit is reached.
+
+        Uses concurrent block windows when SEARCH_WINDOWS > 1, otherwise pages
+        sequentially.
+
+        Args:
+            contract_address: Contract address to fetch transactions for
+            chain_id: Blockchain chain ID
+            user_limit: Maximum number of unique addresses to collect
+            task_id: Task identifier for logging
+            before_block: Highest block to fetch (default: latest)
+            after_block: Stop above this block (default: search to genesis)
+
+        Returns:
+            Tuple of (all_transactions, highest_block, lowest_block, limit_reached)
+        """
+        if self.SEARCH_WINDOWS > 1:
+            return await self._fetch_transaction_windows(
+                contract_address,
+                chain_id,
+                user_limit,
+                task_id,
+                before_block,
+                after_block,
+            )
+        return await self._fetch_sequential_batches(
+            contract_address, chain_id, user_limit, task_id, before_block, after_block
+        )
+
+    async def _report_progress(
+        self,
+        task_id: Optional[str],
+        transactions_fetched: int,
+        searched_to_block: Optional[int],
+    ):
+        """
+        Publish fetch progress to the task's progress channel.
+
+        Args:
+            task_id: Task identifier (None skips publishing)
+            transactions_fetched: Transactions fetched so far
+            searched_to_block: Lowest block searched so far
+        """
+        await publish_progress(
+            self.redis,
+            task_id,
+            "progress",
+            phase="fetching",
+            pages_fetched=self._pages_fetched,
+            transactions_fetched=transactions_fetched,
+            addresses_found=len(self.unique_addresses),
+            searched_to_block=searched_to_block,
+        )
+
+    async def _throttle(self):
+        """Space request starts RATE_LIMIT_DELAY apart across concurrent windows."""
+        async with self._request_lock:
+            wait = self._last_request_at + self.RATE_LIMIT_DELAY - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_request_at = time.monotonic()
+
+    async def _fetch_window(
+        self,
+        session: aiohttp.ClientSession,
+        contract_address: str,
+        chain_id: int,
+        start_block: int,
+        end_block: int,
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Fetch every transaction in a block window, newest first.
+
+        Pages within the window until it is exhausted or the MAX_BATCHES page
+        budget shared by all windows runs out.
+
+        Args:
+            session: aiohttp session for making requests
+            contract_address: Contract address to fetch transactions for
+            chain_id: Blockchain chain ID
+            start_block: Lowest block of the window
+            end_block: Highest block of the window
+
+        Returns:
+            Tuple of (transactions in descending order, window fully fetched)
+        """
+        transactions = []
+        current_end = end_block
+
+        while True:
+            if self._pages_fetched >= self.MAX_BATCHES:
+                return transactions, False
+
+            await self._throttle()
+            self._pages_fetched += 1
+            batch = await self.etherscan.account.fetch_transaction_batch(
+                session=session,
+                address=contract_address,
+                chain_id=chain_id,
+                start_block=start_block,
+                end_block=str(current_end),
+                limit=self.BATCH_SIZE,
+                sort="desc",
+            )
+            transactions.extend(batch.transactions)
+
+            if batch.total_count < self.BATCH_SIZE:
+                return transactions, True
+
+            # A full page may have cut the oldest block short; re-read that block
+            # unless the whole page was one block (then move past it)
+            oldest_block = int(batch.transactions[-1]["block_number"])
+            current_end = (
+                oldest_block if oldest_block < current_end else oldest_block - 1
+            )
+            if current_end < start_block:
+                return transactions, True
+
+    async def _fetch_transaction_windows(
+        self,
+        contract_address: str,
+        chain_id: int,
+        user_limit: int,
+        task_id: str,
+        before_block: Optional[int] = None,
+        after_block: Optional[int] = None,
+    ) -> Tuple[List[Dict], Optional[int], Optional[int], bool]:
+        """
+        Search backwards from the latest block with concurrent block windows.
+
+        A probe page from the latest block (or before_block) measures how many blocks one page of
+        this contract's transactions spans. Windows of that size are then fetched
+        SEARCH_WINDOWS at a time below the probe, and consumed strictly newest
+        first, so the addresses collected are the most recent ones exactly as in
+        the sequential walk. Each consumed window re-sizes the next ones from the
+        transaction density it saw, so quiet stretches are covered in few pages.
+        Once the user limit is reached, outstanding windows are cancelled. A
+        window that fails is retried once; if it fails again, the outstanding
+        windows are cancelled and FetchInterruptedError is raised, so a
+        truncated search is never returned, cached or persisted as complete.
+
+        Args:
+            contract_address: Contract address to fetch transactions for
+            chain_id: Blockchain chain ID
+            user_limit: Maximum number of unique addresses to collect
+            task_id: Task identifier for logging
+            before_block: Highest block to search (default: latest)
+            after_block: Stop above this block (default: search to genesis)
+
+        Returns:
+            Tuple of (all_transactions, highest_block, lowest_block, limit_reached)
+
+        Raises:
+            FetchInterruptedError: If a block window fails twice; resume_block is
+                the highest block of the failed window
+        """
+        all_transactions = []
+        seen_hashes: Set[str] = set()
+        limit_reached = False
+        self._pages_fetched = 0
+        pending = deque()
+
+        def take_new(transactions: List[Dict]) -> List[Dict]:
+            # Window and page boundaries re-read a block; keep each tx once
+            new = [tx for tx in transactions if tx.get("hash") not in seen_hashes]
+            seen_hashes.update(tx.get("hash") for tx in new)
+            return new
+
+        search_end = "latest" if before_block is None else str(before_block)
+        search_floor = after_block + 1 if after_block is not None else 0
+        logger.info(
+            f"Task {task_id}: Starting windowed address import from block {search_end} "
+            f"backwards to find {user_limit} unique addresses "
+            f"({self.SEARCH_WINDOWS} concurrent windows)"
+        )
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                # Probe: the newest page, which also sizes the windows
+                await self._throttle()
+                self._pages_fetched += 1
+                probe = await self.etherscan.account.fetch_transaction_batch(
+                    session=session,
+                    address=contract_address,
+                    chain_id=chain_id,
+                    start_block=search_floor,
+                    end_block=search_end,
+                    limit=self.BATCH_SIZE,
+                    sort="desc",
+                )
+                transactions = take_new(probe.transactions)
+                all_transactions.extend(transactions)
+                limit_reached = await self.process_transaction_batch(
+                    transactions, user_limit, contract_address
+                )
+                await self._report_progress(
+                    task_id,
+                    len(all_transactions),
+                    (
+                        int(probe.transactions[-1]["block_number"])
+                        if probe.transactions
+                        else search_floor
+                    ),
+                )
+
+                if not limit_reached and probe.total_count >= self.BATCH_SIZE:
+                    newest_block = int(probe.transactions[0]["block_number"])
+                    oldest_block = int(probe.transactions[-1]["block_number"])
+                    window_size = max(newest_block - oldest_block + 1, 1)
+                    next_end = oldest_block
+                    searched_to_block = next_end + 1
+                    logger.info(
+                        f"Task {task_id}: One page spans ~{window_size} blocks, "
+                        f"searching below block {next_end}"
+                    )
+
+                    while True:
+                        # Keep SEARCH_WINDOWS windows in flight below the consumer
+                        while len(pending) < self.SEARCH_WINDOWS and next_end >= max(
+                            self.MIN_BLOCK_THRESHOLD, search_floor
+                        ):
+                            start_block = max(next_end - window_size + 1, search_floor)
+                            task = asyncio.create_task(
+                                self._fetch_window(
+                                    session,
+                                    contract_address,
+                                    chain_id,
+                                    start_block,
+                                    next_end,
+                                )
+                            )
+                            pending.append((task, start_block, next_end))
+                            next_end = start_block - 1
+
+                        if not pending:
+                            logger.info(
+                                f"Task {task_id}: Reached block {search_floor}, stopping"
+                            )
+                            break
+
+                        task, window_start, window_end = pending.popleft()
+                        span = window_end - window_start + 1
+                        try:
+                            window_transactions, complete = await task
+                        except Exception as e:
+                            logger.warning(
+                                f"Task {task_id}: Error in block window "
+                                f"{window_start}-{window_end}, retrying: {e}"
+                            )
+                            try:
+                                window_transactions, complete = (
+                                    await self._fetch_window(
+                                        session,
+                                        contract_address,
+                                        chain_id,
+                                        window_start,
+                                        window_end,
+                                    )
+                                )
+                            except Exception as retry_error:
+                                # A truncated search must not pass as a complete result
+                                raise FetchInterruptedError(
+                                    f"Block window {window_start}-{window_end} failed: "
+                                    f"{retry_error}",
+                                    resume_block=window_end,
+                                    fetched_count=len(all_transactions),
+                                ) from retry_error
+
+                        transactions = take_new(window_transactions)
+                        all_transactions.extend(transactions)
+                        limit_reached = await self.process_transaction_batch(
+                            transactions, user_limit, contract_address
+                        )
+
+                        # Windows are contiguous, so consumed ones end here
+                        searched_to_block -= span
+                        await self._report_progress(
+                            task_id, len(all_transactions), searched_to_block
+                        )
+                        logger.info(
+                            f"Task {task_id}: Window yielded {len(transactions)} transactions. "
+                            f"Unique addresses so far: {len(self.unique_addresses)}"
+                        )
+
+                        if limit_reached:
+                            logger.info(
+                                f"Task {task_id}: Reached user limit of {user_limit} addresses, "
+                                f"cancelling {len(pending)} outstanding windows"
+                            )
+                            break
+                        if not complete:
+                            # Later windows would leave a gap below this one
+                            logger.info(
+                                f"Task {task_id}: Page budget of {self.MAX_BATCHES} exhausted, stopping"
+                            )
+                            break
+                        # Size the next windows to about one page at the density
+                        # just seen, growing at most MAX_WINDOW_GROWTH times
+                        window_size = max(
+                            min(
+                                span
+                                * self.BATCH_SIZE
+                                // max(len(window_transactions), 1),
+                                span * self.MAX_WINDOW_GROWTH,
+                            ),
+                            1,
+                        )
+
+        except Exception as e:
+            logger.error(f"Task {task_id}: Error during windowed fetching: {e}")
+            raise
+        finally:
+            tasks = [task for task, _, _ in pending]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        lowest_block, highest_block = (
+            extract_block_range(all_transactions) if all_transactions else (None, None)
+        )
+        logger.info(
+            f"Task {task_id}: Windowed import fetched {len(all_transactions)} transactions "
+            f"in {self._pages_fetched} pages"
+        )
+        return all_transactions, highest_block, lowest_block, limit_reached
+
+    async def _fetch_sequential_batches(
+        self,
+        contract_address: str,
+        chain_id: int,
+        user_limit: int,
+        task_id: str,
+        before_block: Optional[int] = None,
+        after_block: Optional[int] = None,
     ) -> Tuple[List[Dict], Optional[int], Optional[int], bool]:
         """
         Fetch transaction batches with early stopping when user limit is reached.
@@ -230,6 +652,8 @@ class ContractAddressImporter:
             chain_id: Blockchain chain ID
             user_limit: Maximum number of unique addresses to collect
             task_id: Task identifier for logging
+            before_block: Highest block to fetch (default: latest)
+            after_block: Stop above this block (default: search to genesis)
 
         Returns:
             Tuple of (all_transactions, highest_block, lowest_block, limit_reached)
@@ -241,13 +665,16 @@ class ContractAddressImporter:
 
         # For address import operations, we always want to search from latest backwards
         # regardless of cursor state - the goal is to find unique addresses, not sync new data
-        current_end_block = "latest"
+        current_end_block = "latest" if before_block is None else str(before_block)
         current_start_block = (
-            0  # Always start from genesis for comprehensive address discovery
+            # Search to genesis for comprehensive address discovery, unless refreshing
+            after_block + 1
+            if after_block is not None
+            else 0
         )
 
         logger.info(
-            f"Task {task_id}: Starting address import from latest block backwards to find {user_limit} unique addresses"
+            f"Task {task_id}: Starting address import from block {current_end_block} backwards to find {user_limit} unique addresses"
         )
 
         batch_count = 0
@@ -291,6 +718,12 @@ class ContractAddressImporter:
                         # Store all transactions for database storage
                         all_transactions.extend(batch.transactions)
                         batch_count += 1
+                        self._pages_fetched = batch_count
+                        await self._report_progress(
+                            task_id,
+                            len(all_transactions),
+                            int(batch.transactions[-1]["block_number"]),
+                        )
 
                         # Update block range tracking
                         if batch.transactions:
@@ -420,13 +853,15 @@ class ContractAddressImporter:
                 # Check for existing data coverage
                 from pipelines.raw.cursor import check_for_data_overlap
 
-                has_overlap = check_for_data_overlap(
+                has_overlap = await iceberg_writer.run(
+                    check_for_data_overlap,
                     catalog,
                     "raw",
                     chain_id,
                     contract_address,
                     lowest_block,
                     highest_block,
+                    priority=PRIORITY_LOW,
                 )
 
                 if has_overlap:
@@ -455,8 +890,14 @@ class ContractAddressImporter:
                 schema = transactions_table.schema()
                 transactions_data = reorder_records(transactions, schema)
 
-                success = load_transactions_with_safety(
-                    catalog, "raw", chain_id, contract_address, transactions_data
+                success = await iceberg_writer.run(
+                    load_transactions_with_safety,
+                    catalog,
+                    "raw",
+                    chain_id,
+                    contract_address,
+                    transactions_data,
+                    priority=PRIORITY_LOW,
                 )
 
                 if success:
@@ -543,9 +984,13 @@ class ContractAddressImporter:
 
         try:
             # Check if this exact block range has already been processed
-            from pipelines.raw.cursor import get_cursor
-
-            existing_cursor = get_cursor(cursor_table, chain_id, contract_address)
+            existing_cursor = await iceberg_writer.run(
+                get_cursor,
+                cursor_table,
+                chain_id,
+                contract_address,
+                priority=PRIORITY_LOW,
+            )
 
             if existing_cursor:
                 existing_start, existing_end = existing_cursor
@@ -565,6 +1010,9 @@ class ContractAddressImporter:
                         )
                         return True  # Skip update, but return success
 
+                    # Filling older history must not move the end block back
+                    highest_block = max(highest_block, existing_end_int)
+
                 except (ValueError, TypeError):
                     logger.warning(
                         f"Task {task_id}: Invalid existing cursor data, proceeding with update"
@@ -697,6 +1145,13 @@ class ContractAddressImporter:
                 contract_address,
                 task_id,
             )
+            await self._index_transactions(
+                chain_id,
+                contract_address,
+                all_transactions,
+                lowest_block,
+                highest_block,
+            )
 
             # Calculate processed blocks
             self.processed_blocks = (
@@ -743,6 +1198,73 @@ class ContractAddressImporter:
 
         return result
 
+    async def _index_transactions(
+        self,
+        chain_id: int,
+        contract_address: str,
+        transactions: List[Dict],
+        lowest_block: Optional[int],
+        end_block: Optional[int],
+    ) -> bool:
+        """
+        Record fetched transactions in the contract's Redis user index.
+
+        The oldest block may have been cut short by the page size, so coverage
+        starts one block above it; the next fill re-reads that block.
+
+        Args:
+            chain_id: Blockchain chain ID
+            contract_address: Contract address
+            transactions: Every transaction fetched from end_block down
+            lowest_block: Oldest block among the transactions
+            end_block: Newest block the fetch covered
+
+        Returns:
+            bool: True if the index was updated
+        """
+        if not transactions:
+            return True
+        return await self.user_index.record(
+            chain_id,
+            contract_address,
+            transactions,
+            lowest_block + 1 if lowest_block is not None else None,
+            end_block,
+        )
+
+    async def get_indexed_result(
+        self, chain_id: int, contract_address: str, user_limit: int
+    ) -> Optional[ContractAddressImportResult]:
+        """
+        Build an import result from the contract's Redis user index.
+
+        Args:
+            chain_id: Blockchain chain ID
+            contract_address: Contract address
+            user_limit: Maximum number of unique addresses to return
+
+        Returns:
+            ContractAddressImportResult with the most recent indexed users (fewer
+            than user_limit if the index is short), or None if nothing is indexed
+        """
+        coverage = await self.user_index.get_coverage(chain_id, contract_address)
+        if not coverage:
+            return None
+
+        start_block, end_block = coverage
+        addresses = await self.user_index.get_recent_users(
+            chain_id, contract_address, user_limit, since_block=start_block
+        )
+        return ContractAddressImportResult(
+            addresses=addresses,
+            total_addresses=len(addresses),
+            blocks_processed=end_block - start_block + 1,
+            transactions_processed=0,
+            start_block=start_block,
+            end_block=end_block,
+            last_updated=datetime.now(timezone.utc),
+        )
+
     async def import_addresses_fast(
         self,
         chain_id: int,
@@ -753,9 +1275,11 @@ class ContractAddressImporter:
         """
         Fast address import that prioritizes speed by skipping database operations.
 
-        This method focuses only on extracting unique addresses and returns immediately
-        after address discovery is complete, without waiting for database persistence.
-        Database operations should be handled separately for better API responsiveness.
+        Users are served from the contract's Redis user index first. Etherscan is
+        only searched below the indexed block range, and only for as many users
+        as the index is short of; the fetched transactions are indexed too.
+        Database operations should be handled separately for better API
+        responsiveness.
 
         Args:
             chain_id: Blockchain chain ID
@@ -764,7 +1288,8 @@ class ContractAddressImporter:
             task_id: Task identifier for logging
 
         Returns:
-            ContractAddressImportResult with imported addresses and basic metadata
+            ContractAddressImportResult with addresses (most recent first) and
+            basic metadata
         """
         logger.info(f"Task {task_id}: Starting fast contract address import")
         logger.info(
@@ -776,15 +1301,42 @@ class ContractAddressImporter:
         self.processed_blocks = 0
         self.processed_transactions = 0
 
+        indexed_result = await self.get_indexed_result(
+            chain_id, contract_address, user_limit
+        )
+        coverage = None
+        indexed_addresses = []
+        if indexed_result:
+            if (
+                indexed_result.total_addresses >= user_limit
+                or indexed_result.start_block <= self.MIN_BLOCK_THRESHOLD
+            ):
+                logger.info(
+                    f"Task {task_id}: Served {indexed_result.total_addresses} addresses "
+                    f"from the user index"
+                )
+                return indexed_result
+            coverage = (indexed_result.start_block, indexed_result.end_block)
+            indexed_addresses = indexed_result.addresses
+            self.unique_addresses.update(indexed_addresses)
+            logger.info(
+                f"Task {task_id}: User index has {len(indexed_addresses)} addresses "
+                f"(blocks {coverage[0]}-{coverage[1]}), searching older history"
+            )
+
         # Fetch transaction batches with early stopping (no database dependency)
         try:
             all_transactions, highest_block, lowest_block, limit_reached = (
                 await self._fetch_transaction_batches(
-                    contract_address, chain_id, user_limit, task_id
+                    contract_address,
+                    chain_id,
+                    user_limit,
+                    task_id,
+                    before_block=coverage[0] - 1 if coverage else None,
                 )
             )
 
-            if not all_transactions:
+            if not all_transactions and not indexed_addresses:
                 logger.info(f"Task {task_id}: No transactions found")
                 return ContractAddressImportResult(
                     addresses=[],
@@ -796,11 +1348,19 @@ class ContractAddressImporter:
                     last_updated=start_time,
                 )
 
+            # Fetched history ends just below the coverage, so the ranges join
+            end_block = coverage[0] - 1 if coverage else highest_block
+            indexed = await self._index_transactions(
+                chain_id, contract_address, all_transactions, lowest_block, end_block
+            )
+
+            # The result spans the indexed range plus the history fetched below it
+            range_end = coverage[1] if coverage else highest_block
+            range_start = lowest_block or (coverage[0] if coverage else None)
+
             # Calculate processed blocks
             self.processed_blocks = (
-                highest_block - lowest_block + 1
-                if highest_block and lowest_block
-                else 0
+                range_end - range_start + 1 if range_end and range_start else 0
             )
 
             logger.info(
@@ -810,8 +1370,14 @@ class ContractAddressImporter:
                 f"across {self.processed_blocks} blocks"
             )
 
-            # Convert set to sorted list
-            unique_addresses_list = sorted(self.unique_addresses)
+            # Most recent first from the index; sorted if it could not be updated
+            unique_addresses_list = []
+            if indexed and range_start:
+                unique_addresses_list = await self.user_index.get_recent_users(
+                    chain_id, contract_address, user_limit, since_block=range_start
+                )
+            if len(unique_addresses_list) < len(self.unique_addresses):
+                unique_addresses_list = sorted(self.unique_addresses)
 
             # Create and return result (without database operations)
             result = ContractAddressImportResult(
@@ -819,8 +1385,8 @@ class ContractAddressImporter:
                 total_addresses=len(unique_addresses_list),
                 blocks_processed=self.processed_blocks,
                 transactions_processed=self.processed_transactions,
-                start_block=lowest_block or 0,
-                end_block=highest_block or 0,
+                start_block=range_start or 0,
+                end_block=range_end or 0,
                 last_updated=start_time,
             )
 
@@ -835,6 +1401,93 @@ class ContractAddressImporter:
             logger.error(f"Task {task_id}: Error during fast import process: {e}")
             raise
 
+    async def refresh_addresses(
+        self,
+        chain_id: int,
+        contract_address: str,
+        cached: ContractAddressImportResult,
+        user_limit: int = 100,
+        task_id: str = None,
+    ) -> ContractAddressImportResult:
+        """
+        Refresh an expired result with only the blocks after its end_block.
+
+        Searches newest first from the latest block down to the cached end_block,
+        stopping early once enough new addresses are found. Addresses active in
+        the new blocks move to the front, most recent first, followed by the
+        cached ones, so the cost follows new activity rather than the user limit.
+
+        Args:
+            chain_id: Blockchain chain ID
+            contract_address: Contract address
+            cached: Expired result to refresh
+            user_limit: Maximum number of unique addresses to return
+            task_id: Task identifier for logging
+
+        Returns:
+            ContractAddressImportResult with the merged addresses and block range
+        """
+        logger.info(
+            f"Task {task_id}: Refreshing {cached.total_addresses} cached addresses "
+            f"with blocks after {cached.end_block}"
+        )
+
+        start_time = datetime.now(timezone.utc)
+        self.unique_addresses.clear()
+        self.processed_blocks = 0
+        self.processed_transactions = 0
+
+        # Never shrink the cached result because of a smaller request limit
+        limit = max(user_limit, cached.total_addresses)
+        all_transactions, highest_block, lowest_block, _ = (
+            await self._fetch_transaction_batches(
+                contract_address,
+                chain_id,
+                limit,
+                task_id,
+                after_block=cached.end_block,
+            )
+        )
+        await self._index_transactions(
+            chain_id, contract_address, all_transactions, lowest_block, highest_block
+        )
+
+        # Fetched transactions are newest first, so this is recency order
+        new_addresses, _ = discover_addresses(
+            all_transactions, contract_address.lower(), set(), limit
+        )
+        recent = set(new_addresses)
+        kept = [address for address in cached.addresses if address not in recent]
+        addresses = (new_addresses + kept)[:limit]
+
+        start_block = (
+            cached.start_block if len(addresses) > len(new_addresses) else lowest_block
+        )
+        end_block = max(highest_block or 0, cached.end_block)
+        logger.info(
+            f"Task {task_id}: Refresh found {len(new_addresses)} recently active "
+            f"addresses in {len(all_transactions)} new transactions"
+        )
+
+        result = ContractAddressImportResult(
+            addresses=addresses,
+            total_addresses=len(addresses),
+            blocks_processed=end_block - start_block + 1 if start_block else 0,
+            transactions_processed=(
+                cached.transactions_processed + self.processed_transactions
+            ),
+            start_block=start_block or 0,
+            end_block=end_block,
+            last_updated=start_time,
+        )
+
+        # Store transaction data for later database persistence
+        result._transaction_data = all_transactions
+        result._highest_block = highest_block
+        result._lowest_block = lowest_block
+
+        return result
+
     async def persist_to_database(
         self,
         catalog,
@@ -850,6 +1503,8 @@ class ContractAddressImporter:
         allowing for decoupled processing and better API responsiveness.
 
         Enhanced with resilience features:
+        - Iceberg I/O runs on the writer executor, so timeouts fire on time and
+          the event loop stays responsive while data is written
         - Timeout protection for database operations
         - Graceful failure handling without affecting cached results
         - Non-blocking approach that skips operations during high concurrency
@@ -1002,7 +1657,10 @@ class ContractAddressImporter:
                 "expires_at": (datetime.now(timezone.utc).timestamp() + cache_ttl),
             }
 
-            success = await self.redis.set_json(cache_key, cache_data, ex=cache_ttl)
+            # Kept past expires_at so an expired result can be refreshed incrementally
+            success = await self.redis.set_json(
+                cache_key, cache_data, ex=cache_ttl + self.STALE_RESULT_TTL
+            )
 
             if success:
                 logger.info(
@@ -1020,7 +1678,7 @@ class ContractAddressImporter:
             return False
 
     async def get_cached_result(
-        self, chain_id: int, contract_address: str
+        self, chain_id: int, contract_address: str, allow_stale: bool = False
     ) -> Optional[ContractAddressImportResult]:
         """
         Retrieve cached unique addresses result from Redis.
@@ -1028,9 +1686,12 @@ class ContractAddressImporter:
         Args:
             chain_id: Blockchain chain ID
             contract_address: Contract address
+            allow_stale: Also return a result past its expires_at (kept for
+                STALE_RESULT_TTL so it can be refreshed)
 
         Returns:
-            ContractAddressImportResult if found and valid, None otherwise
+            ContractAddressImportResult if found (and valid, unless allow_stale),
+            None otherwise
         """
         try:
             cache_key = generate_unique_addresses_key(chain_id, contract_address)
@@ -1041,9 +1702,12 @@ class ContractAddressImporter:
 
             # Check if cache is still valid
             expires_at = cache_data.get("expires_at")
-            if expires_at and datetime.now(timezone.utc).timestamp() > expires_at:
+            if (
+                expires_at
+                and datetime.now(timezone.utc).timestamp() > expires_at
+                and not allow_stale
+            ):
                 logger.info(f"Cache expired for {contract_address} on chain {chain_id}")
-                await self.redis.delete(cache_key)
                 return None
 
             # Reconstruct result object
@@ -1072,3 +1736,82 @@ class ContractAddressImporter:
         except Exception as e:
             logger.error(f"Error retrieving cached unique addresses: {e}")
             return None
+
+    async def persist_result(
+        self,
+        catalog,
+        chain_id: int,
+        contract_address: str,
+        result: ContractAddressImportResult,
+    ) -> bool:
+        """
+        Store the result in standardized.contract_users.
+
+        Args:
+            catalog: Iceberg catalog
+            chain_id: Blockchain chain ID
+            contract_address: Contract address
+            result: ContractAddressImportResult to store
+
+        Returns:
+            bool: True if stored successfully
+        """
+        if not catalog:
+            return False
+
+        return await save_contract_users(
+            catalog,
+            chain_id,
+            contract_address,
+            {
+                "addresses": result.addresses,
+                "total_addresses": result.total_addresses,
+                "blocks_processed": result.blocks_processed,
+                "transactions_processed": result.transactions_processed,
+                "start_block": result.start_block,
+                "end_block": result.end_block,
+                "last_updated": result.last_updated,
+            },
+        )
+
+    async def get_persisted_result(
+        self, catalog, chain_id: int, contract_address: str, cache_ttl: int = 3600
+    ) -> Optional[ContractAddressImportResult]:
+        """
+        Retrieve the result stored in standardized.contract_users.
+
+        Args:
+            catalog: Iceberg catalog
+            chain_id: Blockchain chain ID
+            contract_address: Contract address
+            cache_ttl: Time-to-live applied to the stored result, in seconds
+
+        Returns:
+            ContractAddressImportResult with expires_at set from last_updated and
+            cache_ttl (it may already be expired), or None if nothing is stored
+        """
+        if not catalog:
+            return None
+
+        row = await get_contract_users(catalog, chain_id, contract_address)
+        if not row:
+            return None
+
+        last_updated = row["last_updated"]
+        if last_updated.tzinfo is None:
+            last_updated = last_updated.replace(tzinfo=timezone.utc)
+
+        logger.info(
+            f"Retrieved stored result: {row['total_addresses']} unique addresses "
+            f"for {contract_address} on chain {chain_id}"
+        )
+        return ContractAddressImportResult(
+            addresses=row["addresses"],
+            total_addresses=row["total_addresses"],
+            blocks_processed=row["blocks_processed"],
+            transactions_processed=row["transactions_processed"],
+            start_block=row["start_block"],
+            end_block=row["end_block"],
+            last_updated=last_updated,
+            expires_at=last_updated + timedelta(seconds=cache_ttl),
+        )
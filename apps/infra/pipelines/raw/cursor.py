@@ -15,6 +15,7 @@ from typing import Optional, Tuple
 
 from config.logging_config import get_logger
 from db.iceberg import get_record_by_filter, load_table, update_or_insert_record
+from db.writer import PRIORITY_HIGH, iceberg_writer
 from models import TimePeriod
 
 # Create a logger for this module
@@ -85,6 +86,38 @@ async def update_cursor(
     """
     Update or insert the cursor for a specific contract address.
 
+    Runs write_cursor on the Iceberg writer at high priority so the cursor
+    scan and commit never block the event loop.
+
+    Args:
+        catalog: Iceberg catalog
+        database: Database name
+        chain_id: Blockchain chain ID
+        contract_address: Contract address to update cursor for
+        end_block: New end block number to set (highest block processed in this operation)
+        start_block: Start block of current operation (optional, used to determine lifetime min)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return await iceberg_writer.run(
+        write_cursor,
+        catalog,
+        database,
+        chain_id,
+        contract_address,
+        end_block,
+        start_block,
+        priority=PRIORITY_HIGH,
+    )
+
+
+def write_cursor(
+    catalog, database, chain_id, contract_address, end_block, start_block=None
+):
+    """
+    Update or insert the cursor for a specific contract address (synchronous).
+
     The start_block represents the minimum block of lifetime coverage (earliest data we have),
     not just the start of the current operation.
 
@@ -101,7 +134,7 @@ async def update_cursor(
     """
     try:
         # Load the cursor table
-        cursor_table = load_table(catalog, database, "cursor")
+        cursor_table = load_table(catalog, database, "cursor", refresh=True)
         if not cursor_table:
             logger.error("Failed to load cursor table")
             return False
@@ -203,7 +236,7 @@ def check_cursor_before_load(catalog, database, chain_id, contract_address):
     """
     try:
         # Load the cursor table
-        cursor_table = load_table(catalog, database, "cursor")
+        cursor_table = load_table(catalog, database, "cursor", refresh=True)
         if not cursor_table:
             logger.error("Failed to load cursor table")
             return None
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Finality Frontier
+
+The most recent blocks of a chain can still reorg. Syncs and backfills only
+fetch up to a per-chain finality frontier, `latest - depth`:
+- raw.transactions only receives final blocks, so loads are plain appends
+- The address cursor stops at the frontier and the next incremental sync
+  starts after it, picking up blocks once they have become final
+
+Finality depths default per chain and can be overridden with the
+FINALITY_DEPTH_<chain_id> environment variable.
+"""
+
+import os
+from typing import Optional
+
+from config.logging_config import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Blocks behind the chain head after which a block is treated as final
+DEFAULT_FINALITY_DEPTH = 64
+FINALITY_DEPTHS = {
+    1: 64,  # Ethereum: two epochs
+    10: 120,  # Optimism
+    137: 256,  # Polygon PoS
+    8453: 120,  # Base
+    42161: 240,  # Arbitrum One
+}
+
+
+def get_finality_depth(chain_id: int) -> int:
+    """Finality depth of a chain, from FINALITY_DEPTH_<chain_id> or the defaults."""
+    depth = os.getenv(f"FINALITY_DEPTH_{chain_id}")
+    if depth:
+        return int(depth)
+    return FINALITY_DEPTHS.get(chain_id, DEFAULT_FINALITY_DEPTH)
+
+
+async def resolve_finalized_block(provider, chain_id: int) -> Optional[int]:
+    """
+    Get the highest final block of a chain.
+
+    Args:
+        provider: EtherscanProvider instance
+        chain_id: Blockchain chain ID
+
+    Returns:
+        Latest block minus the finality depth, or None if the latest block is
+        unavailable
+    """
+    latest = await provider.get_latest_block_number(chain_id)
+    if latest is None:
+        logger.warning(f"Latest block unavailable on chain {chain_id}")
+        return None
+    return max(latest - get_finality_depth(chain_id), 0)
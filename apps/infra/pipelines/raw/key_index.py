@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Key Index Handler
+
+This module maintains a persistent existing-key index for raw tables:
+- A Bloom filter per (chain_id, block_date) partition, stored in an Iceberg table
+- Exact verification of Bloom hits against the data table
+- Splitting incoming batches into new, changed and already-present rows
+
+The index lets overlapping loads append the rows we don't have yet instead of
+paying for a merge of the whole batch. Only rows that actually changed need a merge.
+"""
+
+import hashlib
+import math
+import traceback
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+from config.logging_config import get_logger
+from db.iceberg import build_partition_filter, load_table, merge_partitions_data
+from pyiceberg.expressions import And, In
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Whether the transaction_keys table exists, by (catalog, database); checked
+# once per process so loads without the index don't each log a failed load
+_key_table_exists: Dict[Tuple, bool] = {}
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter using double hashing over a BLAKE2b digest.
+
+    Never returns false negatives; false positives are resolved by an exact check.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytes] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(bits) if bits else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> "BloomFilter":
+        """
+        Create an empty filter sized for the expected number of keys.
+
+        Args:
+            capacity: Expected number of keys
+            false_positive_rate: Target false positive rate at capacity
+
+        Returns:
+            Empty BloomFilter
+        """
+        capacity = max(capacity, 1)
+        num_bits = int(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str):
+        """Add a key to the filter."""
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def might_contain(self, key: str) -> bool:
+        """Return False if the key was definitely never added."""
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key)
+        )
+
+    def union(self, other: "BloomFilter"):
+        """Merge another filter with identical sizing into this one."""
+        self.bits = bytearray(a | b for a, b in zip(self.bits, other.bits))
+
+
+class KeyIndex:
+    """
+    Persistent existing-key index over a partitioned raw table.
+
+    Keeps one Bloom filter per partition in an index table and verifies
+    Bloom hits against the data table, so loads can drop rows we already
+    have and append the rest.
+    """
+
+    # Configuration constants
+    EXPECTED_KEYS_PER_PARTITION = 100_000  # Bloom sizing per partition
+    FALSE_POSITIVE_RATE = 0.01  # Target false positive rate at capacity
+    EXACT_CHECK_BATCH = 1000  # Max keys per IN predicate during exact checks
+    COMMIT_ATTEMPTS = 3  # Index commits tried before dropping the partitions
+
+    def __init__(
+        self,
+        catalog,
+        database: str,
+        table_name: str,
+        index_table_name: str,
+        key_cols: List[str],
+        partition_cols: List[str],
+        lookup_col: str,
+        volatile_cols: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the key index.
+
+        Args:
+            catalog: Iceberg catalog
+            database: Database name of both tables
+            table_name: Data table the index covers
+            index_table_name: Table storing the per-partition Bloom filters
+            key_cols: Columns identifying a row
+            partition_cols: Identity partition columns of the data table
+            lookup_col: Selective key column used for exact checks (e.g. hash)
+            volatile_cols: Columns ignored when deciding whether a stored row changed
+        """
+        self.catalog = catalog
+        self.database = database
+        self.table_name = table_name
+        self.index_table_name = index_table_name
+        self.key_cols = key_cols
+        self.partition_cols = partition_cols
+        self.lookup_col = lookup_col
+        self.volatile_cols = set(volatile_cols or [])
+        self.index_table = load_table(catalog, database, index_table_name, refresh=True)
+        self.filters: Dict[Tuple, BloomFilter] = {}
+        self.key_counts: Dict[Tuple, int] = {}
+
+    @property
+    def available(self) -> bool:
+        """Whether the index table exists and the index can be used."""
+        return self.index_table is not None
+
+    def _key(self, row: Dict) -> str:
+        return ":".join(str(row.get(col)) for col in self.key_cols)
+
+    def _partition(self, row: Dict) -> Tuple:
+        return tuple(row.get(col) for col in self.partition_cols)
+
+    def _new_filter(self, key_count: int) -> BloomFilter:
+        capacity = self.EXPECTED_KEYS_PER_PARTITION
+        while capacity < key_count:
+            capacity *= 2
+        return BloomFilter.for_capacity(capacity, self.FALSE_POSITIVE_RATE)
+
+    def _read_index_rows(self, partitions: List[Tuple]) -> List[Dict]:
+        partition_table = pa.Table.from_pylist(
+            [dict(zip(self.partition_cols, p)) for p in partitions]
+        )
+        row_filter = build_partition_filter(partition_table, self.partition_cols)
+        if row_filter is None:
+            return []
+        self.index_table.refresh()
+        return self.index_table.scan(row_filter=row_filter).to_arrow().to_pylist()
+
+    def _build_from_data(self, table, partitions: List[Tuple]):
+        """Bootstrap filters for partitions that were written before the index existed."""
+        partition_table = pa.Table.from_pylist(
+            [dict(zip(self.partition_cols, p)) for p in partitions]
+        )
+        row_filter = build_partition_filter(partition_table, self.partition_cols)
+        if row_filter is None:
+            return
+        keys = table.scan(
+            row_filter=row_filter,
+            selected_fields=tuple(dict.fromkeys(self.key_cols + self.partition_cols)),
+        ).to_arrow()
+
+        rows_by_partition = defaultdict(list)
+        for row in keys.to_pylist():
+            rows_by_partition[self._partition(row)].append(row)
+
+        for partition in partitions:
+            rows = rows_by_partition.get(partition, [])
+            bloom = self._new_filter(len(rows))
+            for row in rows:
+                bloom.add(self._key(row))
+            self.filters[partition] = bloom
+            self.key_counts[partition] = len(rows)
+
+        logger.info(
+            f"Bootstrapped key index for {len(partitions)} partitions "
+            f"from {keys.num_rows} existing rows"
+        )
+
+    def _load_filters(self, table, partitions: List[Tuple]):
+        """Load filters for the given partitions, bootstrapping missing ones."""
+        missing = [p for p in partitions if p not in self.filters]
+        if not missing:
+            return
+
+        for row in self._read_index_rows(missing):
+            partition = self._partition(row)
+            self.filters[partition] = BloomFilter(
+                row["num_bits"], row["num_hashes"], row["bloom"]
+            )
+            self.key_counts[partition] = row["key_count"]
+
+        unindexed = [p for p in missing if p not in self.filters]
+        if unindexed:
+            self._build_from_data(table, unindexed)
+
+    def _find_existing(self, table, candidates: List[Dict]) -> Dict[str, Dict]:
+        """Exact check: fetch the stored rows for candidate keys."""
+        existing = {}
+        candidate_table = pa.Table.from_pylist(
+            [{col: row.get(col) for col in self.partition_cols} for row in candidates]
+        )
+        partition_filter = build_partition_filter(candidate_table, self.partition_cols)
+        lookups = sorted({row[self.lookup_col] for row in candidates})
+
+        for i in range(0, len(lookups), self.EXACT_CHECK_BATCH):
+            batch = set(lookups[i : i + self.EXACT_CHECK_BATCH])
+            row_filter = In(self.lookup_col, batch)
+            if partition_filter is not None:
+                row_filter = And(partition_filter, row_filter)
+            for row in table.scan(row_filter=row_filter).to_arrow().to_pylist():
+                existing[self._key(row)] = row
+
+        return existing
+
+    def split_batch(self, table, data: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split a batch into rows we don't have yet and rows that changed.
+
+        Rows already stored with identical values are dropped.
+
+        Args:
+            table: Data table (used for bootstrap and exact checks)
+            data: List of dictionaries ordered like the table schema
+
+        Returns:
+            Tuple of (new_rows, changed_rows)
+        """
+        self._load_filters(table, list({self._partition(row) for row in data}))
+
+        new_rows, candidates = [], []
+        for row in data:
+            bloom = self.filters.get(self._partition(row))
+            if bloom is not None and bloom.might_contain(self._key(row)):
+                candidates.append(row)
+            else:
+                new_rows.append(row)
+
+        changed_rows = []
+        if candidates:
+            existing = self._find_existing(table, candidates)
+            for row in candidates:
+                stored = existing.get(self._key(row))
+                if stored is None:
+                    new_rows.append(row)  # Bloom false positive
+                elif any(
+                    stored.get(col) != value
+                    for col, value in row.items()
+                    if col not in self.volatile_cols
+                ):
+                    changed_rows.append(row)
+
+        logger.info(
+            f"Key index split {len(data)} rows: {len(new_rows)} new, "
+            f"{len(changed_rows)} changed, "
+            f"{len(data) - len(new_rows) - len(changed_rows)} already present"
+        )
+        return new_rows, changed_rows
+
+    def add_rows(self, table, data: List[Dict]) -> bool:
+        """
+        Record written rows in the index and persist the touched partitions.
+
+        Filters are re-read and unioned before writing so that concurrent
+        writers don't drop each other's keys; a filter another writer resized
+        is rebuilt from the data table instead. The index commit fails if the
+        index changed since it was read, and is then redone from the new
+        state, up to COMMIT_ATTEMPTS times. If it still fails, the index rows
+        of the partitions are dropped, so later loads rebuild them from the
+        data table instead of trusting filters that miss these rows.
+
+        Args:
+            table: Data table the rows were written to
+            data: List of dictionaries or PyArrow table that was written
+
+        Returns:
+            bool: True if the index covers the rows or was dropped for their
+            partitions, False if it may be missing them
+        """
+        if not len(data):
+            return True
+
+        if isinstance(data, pa.Table):
+            columns = list(dict.fromkeys(self.key_cols + self.partition_cols))
+            data = data.select(columns).to_pylist()
+        partitions = list({self._partition(row) for row in data})
+
+        for attempt in range(1, self.COMMIT_ATTEMPTS + 1):
+            try:
+                if self._commit_rows(table, data, partitions):
+                    return True
+                logger.warning(
+                    f"Key index commit failed (attempt {attempt}/{self.COMMIT_ATTEMPTS})"
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Error updating key index (attempt {attempt}/"
+                    f"{self.COMMIT_ATTEMPTS}): {e}"
+                )
+                logger.debug(traceback.format_exc())
+            # Start over from what is persisted now
+            for partition in partitions:
+                self.filters.pop(partition, None)
+                self.key_counts.pop(partition, None)
+
+        return self._drop_partitions(partitions)
+
+    def _commit_rows(self, table, data: List[Dict], partitions: List[Tuple]) -> bool:
+        """Add rows to the filters of their partitions and commit those filters."""
+        self._load_filters(table, partitions)
+
+        for row in data:
+            partition = self._partition(row)
+            key = self._key(row)
+            if not self.filters[partition].might_contain(key):
+                self.filters[partition].add(key)
+                self.key_counts[partition] += 1
+
+        # Union with filters persisted by other writers since we loaded ours.
+        # This read also pins the index snapshot the commit below builds on.
+        rebuild = []
+        for row in self._read_index_rows(partitions):
+            partition = self._partition(row)
+            bloom = self.filters[partition]
+            if (row["num_bits"], row["num_hashes"]) == (
+                bloom.num_bits,
+                bloom.num_hashes,
+            ):
+                bloom.union(
+                    BloomFilter(row["num_bits"], row["num_hashes"], row["bloom"])
+                )
+            else:
+                # Resized by another writer; neither filter holds every key
+                rebuild.append(partition)
+
+        # Rebuild filters that outgrew their sizing to keep false positives low
+        rebuild += [
+            p
+            for p in partitions
+            if p not in rebuild
+            and self.key_counts[p] > 2 * self._capacity(self.filters[p])
+        ]
+        if rebuild:
+            # Include rows other writers committed since the table was loaded
+            table.refresh()
+            self._build_from_data(table, rebuild)
+
+        now = datetime.now()
+        index_rows = [
+            {
+                **dict(zip(self.partition_cols, partition)),
+                "bloom": bytes(self.filters[partition].bits),
+                "num_bits": self.filters[partition].num_bits,
+                "num_hashes": self.filters[partition].num_hashes,
+                "key_count": self.key_counts[partition],
+                "updated_at": now,
+            }
+            for partition in partitions
+        ]
+
+        return merge_partitions_data(
+            self.index_table,
+            index_rows,
+            self.index_table.schema().as_arrow(),
+            join_cols=self.partition_cols,
+            partition_cols=self.partition_cols,
+        )
+
+    def _drop_partitions(self, partitions: List[Tuple]) -> bool:
+        """Delete the index rows of partitions so loads rebuild them from the data."""
+        partition_table = pa.Table.from_pylist(
+            [dict(zip(self.partition_cols, p)) for p in partitions]
+        )
+        row_filter = build_partition_filter(partition_table, self.partition_cols)
+        if row_filter is None:
+            logger.error("Key index partitions with null values can't be dropped")
+            return False
+        for attempt in range(1, self.COMMIT_ATTEMPTS + 1):
+            try:
+                self.index_table.refresh()
+                self.index_table.delete(delete_filter=row_filter)
+                logger.warning(
+                    f"Dropped the key index of {len(partitions)} partitions, "
+                    f"they will be rebuilt from the data table"
+                )
+                return True
+            except Exception as e:
+                logger.warning(
+                    f"Error dropping key index partitions (attempt {attempt}/"
+                    f"{self.COMMIT_ATTEMPTS}): {e}"
+                )
+                logger.debug(traceback.format_exc())
+        logger.error(
+            f"Key index of {len(partitions)} partitions may be missing written rows"
+        )
+        return False
+
+    def _capacity(self, bloom: BloomFilter) -> int:
+        return int(
+            bloom.num_bits * (math.log(2) ** 2) / -math.log(self.FALSE_POSITIVE_RATE)
+        )
+
+
+def get_transactions_key_index(catalog, database) -> Optional[KeyIndex]:
+    """
+    Get the key index over (chain_id, block_number, hash) for the transactions table.
+
+    Args:
+        catalog: Iceberg catalog
+        database: Database name
+
+    Returns:
+        KeyIndex, or None if the transaction_keys table is not available
+    """
+    exists = _key_table_exists.get((catalog, database))
+    if exists is None:
+        try:
+            exists = catalog.table_exists(f"{database}.transaction_keys")
+        except Exception as e:
+            logger.error(f"Error checking for the transaction key index table: {e}")
+            return None
+        _key_table_exists[(catalog, database)] = exists
+        if not exists:
+            logger.warning(
+                "Transaction key index table not available, loads will merge on "
+                "overlap (create it and restart to use the index)"
+            )
+    if not exists:
+        return None
+
+    index = KeyIndex(
+        catalog,
+        database,
+        table_name="transactions",
+        index_table_name="transaction_keys",
+        key_cols=["chain_id", "block_number", "hash"],
+        partition_cols=["chain_id", "block_date"],
+        lookup_col="hash",
+        # Etherscan recomputes confirmations on every fetch
+        volatile_cols=["confirmations"],
+    )
+    if not index.available:
+        logger.warning(
+            "Transaction key index table not available, loads will merge on overlap"
+        )
+        return None
+    return index
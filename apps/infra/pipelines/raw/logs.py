@@ -0,0 +1,676 @@
+#!/usr/bin/env python3
+"""
+Logs Table Handler
+
+This module stores Etherscan event logs in raw.logs:
+- Vectorized conversion of getLogs pages into typed Arrow columns (the hex
+  block_number, timestamp, log_index and gas fields are decoded in bulk)
+- Loading logs with overlap detection: non-overlapping batches are appended,
+  overlapping ones are merged into the touched (chain_id, block_date) partitions
+- An incremental cursor per (chain_id, address, topic filter) in raw.logs_cursor
+- run_logs_sync(): Incremental or full sync of an address and/or topic filter,
+  committed chunk by chunk so a failed page never loses committed work. Syncs
+  stop at the chain's finality frontier, so raw.logs never stores logs that
+  can still be reorged
+"""
+
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from db.iceberg import deduplicate_arrow, load_table, merge_partitions_data
+from db.writer import PRIORITY_HIGH, PRIORITY_NORMAL, iceberg_writer
+from pipelines.raw.finality import resolve_finalized_block
+from providers.etherscan import EtherscanProvider, FetchInterruptedError, FetchMode
+from pyiceberg.expressions import And, EqualTo
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+LOGS_TABLE = "logs"
+LOGS_CURSOR_TABLE = "logs_cursor"
+
+# Columns identifying a log row
+LOGS_JOIN_COLS = ["chain_id", "block_number", "transaction_hash", "log_index"]
+
+# Identity partition columns of raw.logs
+LOGS_PARTITION_COLS = ["chain_id", "block_date"]
+
+# Logs fetched before a chunk is committed
+CHUNK_ROWS = 50_000
+
+# getLogs fields as returned by the provider with enhance=False
+_RAW_LOGS_SCHEMA = pa.schema(
+    [
+        ("chain_id", pa.int32()),
+        ("address", pa.string()),
+        ("topics", pa.list_(pa.string())),
+        ("data", pa.string()),
+        ("block_number", pa.string()),
+        ("block_hash", pa.string()),
+        ("timestamp", pa.string()),
+        ("gas_price", pa.string()),
+        ("gas_used", pa.string()),
+        ("log_index", pa.string()),
+        ("transaction_hash", pa.string()),
+        ("transaction_index", pa.string()),
+    ]
+)
+
+# Nibble value of each ASCII code; 255 marks a non-hex character
+_HEX_NIBBLES = np.full(256, 255, dtype=np.uint8)
+for _offset, _chars in ((0, b"0123456789"), (10, b"abcdef"), (10, b"ABCDEF")):
+    _HEX_NIBBLES[np.frombuffer(_chars, dtype=np.uint8)] = np.arange(
+        _offset, _offset + len(_chars), dtype=np.uint8
+    )
+_HEX_PLACES = 16 ** np.arange(15, -1, -1, dtype=np.uint64)
+
+
+def _hex_words(strings: pa.Array, skip: int, words: int) -> np.ndarray:
+    """
+    Decode equal-length strings of skip + 16 * words characters, read straight
+    from the string data buffer, into a (rows, words) uint64 matrix.
+    """
+    _, offsets, data = strings.buffers()
+    start = np.frombuffer(offsets, dtype=np.int32)[strings.offset]
+    stride = skip + 16 * words
+    chars = np.frombuffer(data, dtype=np.uint8)[
+        start : start + stride * len(strings)
+    ].reshape(-1, stride)[:, skip:]
+    nibbles = _HEX_NIBBLES[chars]
+    if (nibbles == 255).any():
+        raise ValueError("Invalid hex value")
+    return nibbles.reshape(-1, words, 16).astype(np.uint64) @ _HEX_PLACES
+
+
+def hex_to_uint64(values) -> pa.Array:
+    """
+    Decode "0x"-prefixed hex strings of up to 16 digits to uint64 in bulk.
+
+    Strings are left-padded to 16 digits and decoded as a (rows, 16) byte
+    matrix with a nibble lookup table and one dot product, instead of one
+    int(value, 16) call per row. Nulls stay null and "0x" decodes to 0.
+
+    Args:
+        values: PyArrow string array or chunked array
+
+    Returns:
+        PyArrow uint64 array
+
+    Raises:
+        ValueError: If a value is not hex or has more than 16 digits
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if len(values) == 0:
+        return pa.array([], pa.uint64())
+    # Scans may return large_string, whose offsets are 64-bit
+    values = pc.cast(values, pa.string())
+
+    valid = pc.is_valid(values).to_numpy(zero_copy_only=False)
+    digits = pc.replace_substring_regex(
+        pc.fill_null(values, "0x0"), pattern="^0[xX]", replacement=""
+    )
+    if pc.max(pc.utf8_length(digits)).as_py() > 16:
+        raise ValueError("Hex value does not fit in 64 bits")
+
+    padded = pc.utf8_lpad(digits, width=16, padding="0")
+    return pa.array(_hex_words(padded, 0, 1)[:, 0], mask=~valid)
+
+
+def hex_to_uint64_words(values, words: int) -> np.ndarray:
+    """
+    Decode fixed-width "0x"-prefixed hex strings into 64-bit words in bulk.
+
+    Used for 32-byte ABI words (words=4), which do not fit a single integer
+    column; the first word is the most significant.
+
+    Args:
+        values: PyArrow string array or chunked array, each value exactly
+            2 + 16 * words characters
+        words: Number of 64-bit words per value
+
+    Returns:
+        numpy uint64 array of shape (rows, words)
+
+    Raises:
+        ValueError: If a value is null, has another length, or is not hex
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    values = pc.cast(values, pa.string())
+    if len(values) == 0:
+        return np.zeros((0, words), dtype=np.uint64)
+
+    lengths = pc.binary_length(values)
+    if values.null_count or pc.any(pc.not_equal(lengths, 2 + 16 * words)).as_py():
+        raise ValueError(f"Hex values must have exactly {16 * words} digits")
+    return _hex_words(values, 2, words)
+
+
+def hex_to_int64(values) -> pa.Array:
+    """
+    Decode "0x"-prefixed hex strings to int64 in bulk (see hex_to_uint64).
+
+    Args:
+        values: PyArrow string array or chunked array
+
+    Returns:
+        PyArrow int64 array
+
+    Raises:
+        ValueError: If a value is not hex or does not fit in int64
+    """
+    decoded = hex_to_uint64(values)
+    largest = pc.max(decoded).as_py()
+    if largest is not None and largest > np.iinfo(np.int64).max:
+        raise ValueError("Hex value does not fit in int64")
+    return pc.cast(decoded, pa.int64())
+
+
+def _topic(topics: pa.Array, position: int) -> pa.Array:
+    """Topic at a position of each log's topics list (null if it has fewer)."""
+    has_topic = pc.greater(pc.list_value_length(topics), position)
+    indices = pc.add(topics.offsets[:-1], position)
+    return pc.take(
+        pc.list_flatten(topics),
+        pc.if_else(has_topic, indices, pa.scalar(None, indices.type)),
+    )
+
+
+def logs_to_arrow(logs: List[Dict]) -> pa.Table:
+    """
+    Convert getLogs rows into a typed Arrow table matching raw.logs.
+
+    Args:
+        logs: Log dictionaries from iter_logs_batches(enhance=False)
+
+    Returns:
+        PyArrow table with integer block/index/gas columns, block_time,
+        block_date and topic0-topic3
+    """
+    raw = pa.Table.from_pylist(logs, schema=_RAW_LOGS_SCHEMA)
+    timestamp = hex_to_int64(raw["timestamp"])
+    block_time = pc.cast(pc.cast(timestamp, pa.timestamp("s")), pa.timestamp("us"))
+    topics = raw["topics"].combine_chunks()
+
+    return pa.table(
+        {
+            "chain_id": raw["chain_id"],
+            "address": pc.utf8_lower(raw["address"]),
+            "block_number": hex_to_int64(raw["block_number"]),
+            "block_hash": raw["block_hash"],
+            "block_time": block_time,
+            "block_date": pc.cast(block_time, pa.date32()),
+            "timestamp": timestamp,
+            "transaction_hash": raw["transaction_hash"],
+            "transaction_index": pc.cast(
+                hex_to_int64(raw["transaction_index"]), pa.int32()
+            ),
+            "log_index": pc.cast(hex_to_int64(raw["log_index"]), pa.int32()),
+            "topic0": _topic(topics, 0),
+            "topic1": _topic(topics, 1),
+            "topic2": _topic(topics, 2),
+            "topic3": _topic(topics, 3),
+            "data": raw["data"],
+            "gas_price": hex_to_int64(raw["gas_price"]),
+            "gas_used": hex_to_int64(raw["gas_used"]),
+        }
+    )
+
+
+def topic_filter_key(
+    topics: Optional[Dict[str, str]] = None,
+    topic_operators: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Build the canonical cursor key of a topic filter.
+
+    Args:
+        topics: Topic filters (topic0-topic3)
+        topic_operators: Topic operators (topic0_1_opr, ...)
+
+    Returns:
+        str: Sorted "key=value" pairs joined by "&", or "" for no filter
+    """
+    items = {**(topics or {}), **(topic_operators or {})}
+    return "&".join(
+        f"{key}={str(value).lower()}" for key, value in sorted(items.items())
+    )
+
+
+def _cursor_filter(chain_id: int, address: str, filter_key: str):
+    return And(
+        And(EqualTo("chain_id", chain_id), EqualTo("address", address)),
+        EqualTo("topic_filter", filter_key),
+    )
+
+
+def read_logs_cursor(
+    catalog, database, chain_id: int, address: str, filter_key: str
+) -> Optional[Tuple[int, int]]:
+    """
+    Get the block range synced for an address and topic filter (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        database: Database name
+        chain_id: Blockchain chain ID
+        address: Emitting contract address ("" for topic-only filters)
+        filter_key: Topic filter key from topic_filter_key()
+
+    Returns:
+        Tuple of (start_block, end_block), or None if never synced
+    """
+    try:
+        table = load_table(catalog, database, LOGS_CURSOR_TABLE, refresh=True)
+        if not table:
+            return None
+
+        rows = (
+            table.scan(row_filter=_cursor_filter(chain_id, address.lower(), filter_key))
+            .to_arrow()
+            .to_pylist()
+        )
+        if not rows:
+            return None
+
+        row = max(rows, key=lambda row: row["updated_at"])
+        return row["start_block"], row["end_block"]
+
+    except Exception as e:
+        logger.error(f"Error reading logs cursor for {address}: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+
+def write_logs_cursor(
+    catalog,
+    database,
+    chain_id: int,
+    address: str,
+    filter_key: str,
+    end_block: int,
+    start_block: Optional[int] = None,
+) -> bool:
+    """
+    Update or insert the logs cursor (synchronous).
+
+    Like the transactions cursor, start_block is the lifetime minimum of the
+    synced range; end_block only moves forward, so a full refresh re-walking
+    covered blocks keeps merging instead of appending duplicates.
+
+    Args:
+        catalog: Iceberg catalog
+        database: Database name
+        chain_id: Blockchain chain ID
+        address: Emitting contract address ("" for topic-only filters)
+        filter_key: Topic filter key from topic_filter_key()
+        end_block: Highest block fully synced
+        start_block: First block of the current operation
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        table = load_table(catalog, database, LOGS_CURSOR_TABLE, refresh=True)
+        if not table:
+            logger.error("Failed to load logs cursor table")
+            return False
+
+        address = address.lower()
+        existing = read_logs_cursor(catalog, database, chain_id, address, filter_key)
+        if existing and start_block is not None:
+            start_block = min(existing[0], start_block)
+        elif existing:
+            start_block = existing[0]
+        elif start_block is None:
+            start_block = 0
+        if existing:
+            end_block = max(existing[1], end_block)
+
+        row = {
+            "chain_id": chain_id,
+            "address": address,
+            "topic_filter": filter_key,
+            "start_block": start_block,
+            "end_block": end_block,
+            "updated_at": datetime.now(),
+        }
+        table.overwrite(
+            pa.Table.from_pylist([row], schema=table.schema().as_arrow()),
+            overwrite_filter=_cursor_filter(chain_id, address, filter_key),
+        )
+        logger.info(
+            f"Logs cursor for chain_id={chain_id}, address={address or '*'}, "
+            f"filter='{filter_key}' updated - start_block={start_block}, "
+            f"end_block={end_block}"
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Error updating logs cursor: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+
+def check_for_logs_overlap(
+    catalog, database, chain_id: int, address: str, start_block: int, end_block: int
+) -> bool:
+    """
+    Check if a block range overlaps logs already stored for an address.
+
+    Every cursor of the address is considered, whatever its topic filter, as
+    well as topic-only cursors: one log can match several filters.
+
+    Args:
+        catalog: Iceberg catalog
+        database: Database name
+        chain_id: Blockchain chain ID
+        address: Emitting contract address ("" for topic-only filters)
+        start_block: Lowest block of the new data
+        end_block: Highest block of the new data
+
+    Returns:
+        bool: True if overlap detected (need merge), False if the data can be appended
+    """
+    try:
+        table = load_table(catalog, database, LOGS_CURSOR_TABLE, refresh=True)
+        if not table:
+            return True
+
+        cursors = table.scan(row_filter=EqualTo("chain_id", chain_id)).to_arrow()
+        if address:
+            cursors = cursors.filter(
+                pc.is_in(cursors["address"], pa.array([address.lower(), ""]))
+            )
+        overlapping = cursors.filter(
+            pc.and_(
+                pc.less_equal(cursors["start_block"], end_block),
+                pc.greater_equal(cursors["end_block"], start_block),
+            )
+        )
+        return overlapping.num_rows > 0
+
+    except Exception as e:
+        logger.error(f"Error checking for logs overlap: {e}")
+        logger.debug(traceback.format_exc())
+        # Default to merge for safety when we can't determine overlap
+        return True
+
+
+def load_logs_with_safety(
+    catalog, database, chain_id, address, data, force_merge=False
+) -> bool:
+    """
+    Load logs into raw.logs with automatic overlap detection.
+
+    Mirrors load_transactions_with_safety: the batch is deduplicated, then
+    appended when no stored cursor covers its block range, and merged into
+    the (chain_id, block_date) partitions it touches otherwise.
+
+    Args:
+        catalog: Iceberg catalog
+        database: Database name
+        chain_id: Blockchain chain ID
+        address: Emitting contract address ("" for topic-only filters)
+        data: Typed PyArrow table from logs_to_arrow()
+        force_merge: If True, always merge regardless of overlap detection
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        if data.num_rows == 0:
+            return True
+
+        table = load_table(catalog, database, LOGS_TABLE, refresh=True)
+        if not table:
+            logger.error("Failed to load logs table")
+            return False
+
+        schema = table.schema().as_arrow()
+        data = deduplicate_arrow(data, LOGS_JOIN_COLS)
+        bounds = pc.min_max(data["block_number"])
+        should_merge = force_merge or check_for_logs_overlap(
+            catalog,
+            database,
+            chain_id,
+            address,
+            bounds["min"].as_py(),
+            bounds["max"].as_py(),
+        )
+
+        if should_merge:
+            logger.info(f"Using PARTITION OVERWRITE for {data.num_rows} logs")
+            return merge_partitions_data(
+                table, data, schema, LOGS_JOIN_COLS, LOGS_PARTITION_COLS
+            )
+
+        logger.info(f"Using APPEND for {data.num_rows} logs (no overlap detected)")
+        table.append(data.select(schema.names).cast(schema))
+        return True
+
+    except Exception as e:
+        logger.error(f"Error loading logs: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+
+@dataclass
+class LogsSyncResult:
+    """Outcome of a logs sync run."""
+
+    rows_committed: int
+    chunks_committed: int
+    start_block: int
+    end_block: Optional[int]
+
+
+async def _commit_logs(
+    catalog,
+    database,
+    chain_id: int,
+    address: str,
+    filter_key: str,
+    rows: pa.Table,
+    start_block: int,
+    committed_through: int,
+) -> pa.Table:
+    """
+    Load the logs of a chunk up to a block and advance the cursor to it.
+
+    Logs above committed_through (the overlap re-read by the next page) are
+    returned instead of loaded, so stored logs never run ahead of the cursor.
+
+    Returns:
+        The logs above committed_through, carried into the next chunk
+
+    Raises:
+        RuntimeError: If the chunk could not be loaded
+    """
+    complete = pc.less_equal(rows["block_number"], committed_through)
+    committed = rows.filter(complete)
+    if committed.num_rows:
+        loaded = await iceberg_writer.run(
+            load_logs_with_safety,
+            catalog,
+            database,
+            chain_id,
+            address,
+            committed,
+            priority=PRIORITY_NORMAL,
+        )
+        if not loaded:
+            raise RuntimeError(
+                f"Failed to load logs chunk ending at block {committed_through}"
+            )
+
+    await iceberg_writer.run(
+        write_logs_cursor,
+        catalog,
+        database,
+        chain_id,
+        address,
+        filter_key,
+        committed_through,
+        start_block,
+        priority=PRIORITY_HIGH,
+    )
+    logger.info(
+        f"Committed {committed.num_rows} logs through block {committed_through} "
+        f"for {address or '*'} ('{filter_key}')"
+    )
+    return rows.filter(pc.invert(complete))
+
+
+async def run_logs_sync(
+    catalog,
+    provider: EtherscanProvider,
+    chain_id: int,
+    address: Optional[str] = None,
+    topics: Optional[Dict[str, str]] = None,
+    topic_operators: Optional[Dict[str, str]] = None,
+    mode: FetchMode = FetchMode.INCREMENTAL,
+    from_block: int = 0,
+    to_block: str = "latest",
+    database: str = "raw",
+) -> Optional[LogsSyncResult]:
+    """
+    Sync event logs of an address and/or topic filter into raw.logs.
+
+    Incremental mode resumes after the cursor's end_block. The sync stops at
+    the finality frontier (or to_block, if lower) and fails if the frontier is
+    unknown, so only final blocks are stored and the cursor never passes a
+    block that can still reorg. Pages are
+    committed every CHUNK_ROWS logs; if a page fails, the logs fetched
+    before it are committed and the cursor advanced before returning None,
+    so the next run resumes from the failed page.
+
+    Args:
+        catalog: Iceberg catalog
+        provider: Etherscan provider
+        chain_id: Blockchain chain ID
+        address: Emitting contract address (None for topic-only filters)
+        topics: Topic filters (topic0-topic3)
+        topic_operators: Topic operators (topic0_1_opr, ...)
+        mode: FetchMode.INCREMENTAL or FetchMode.FULL_REFRESH
+        from_block: First block for a full refresh or a first incremental run
+        to_block: Last block to sync or "latest" (the finality frontier)
+        database: Database name
+
+    Returns:
+        LogsSyncResult, or None if the sync failed
+    """
+    address = (address or "").lower()
+    filter_key = topic_filter_key(topics, topic_operators)
+    if not address and not filter_key:
+        raise ValueError("An address or a topic filter is required")
+
+    start_block = from_block
+    if mode == FetchMode.INCREMENTAL:
+        cursor = await iceberg_writer.run(
+            read_logs_cursor,
+            catalog,
+            database,
+            chain_id,
+            address,
+            filter_key,
+            priority=PRIORITY_HIGH,
+        )
+        if cursor is not None:
+            start_block = cursor[1] + 1
+
+    finalized_block = await resolve_finalized_block(provider, chain_id)
+    if finalized_block is None:
+        logger.error(
+            f"Finality frontier unknown on chain {chain_id}, not syncing logs "
+            f"for {address or '*'} ('{filter_key}')"
+        )
+        return None
+    end_limit = (
+        finalized_block if to_block == "latest" else min(int(to_block), finalized_block)
+    )
+    if start_block > end_limit:
+        logger.info(
+            f"Logs for {address or '*'} ('{filter_key}') are synced up to the "
+            f"final block {end_limit}"
+        )
+        return LogsSyncResult(0, 0, start_block, None)
+    logger.info(
+        f"Syncing logs for {address or '*'} ('{filter_key}') on chain {chain_id} "
+        f"from block {start_block} to final block {end_limit} ({mode.value})"
+    )
+
+    pending: List[Dict] = []
+    carried = logs_to_arrow([])
+    rows_committed = 0
+    chunks_committed = 0
+    end_block = None
+
+    async def commit(committed_through: int):
+        nonlocal pending, carried, rows_committed, chunks_committed, end_block
+        rows = pa.concat_tables([carried, logs_to_arrow(pending)])
+        carried = await _commit_logs(
+            catalog,
+            database,
+            chain_id,
+            address,
+            filter_key,
+            rows,
+            start_block,
+            committed_through,
+        )
+        pending = []
+        rows_committed += rows.num_rows - carried.num_rows
+        chunks_committed += 1
+        end_block = committed_through
+
+    try:
+        async for batch in provider.logs.iter_logs_batches(
+            chain_id=chain_id,
+            from_block=start_block,
+            to_block=str(end_limit),
+            address=address or None,
+            topics=topics,
+            topic_operators=topic_operators,
+            enhance=False,
+        ):
+            pending.extend(batch.logs)
+            if batch.next_block is not None and len(pending) < CHUNK_ROWS:
+                continue
+
+            # Blocks below the next page's start are complete
+            if batch.next_block is not None:
+                await commit(batch.next_block - 1)
+            else:
+                await commit(end_limit)
+
+    except FetchInterruptedError as e:
+        logger.error(f"Logs sync interrupted: {e}")
+        try:
+            if e.resume_block > start_block:
+                await commit(e.resume_block - 1)
+                logger.info(
+                    f"Committed {rows_committed} logs before the failure, "
+                    f"next run resumes at block {e.resume_block}"
+                )
+        except Exception as commit_error:
+            logger.error(f"Failed to commit logs before the failure: {commit_error}")
+            logger.debug(traceback.format_exc())
+        return None
+
+    except Exception as e:
+        logger.error(f"Error syncing logs: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+    logger.info(
+        f"Logs sync complete: {rows_committed} logs in {chunks_committed} chunks"
+    )
+    return LogsSyncResult(rows_committed, chunks_committed, start_block, end_block)
@@ -0,0 +1,128 @@
+"""
+Staged Pipeline Helpers
+
+Building blocks for running fetch → transform → load as concurrent stages:
+- Bounded asyncio queues between stages for backpressure
+- StageMetrics: per-stage busy / idle / blocked time and throughput
+- Bottleneck reporting from the collected metrics
+
+A stage is "busy" while doing its own work, "idle" while waiting on its
+upstream queue and "blocked" while waiting for room in its downstream queue.
+The stage with the most busy time is the bottleneck; the others mostly wait.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from config.logging_config import get_logger
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Marks the end of a stream on a stage queue
+END_OF_STREAM = object()
+
+
+@dataclass
+class StageMetrics:
+    """Throughput and time accounting for one pipeline stage."""
+
+    name: str
+    batches: int = 0
+    rows: int = 0
+    busy_seconds: float = 0.0
+    idle_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows processed per second of busy time."""
+        return self.rows / self.busy_seconds if self.busy_seconds else 0.0
+
+    def record(self, rows: int, busy_seconds: float):
+        """Record one processed batch."""
+        self.batches += 1
+        self.rows += rows
+        self.busy_seconds += busy_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "batches": self.batches,
+            "rows": self.rows,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "idle_seconds": round(self.idle_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def create_stage_queue(maxsize: int) -> asyncio.Queue:
+    """
+    Create a bounded queue between two stages.
+
+    A full queue makes the upstream stage wait, so a slow writer throttles
+    fetching instead of letting fetched pages pile up in memory.
+
+    Args:
+        maxsize: Maximum number of batches in flight between the stages
+
+    Returns:
+        asyncio.Queue
+    """
+    return asyncio.Queue(maxsize=maxsize)
+
+
+async def get_item(queue: asyncio.Queue, metrics: StageMetrics) -> Any:
+    """Take the next item from an upstream queue, counting the wait as idle time."""
+    start = time.perf_counter()
+    item = await queue.get()
+    metrics.idle_seconds += time.perf_counter() - start
+    return item
+
+
+async def put_item(queue: asyncio.Queue, item: Any, metrics: StageMetrics):
+    """Hand an item downstream, counting a full queue as blocked time."""
+    start = time.perf_counter()
+    await queue.put(item)
+    metrics.blocked_seconds += time.perf_counter() - start
+
+
+def find_bottleneck(metrics: List[StageMetrics]) -> Optional[StageMetrics]:
+    """
+    Return the stage that spent the most time busy.
+
+    Args:
+        metrics: Metrics of every stage in the pipeline
+
+    Returns:
+        Bottleneck stage metrics, or None if nothing ran
+    """
+    active = [m for m in metrics if m.batches]
+    return max(active, key=lambda m: m.busy_seconds) if active else None
+
+
+def log_pipeline_metrics(metrics: List[StageMetrics], log_prefix: str = "Pipeline"):
+    """
+    Log per-stage throughput and the bottleneck stage.
+
+    Args:
+        metrics: Metrics of every stage in the pipeline
+        log_prefix: Prefix for the log lines
+    """
+    for stage in metrics:
+        logger.info(
+            f"{log_prefix}: stage {stage.name}: {stage.batches} batches, "
+            f"{stage.rows} rows, busy {stage.busy_seconds:.2f}s, "
+            f"idle {stage.idle_seconds:.2f}s, blocked {stage.blocked_seconds:.2f}s, "
+            f"{stage.rows_per_second:.0f} rows/s"
+        )
+
+    bottleneck = find_bottleneck(metrics)
+    if bottleneck:
+        logger.info(
+            f"{log_prefix}: bottleneck is the {bottleneck.name} stage "
+            f"({bottleneck.busy_seconds:.2f}s busy)"
+        )
@@ -0,0 +1,594 @@
+"""
+Checkpointed Transaction Sync
+
+Resumable sync of an address's transactions into raw.transactions.
+
+Architecture:
+- TransactionSync: Runs fetch → normalize → write as concurrent stages joined by
+  bounded queues, committing every CHUNK_ROWS rows
+- SyncCheckpoint: Progress stored in Redis after each committed chunk
+  (resume block, last committed block, rows committed so far)
+- ContractUserIndex: Users of every committed chunk are added to the address's
+  Redis user index
+- Each committed chunk is published as a progress event on the task's channel
+- Fetching stops at the chain's finality frontier (latest block minus the
+  finality depth), so reorgable blocks are never loaded and the next sync
+  picks them up once they are final
+
+A failed or restarted sync for the same address picks up from the checkpoint
+instead of re-downloading every page. Rows fetched before a page failure are
+committed before the error is re-raised, so no completed page is lost.
+"""
+
+import asyncio
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from config.redis_config import generate_sync_checkpoint_key
+from db.iceberg import load_table
+from db.writer import PRIORITY_HIGH, PRIORITY_NORMAL, iceberg_writer
+from jobs.progress import publish_progress
+from pipelines.raw.cursor import get_cursor, update_cursor
+from pipelines.raw.finality import resolve_finalized_block
+from pipelines.raw.pipeline import (
+    END_OF_STREAM,
+    StageMetrics,
+    create_stage_queue,
+    get_item,
+    log_pipeline_metrics,
+    put_item,
+)
+from pipelines.raw.transactions import load_transactions_with_safety
+from pipelines.raw.user_index import ContractUserIndex
+from providers.etherscan import FetchInterruptedError, FetchMode, TimePeriod
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+
+def _split_at_block(rows: pa.Table, block: int) -> Tuple[pa.Table, pa.Table]:
+    """Split transactions into those up to a block and those above it."""
+    blocks = pc.cast(rows["block_number"], pa.int64())
+    complete = pc.less_equal(blocks, block)
+    return rows.filter(complete), rows.filter(pc.invert(complete))
+
+
+@dataclass
+class SyncCheckpoint:
+    """Progress of an in-flight sync, persisted after each committed chunk."""
+
+    chain_id: int
+    address: str
+    mode: str
+    start_block: int  # First block of the whole sync
+    next_block: int  # Block to resume fetching from
+    last_committed_block: Optional[int] = None  # Highest block committed
+    rows_committed: int = 0
+    task_id: Optional[str] = None
+    time_period: Optional[str] = None  # Period of a time_range sync
+    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+@dataclass
+class SyncResult:
+    """Outcome of a sync run."""
+
+    rows_committed: int
+    chunks_committed: int
+    start_block: int
+    end_block: Optional[int]
+    resumed: bool
+    stage_metrics: List[Dict] = field(default_factory=list)
+
+
+@dataclass
+class _NormalizedBatch:
+    """A fetched page converted to an Arrow table in the table schema."""
+
+    table: pa.Table
+    last_block_number: int
+    next_block: Optional[int]
+
+
+class TransactionSync:
+    """
+    Checkpointed sync of one address's transactions.
+
+    Commits fetched rows every CHUNK_ROWS rows, advances the cursor and stores a
+    checkpoint so a restart resumes exactly where the previous run stopped.
+    """
+
+    # Configuration constants
+    CHUNK_ROWS = 50_000  # Rows buffered before committing a chunk
+    FETCH_QUEUE_SIZE = 4  # Fetched pages waiting to be normalized
+    WRITE_QUEUE_SIZE = 4  # Normalized pages waiting to be written
+    CHECKPOINT_TTL = 7 * 86400  # Keep unfinished checkpoints for a week
+
+    def __init__(
+        self,
+        catalog,
+        provider,
+        redis_manager=None,
+        database: str = "raw",
+        task_id: Optional[str] = None,
+    ):
+        """
+        Initialize the sync.
+
+        Args:
+            catalog: Iceberg catalog
+            provider: EtherscanProvider instance
+            redis_manager: Redis manager for checkpoints (None disables resume)
+            database: Database containing transactions and cursor tables
+            task_id: Task identifier for logging
+        """
+        self.catalog = catalog
+        self.provider = provider
+        self.redis_manager = redis_manager
+        self.user_index = (
+            ContractUserIndex(redis_manager) if redis_manager is not None else None
+        )
+        self.database = database
+        self.log_prefix = f"Task {task_id}" if task_id else "Sync"
+        self.task_id = task_id
+        self.finalized_block: Optional[int] = None
+
+    async def get_checkpoint(
+        self, chain_id: int, address: str
+    ) -> Optional[SyncCheckpoint]:
+        """Load the checkpoint of an unfinished sync, if any."""
+        if self.redis_manager is None:
+            return None
+        data = await self.redis_manager.get_json(
+            generate_sync_checkpoint_key(chain_id, address)
+        )
+        return SyncCheckpoint(**data) if data else None
+
+    async def _save_checkpoint(self, checkpoint: SyncCheckpoint):
+        if self.redis_manager is None:
+            return
+        checkpoint.updated_at = datetime.now().isoformat()
+        saved = await self.redis_manager.set_json(
+            generate_sync_checkpoint_key(checkpoint.chain_id, checkpoint.address),
+            asdict(checkpoint),
+            ex=self.CHECKPOINT_TTL,
+        )
+        if not saved:
+            logger.warning(f"{self.log_prefix}: Failed to save sync checkpoint")
+
+    @staticmethod
+    def _checkpoint_matches(
+        checkpoint: SyncCheckpoint,
+        mode: FetchMode,
+        last_block_number: Optional[int],
+        time_period: Optional[TimePeriod],
+    ) -> bool:
+        """Whether a leftover checkpoint belongs to the requested sync."""
+        if checkpoint.mode != mode.value:
+            return False
+        if mode == FetchMode.TIME_RANGE:
+            period = time_period or TimePeriod.DAYS_7
+            return checkpoint.time_period == period.value
+        if mode == FetchMode.INCREMENTAL and last_block_number is not None:
+            # Committed chunks move the cursor to next_block - 1
+            return checkpoint.next_block == last_block_number + 1
+        return True
+
+    async def _clear_checkpoint(self, chain_id: int, address: str):
+        if self.redis_manager is not None:
+            await self.redis_manager.delete(
+                generate_sync_checkpoint_key(chain_id, address)
+            )
+
+    def _current_cursor_end(self, chain_id: int, address: str) -> Optional[int]:
+        cursor_table = load_table(self.catalog, self.database, "cursor", refresh=True)
+        cursor = get_cursor(cursor_table, chain_id, address) if cursor_table else None
+        try:
+            return int(cursor[1]) if cursor else None
+        except (TypeError, ValueError):
+            return None
+
+    async def _commit_chunk(
+        self,
+        checkpoint: SyncCheckpoint,
+        rows: pa.Table,
+        committed_through: int,
+        cursor_start: Optional[int],
+        cursor_end: Optional[int],
+    ) -> Optional[int]:
+        """
+        Write a chunk, advance the cursor, index its users and save the checkpoint.
+
+        The Iceberg write runs on the writer executor so the fetch and
+        normalize stages keep running while it commits.
+
+        Returns:
+            The cursor end block after the commit
+        """
+        if rows.num_rows:
+            loaded = await iceberg_writer.run(
+                load_transactions_with_safety,
+                self.catalog,
+                self.database,
+                checkpoint.chain_id,
+                checkpoint.address,
+                rows,
+                priority=PRIORITY_NORMAL,
+            )
+            if not loaded:
+                raise RuntimeError(
+                    f"Failed to load chunk ending at block {committed_through}"
+                )
+
+        if self.user_index is not None:
+            # The chunk continues from the last committed block (re-read on resume)
+            await self.user_index.record(
+                checkpoint.chain_id,
+                checkpoint.address,
+                rows,
+                (
+                    checkpoint.last_committed_block
+                    if checkpoint.last_committed_block is not None
+                    else checkpoint.start_block
+                ),
+                committed_through,
+            )
+
+        # Only move the cursor forward; a full refresh re-walks covered blocks
+        if cursor_end is None or committed_through > cursor_end:
+            await update_cursor(
+                self.catalog,
+                self.database,
+                checkpoint.chain_id,
+                checkpoint.address,
+                committed_through,
+                start_block=cursor_start,
+            )
+            cursor_end = committed_through
+
+        checkpoint.last_committed_block = committed_through
+        checkpoint.rows_committed += rows.num_rows
+        await self._save_checkpoint(checkpoint)
+
+        await publish_progress(
+            self.redis_manager,
+            self.task_id,
+            "progress",
+            phase="committing",
+            rows_committed=checkpoint.rows_committed,
+            last_committed_block=committed_through,
+        )
+
+        logger.info(
+            f"{self.log_prefix}: Committed {rows.num_rows} rows through block "
+            f"{committed_through} ({checkpoint.rows_committed} total)"
+        )
+        return cursor_end
+
+    async def _fetch_stage(
+        self,
+        checkpoint: SyncCheckpoint,
+        out_queue: asyncio.Queue,
+        metrics: StageMetrics,
+    ) -> Optional[Exception]:
+        """
+        Page through Etherscan and hand raw batches downstream.
+
+        Returns:
+            The fetch error if paging was interrupted, None when complete
+        """
+        batches = self.provider.account.iter_transaction_batches(
+            checkpoint.address,
+            checkpoint.chain_id,
+            checkpoint.next_block,
+            end_block=str(self.finalized_block),
+        )
+        error = None
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    batch = await batches.__anext__()
+                except StopAsyncIteration:
+                    break
+                metrics.record(len(batch.transactions), time.perf_counter() - start)
+                await put_item(out_queue, batch, metrics)
+        except FetchInterruptedError as e:
+            # Let the writer commit what was already fetched before failing
+            error = e
+        await out_queue.put(END_OF_STREAM)
+        return error
+
+    async def _normalize_stage(
+        self,
+        schema: pa.Schema,
+        in_queue: asyncio.Queue,
+        out_queue: asyncio.Queue,
+        metrics: StageMetrics,
+    ):
+        """Convert fetched row dictionaries to Arrow tables in the table schema."""
+        while True:
+            batch = await get_item(in_queue, metrics)
+            if batch is END_OF_STREAM:
+                await out_queue.put(END_OF_STREAM)
+                return
+
+            start = time.perf_counter()
+            # from_pylist with the table schema drops extra keys and orders columns
+            table = pa.Table.from_pylist(batch.transactions, schema=schema)
+            metrics.record(table.num_rows, time.perf_counter() - start)
+
+            await put_item(
+                out_queue,
+                _NormalizedBatch(table, batch.last_block_number, batch.next_block),
+                metrics,
+            )
+
+    async def _write_stage(
+        self,
+        checkpoint: SyncCheckpoint,
+        in_queue: asyncio.Queue,
+        metrics: StageMetrics,
+        cursor_start: Optional[int],
+        cursor_end: Optional[int],
+    ) -> int:
+        """
+        Buffer normalized batches and commit them in CHUNK_ROWS chunks.
+
+        Returns:
+            Number of chunks committed
+        """
+        buffer: List[pa.Table] = []
+        buffered_rows = 0
+        last = None
+        chunks = 0
+
+        while True:
+            batch = await get_item(in_queue, metrics)
+            if batch is END_OF_STREAM:
+                break
+
+            buffer.append(batch.table)
+            buffered_rows += batch.table.num_rows
+            last = batch
+
+            if buffered_rows >= self.CHUNK_ROWS and batch.next_block is not None:
+                start = time.perf_counter()
+                checkpoint.next_block = batch.next_block
+                # The page limit may cut the last block, so only the blocks
+                # before next_block are complete; the rest is carried into the
+                # next chunk (the provider drops the re-read overlap)
+                committed, carried = _split_at_block(
+                    pa.concat_tables(buffer), batch.next_block - 1
+                )
+                cursor_end = await self._commit_chunk(
+                    checkpoint,
+                    committed,
+                    batch.next_block - 1,
+                    cursor_start,
+                    cursor_end,
+                )
+                metrics.record(committed.num_rows, time.perf_counter() - start)
+                buffer, buffered_rows, last = [carried], carried.num_rows, None
+                chunks += 1
+
+        if last is not None:
+            start = time.perf_counter()
+            rows = pa.concat_tables(buffer)
+            if last.next_block is None:
+                checkpoint.next_block = last.last_block_number + 1
+                committed_through = last.last_block_number
+            else:
+                # The stream stopped after a full page (interrupted, or the
+                # next page was empty), so its cut blocks are left to the
+                # run resuming from next_block
+                checkpoint.next_block = last.next_block
+                committed_through = last.next_block - 1
+                rows, _ = _split_at_block(rows, committed_through)
+            await self._commit_chunk(
+                checkpoint,
+                rows,
+                committed_through,
+                cursor_start,
+                cursor_end,
+            )
+            metrics.record(rows.num_rows, time.perf_counter() - start)
+            chunks += 1
+
+        return chunks
+
+    async def run(
+        self,
+        chain_id: int,
+        address: str,
+        mode: FetchMode = FetchMode.INCREMENTAL,
+        last_block_number: Optional[int] = None,
+        time_period: Optional[TimePeriod] = None,
+    ) -> SyncResult:
+        """
+        Sync transactions for an address, resuming from a checkpoint if present.
+
+        Fetching, normalizing and writing run as concurrent stages connected by
+        bounded queues, so network time overlaps with Iceberg writes and a slow
+        writer throttles fetching instead of buffering unbounded pages.
+
+        A leftover checkpoint of a different mode, time period or (for
+        incremental syncs) start block is discarded instead of resumed.
+
+        Args:
+            chain_id: Blockchain chain ID
+            address: Contract or wallet address
+            mode: Fetch mode
+            last_block_number: Last processed block for incremental mode
+            time_period: Time period for TIME_RANGE mode
+
+        Returns:
+            SyncResult describing the run
+
+        Raises:
+            FetchInterruptedError: If fetching fails; progress so far is committed
+            RuntimeError: If the table or the finality frontier is unavailable
+        """
+        address = address.lower()
+        table = await iceberg_writer.run(
+            load_table,
+            self.catalog,
+            self.database,
+            "transactions",
+            priority=PRIORITY_HIGH,
+        )
+        if table is None:
+            raise RuntimeError("Failed to load transactions table")
+
+        # Without the frontier, rows of reorgable blocks would be appended for good
+        self.finalized_block = await resolve_finalized_block(self.provider, chain_id)
+        if self.finalized_block is None:
+            raise RuntimeError(
+                f"Finality frontier of chain {chain_id} unknown, not syncing"
+            )
+        logger.info(
+            f"{self.log_prefix}: Fetching up to final block {self.finalized_block}"
+        )
+
+        checkpoint = await self.get_checkpoint(chain_id, address)
+        if checkpoint and not self._checkpoint_matches(
+            checkpoint, mode, last_block_number, time_period
+        ):
+            logger.info(
+                f"{self.log_prefix}: Discarding {checkpoint.mode} checkpoint at block "
+                f"{checkpoint.next_block}, it doesn't match the requested {mode.value} sync"
+            )
+            await self._clear_checkpoint(chain_id, address)
+            checkpoint = None
+        resumed = checkpoint is not None
+
+        if checkpoint:
+            logger.info(
+                f"{self.log_prefix}: Resuming {checkpoint.mode} sync from block "
+                f"{checkpoint.next_block} ({checkpoint.rows_committed} rows already committed)"
+            )
+            checkpoint.task_id = self.task_id
+        else:
+            start_block = await self.provider.account.resolve_start_block(
+                chain_id, mode, last_block_number, time_period
+            )
+            checkpoint = SyncCheckpoint(
+                chain_id=chain_id,
+                address=address,
+                mode=mode.value,
+                start_block=start_block,
+                next_block=start_block,
+                task_id=self.task_id,
+                time_period=(
+                    (time_period or TimePeriod.DAYS_7).value
+                    if mode == FetchMode.TIME_RANGE
+                    else None
+                ),
+            )
+            await self._save_checkpoint(checkpoint)
+
+        # Incremental syncs extend the existing coverage; others set its start
+        cursor_start = (
+            None
+            if checkpoint.mode == FetchMode.INCREMENTAL.value
+            else checkpoint.start_block
+        )
+        cursor_end = await iceberg_writer.run(
+            self._current_cursor_end, chain_id, address, priority=PRIORITY_HIGH
+        )
+
+        fetch_metrics = StageMetrics("fetch")
+        normalize_metrics = StageMetrics("normalize")
+        write_metrics = StageMetrics("write")
+        fetched = create_stage_queue(self.FETCH_QUEUE_SIZE)
+        normalized = create_stage_queue(self.WRITE_QUEUE_SIZE)
+
+        tasks = [
+            asyncio.create_task(self._fetch_stage(checkpoint, fetched, fetch_metrics)),
+            asyncio.create_task(
+                self._normalize_stage(
+                    table.schema().as_arrow(), fetched, normalized, normalize_metrics
+                )
+            ),
+            asyncio.create_task(
+                self._write_stage(
+                    checkpoint, normalized, write_metrics, cursor_start, cursor_end
+                )
+            ),
+        ]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        failed = [task for task in done if task.exception() is not None]
+        if failed:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        metrics = [fetch_metrics, normalize_metrics, write_metrics]
+        log_pipeline_metrics(metrics, self.log_prefix)
+        if failed:
+            raise failed[0].exception()
+
+        fetch_error, chunks = tasks[0].result(), tasks[2].result()
+        if fetch_error:
+            logger.error(
+                f"{self.log_prefix}: Sync interrupted, resume from block "
+                f"{fetch_error.resume_block}"
+            )
+            raise fetch_error
+
+        await self._clear_checkpoint(chain_id, address)
+        logger.info(
+            f"{self.log_prefix}: Sync complete, {checkpoint.rows_committed} rows "
+            f"committed in {chunks} chunks"
+        )
+        return SyncResult(
+            rows_committed=checkpoint.rows_committed,
+            chunks_committed=chunks,
+            start_block=checkpoint.start_block,
+            end_block=checkpoint.last_committed_block,
+            resumed=resumed,
+            stage_metrics=[m.to_dict() for m in metrics],
+        )
+
+
+async def run_checkpointed_sync(
+    catalog,
+    provider,
+    chain_id: int,
+    address: str,
+    mode: FetchMode,
+    last_block_number: Optional[int] = None,
+    time_period: Optional[TimePeriod] = None,
+    redis_manager=None,
+    task_id: Optional[str] = None,
+) -> Optional[SyncResult]:
+    """
+    Run a checkpointed sync, logging instead of raising on failure.
+
+    Args:
+        catalog: Iceberg catalog
+        provider: EtherscanProvider instance
+        chain_id: Blockchain chain ID
+        address: Contract or wallet address
+        mode: Fetch mode
+        last_block_number: Last processed block for incremental mode
+        time_period: Time period for TIME_RANGE mode
+        redis_manager: Redis manager for checkpoints (None disables resume)
+        task_id: Task identifier for logging
+
+    Returns:
+        SyncResult, or None if the sync failed (progress is kept in the checkpoint)
+    """
+    try:
+        sync = TransactionSync(catalog, provider, redis_manager, task_id=task_id)
+        return await sync.run(chain_id, address, mode, last_block_number, time_period)
+    except Exception as e:
+        logger.error(f"Checkpointed sync for {address} failed: {e}")
+        logger.debug(traceback.format_exc())
+        return None
@@ -4,26 +4,91 @@ Transactions Table Handler
 
 This module provides functions for interacting with the transactions table:
 - Loading transaction data with automatic duplicate detection
-- Processing transactions with smart upsert/append logic
+- Processing transactions with smart upsert/append/merge logic
 """
 
 import traceback
 
+import pyarrow as pa
+import pyarrow.compute as pc
 from config.logging_config import get_logger
 from db.iceberg import (
     append_data,
     load_table,
+    merge_partitions_data,
     upsert_data,
 )
+from db.partitioning import with_address_buckets
 from pipelines.raw.cursor import check_cursor_before_load, check_for_data_overlap
+from pipelines.raw.key_index import get_transactions_key_index
 from utils.blockchain import extract_block_range
 
 # Create a logger for this module
 logger = get_logger(__name__)
 
+# Columns identifying a transaction row
+TRANSACTIONS_JOIN_COLS = ["chain_id", "block_number", "hash"]
+
+# Identity partition columns of raw.transactions
+TRANSACTIONS_PARTITION_COLS = ["chain_id", "block_date"]
+
+# Merge modes used when incoming data overlaps existing data
+MERGE_MODE_UPSERT = "upsert"
+MERGE_MODE_PARTITION_OVERWRITE = "partition_overwrite"
+
+
+def _merge_transactions(table, data, schema, merge_mode):
+    """
+    Merge overlapping transaction data using the requested merge mode.
+
+    Args:
+        table: Iceberg transactions table
+        data: List of dictionaries containing the transaction data
+        schema: PyArrow schema of the table
+        merge_mode: MERGE_MODE_PARTITION_OVERWRITE or MERGE_MODE_UPSERT
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if merge_mode == MERGE_MODE_PARTITION_OVERWRITE:
+        logger.info(
+            f"Using PARTITION OVERWRITE for {len(data)} transactions (duplicate prevention)"
+        )
+        return merge_partitions_data(
+            table,
+            data,
+            schema,
+            join_cols=TRANSACTIONS_JOIN_COLS,
+            partition_cols=TRANSACTIONS_PARTITION_COLS,
+        )
+
+    logger.info(f"Using UPSERT for {len(data)} transactions (duplicate prevention)")
+    upsert_data(table, data, schema, join_cols=TRANSACTIONS_JOIN_COLS)
+    return True
+
+
+def _transaction_block_range(data):
+    """Min and max block number of list-of-dict or Arrow transaction data."""
+    if not isinstance(data, pa.Table):
+        return extract_block_range(data)
+
+    blocks = pc.cast(data["block_number"], pa.int64())
+    blocks = pc.filter(blocks, pc.greater(blocks, 0))
+    if len(blocks) == 0:
+        return None, None
+    bounds = pc.min_max(blocks)
+    return bounds["min"].as_py(), bounds["max"].as_py()
+
 
 def load_transactions_with_safety(
-    catalog, database, chain_id, contract_address, data, force_upsert=False
+    catalog,
+    database,
+    chain_id,
+    contract_address,
+    data,
+    force_upsert=False,
+    merge_mode=MERGE_MODE_PARTITION_OVERWRITE,
+    use_key_index=True,
 ):
     """
     Load transaction data into the transactions table with automatic overlap detection.
@@ -33,13 +98,26 @@ def load_transactions_with_safety(
     - Performance considerations (append when safe)
     - Safety overrides (force_upsert for guaranteed deduplication)
 
+    Overlapping data is merged with a partition-scoped overwrite by default: only
+    the (chain_id, block_date) partitions touched by the batch are read, merged
+    and rewritten, so the cost scales with the batch rather than the table.
+
+    When the transaction_keys index is available, overlapping batches are first
+    split against it: rows we already have are dropped, new rows are appended and
+    only rows whose stored values changed are merged. The index is updated with
+    every write.
+
     Args:
         catalog: Iceberg catalog
         database: Database name
         chain_id: Blockchain chain ID
         contract_address: Contract address
-        data: List of dictionaries containing the transaction data
-        force_upsert: If True, always use upsert regardless of overlap detection
+        data: List of dictionaries or PyArrow table containing the transaction data
+        force_upsert: If True, always merge regardless of overlap detection
+        merge_mode: How overlapping data is merged - "partition_overwrite" (default)
+                    or "upsert" (PyIceberg whole-table upsert)
+        use_key_index: If True, use the transaction_keys index to turn overlapping
+                       loads into appends and keep it up to date
 
     Returns:
         bool: True if successful, False otherwise
@@ -58,13 +136,14 @@ def load_transactions_with_safety(
             logger.info(f"Safety check: No existing data for {contract_address}")
 
         # Load the transactions table
-        table = load_table(catalog, database, "transactions")
+        table = load_table(catalog, database, "transactions", refresh=True)
         if not table:
             logger.error("Failed to load transactions table")
             return False
 
         # Get the schema
         schema = table.schema().as_arrow()
+        data = with_address_buckets(table, data)
 
         # Determine the operation method
         should_upsert = force_upsert
@@ -72,7 +151,9 @@ def load_transactions_with_safety(
         if not force_upsert and data:
             # Get block range from the new data
             try:
-                lowest_block_number, highest_block_number = extract_block_range(data)
+                lowest_block_number, highest_block_number = _transaction_block_range(
+                    data
+                )
                 if lowest_block_number is not None and highest_block_number is not None:
                     # Check for overlap with existing data
                     should_upsert = check_for_data_overlap(
@@ -92,20 +173,39 @@ def load_transactions_with_safety(
                 )
                 should_upsert = True  # Safe default
 
+        key_index = (
+            get_transactions_key_index(catalog, database)
+            if use_key_index and data
+            else None
+        )
+
         # Perform the operation
-        if should_upsert:
-            logger.info(
-                f"Using UPSERT for {len(data)} transactions (duplicate prevention)"
-            )
-            upsert_data(
-                table, data, schema, join_cols=["chain_id", "block_number", "hash"]
-            )
+        written = data
+        if should_upsert and key_index and not force_upsert:
+            rows = data.to_pylist() if isinstance(data, pa.Table) else data
+            new_rows, changed_rows = key_index.split_batch(table, rows)
+            if new_rows:
+                logger.info(
+                    f"Using APPEND for {len(new_rows)} transactions (not in key index)"
+                )
+                append_data(table, new_rows, schema)
+            if changed_rows and not _merge_transactions(
+                table, changed_rows, schema, merge_mode
+            ):
+                return False
+            written = new_rows + changed_rows
+        elif should_upsert:
+            if not _merge_transactions(table, data, schema, merge_mode):
+                return False
         else:
             logger.info(
                 f"Using APPEND for {len(data)} transactions (no overlap detected)"
             )
             append_data(table, data, schema)
 
+        if key_index and not key_index.add_rows(table, written):
+            logger.warning("Failed to update transaction key index")
+
         return True
 
     except Exception as e:
@@ -122,26 +222,31 @@ def load_transactions_simple(catalog, database, data, operation="auto"):
         catalog: Iceberg catalog
         database: Database name
         data: List of dictionaries containing the transaction data
-        operation: "auto" (smart detection), "upsert" (force upsert), "append" (force append)
+        operation: "auto" (smart detection), "upsert" (force upsert), "append" (force append),
+                   "merge" (force partition-scoped overwrite)
 
     Returns:
         bool: True if successful, False otherwise
     """
     try:
         # Load the transactions table
-        table = load_table(catalog, database, "transactions")
+        table = load_table(catalog, database, "transactions", refresh=True)
         if not table:
             logger.error("Failed to load transactions table")
             return False
 
         # Get the schema
         schema = table.schema().as_arrow()
+        data = with_address_buckets(table, data)
 
         # Perform the operation
         if operation == "upsert":
             logger.info(f"Force UPSERT for {len(data)} transactions")
-            upsert_data(
-                table, data, schema, join_cols=["chain_id", "block_number", "hash"]
+            upsert_data(table, data, schema, join_cols=TRANSACTIONS_JOIN_COLS)
+        elif operation == "merge":
+            logger.info(f"Force MERGE for {len(data)} transactions")
+            return _merge_transactions(
+                table, data, schema, MERGE_MODE_PARTITION_OVERWRITE
             )
         elif operation == "append":
             logger.info(f"Force APPEND for {len(data)} transactions")
@@ -151,9 +256,7 @@ def load_transactions_simple(catalog, database, data, operation="auto"):
             logger.info(
                 f"Auto mode - using UPSERT for {len(data)} transactions (safe default)"
             )
-            upsert_data(
-                table, data, schema, join_cols=["chain_id", "block_number", "hash"]
-            )
+            upsert_data(table, data, schema, join_cols=TRANSACTIONS_JOIN_COLS)
 
         return True
 
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Contract User Index
+
+Per-contract user structures in Redis, maintained by every ingest path:
+- users (ZSET): Each address that interacted with the contract, scored by the
+  last block it was seen in, so the most recent users are a ZREVRANGE away
+- hll (HyperLogLog): Unique-user cardinality, kept even when the ZSET is trimmed
+- coverage (HASH): The contiguous block range whose transactions have all been
+  indexed; only users seen inside it are served
+
+Syncs and address imports record every batch they ingest, so address imports
+and user counts are answered from Redis, and Etherscan is only asked for
+history older than the covered range.
+"""
+
+import traceback
+from typing import Dict, List, Optional, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from config.redis_config import (
+    RedisManager,
+    generate_contract_users_coverage_key,
+    generate_contract_users_hll_key,
+    generate_contract_users_key,
+)
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Merge a block range into the stored coverage. Overlapping or adjacent ranges
+# are joined; a disjoint range replaces the coverage only if it is newer, so the
+# coverage is always the most recent contiguous stretch.
+# KEYS: coverage  ARGV: start_block, end_block, ttl
+_COVERAGE_SCRIPT = """
+local start_block = tonumber(ARGV[1])
+local end_block = tonumber(ARGV[2])
+local current = redis.call('HMGET', KEYS[1], 'start_block', 'end_block')
+if current[1] then
+    local current_start = tonumber(current[1])
+    local current_end = tonumber(current[2])
+    if start_block <= current_end + 1 and end_block >= current_start - 1 then
+        start_block = math.min(start_block, current_start)
+        end_block = math.max(end_block, current_end)
+    elseif end_block < current_start then
+        start_block = current_start
+        end_block = current_end
+    end
+end
+redis.call('HSET', KEYS[1], 'start_block', start_block, 'end_block', end_block)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {start_block, end_block}
+"""
+
+
+def last_seen_blocks(
+    transactions: Union[pa.Table, List[Dict]], exclude_address: str
+) -> Dict[str, int]:
+    """
+    Compute the highest block each address appears in.
+
+    Args:
+        transactions: Arrow table or row dictionaries with from, to and
+            block_number
+        exclude_address: Lowercase address to skip (the contract itself)
+
+    Returns:
+        Dictionary of lowercase address to last-seen block
+    """
+    if isinstance(transactions, pa.Table):
+        table = transactions.select(["from", "to", "block_number"])
+    else:
+        table = pa.table(
+            {
+                "from": pa.array([tx.get("from") for tx in transactions], pa.string()),
+                "to": pa.array([tx.get("to") for tx in transactions], pa.string()),
+                "block_number": pa.array(
+                    [tx.get("block_number") for tx in transactions], pa.string()
+                ),
+            }
+        )
+    if table.num_rows == 0:
+        return {}
+
+    blocks = pc.cast(table["block_number"], pa.int64())
+    stacked = pa.table(
+        {
+            "address": pc.ascii_lower(
+                pa.chunked_array(table["from"].chunks + table["to"].chunks)
+            ),
+            "block": pa.chunked_array(blocks.chunks + blocks.chunks),
+        }
+    )
+    address = stacked["address"]
+    stacked = stacked.filter(
+        pc.and_(
+            pc.and_(pc.is_valid(address), pc.not_equal(address, "")),
+            pc.not_equal(address, exclude_address),
+        )
+    )
+    latest = stacked.group_by("address").aggregate([("block", "max")])
+    return dict(zip(latest["address"].to_pylist(), latest["block_max"].to_pylist()))
+
+
+class ContractUserIndex:
+    """
+    Redis-backed recency index and cardinality estimate of a contract's users.
+
+    All operations log and return a falsy value on Redis errors, so ingest
+    paths never fail because the index could not be updated.
+    """
+
+    # Configuration constants
+    INDEX_TTL = 30 * 86400  # Dropped if no ingest touches the contract for 30 days
+    MAX_USERS = 100_000  # Most recent users kept in the sorted set
+    ZADD_CHUNK = 10_000  # Members per ZADD/PFADD call
+
+    def __init__(self, redis_manager: RedisManager):
+        """
+        Initialize the index.
+
+        Args:
+            redis_manager: Redis manager holding the index
+        """
+        self.redis_manager = redis_manager
+        self._coverage_script = None
+
+    async def _client(self):
+        if not self.redis_manager.connected:
+            await self.redis_manager.connect()
+        return self.redis_manager.client
+
+    async def record(
+        self,
+        chain_id: int,
+        contract_address: str,
+        transactions: Union[pa.Table, List[Dict]],
+        start_block: Optional[int],
+        end_block: Optional[int],
+    ) -> bool:
+        """
+        Add ingested transactions to the index and extend its coverage.
+
+        Args:
+            chain_id: Blockchain chain ID
+            contract_address: Contract (or wallet) the transactions belong to
+            transactions: Every transaction of the address in the block range
+            start_block: First block the transactions fully cover
+            end_block: Last block the transactions fully cover
+
+        Returns:
+            bool: True if the index was updated
+        """
+        contract_address = contract_address.lower()
+        try:
+            users = last_seen_blocks(transactions, contract_address)
+            client = await self._client()
+            users_key = generate_contract_users_key(chain_id, contract_address)
+            hll_key = generate_contract_users_hll_key(chain_id, contract_address)
+
+            if users:
+                members = list(users.items())
+                async with client.pipeline(transaction=False) as pipe:
+                    for offset in range(0, len(members), self.ZADD_CHUNK):
+                        chunk = dict(members[offset : offset + self.ZADD_CHUNK])
+                        # GT: never move a user back to an older block
+                        pipe.zadd(users_key, chunk, gt=True)
+                        pipe.pfadd(hll_key, *chunk.keys())
+                    pipe.zremrangebyrank(users_key, 0, -(self.MAX_USERS + 1))
+                    pipe.expire(users_key, self.INDEX_TTL)
+                    pipe.expire(hll_key, self.INDEX_TTL)
+                    await pipe.execute()
+
+            if (
+                start_block is not None
+                and end_block is not None
+                and start_block <= end_block
+            ):
+                if self._coverage_script is None:
+                    self._coverage_script = client.register_script(_COVERAGE_SCRIPT)
+                await self._coverage_script(
+                    keys=[
+                        generate_contract_users_coverage_key(chain_id, contract_address)
+                    ],
+                    args=[start_block, end_block, self.INDEX_TTL],
+                )
+
+            logger.debug(
+                f"Indexed {len(users)} users of {contract_address} on chain {chain_id} "
+                f"(blocks {start_block}-{end_block})"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error indexing users of {contract_address}: {e}")
+            logger.debug(traceback.format_exc())
+            return False
+
+    async def get_coverage(
+        self, chain_id: int, contract_address: str
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Get the block range the index fully covers.
+
+        Args:
+            chain_id: Blockchain chain ID
+            contract_address: Contract address
+
+        Returns:
+            Tuple of (start_block, end_block), or None if nothing is indexed
+        """
+        try:
+            client = await self._client()
+            start_block, end_block = await client.hmget(
+                generate_contract_users_coverage_key(chain_id, contract_address),
+                ["start_block", "end_block"],
+            )
+            if start_block is None or end_block is None:
+                return None
+            return int(start_block), int(end_block)
+        except Exception as e:
+            logger.error(f"Error reading user index coverage: {e}")
+            return None
+
+    async def get_recent_users(
+        self, chain_id: int, contract_address: str, limit: int, since_block: int
+    ) -> List[str]:
+        """
+        Get the most recent users seen at or after a block.
+
+        Args:
+            chain_id: Blockchain chain ID
+            contract_address: Contract address
+            limit: Maximum number of users to return
+            since_block: Lowest last-seen block to include (the coverage start)
+
+        Returns:
+            Addresses ordered by last-seen block, newest first
+        """
+        try:
+            client = await self._client()
+            return await client.zrevrangebyscore(
+                generate_contract_users_key(chain_id, contract_address),
+                "+inf",
+                since_block,
+                start=0,
+                num=limit,
+            )
+        except Exception as e:
+            logger.error(f"Error reading recent users of {contract_address}: {e}")
+            return []
+
+    async def count_users(
+        self, chain_id: int, contract_address: str
+    ) -> Optional[Dict[str, int]]:
+        """
+        Get user counts for a contract.
+
+        Args:
+            chain_id: Blockchain chain ID
+            contract_address: Contract address
+
+        Returns:
+            Dictionary with the HyperLogLog estimate, the number of users held in
+            the sorted set and the covered block range, or None if nothing is indexed
+        """
+        try:
+            client = await self._client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.pfcount(
+                    generate_contract_users_hll_key(chain_id, contract_address)
+                )
+                pipe.zcard(generate_contract_users_key(chain_id, contract_address))
+                pipe.hmget(
+                    generate_contract_users_coverage_key(chain_id, contract_address),
+                    ["start_block", "end_block"],
+                )
+                unique_users, indexed_users, (start_block, end_block) = (
+                    await pipe.execute()
+                )
+            if not unique_users and start_block is None:
+                return None
+            return {
+                "unique_users": unique_users,
+                "indexed_users": indexed_users,
+                "start_block": int(start_block) if start_block is not None else None,
+                "end_block": int(end_block) if end_block is not None else None,
+            }
+        except Exception as e:
+            logger.error(f"Error counting users of {contract_address}: {e}")
+            return None
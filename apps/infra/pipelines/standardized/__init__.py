@@ -0,0 +1,3 @@
+"""
+Standardized data pipelines package
+"""
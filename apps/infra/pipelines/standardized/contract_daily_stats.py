@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Contract Daily Stats Rollup
+
+This module maintains standardized.contract_daily_stats, a rollup of
+standardized.transactions by contract and day:
+- One row per (chain_id, contract_address, block_date) with the transaction
+  count, exact wei value and fee sums, the first and last block time and a
+  HyperLogLog sketch of the senders (users_sketch, see utils.hll)
+- Maintained incrementally: only the transactions added since the last
+  update are aggregated, and their rows are merged into the stored rows of
+  the same keys (counts and sums added, times widened, sketches unioned)
+- Sorted by contract_address within each (chain_id, block_date) partition so
+  min/max statistics prune files for per-contract scans
+
+Unique users over several days are estimated by merging the days' sketches,
+so the rollup stays one row per contract and day however many users it has.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from db.iceberg import build_partition_filter
+from pyiceberg.expressions import AlwaysTrue, And, In
+from utils.hll import address_sketches, merge_sketches
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+DATABASE = "standardized"
+TABLE_NAME = "contract_daily_stats"
+
+# Columns identifying a rollup row
+CONTRACT_DAILY_STATS_KEYS = ["chain_id", "contract_address", "block_date"]
+
+
+def _sorted_rows(stats: pa.Table) -> pa.Table:
+    return stats.sort_by(
+        [("contract_address", "ascending"), ("block_date", "ascending")]
+    )
+
+
+def aggregate_daily_stats(transactions: pa.Table) -> pa.Table:
+    """
+    Aggregate standardized transactions into contract daily stats rows.
+
+    Transactions without a recipient (contract creations) are skipped.
+
+    Args:
+        transactions: PyArrow table of standardized.transactions columns
+
+    Returns:
+        PyArrow table of contract_daily_stats rows sorted by contract_address
+    """
+    transactions = transactions.filter(pc.is_valid(transactions["to"]))
+    stats = (
+        transactions.select(
+            [
+                "chain_id",
+                "block_date",
+                "to",
+                "from",
+                "hash",
+                "value",
+                "fee",
+                "block_time",
+            ]
+        )
+        .group_by(["chain_id", "block_date", "to"], use_threads=False)
+        .aggregate(
+            [
+                ("hash", "count"),
+                ("value", "sum"),
+                ("fee", "sum"),
+                ("block_time", "min"),
+                ("block_time", "max"),
+                ("from", "distinct"),
+            ]
+        )
+    )
+    stats = stats.append_column(
+        "users_sketch", address_sketches(stats["from_distinct"])
+    ).drop_columns(["from_distinct"])
+    stats = stats.rename_columns(
+        {
+            "to": "contract_address",
+            "hash_count": "tx_count",
+            "value_sum": "total_value",
+            "fee_sum": "total_fees",
+            "block_time_min": "first_time",
+            "block_time_max": "last_time",
+        }
+    )
+    return _sorted_rows(stats)
+
+
+def combine_daily_stats(stats: pa.Table) -> pa.Table:
+    """
+    Combine rollup rows sharing a key into one row per key.
+
+    Args:
+        stats: PyArrow table of contract_daily_stats rows
+
+    Returns:
+        PyArrow table of contract_daily_stats rows sorted by contract_address
+    """
+    combined = stats.group_by(CONTRACT_DAILY_STATS_KEYS, use_threads=False).aggregate(
+        [
+            ("tx_count", "sum"),
+            ("total_value", "sum"),
+            ("total_fees", "sum"),
+            ("first_time", "min"),
+            ("last_time", "max"),
+            ("users_sketch", "list"),
+        ]
+    )
+    sketches = pa.array(
+        [merge_sketches(s) for s in combined["users_sketch_list"].to_pylist()],
+        pa.binary(),
+    )
+    combined = combined.append_column("users_sketch", sketches).drop_columns(
+        ["users_sketch_list"]
+    )
+    return _sorted_rows(
+        combined.rename_columns(
+            {
+                "tx_count_sum": "tx_count",
+                "total_value_sum": "total_value",
+                "total_fees_sum": "total_fees",
+                "first_time_min": "first_time",
+                "last_time_max": "last_time",
+            }
+        )
+    )
+
+
+def merge_daily_stats(
+    table, stats: pa.Table, replace: bool = False, snapshot_properties=None
+) -> None:
+    """
+    Merge rollup rows of new transactions into the table (synchronous).
+
+    Only the stored rows of the contracts and days in the batch are read,
+    combined with it and rewritten, in one commit.
+
+    Args:
+        table: standardized.contract_daily_stats Iceberg table
+        stats: Rollup rows from aggregate_daily_stats()
+        replace: Replace every stored row instead (the first batch of a
+            rebuild)
+        snapshot_properties: Properties recorded on the commit
+    """
+    schema = table.schema().as_arrow()
+    stats = stats.select(schema.names).cast(schema)
+
+    if replace:
+        merged, row_filter, existing_rows = stats, AlwaysTrue(), 0
+    else:
+        row_filter = build_partition_filter(stats, ["chain_id", "block_date"])
+        if row_filter is None:
+            raise ValueError("Rollup rows without a chain_id or block_date")
+        row_filter = And(
+            row_filter,
+            In("contract_address", set(stats["contract_address"].to_pylist())),
+        )
+        existing = table.scan(row_filter=row_filter).to_arrow()
+        existing_rows = existing.num_rows
+        merged = combine_daily_stats(
+            pa.concat_tables([existing.select(schema.names).cast(schema), stats])
+        )
+
+    table.overwrite(
+        merged.select(schema.names).cast(schema),
+        overwrite_filter=row_filter,
+        snapshot_properties=snapshot_properties or {},
+    )
+    logger.info(
+        f"Merged {stats.num_rows} contract daily stats rows into "
+        f"{existing_rows} stored rows"
+    )
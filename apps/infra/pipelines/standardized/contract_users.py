@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Contract Users Table Handler
+
+This module keeps a durable copy of address import results in
+standardized.contract_users:
+- One row per (chain_id, contract_address) with the most recent users, the
+  block range they were found in and when the result was produced
+- Written after every import, so a Redis eviction or restart doesn't force an
+  Etherscan rescan
+- Read when the Redis cache misses, before falling back to Etherscan
+"""
+
+import traceback
+from datetime import datetime
+from typing import Dict, Optional
+
+import pyarrow as pa
+from config.logging_config import get_logger
+from db.iceberg import load_table
+from db.writer import PRIORITY_HIGH, PRIORITY_LOW, iceberg_writer
+from pyiceberg.expressions import And, EqualTo
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+DATABASE = "standardized"
+TABLE_NAME = "contract_users"
+
+
+def _contract_filter(chain_id: int, contract_address: str):
+    return And(
+        EqualTo("chain_id", chain_id),
+        EqualTo("contract_address", contract_address.lower()),
+    )
+
+
+def read_contract_users(
+    catalog, chain_id: int, contract_address: str
+) -> Optional[Dict]:
+    """
+    Read the stored import result for a contract (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+
+    Returns:
+        Row dictionary with addresses, counts, block range and timestamps, or
+        None if no result is stored
+    """
+    try:
+        table = load_table(catalog, DATABASE, TABLE_NAME)
+        if not table:
+            return None
+
+        rows = (
+            table.scan(row_filter=_contract_filter(chain_id, contract_address))
+            .to_arrow()
+            .to_pylist()
+        )
+        if not rows:
+            return None
+
+        # Concurrent writers can briefly leave two rows; the newest wins
+        return max(rows, key=lambda row: row["updated_at"])
+
+    except Exception as e:
+        logger.error(f"Error reading contract users for {contract_address}: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+
+def write_contract_users(
+    catalog, chain_id: int, contract_address: str, result: Dict
+) -> bool:
+    """
+    Replace the stored import result for a contract (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+        result: Import result with addresses, total_addresses, blocks_processed,
+            transactions_processed, start_block, end_block and last_updated
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        table = load_table(catalog, DATABASE, TABLE_NAME, refresh=True)
+        if not table:
+            return False
+
+        row = {
+            "chain_id": chain_id,
+            "contract_address": contract_address.lower(),
+            "addresses": result["addresses"],
+            "total_addresses": result["total_addresses"],
+            "blocks_processed": result["blocks_processed"],
+            "transactions_processed": result["transactions_processed"],
+            "start_block": result["start_block"],
+            "end_block": result["end_block"],
+            "last_updated": result["last_updated"],
+            "updated_at": datetime.now(),
+        }
+        data = pa.Table.from_pylist([row], schema=table.schema().as_arrow())
+
+        # Delete the previous row and append the new one in a single snapshot
+        table.overwrite(
+            data, overwrite_filter=_contract_filter(chain_id, contract_address)
+        )
+        logger.info(
+            f"Stored {result['total_addresses']} contract users for "
+            f"{contract_address} on chain {chain_id}"
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Error writing contract users for {contract_address}: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+
+async def get_contract_users(
+    catalog, chain_id: int, contract_address: str
+) -> Optional[Dict]:
+    """
+    Read the stored import result for a contract on the Iceberg writer.
+
+    Runs at high priority: it sits on the path of an import request.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+
+    Returns:
+        Row dictionary, or None if no result is stored
+    """
+    return await iceberg_writer.run(
+        read_contract_users,
+        catalog,
+        chain_id,
+        contract_address,
+        priority=PRIORITY_HIGH,
+    )
+
+
+async def save_contract_users(
+    catalog, chain_id: int, contract_address: str, result: Dict
+) -> bool:
+    """
+    Replace the stored import result for a contract on the Iceberg writer.
+
+    Runs at low priority: the result is already cached in Redis.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+        result: Import result fields (see write_contract_users)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return await iceberg_writer.run(
+        write_contract_users,
+        catalog,
+        chain_id,
+        contract_address,
+        result,
+        priority=PRIORITY_LOW,
+    )
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+Decoded Calls Table Handler
+
+This module decodes contract call arguments from standardized.transactions
+calldata into standardized.decoded_calls:
+- ABIs come from standardized.contracts and are parsed once per ABI into a
+  selector → function map (LRU cached)
+- Transactions are grouped by (contract, 4-byte selector), so each group is
+  decoded in bulk with a single set of argument types
+- Groups are split into chunks decoded on a process pool, so decoding scales
+  across cores instead of holding the event loop
+- Per-selector throughput is reported as StageMetrics
+- Incremental runs decode the standardized.transactions partitions that
+  changed since the snapshot the contract's last run read, so history loaded
+  below already decoded blocks (imports, backfills, full refreshes) is decoded
+  too; the snapshot is recorded per contract in standardized.decoded_calls_cursor
+  right after the contract's calls are written
+
+Arguments are stored as a JSON object keyed by input name; integers are
+written as decimal strings and bytes as 0x-prefixed hex, so no value loses
+precision.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from db.iceberg import load_table, merge_partitions_data
+from db.partitioning import address_bucket_filter
+from db.writer import PRIORITY_HIGH, PRIORITY_NORMAL, iceberg_writer
+from eth_abi import decode
+from eth_utils import function_signature_to_4byte_selector
+from pipelines.raw.pipeline import StageMetrics, log_pipeline_metrics
+from pipelines.standardized.transactions import changed_partitions, partitions_filter
+from pyiceberg.expressions import And, EqualTo, GreaterThanOrEqual, In
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+DATABASE = "standardized"
+TABLE_NAME = "decoded_calls"
+
+# Columns identifying a decoded call
+DECODED_CALLS_JOIN_COLS = ["chain_id", "hash"]
+
+# Identity partition columns of standardized.decoded_calls
+DECODED_CALLS_PARTITION_COLS = ["chain_id", "block_date"]
+
+# Decoder processes and calls decoded per process task
+DECODE_PROCESSES = int(os.getenv("DECODE_PROCESSES", str(os.cpu_count() or 1)))
+DECODE_CHUNK = 5_000
+
+# Typed transactions the calls are decoded from
+SOURCE_DATABASE = "standardized"
+SOURCE_TABLE_NAME = "transactions"
+
+# One row per (chain_id, contract_address) with the source snapshot its last run read
+CURSOR_TABLE_NAME = "decoded_calls_cursor"
+
+# Columns of standardized.transactions the decoder reads
+_TRANSACTION_COLUMNS = (
+    "chain_id",
+    "block_number",
+    "block_time",
+    "block_date",
+    "hash",
+    "from",
+    "to",
+    "input",
+)
+
+
+@dataclass(frozen=True)
+class FunctionAbi:
+    """A function of a contract ABI, keyed by its 4-byte selector."""
+
+    selector: str
+    name: str
+    signature: str
+    types: Tuple[str, ...]
+    names: Tuple[str, ...]
+
+
+@dataclass
+class DecodeResult:
+    """Outcome of a decoding run."""
+
+    calls: int = 0
+    decoded: int = 0
+    failed: int = 0
+    start_block: Optional[int] = None
+    end_block: Optional[int] = None
+    selectors: List[Dict] = field(default_factory=list)
+
+
+@dataclass
+class DecodePlan:
+    """The source rows of a decoding run and the snapshot they were read at."""
+
+    transactions: Optional[pa.Table]  # None when nothing needs decoding
+    source_snapshot_id: Optional[int] = None  # Recorded once the run is written
+
+
+def _canonical_type(param: Dict) -> str:
+    """Canonical ABI type of a parameter, expanding tuple components."""
+    abi_type = param["type"]
+    if abi_type.startswith("tuple"):
+        components = ",".join(_canonical_type(c) for c in param["components"])
+        return f"({components}){abi_type[len('tuple'):]}"
+    return abi_type
+
+
+@lru_cache(maxsize=1024)
+def parse_function_abis(abi_json: str) -> Dict[str, FunctionAbi]:
+    """
+    Build the selector → function map of a contract ABI.
+
+    Args:
+        abi_json: ABI JSON string as stored in standardized.contracts
+
+    Returns:
+        Dictionary of 0x-prefixed lowercase selector to FunctionAbi (empty if
+        the ABI is missing or invalid)
+    """
+    try:
+        abi = json.loads(abi_json) if abi_json else []
+    except (TypeError, ValueError):
+        return {}
+    if not isinstance(abi, list):
+        return {}
+
+    functions = {}
+    for item in abi:
+        if item.get("type") != "function":
+            continue
+        inputs = item.get("inputs", [])
+        types = tuple(_canonical_type(param) for param in inputs)
+        signature = f"{item['name']}({','.join(types)})"
+        selector = "0x" + function_signature_to_4byte_selector(signature).hex()
+        functions[selector] = FunctionAbi(
+            selector=selector,
+            name=item["name"],
+            signature=signature,
+            types=types,
+            names=tuple(
+                param.get("name") or f"arg{i}" for i, param in enumerate(inputs)
+            ),
+        )
+    return functions
+
+
+def _to_json_value(value):
+    """Convert a decoded ABI value to a lossless JSON value."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, (list, tuple)):
+        return [_to_json_value(v) for v in value]
+    return value
+
+
+def _decode_chunk(
+    types: Tuple[str, ...], names: Tuple[str, ...], calldata: List[str]
+) -> Tuple[List[Optional[str]], List[Optional[str]], float]:
+    """
+    Decode the calldata of one selector's calls (runs in a pool process).
+
+    Args:
+        types: Canonical argument types
+        names: Argument names
+        calldata: 0x-prefixed calldata including the selector
+
+    Returns:
+        Tuple of (args_json per call, decode error per call, seconds spent)
+    """
+    start = time.perf_counter()
+    args, errors = [], []
+    for data in calldata:
+        try:
+            values = decode(types, bytes.fromhex(data[10:]))
+            args.append(
+                json.dumps({name: _to_json_value(v) for name, v in zip(names, values)})
+            )
+            errors.append(None)
+        except Exception as e:
+            args.append(None)
+            errors.append(f"{type(e).__name__}: {e}"[:500])
+    return args, errors, time.perf_counter() - start
+
+
+# Process pool shared by all decoding runs of this process (created on first use)
+_decode_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_decode_pool() -> ProcessPoolExecutor:
+    """
+    Get the decoder process pool.
+
+    Spawned rather than forked, like the ETL workers: forking a process that
+    runs Iceberg writer threads can deadlock the child.
+
+    Returns:
+        ProcessPoolExecutor with DECODE_PROCESSES processes
+    """
+    global _decode_pool
+    if _decode_pool is None:
+        _decode_pool = ProcessPoolExecutor(
+            max_workers=DECODE_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _decode_pool
+
+
+def shutdown_decode_pool():
+    """Stop the decoder process pool if it was started."""
+    global _decode_pool
+    if _decode_pool is not None:
+        _decode_pool.shutdown(cancel_futures=True)
+        _decode_pool = None
+
+
+def _chunks(indices: List[int]) -> Iterable[List[int]]:
+    for offset in range(0, len(indices), DECODE_CHUNK):
+        yield indices[offset : offset + DECODE_CHUNK]
+
+
+async def decode_calls(
+    transactions: pa.Table, abis: Dict[str, str]
+) -> Tuple[pa.Table, List[StageMetrics]]:
+    """
+    Decode the calldata of transactions grouped by (contract, selector).
+
+    Args:
+        transactions: standardized.transactions rows (chain_id, block_number,
+            block_time, block_date, hash, from, to, input)
+        abis: ABI JSON by lowercase contract address
+
+    Returns:
+        Tuple of (decoded_calls rows, per-selector metrics). Calls whose
+        selector is not in the ABI are kept with a decode_error.
+    """
+    calls = transactions.filter(
+        pc.greater_equal(pc.utf8_length(transactions["input"]), 10)
+    )
+    selectors = pc.utf8_lower(pc.utf8_slice_codeunits(calls["input"], 0, 10))
+    contracts = pc.utf8_lower(calls["to"])
+    groups = (
+        pa.table(
+            {
+                "contract_address": contracts,
+                "selector": selectors,
+                "row": pa.array(np.arange(calls.num_rows)),
+            }
+        )
+        .group_by(["contract_address", "selector"])
+        .aggregate([("row", "list")])
+    )
+
+    num_rows = calls.num_rows
+    function_names = [None] * num_rows
+    signatures = [None] * num_rows
+    args_json = [None] * num_rows
+    errors = [None] * num_rows
+    calldata = calls["input"].to_pylist()
+
+    loop = asyncio.get_running_loop()
+    pool = get_decode_pool()
+    metrics: Dict[str, StageMetrics] = {}
+    pending = []
+    for contract, selector, rows in zip(
+        groups["contract_address"].to_pylist(),
+        groups["selector"].to_pylist(),
+        groups["row_list"].to_pylist(),
+    ):
+        function = parse_function_abis(abis.get(contract, "")).get(selector)
+        if function is None:
+            for row in rows:
+                errors[row] = "Unknown selector"
+            continue
+
+        for row in rows:
+            function_names[row] = function.name
+            signatures[row] = function.signature
+        stage = metrics.setdefault(
+            selector, StageMetrics(f"{function.name} ({selector})")
+        )
+        for chunk in _chunks(rows):
+            future = loop.run_in_executor(
+                pool,
+                _decode_chunk,
+                function.types,
+                function.names,
+                [calldata[row] for row in chunk],
+            )
+            pending.append((chunk, stage, future))
+
+    try:
+        results = await asyncio.gather(*(future for _, _, future in pending))
+    except BrokenProcessPool:
+        # A crashed worker breaks the whole pool; start a fresh one next time
+        shutdown_decode_pool()
+        raise
+
+    for (chunk, stage, _), (chunk_args, chunk_errors, seconds) in zip(pending, results):
+        stage.record(len(chunk), seconds)
+        for row, args, error in zip(chunk, chunk_args, chunk_errors):
+            args_json[row] = args
+            errors[row] = error
+
+    decoded = pa.table(
+        {
+            "chain_id": calls["chain_id"],
+            "contract_address": contracts,
+            "block_number": calls["block_number"],
+            "block_time": calls["block_time"],
+            "block_date": calls["block_date"],
+            "hash": calls["hash"],
+            "from_address": pc.utf8_lower(calls["from"]),
+            "selector": selectors,
+            "function_name": pa.array(function_names, pa.string()),
+            "signature": pa.array(signatures, pa.string()),
+            "args_json": pa.array(args_json, pa.string()),
+            "decode_error": pa.array(errors, pa.string()),
+            "decoded_at": pa.array([datetime.now()] * num_rows, pa.timestamp("us")),
+        }
+    )
+    return decoded, list(metrics.values())
+
+
+def read_contract_abis(catalog, chain_id: int, contract_addresses: List[str]):
+    """
+    Read ABIs from standardized.contracts (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        contract_addresses: Contract addresses
+
+    Returns:
+        Dictionary of lowercase contract address to ABI JSON
+    """
+    try:
+        table = load_table(catalog, DATABASE, "contracts")
+        if not table:
+            return {}
+
+        rows = (
+            table.scan(
+                row_filter=And(
+                    EqualTo("chain_id", chain_id),
+                    In(
+                        "contract_address",
+                        {address.lower() for address in contract_addresses},
+                    ),
+                ),
+                selected_fields=("contract_address", "abi_json"),
+            )
+            .to_arrow()
+            .to_pylist()
+        )
+        return {
+            row["contract_address"].lower(): row["abi_json"]
+            for row in rows
+            if row["abi_json"]
+        }
+
+    except Exception as e:
+        logger.error(f"Error reading contract ABIs: {e}")
+        logger.debug(traceback.format_exc())
+        return {}
+
+
+def _cursor_filter(chain_id: int, contract_address: str):
+    return And(
+        EqualTo("chain_id", chain_id), EqualTo("contract_address", contract_address)
+    )
+
+
+def read_decoded_snapshot(
+    cursor_table, chain_id: int, contract_address: str
+) -> Optional[int]:
+    """
+    Get the source snapshot the contract's last decoding run read.
+
+    Args:
+        cursor_table: standardized.decoded_calls_cursor table
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+
+    Returns:
+        standardized.transactions snapshot id, or None if never decoded
+    """
+    rows = (
+        cursor_table.scan(row_filter=_cursor_filter(chain_id, contract_address.lower()))
+        .to_arrow()
+        .to_pylist()
+    )
+    if not rows:
+        return None
+    return max(rows, key=lambda row: row["updated_at"])["source_snapshot_id"]
+
+
+def plan_decoding(
+    catalog, chain_id: int, contract_address: str, start_block: Optional[int] = None
+) -> Optional[DecodePlan]:
+    """
+    Read the transactions sent to a contract that need decoding (synchronous).
+
+    With start_block, every call from that block on is read. Otherwise only
+    the partitions changed since the contract's last run are read.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+        start_block: First block to re-decode (default: changed partitions)
+
+    Returns:
+        DecodePlan, or None if a table is missing
+    """
+    source = load_table(catalog, SOURCE_DATABASE, SOURCE_TABLE_NAME, refresh=True)
+    cursor_table = load_table(catalog, DATABASE, CURSOR_TABLE_NAME, refresh=True)
+    if not source or not cursor_table:
+        return None
+
+    row_filter = And(
+        EqualTo("chain_id", chain_id), EqualTo("to", contract_address.lower())
+    )
+    bucket_filter = address_bucket_filter(source, "to", contract_address.lower())
+    if bucket_filter is not None:
+        row_filter = And(row_filter, bucket_filter)
+
+    source_snapshot_id = None
+    if start_block is not None:
+        row_filter = And(row_filter, GreaterThanOrEqual("block_number", start_block))
+    else:
+        changed = changed_partitions(
+            source, read_decoded_snapshot(cursor_table, chain_id, contract_address)
+        )
+        if changed is None:
+            return DecodePlan(None)
+        source_snapshot_id, partitions = changed
+        partitions = [p for p in partitions if p[0] == chain_id]
+        if not partitions:
+            return DecodePlan(None, source_snapshot_id)
+        row_filter = And(row_filter, partitions_filter(partitions))
+
+    transactions = source.scan(
+        row_filter=row_filter, selected_fields=_TRANSACTION_COLUMNS
+    ).to_arrow()
+    return DecodePlan(transactions, source_snapshot_id)
+
+
+def record_decoded_snapshot(
+    catalog, chain_id: int, contract_address: str, source_snapshot_id: int
+) -> bool:
+    """
+    Record the source snapshot a contract's decoding run read (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+        source_snapshot_id: standardized.transactions snapshot id
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        table = load_table(catalog, DATABASE, CURSOR_TABLE_NAME, refresh=True)
+        if not table:
+            logger.error("Failed to load decoded_calls cursor table")
+            return False
+
+        contract_address = contract_address.lower()
+        row = {
+            "chain_id": chain_id,
+            "contract_address": contract_address,
+            "source_snapshot_id": source_snapshot_id,
+            "updated_at": datetime.now(),
+        }
+        table.overwrite(
+            pa.Table.from_pylist([row], schema=table.schema().as_arrow()),
+            overwrite_filter=_cursor_filter(chain_id, contract_address),
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Error updating decoded_calls cursor: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+
+def write_decoded_calls(catalog, decoded: pa.Table) -> bool:
+    """
+    Merge decoded calls into standardized.decoded_calls (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        decoded: Rows from decode_calls()
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    table = load_table(catalog, DATABASE, TABLE_NAME, refresh=True)
+    if not table:
+        logger.error("Failed to load decoded_calls table")
+        return False
+
+    return merge_partitions_data(
+        table,
+        decoded,
+        table.schema().as_arrow(),
+        DECODED_CALLS_JOIN_COLS,
+        DECODED_CALLS_PARTITION_COLS,
+    )
+
+
+async def run_call_decoding(
+    catalog,
+    chain_id: int,
+    contract_address: str,
+    start_block: Optional[int] = None,
+) -> Optional[DecodeResult]:
+    """
+    Decode a contract's calls from standardized.transactions into
+    standardized.decoded_calls.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        contract_address: Contract address
+        start_block: First block to re-decode (default: the partitions changed
+            since the contract's last run)
+
+    Returns:
+        DecodeResult with call counts and per-selector metrics, or None on failure
+    """
+    contract_address = contract_address.lower()
+    try:
+        abis = await iceberg_writer.run(
+            read_contract_abis,
+            catalog,
+            chain_id,
+            [contract_address],
+            priority=PRIORITY_HIGH,
+        )
+        if not parse_function_abis(abis.get(contract_address, "")):
+            logger.warning(
+                f"No ABI for {contract_address} on chain {chain_id}; "
+                f"add it to standardized.contracts to decode its calls"
+            )
+            return DecodeResult()
+
+        plan = await iceberg_writer.run(
+            plan_decoding,
+            catalog,
+            chain_id,
+            contract_address,
+            start_block,
+            priority=PRIORITY_NORMAL,
+        )
+        if plan is None:
+            logger.error("Failed to load transactions or decoded_calls cursor table")
+            return None
+
+        decoded = None
+        if plan.transactions is not None:
+            decoded, metrics = await decode_calls(plan.transactions, abis)
+            log_pipeline_metrics(metrics, f"Decode {contract_address}")
+
+        if decoded is not None and decoded.num_rows:
+            written = await iceberg_writer.run(
+                write_decoded_calls, catalog, decoded, priority=PRIORITY_NORMAL
+            )
+            if not written:
+                return None
+
+        # Recorded after the write: a failure in between is redone by the next
+        # run, whose merge replaces the calls written here
+        if plan.source_snapshot_id is not None and not await iceberg_writer.run(
+            record_decoded_snapshot,
+            catalog,
+            chain_id,
+            contract_address,
+            plan.source_snapshot_id,
+            priority=PRIORITY_NORMAL,
+        ):
+            return None
+
+        if decoded is None or decoded.num_rows == 0:
+            logger.info(f"No new calls to decode for {contract_address}")
+            return DecodeResult(start_block=start_block)
+
+        failed = decoded.num_rows - pc.count(decoded["args_json"]).as_py()
+        bounds = pc.min_max(decoded["block_number"])
+        logger.info(
+            f"Decoded {decoded.num_rows - failed} of {decoded.num_rows} calls to "
+            f"{contract_address} (blocks {bounds['min']}-{bounds['max']})"
+        )
+        return DecodeResult(
+            calls=decoded.num_rows,
+            decoded=decoded.num_rows - failed,
+            failed=failed,
+            start_block=bounds["min"].as_py(),
+            end_block=bounds["max"].as_py(),
+            selectors=[stage.to_dict() for stage in metrics],
+        )
+
+    except Exception as e:
+        logger.error(f"Error decoding calls of {contract_address}: {e}")
+        logger.debug(traceback.format_exc())
+        return None
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Interaction Edges Table Handler
+
+This module maintains standardized.interaction_edges, the cumulative
+wallet-to-contract interaction graph derived from standardized.transactions:
+- One edge per (chain_id, address, contract) with the transaction count, first
+  and last block time and exact wei value sum, where address is the sender and
+  contract the recipient
+- Each edge is stored twice, in an "address" lookup copy and a "contract"
+  lookup copy. Each copy is partitioned on the bucket of its lookup column
+  (lookup_bucket) and sorted by it, so a lookup in either direction reads one
+  bucket and min/max statistics prune its files
+- Maintained incrementally: only the transactions added since the last
+  update are aggregated, and their edges are merged into the stored edges of
+  the same keys (counts and values added, first and last seen widened)
+"""
+
+from functools import reduce
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from db.partitioning import DEFAULT_ADDRESS_BUCKETS, address_bucket
+from pyiceberg.expressions import AlwaysTrue, And, EqualTo, In, Or
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+DATABASE = "standardized"
+TABLE_NAME = "interaction_edges"
+
+# Columns identifying an edge
+INTERACTION_EDGES_KEYS = ["chain_id", "address", "contract"]
+
+# Values of the lookup partition column and the column each copy is sorted by
+LOOKUP_ADDRESS = "address"
+LOOKUP_CONTRACT = "contract"
+_LOOKUP_SORT_COLUMNS = {
+    LOOKUP_ADDRESS: "address",
+    LOOKUP_CONTRACT: "contract",
+}
+
+# Buckets of each lookup copy; changing it needs the table rebuilt
+LOOKUP_BUCKETS = DEFAULT_ADDRESS_BUCKETS
+
+
+def _lookup_copy(edges: pa.Table, lookup: str) -> pa.Table:
+    """One lookup copy of edges, with its partition columns, sorted for it."""
+    column = _LOOKUP_SORT_COLUMNS[lookup]
+    copy = edges.sort_by([(column, "ascending")])
+    buckets = [
+        address_bucket(address, LOOKUP_BUCKETS) for address in copy[column].to_pylist()
+    ]
+    return copy.append_column(
+        "lookup", pa.array([lookup] * copy.num_rows, pa.string())
+    ).append_column("lookup_bucket", pa.array(buckets, pa.int32()))
+
+
+def _combine_edges(edges: pa.Table) -> pa.Table:
+    """Combine edges sharing a key into one edge per key."""
+    return (
+        edges.group_by(INTERACTION_EDGES_KEYS, use_threads=False)
+        .aggregate(
+            [
+                ("count", "sum"),
+                ("first_seen", "min"),
+                ("last_seen", "max"),
+                ("value", "sum"),
+            ]
+        )
+        .rename_columns(
+            {
+                "count_sum": "count",
+                "first_seen_min": "first_seen",
+                "last_seen_max": "last_seen",
+                "value_sum": "value",
+            }
+        )
+    )
+
+
+def aggregate_interaction_edges(transactions: pa.Table) -> pa.Table:
+    """
+    Build both lookup copies of the interaction edges of transactions.
+
+    Transactions without a recipient (contract creations) are skipped.
+
+    Args:
+        transactions: PyArrow table of standardized.transactions columns
+
+    Returns:
+        PyArrow table of interaction_edges rows
+    """
+    transactions = transactions.filter(pc.is_valid(transactions["to"]))
+    edges = (
+        transactions.select(["chain_id", "from", "to", "hash", "block_time", "value"])
+        .group_by(["chain_id", "from", "to"], use_threads=False)
+        .aggregate(
+            [
+                ("hash", "count"),
+                ("block_time", "min"),
+                ("block_time", "max"),
+                ("value", "sum"),
+            ]
+        )
+        .rename_columns(
+            {
+                "from": "address",
+                "to": "contract",
+                "hash_count": "count",
+                "block_time_min": "first_seen",
+                "block_time_max": "last_seen",
+                "value_sum": "value",
+            }
+        )
+    )
+    return pa.concat_tables(
+        [_lookup_copy(edges, lookup) for lookup in _LOOKUP_SORT_COLUMNS]
+    )
+
+
+def edge_lookup_filter(lookup: str, address: str):
+    """
+    Build the scan predicate for the edges of an address in one direction.
+
+    Args:
+        lookup: LOOKUP_ADDRESS for edges sent by the address, LOOKUP_CONTRACT
+            for edges received by it
+        address: Lowercase 0x-prefixed address
+
+    Returns:
+        BooleanExpression
+    """
+    return And(
+        And(
+            EqualTo("lookup", lookup),
+            EqualTo("lookup_bucket", address_bucket(address, LOOKUP_BUCKETS)),
+        ),
+        EqualTo(_LOOKUP_SORT_COLUMNS[lookup], address),
+    )
+
+
+def wallet_edges_filter(address: str):
+    """Scan predicate for the edges an address sent or received."""
+    return Or(
+        edge_lookup_filter(LOOKUP_ADDRESS, address),
+        edge_lookup_filter(LOOKUP_CONTRACT, address),
+    )
+
+
+def select_edges(edges: pa.Table, lookup: str, address: str) -> pa.Table:
+    """
+    Select in memory the edges edge_lookup_filter() would scan.
+
+    Args:
+        edges: PyArrow table of interaction_edges rows
+        lookup: LOOKUP_ADDRESS or LOOKUP_CONTRACT
+        address: Lowercase 0x-prefixed address
+
+    Returns:
+        PyArrow table of the matching rows
+    """
+    return edges.filter(
+        pc.and_(
+            pc.equal(edges["lookup"], lookup),
+            pc.equal(edges[_LOOKUP_SORT_COLUMNS[lookup]], address),
+        )
+    )
+
+
+def _stored_copy_filter(edges: pa.Table, lookup: str):
+    """Scan predicate for the stored edges of a copy sharing a lookup value."""
+    column = _LOOKUP_SORT_COLUMNS[lookup]
+    filters = []
+    for chain_id in pc.unique(edges["chain_id"]).to_pylist():
+        chain_edges = edges.filter(pc.equal(edges["chain_id"], chain_id))
+        filters.append(
+            And(
+                And(EqualTo("chain_id", chain_id), EqualTo("lookup", lookup)),
+                And(
+                    In("lookup_bucket", set(chain_edges["lookup_bucket"].to_pylist())),
+                    In(column, set(chain_edges[column].to_pylist())),
+                ),
+            )
+        )
+    return reduce(Or, filters)
+
+
+def merge_interaction_edges(
+    table, edges: pa.Table, replace: bool = False, snapshot_properties=None
+) -> None:
+    """
+    Merge the edges of new transactions into the table (synchronous).
+
+    Each copy reads only its stored edges sharing a lookup value with the
+    batch, from the buckets of those values, and rewrites them combined with
+    the batch; both copies are rewritten in one commit.
+
+    Args:
+        table: standardized.interaction_edges Iceberg table
+        edges: Edges from aggregate_interaction_edges()
+        replace: Replace every stored edge instead (the first batch of a
+            rebuild)
+        snapshot_properties: Properties recorded on the commit
+    """
+    schema = table.schema().as_arrow()
+    edges = edges.select(schema.names).cast(schema)
+
+    copies, filters, existing_rows = [], [], 0
+    for lookup in _LOOKUP_SORT_COLUMNS:
+        batch = edges.filter(pc.equal(edges["lookup"], lookup))
+        if not replace:
+            copy_filter = _stored_copy_filter(batch, lookup)
+            existing = table.scan(row_filter=copy_filter).to_arrow()
+            existing_rows += existing.num_rows
+            batch = pa.concat_tables(
+                [existing.select(schema.names).cast(schema), batch]
+            )
+            filters.append(copy_filter)
+        copies.append(_lookup_copy(_combine_edges(batch), lookup))
+
+    merged = pa.concat_tables(copies)
+    table.overwrite(
+        merged.select(schema.names).cast(schema),
+        overwrite_filter=reduce(Or, filters) if filters else AlwaysTrue(),
+        snapshot_properties=snapshot_properties or {},
+    )
+    logger.info(
+        f"Merged {edges.num_rows // 2} interaction edges, "
+        f"rewriting {existing_rows} stored rows"
+    )
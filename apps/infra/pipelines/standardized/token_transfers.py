@@ -0,0 +1,679 @@
+#!/usr/bin/env python3
+"""
+Token Transfers Table Handler
+
+This module derives ERC-20 transfers from raw.logs into
+standardized.token_transfers:
+- Transfer(address,address,uint256) logs of a token are synced into raw.logs
+  with run_logs_sync() under a topic0 filter
+- Topics and data are decoded in bulk: from/to are sliced out of topic1/topic2
+  and the uint256 amount is decoded into four 64-bit words straight from the
+  string buffer, so only amounts of 2^192 and above fall back to Python ints
+- Token decimals and symbols are read once per token over RPC and cached in
+  Redis and in process
+- Only blocks at or below the logs cursor are derived; the logs sync stops at
+  the finality frontier, so every derived block is complete and final and the
+  table is append-only
+- The derived block range of each token is recorded in a table property in
+  the same commit as its transfers, so logs loaded below it later (a full
+  refresh extending the logs cursor down) are derived too, without duplicates
+
+The table is partitioned by (chain_id, token_address, lookup), so a per-token
+scan reads only that token's files. Each transfer is stored twice, in a
+"from" lookup partition sorted by from_address and a "to" lookup partition
+sorted by to_address, so per-holder scans prune files on the column
+statistics in both directions.
+"""
+
+import asyncio
+import traceback
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from config.redis_config import generate_token_metadata_key
+from db.iceberg import load_table
+from db.writer import PRIORITY_HIGH, PRIORITY_NORMAL, iceberg_writer
+from pipelines.raw.logs import (
+    hex_to_uint64_words,
+    read_logs_cursor,
+    run_logs_sync,
+    topic_filter_key,
+)
+from providers.etherscan import EtherscanProvider, FetchMode
+from pyiceberg.expressions import (
+    And,
+    EqualTo,
+    GreaterThan,
+    LessThanOrEqual,
+    NotEqualTo,
+    Or,
+)
+from utils.blockchain import get_web3_for_chain
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+DATABASE = "standardized"
+TABLE_NAME = "token_transfers"
+
+# keccak256("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+TRANSFER_TOPICS = {"topic0": TRANSFER_TOPIC}
+
+# Values of the lookup partition column and the column each copy is sorted by
+LOOKUP_FROM = "from"
+LOOKUP_TO = "to"
+_LOOKUP_SORT_COLUMNS = {
+    LOOKUP_FROM: "from_address",
+    LOOKUP_TO: "to_address",
+}
+
+# Table property prefix holding the block range derived for a token
+DERIVED_RANGE_PROPERTY = "token-transfers.derived-range"
+
+# Transfers appended per commit (cut on block boundaries)
+TRANSFER_CHUNK_ROWS = 250_000
+
+# Token metadata cache TTL in Redis (decimals and symbols do not change)
+TOKEN_METADATA_TTL = 30 * 86400
+
+# Columns of raw.logs the decoder reads
+_LOG_COLUMNS = (
+    "chain_id",
+    "address",
+    "block_number",
+    "block_time",
+    "block_date",
+    "transaction_hash",
+    "log_index",
+    "topic1",
+    "topic2",
+    "topic3",
+    "data",
+)
+
+# Minimal ERC-20 metadata ABIs; some tokens (e.g. MKR) return bytes32 symbols
+_ERC20_METADATA_ABI = [
+    {
+        "name": "decimals",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "uint8"}],
+    },
+    {
+        "name": "symbol",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "string"}],
+    },
+]
+_BYTES32_SYMBOL_ABI = [
+    {
+        "name": "symbol",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "", "type": "bytes32"}],
+    }
+]
+
+# In-process token metadata, keyed by (chain_id, token_address)
+_token_metadata: Dict[tuple, Dict] = {}
+
+
+@dataclass
+class TokenTransfersResult:
+    """Outcome of a token transfers sync run."""
+
+    logs_committed: int = 0
+    transfers: int = 0
+    start_block: Optional[int] = None
+    end_block: Optional[int] = None
+    symbol: Optional[str] = None
+    decimals: Optional[int] = None
+
+
+def _fetch_token_metadata(chain_id: int, token_address: str) -> Dict:
+    """Read decimals and symbol of a token over RPC (blocking)."""
+    w3 = get_web3_for_chain(chain_id)
+    address = w3.to_checksum_address(token_address)
+    contract = w3.eth.contract(address=address, abi=_ERC20_METADATA_ABI)
+
+    metadata = {"decimals": None, "symbol": None}
+    try:
+        metadata["decimals"] = contract.functions.decimals().call()
+    except Exception as e:
+        logger.warning(f"No decimals() for token {token_address}: {e}")
+
+    try:
+        metadata["symbol"] = contract.functions.symbol().call()
+    except Exception:
+        try:
+            raw_symbol = (
+                w3.eth.contract(address=address, abi=_BYTES32_SYMBOL_ABI)
+                .functions.symbol()
+                .call()
+            )
+            metadata["symbol"] = raw_symbol.rstrip(b"\x00").decode(
+                "utf-8", errors="replace"
+            )
+        except Exception as e:
+            logger.warning(f"No symbol() for token {token_address}: {e}")
+
+    return metadata
+
+
+async def get_token_metadata(
+    chain_id: int, token_address: str, redis_manager=None
+) -> Dict:
+    """
+    Get the decimals and symbol of a token, cached in process and in Redis.
+
+    Args:
+        chain_id: Blockchain chain ID
+        token_address: Token contract address
+        redis_manager: Optional Redis manager for the shared cache
+
+    Returns:
+        Dictionary with "decimals" and "symbol" (None when the token lacks them)
+    """
+    token_address = token_address.lower()
+    cache_key = (chain_id, token_address)
+    if cache_key in _token_metadata:
+        return _token_metadata[cache_key]
+
+    redis_key = generate_token_metadata_key(chain_id, token_address)
+    if redis_manager:
+        cached = await redis_manager.get_json(redis_key)
+        if cached:
+            _token_metadata[cache_key] = cached
+            return cached
+
+    try:
+        metadata = await asyncio.to_thread(
+            _fetch_token_metadata, chain_id, token_address
+        )
+    except Exception as e:
+        logger.error(f"Error reading metadata of token {token_address}: {e}")
+        logger.debug(traceback.format_exc())
+        return {"decimals": None, "symbol": None}
+
+    # A token without either field is more likely an RPC failure: retry later
+    if metadata["decimals"] is None and metadata["symbol"] is None:
+        return metadata
+
+    _token_metadata[cache_key] = metadata
+    if redis_manager:
+        await redis_manager.set_json(redis_key, metadata, ex=TOKEN_METADATA_TTL)
+    return metadata
+
+
+def _topic_address(topics: pa.Array) -> pa.Array:
+    """Address held in the low 20 bytes of 32-byte topics."""
+    return pc.binary_join_element_wise(
+        "0x",
+        pc.utf8_lower(pc.utf8_slice_codeunits(pc.cast(topics, pa.string()), 26, 66)),
+        "",
+    )
+
+
+def _decimal_strings(words: np.ndarray, data: pa.Array) -> pa.Array:
+    """
+    Exact decimal strings of uint256 values given as four 64-bit words.
+
+    Values below 2^192 are assembled with decimal256 arithmetic; only larger
+    ones (such as "infinite" amounts) go through Python ints.
+    """
+    word = pa.decimal256(20, 0)
+    shift = pa.scalar(2**64, word)
+    value = pc.cast(pa.array(words[:, 1]), word)
+    value = pc.add(pc.multiply(value, shift), pc.cast(pa.array(words[:, 2]), word))
+    value = pc.cast(value, pa.decimal256(39, 0))
+    value = pc.add(pc.multiply(value, shift), pc.cast(pa.array(words[:, 3]), word))
+    strings = pc.cast(value, pa.string())
+
+    huge = words[:, 0] > 0
+    if huge.any():
+        strings = pc.replace_with_mask(
+            strings,
+            pa.array(huge),
+            pa.array(
+                [str(int(value, 16)) for value in pc.filter(data, huge).to_pylist()],
+                pa.string(),
+            ),
+        )
+    return strings
+
+
+def decode_transfers(logs: pa.Table, token_metadata: Dict[str, Dict]) -> pa.Table:
+    """
+    Decode Transfer logs into token transfer rows in bulk.
+
+    Logs without exactly two indexed addresses and a 32-byte amount (such as
+    ERC-721 transfers, which index the token id as topic3) are skipped.
+
+    Args:
+        logs: raw.logs rows of Transfer events
+        token_metadata: Lowercase token address → get_token_metadata() result
+
+    Returns:
+        PyArrow table of standardized.token_transfers columns; amount_raw is
+        the exact decimal string and amount is scaled by the token decimals
+        (null when they are unknown)
+    """
+    is_erc20 = pc.and_(
+        pc.and_(
+            pc.is_null(logs["topic3"]),
+            pc.equal(pc.binary_length(logs["data"]), 66),
+        ),
+        pc.and_(
+            pc.equal(pc.utf8_length(logs["topic1"]), 66),
+            pc.equal(pc.utf8_length(logs["topic2"]), 66),
+        ),
+    )
+    logs = logs.filter(pc.fill_null(is_erc20, False))
+    if logs.num_rows == 0:
+        return pa.table({})
+
+    data = logs["data"].combine_chunks()
+    words = hex_to_uint64_words(data, 4)
+    amount = np.zeros(logs.num_rows, dtype=np.float64)
+    for word in words.T:
+        amount = amount * 2.0**64 + word.astype(np.float64)
+
+    tokens = logs["address"].to_numpy(zero_copy_only=False)
+    scale = np.full(logs.num_rows, np.nan)
+    symbols = np.full(logs.num_rows, None, dtype=object)
+    for token, metadata in token_metadata.items():
+        is_token = tokens == token
+        if metadata.get("decimals") is not None:
+            scale[is_token] = 10.0 ** -metadata["decimals"]
+        symbols[is_token] = metadata.get("symbol")
+
+    return pa.table(
+        {
+            "chain_id": logs["chain_id"],
+            "token_address": logs["address"],
+            "block_number": logs["block_number"],
+            "block_time": logs["block_time"],
+            "block_date": logs["block_date"],
+            "transaction_hash": logs["transaction_hash"],
+            "log_index": logs["log_index"],
+            "from_address": _topic_address(logs["topic1"].combine_chunks()),
+            "to_address": _topic_address(logs["topic2"].combine_chunks()),
+            "amount_raw": _decimal_strings(words, data),
+            "amount": pa.array(amount * scale, mask=np.isnan(scale)),
+            "symbol": pa.array(symbols, pa.string()),
+        }
+    )
+
+
+def _range_property(chain_id: int, token_address: str) -> str:
+    return f"{DERIVED_RANGE_PROPERTY}.{chain_id}.{token_address.lower()}"
+
+
+def read_derived_range(
+    catalog, chain_id: int, token_address: str
+) -> Optional[Tuple[int, int]]:
+    """
+    Get the block range derived for a token (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        token_address: Token contract address
+
+    Returns:
+        Tuple of (first block, last block) derived, or None if nothing is derived
+    """
+    table = load_table(catalog, DATABASE, TABLE_NAME, refresh=True)
+    if not table:
+        return None
+
+    derived = table.properties.get(_range_property(chain_id, token_address))
+    if not derived:
+        return None
+    start_block, end_block = derived.split(":")
+    return int(start_block), int(end_block)
+
+
+def read_transfer_logs(
+    catalog, chain_id: int, token_address: str, after_block: int, end_block: int
+) -> Optional[pa.Table]:
+    """
+    Read a token's Transfer logs in (after_block, end_block] (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        token_address: Token contract address
+        after_block: Last block already derived (-1 for none)
+        end_block: Last block covered by the logs cursor
+
+    Returns:
+        PyArrow table of raw.logs columns, or None if the table is missing
+    """
+    table = load_table(catalog, "raw", "logs", refresh=True)
+    if not table:
+        return None
+
+    return table.scan(
+        row_filter=And(
+            And(
+                EqualTo("chain_id", chain_id),
+                EqualTo("address", token_address.lower()),
+            ),
+            And(
+                EqualTo("topic0", TRANSFER_TOPIC),
+                And(
+                    GreaterThan("block_number", after_block),
+                    LessThanOrEqual("block_number", end_block),
+                ),
+            ),
+        ),
+        selected_fields=_LOG_COLUMNS,
+    ).to_arrow()
+
+
+def read_holder_transfers(
+    catalog,
+    chain_id: int,
+    holder: str,
+    token_address: Optional[str] = None,
+) -> Optional[pa.Table]:
+    """
+    Read the transfers sent or received by an address (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        holder: Holder address
+        token_address: Optional token to restrict the scan to one partition
+
+    Returns:
+        PyArrow table of token transfers, or None if the table is missing
+    """
+    table = load_table(catalog, DATABASE, TABLE_NAME)
+    if not table:
+        return None
+
+    holder = holder.lower()
+    row_filter = And(
+        EqualTo("chain_id", chain_id),
+        Or(
+            And(EqualTo("lookup", LOOKUP_FROM), EqualTo("from_address", holder)),
+            # Self-transfers are already read from the "from" copy
+            And(
+                EqualTo("lookup", LOOKUP_TO),
+                And(EqualTo("to_address", holder), NotEqualTo("from_address", holder)),
+            ),
+        ),
+    )
+    if token_address:
+        row_filter = And(row_filter, EqualTo("token_address", token_address.lower()))
+    return table.scan(row_filter=row_filter).to_arrow()
+
+
+def transfer_lookup_copies(transfers: pa.Table) -> pa.Table:
+    """
+    Build the "from" and "to" lookup copies of transfers, each sorted by its column.
+
+    Args:
+        transfers: Rows from decode_transfers()
+
+    Returns:
+        PyArrow table with a lookup column and two rows per transfer
+    """
+    copies = []
+    for lookup, column in _LOOKUP_SORT_COLUMNS.items():
+        copy = transfers.sort_by([(column, "ascending"), ("block_number", "ascending")])
+        copies.append(
+            copy.append_column(
+                "lookup", pa.array([lookup] * copy.num_rows, pa.string())
+            )
+        )
+    return pa.concat_tables(copies)
+
+
+def append_transfers(
+    catalog,
+    chain_id: int,
+    token_address: str,
+    transfers: pa.Table,
+    derived_range: Tuple[int, int],
+) -> bool:
+    """
+    Append decoded transfers and record the token's derived range (synchronous).
+
+    Both go into one commit, so the recorded range always matches the
+    transfers stored.
+
+    Args:
+        catalog: Iceberg catalog
+        chain_id: Blockchain chain ID
+        token_address: Token contract address
+        transfers: Rows from decode_transfers() covering whole blocks
+        derived_range: (first block, last block) derived once this commit lands
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        table = load_table(catalog, DATABASE, TABLE_NAME, refresh=True)
+        if not table:
+            logger.error("Failed to load token_transfers table")
+            return False
+
+        schema = table.schema().as_arrow()
+        with table.transaction() as transaction:
+            if transfers.num_rows:
+                copies = transfer_lookup_copies(transfers)
+                transaction.append(copies.select(schema.names).cast(schema))
+            transaction.set_properties(
+                **{
+                    _range_property(chain_id, token_address): (
+                        f"{derived_range[0]}:{derived_range[1]}"
+                    )
+                }
+            )
+        return True
+
+    except Exception as e:
+        logger.error(f"Error appending token transfers: {e}")
+        logger.debug(traceback.format_exc())
+        return False
+
+
+def _block_chunks(block_numbers: np.ndarray) -> List[slice]:
+    """Split sorted block numbers into TRANSFER_CHUNK_ROWS slices of whole blocks."""
+    chunks = []
+    start = 0
+    while start < len(block_numbers):
+        end = min(start + TRANSFER_CHUNK_ROWS, len(block_numbers))
+        end = int(np.searchsorted(block_numbers, block_numbers[end - 1], "right"))
+        chunks.append(slice(start, end))
+        start = end
+    return chunks
+
+
+async def _derive_blocks(
+    catalog,
+    chain_id: int,
+    token_address: str,
+    metadata: Dict,
+    first_block: int,
+    last_block: int,
+    derived: Tuple[int, int],
+    result: TokenTransfersResult,
+) -> Optional[Tuple[int, int]]:
+    """
+    Derive the transfers of a block range adjacent to the derived range.
+
+    Chunks are committed moving away from the derived range (ascending above
+    it, descending below it), so the recorded range stays contiguous when a
+    run is interrupted and the next run resumes without duplicates.
+
+    Returns:
+        The derived range after the commits, or None on failure
+    """
+    logs = await iceberg_writer.run(
+        read_transfer_logs,
+        catalog,
+        chain_id,
+        token_address,
+        first_block - 1,
+        last_block,
+        priority=PRIORITY_NORMAL,
+    )
+    if logs is None:
+        logger.error("Failed to load logs table")
+        return None
+
+    transfers = decode_transfers(logs, {token_address: metadata}).sort_by(
+        [("block_number", "ascending"), ("log_index", "ascending")]
+    )
+    blocks = transfers["block_number"].to_numpy()
+    below = last_block < derived[0]
+    # A range without transfers still moves the recorded range
+    chunks = _block_chunks(blocks) or [slice(0, 0)]
+    if below:
+        chunks.reverse()
+
+    for i, chunk in enumerate(chunks):
+        final = i == len(chunks) - 1
+        if below:
+            derived = (first_block if final else int(blocks[chunk.start]), derived[1])
+        else:
+            derived = (derived[0], last_block if final else int(blocks[chunk.stop - 1]))
+        rows = transfers.slice(chunk.start, chunk.stop - chunk.start)
+        appended = await iceberg_writer.run(
+            append_transfers,
+            catalog,
+            chain_id,
+            token_address,
+            rows,
+            derived,
+            priority=PRIORITY_NORMAL,
+        )
+        if not appended:
+            return None
+        result.transfers += rows.num_rows
+
+    if len(blocks):
+        result.start_block = min(int(blocks[0]), result.start_block or int(blocks[0]))
+        result.end_block = max(int(blocks[-1]), result.end_block or int(blocks[-1]))
+    return derived
+
+
+async def run_token_transfers_sync(
+    catalog,
+    provider: EtherscanProvider,
+    chain_id: int,
+    token_address: str,
+    mode: FetchMode = FetchMode.INCREMENTAL,
+    redis_manager=None,
+) -> Optional[TokenTransfersResult]:
+    """
+    Sync a token's Transfer logs and derive its new token transfers.
+
+    Transfers are derived for the blocks of the logs cursor outside the
+    token's derived range, in chunks of whole blocks, so an interrupted run
+    resumes without duplicates.
+
+    Args:
+        catalog: Iceberg catalog
+        provider: Etherscan provider
+        chain_id: Blockchain chain ID
+        token_address: ERC-20 token contract address
+        mode: Logs sync mode (FetchMode.INCREMENTAL or FetchMode.FULL_REFRESH)
+        redis_manager: Optional Redis manager for the token metadata cache
+
+    Returns:
+        TokenTransfersResult, or None on failure
+    """
+    token_address = token_address.lower()
+    try:
+        synced = await run_logs_sync(
+            catalog, provider, chain_id, token_address, TRANSFER_TOPICS, mode=mode
+        )
+        if synced is None:
+            logger.error(f"Transfer logs sync failed for {token_address}")
+            return None
+
+        cursor = await iceberg_writer.run(
+            read_logs_cursor,
+            catalog,
+            "raw",
+            chain_id,
+            token_address,
+            topic_filter_key(TRANSFER_TOPICS),
+            priority=PRIORITY_HIGH,
+        )
+        metadata = await get_token_metadata(chain_id, token_address, redis_manager)
+        result = TokenTransfersResult(
+            logs_committed=synced.rows_committed,
+            symbol=metadata["symbol"],
+            decimals=metadata["decimals"],
+        )
+        if cursor is None:
+            logger.info(f"No Transfer logs synced for {token_address}")
+            return result
+
+        derived = await iceberg_writer.run(
+            read_derived_range,
+            catalog,
+            chain_id,
+            token_address,
+            priority=PRIORITY_NORMAL,
+        )
+        cursor_start, cursor_end = cursor
+        if derived is None:
+            derived = (cursor_start, cursor_start - 1)
+
+        if cursor_start < derived[0]:
+            derived = await _derive_blocks(
+                catalog,
+                chain_id,
+                token_address,
+                metadata,
+                cursor_start,
+                derived[0] - 1,
+                derived,
+                result,
+            )
+            if derived is None:
+                return None
+        if cursor_end > derived[1]:
+            derived = await _derive_blocks(
+                catalog,
+                chain_id,
+                token_address,
+                metadata,
+                derived[1] + 1,
+                cursor_end,
+                derived,
+                result,
+            )
+            if derived is None:
+                return None
+
+        if result.transfers == 0:
+            logger.info(f"No new transfers of {token_address}")
+            return result
+
+        logger.info(
+            f"Derived {result.transfers} transfers of {token_address} "
+            f"(blocks {result.start_block}-{result.end_block})"
+        )
+        return result
+
+    except Exception as e:
+        logger.error(f"Error syncing transfers of {token_address}: {e}")
+        logger.debug(traceback.format_exc())
+        return None
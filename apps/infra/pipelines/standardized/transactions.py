@@ -0,0 +1,673 @@
+#!/usr/bin/env python3
+"""
+Standardized Transactions Table Handler
+
+This module converts raw.transactions, where every field is a string, into
+standardized.transactions with native types:
+- Block numbers, gas, nonces and timestamps as int64, wei values and fees as
+  decimal(38,0) (exact, unlike float64), is_error as a boolean and addresses
+  lowercased
+- One row per (chain_id, hash), sorted by (to, block_number) within each
+  partition so min/max statistics prune files for per-contract scans
+- Incremental conversion: the raw snapshot each conversion read is recorded
+  in the standardized snapshot summary, and the next run only rewrites the
+  (chain_id, block_date) partitions whose raw data files changed since then
+- After each conversion, the derived standardized.contract_daily_stats and
+  standardized.interaction_edges tables merge in only the transactions added
+  since their last update: each records the standardized snapshot it has
+  merged in its own snapshot summary, and the rows of the partitions changed
+  since then that snapshot lacked (by hash) are aggregated and merged
+"""
+
+import json
+import traceback
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from config.logging_config import get_logger
+from db.iceberg import deduplicate_arrow, load_table
+from db.partitioning import with_address_buckets
+from db.writer import PRIORITY_LOW, iceberg_writer
+from pipelines.standardized import contract_daily_stats, interaction_edges
+from pyiceberg.expressions import AlwaysTrue, And, EqualTo, In, Or
+from pyiceberg.manifest import ManifestContent, ManifestEntryStatus
+from pyiceberg.table.snapshots import Operation
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+DATABASE = "standardized"
+TABLE_NAME = "transactions"
+
+# Columns identifying a standardized transaction
+STANDARDIZED_TRANSACTIONS_JOIN_COLS = ["chain_id", "hash"]
+
+# Snapshot summary property holding the raw snapshot a conversion read
+RAW_SNAPSHOT_PROPERTY = "raw-snapshot-id"
+
+# Snapshot summary property marking commits made by table maintenance
+MAINTENANCE_PROPERTY = "maintenance"
+
+# (chain_id, block_date) partitions rewritten per commit
+PARTITIONS_PER_COMMIT = 30
+
+# Snapshot summary properties of the derived tables: the standardized snapshot
+# merged, and the progress of a merge spanning several commits
+TRANSACTIONS_SNAPSHOT_PROPERTY = "transactions-snapshot-id"
+CATCH_UP_PROPERTY = "transactions-catch-up"
+
+# Standardized columns the derived tables are aggregated from
+_DERIVED_SOURCE_COLUMNS = (
+    "chain_id",
+    "block_date",
+    "block_time",
+    "hash",
+    "from",
+    "to",
+    "value",
+    "fee",
+)
+
+# Derived tables as (module, aggregate new transactions, merge the aggregates)
+DERIVED_TABLES = (
+    (
+        contract_daily_stats,
+        contract_daily_stats.aggregate_daily_stats,
+        contract_daily_stats.merge_daily_stats,
+    ),
+    (
+        interaction_edges,
+        interaction_edges.aggregate_interaction_edges,
+        interaction_edges.merge_interaction_edges,
+    ),
+)
+
+# Plan-and-convert rounds per run while syncs keep committing
+MAX_CONVERSION_ROUNDS = 3
+
+# Raw string columns converted to int64 and to exact wei decimals
+_INT64_COLUMNS = (
+    "block_number",
+    "timestamp",
+    "nonce",
+    "gas",
+    "gas_price",
+    "gas_used",
+    "cumulative_gas_used",
+)
+_WEI = pa.decimal128(38, 0)
+
+Partition = Tuple[int, date]
+
+
+def _nulls_for_empty(column) -> pa.Array:
+    """Replace empty strings with nulls (Etherscan sends "" for missing fields)."""
+    return pc.if_else(pc.equal(column, ""), pa.scalar(None, column.type), column)
+
+
+def _lowercase_address(column) -> pa.Array:
+    return pc.utf8_lower(_nulls_for_empty(column))
+
+
+def standardize_transactions(raw: pa.Table) -> pa.Table:
+    """
+    Convert raw.transactions rows into typed standardized.transactions rows.
+
+    Args:
+        raw: PyArrow table of raw.transactions rows
+
+    Returns:
+        PyArrow table with one row per (chain_id, hash), sorted by
+        (to, block_number)
+    """
+    raw = deduplicate_arrow(raw, STANDARDIZED_TRANSACTIONS_JOIN_COLS)
+    columns = {
+        name: pc.cast(_nulls_for_empty(raw[name]), pa.int64())
+        for name in _INT64_COLUMNS
+    }
+    # gas_used * gas_price can overflow int64; multiply as 256-bit decimals
+    fee = pc.multiply(
+        pc.cast(columns["gas_used"], pa.decimal256(19, 0)),
+        pc.cast(columns["gas_price"], pa.decimal256(19, 0)),
+    )
+
+    standardized = pa.table(
+        {
+            "chain_id": raw["chain_id"],
+            "block_number": columns["block_number"],
+            "block_hash": raw["block_hash"],
+            "block_time": raw["block_time"],
+            "block_date": raw["block_date"],
+            "timestamp": columns["timestamp"],
+            "hash": raw["hash"],
+            "nonce": columns["nonce"],
+            "transaction_index": pc.cast(
+                _nulls_for_empty(raw["transaction_index"]), pa.int32()
+            ),
+            "from": _lowercase_address(raw["from"]),
+            "to": _lowercase_address(raw["to"]),
+            "value": pc.cast(_nulls_for_empty(raw["value"]), _WEI),
+            "gas": columns["gas"],
+            "gas_price": columns["gas_price"],
+            "gas_used": columns["gas_used"],
+            "cumulative_gas_used": columns["cumulative_gas_used"],
+            "fee": pc.cast(fee, _WEI),
+            "input": raw["input"],
+            "method_id": _nulls_for_empty(raw["method_id"]),
+            "function_name": _nulls_for_empty(raw["function_name"]),
+            "contract_address": _lowercase_address(raw["contract_address"]),
+            "txreceipt_status": pc.cast(
+                _nulls_for_empty(raw["txreceipt_status"]), pa.int32()
+            ),
+            "is_error": pc.equal(raw["is_error"], "1"),
+        }
+    )
+    return standardized.sort_by([("to", "ascending"), ("block_number", "ascending")])
+
+
+def read_converted_snapshot(table) -> Optional[int]:
+    """
+    Get the raw snapshot the last completed conversion read.
+
+    Args:
+        table: standardized.transactions Iceberg table
+
+    Returns:
+        Raw snapshot id, or None if nothing was converted yet
+    """
+    snapshot = table.current_snapshot()
+    while snapshot is not None:
+        raw_snapshot_id = snapshot.summary.additional_properties.get(
+            RAW_SNAPSHOT_PROPERTY
+        )
+        if raw_snapshot_id:
+            return int(raw_snapshot_id)
+        if snapshot.parent_snapshot_id is None:
+            return None
+        snapshot = table.snapshot_by_id(snapshot.parent_snapshot_id)
+    return None
+
+
+def _manifest_partitions(
+    table, manifests, added_by: Optional[int] = None
+) -> Optional[Set[Partition]]:
+    """
+    (chain_id, block_date) of the data files listed in the manifests.
+
+    With added_by, only files added or deleted by that snapshot count; files a
+    manifest merely carries over (EXISTING entries) are skipped. Without it,
+    every live file counts.
+    """
+    partitions = set()
+    specs = table.specs()
+    for manifest in manifests:
+        if manifest.content != ManifestContent.DATA:
+            continue
+        names = [field.name for field in specs[manifest.partition_spec_id].fields]
+        if "chain_id" not in names or "block_date" not in names:
+            return None
+        chain_pos, date_pos = names.index("chain_id"), names.index("block_date")
+        entries = manifest.fetch_manifest_entry(
+            table.io, discard_deleted=added_by is None
+        )
+        for entry in entries:
+            if added_by is not None and (
+                entry.status == ManifestEntryStatus.EXISTING
+                or entry.snapshot_id != added_by
+            ):
+                continue
+            partition = entry.data_file.partition
+            block_date = partition[date_pos]
+            if isinstance(block_date, int):
+                block_date = date(1970, 1, 1) + timedelta(days=block_date)
+            partitions.add((partition[chain_pos], block_date))
+    return partitions
+
+
+def _is_maintenance(snapshot) -> bool:
+    """Whether a snapshot only reorganized files without changing rows."""
+    return (
+        snapshot.summary.operation == Operation.REPLACE
+        or MAINTENANCE_PROPERTY in snapshot.summary.additional_properties
+    )
+
+
+def changed_partitions(
+    raw_table, since_snapshot_id: Optional[int], snapshot_id: Optional[int] = None
+) -> Optional[Tuple[int, List[Partition]]]:
+    """
+    Find the raw partitions whose data files changed since a snapshot.
+
+    Walks the snapshots committed after since_snapshot_id and reads only the
+    manifests each one wrote, taking the files it added or deleted. Snapshots
+    written by table maintenance (compaction, spec and manifest rewrites) keep
+    the same rows and are skipped. Without a usable earlier snapshot every
+    partition counts as changed.
+
+    Args:
+        raw_table: raw.transactions Iceberg table (or another table
+            partitioned by (chain_id, block_date))
+        since_snapshot_id: Raw snapshot of the last conversion, or None
+        snapshot_id: Snapshot to compare, the current one by default
+
+    Returns:
+        Tuple of (compared raw snapshot id, sorted changed partitions), or
+        None if raw.transactions has no snapshot or is not partitioned by
+        (chain_id, block_date)
+    """
+    current = (
+        raw_table.snapshot_by_id(snapshot_id)
+        if snapshot_id is not None
+        else raw_table.current_snapshot()
+    )
+    if current is None:
+        return None
+
+    # Snapshots committed since the last conversion, newest first
+    snapshots = []
+    snapshot = current
+    while snapshot is not None and snapshot.snapshot_id != since_snapshot_id:
+        snapshots.append(snapshot)
+        snapshot = (
+            raw_table.snapshot_by_id(snapshot.parent_snapshot_id)
+            if snapshot.parent_snapshot_id is not None
+            else None
+        )
+
+    if snapshot is None:
+        if since_snapshot_id is not None:
+            logger.warning(
+                f"Raw snapshot {since_snapshot_id} is expired, "
+                "converting every partition"
+            )
+        partitions = _manifest_partitions(raw_table, current.manifests(raw_table.io))
+    else:
+        partitions = set()
+        for snapshot in snapshots:
+            if _is_maintenance(snapshot):
+                continue
+            manifests = [
+                m
+                for m in snapshot.manifests(raw_table.io)
+                if m.added_snapshot_id == snapshot.snapshot_id
+            ]
+            added = _manifest_partitions(raw_table, manifests, snapshot.snapshot_id)
+            if added is None:
+                partitions = None
+                break
+            partitions |= added
+
+    if partitions is None:
+        logger.error("raw.transactions is not partitioned by chain_id and block_date")
+        return None
+    return current.snapshot_id, sorted(partitions)
+
+
+def partitions_filter(partitions: List[Partition]):
+    """Build a scan predicate selecting (chain_id, block_date) partitions."""
+    by_chain: Dict[int, Set[str]] = {}
+    for chain_id, block_date in partitions:
+        by_chain.setdefault(chain_id, set()).add(block_date.isoformat())
+
+    filters = [
+        And(EqualTo("chain_id", chain_id), In("block_date", dates))
+        for chain_id, dates in by_chain.items()
+    ]
+    row_filter = filters[0]
+    for other in filters[1:]:
+        row_filter = Or(row_filter, other)
+    return row_filter
+
+
+def convert_partitions(
+    catalog,
+    partitions: List[Partition],
+    raw_snapshot_id: int,
+    completes_snapshot: bool,
+) -> Optional[int]:
+    """
+    Rewrite standardized partitions from a raw snapshot (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+        partitions: (chain_id, block_date) partitions to rewrite
+        raw_snapshot_id: Raw snapshot to read
+        completes_snapshot: Whether this is the last batch for the raw
+            snapshot, which records it as converted
+
+    Returns:
+        Number of rows written, or None on failure
+    """
+    try:
+        raw_table = load_table(catalog, "raw", "transactions", refresh=True)
+        table = load_table(catalog, DATABASE, TABLE_NAME, refresh=True)
+        if not raw_table or not table:
+            logger.error("Failed to load transactions tables")
+            return None
+
+        row_filter = partitions_filter(partitions)
+        raw = raw_table.scan(row_filter=row_filter, snapshot_id=raw_snapshot_id)
+        standardized = with_address_buckets(
+            table, standardize_transactions(raw.to_arrow())
+        )
+
+        schema = table.schema().as_arrow()
+        table.overwrite(
+            standardized.select(schema.names).cast(schema),
+            overwrite_filter=row_filter,
+            snapshot_properties=(
+                {RAW_SNAPSHOT_PROPERTY: str(raw_snapshot_id)}
+                if completes_snapshot
+                else {}
+            ),
+        )
+        return standardized.num_rows
+
+    except Exception as e:
+        logger.error(f"Error converting transaction partitions: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+
+def plan_conversion(catalog) -> Optional[Tuple[int, List[Partition]]]:
+    """
+    Find the raw partitions to convert since the last conversion (synchronous).
+
+    Args:
+        catalog: Iceberg catalog
+
+    Returns:
+        Tuple of (raw snapshot id, partitions), or None if there is nothing
+        to convert from or the tables are missing
+    """
+    try:
+        raw_table = load_table(catalog, "raw", "transactions", refresh=True)
+        table = load_table(catalog, DATABASE, TABLE_NAME, refresh=True)
+        if not raw_table or not table:
+            logger.error("Failed to load transactions tables")
+            return None
+
+        return changed_partitions(raw_table, read_converted_snapshot(table))
+
+    except Exception as e:
+        logger.error(f"Error planning transactions conversion: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+
+def read_derived_state(derived) -> Tuple[Optional[int], Optional[dict]]:
+    """
+    Get how far a derived table has merged standardized.transactions.
+
+    Args:
+        derived: Derived Iceberg table (see DERIVED_TABLES)
+
+    Returns:
+        Tuple of (standardized snapshot id merged, progress of an unfinished
+        merge as a dict with from, to and done), either of which may be None
+    """
+    snapshot = derived.current_snapshot()
+    while snapshot is not None:
+        properties = snapshot.summary.additional_properties
+        if CATCH_UP_PROPERTY in properties:
+            return None, json.loads(properties[CATCH_UP_PROPERTY])
+        if TRANSACTIONS_SNAPSHOT_PROPERTY in properties:
+            return int(properties[TRANSACTIONS_SNAPSHOT_PROPERTY]), None
+        if snapshot.parent_snapshot_id is None:
+            return None, None
+        snapshot = derived.snapshot_by_id(snapshot.parent_snapshot_id)
+    return None, None
+
+
+def plan_derived_update(catalog, database: str, table_name: str) -> Optional[dict]:
+    """
+    Plan merging a derived table up to standardized.transactions (synchronous).
+
+    The table merges the rows of the standardized partitions changed since
+    the snapshot it last merged that this snapshot lacked. An unfinished merge
+    is resumed; without a usable merged snapshot the table is rebuilt from
+    every partition, replacing its rows.
+
+    Args:
+        catalog: Iceberg catalog
+        database: Derived table database
+        table_name: Derived table name
+
+    Returns:
+        Dictionary with from (merged snapshot id, None for a rebuild), to
+        (snapshot to merge, None if up to date), partitions and done (number
+        of partitions already merged), or None on failure
+    """
+    try:
+        table = load_table(catalog, DATABASE, TABLE_NAME, refresh=True)
+        derived = load_table(catalog, database, table_name, refresh=True)
+        if not table or not derived:
+            logger.error(f"Failed to load {database}.{table_name} tables")
+            return None
+
+        merged, progress = read_derived_state(derived)
+        if progress is not None:
+            since, target, done = progress["from"], progress["to"], progress["done"]
+        else:
+            current = table.current_snapshot()
+            if current is None or current.snapshot_id == merged:
+                return {"from": merged, "to": None, "partitions": [], "done": 0}
+            since, target, done = merged, current.snapshot_id, 0
+
+        if table.snapshot_by_id(target) is None or (
+            since is not None and table.snapshot_by_id(since) is None
+        ):
+            logger.warning(
+                f"Snapshots merged into {database}.{table_name} are expired, "
+                "rebuilding it"
+            )
+            since, target, done = None, table.current_snapshot().snapshot_id, 0
+
+        changed = changed_partitions(table, since, target)
+        if changed is None:
+            return None
+        return {"from": since, "to": target, "partitions": changed[1], "done": done}
+
+    except Exception as e:
+        logger.error(f"Error planning {database}.{table_name} update: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+
+def merge_derived_partitions(catalog, derived_table, plan: dict, start: int):
+    """
+    Merge one batch of planned partitions into a derived table (synchronous).
+
+    The commit records the merged snapshot after the last batch, and the
+    progress of the plan before it, so an interrupted merge resumes after the
+    last batch committed instead of merging a batch twice.
+
+    Args:
+        catalog: Iceberg catalog
+        derived_table: Entry of DERIVED_TABLES
+        plan: Plan from plan_derived_update()
+        start: Index of the first partition of the batch
+
+    Returns:
+        Number of new transactions merged, or None on failure
+    """
+    module, aggregate, merge = derived_table
+    try:
+        table = load_table(catalog, DATABASE, TABLE_NAME, refresh=True)
+        derived = load_table(catalog, module.DATABASE, module.TABLE_NAME, refresh=True)
+        if not table or not derived:
+            logger.error(f"Failed to load {module.TABLE_NAME} tables")
+            return None
+
+        partitions = plan["partitions"][start : start + PARTITIONS_PER_COMMIT]
+        done = start + len(partitions)
+        if done >= len(plan["partitions"]):
+            properties = {TRANSACTIONS_SNAPSHOT_PROPERTY: str(plan["to"])}
+        else:
+            progress = {"from": plan["from"], "to": plan["to"], "done": done}
+            properties = {CATCH_UP_PROPERTY: json.dumps(progress)}
+        replace = plan["from"] is None and start == 0
+
+        new_rows = pa.table({})
+        if partitions:
+            row_filter = partitions_filter(partitions)
+            new_rows = table.scan(
+                row_filter=row_filter,
+                selected_fields=_DERIVED_SOURCE_COLUMNS,
+                snapshot_id=plan["to"],
+            ).to_arrow()
+            if plan["from"] is not None:
+                merged_hashes = table.scan(
+                    row_filter=row_filter,
+                    selected_fields=("hash",),
+                    snapshot_id=plan["from"],
+                ).to_arrow()["hash"]
+                new_rows = new_rows.filter(
+                    pc.invert(
+                        pc.is_in(
+                            new_rows["hash"], value_set=merged_hashes.combine_chunks()
+                        )
+                    )
+                )
+
+        aggregates = aggregate(new_rows) if new_rows.num_rows else None
+        if aggregates is not None and aggregates.num_rows:
+            merge(derived, aggregates, replace, properties)
+        else:
+            # Nothing to merge: only record the progress (a rebuild still
+            # drops the stored rows first)
+            if replace and derived.current_snapshot() is not None:
+                derived.delete(delete_filter=AlwaysTrue())
+            with derived.transaction() as transaction:
+                with transaction.update_snapshot(
+                    snapshot_properties=properties
+                ).fast_append():
+                    pass
+        return new_rows.num_rows
+
+    except Exception as e:
+        logger.error(f"Error merging transactions into {module.TABLE_NAME}: {e}")
+        logger.debug(traceback.format_exc())
+        return None
+
+
+async def update_derived_tables(catalog) -> Optional[int]:
+    """
+    Merge new standardized transactions into each derived table.
+
+    Plans and batches run on the Iceberg writer at low priority, like the
+    conversion.
+
+    Args:
+        catalog: Iceberg catalog
+
+    Returns:
+        Number of new transactions merged over all derived tables, or None on
+        failure
+    """
+    total = 0
+    for derived_table in DERIVED_TABLES:
+        module = derived_table[0]
+        plan = await iceberg_writer.run(
+            plan_derived_update,
+            catalog,
+            module.DATABASE,
+            module.TABLE_NAME,
+            priority=PRIORITY_LOW,
+        )
+        if plan is None:
+            return None
+        if plan["to"] is None:
+            continue
+
+        # A plan without partitions still commits once to record the snapshot
+        rows = 0
+        starts = range(plan["done"], len(plan["partitions"]), PARTITIONS_PER_COMMIT)
+        for start in starts or [plan["done"]]:
+            merged = await iceberg_writer.run(
+                merge_derived_partitions,
+                catalog,
+                derived_table,
+                plan,
+                start,
+                priority=PRIORITY_LOW,
+            )
+            if merged is None:
+                return None
+            rows += merged
+        logger.info(f"Merged {rows} new transactions into {module.TABLE_NAME}")
+        total += rows
+
+    return total
+
+
+async def _convert_changed_partitions(catalog) -> Optional[dict]:
+    """Run one planned conversion: rewrite the changed partitions in batches."""
+    plan = await iceberg_writer.run(plan_conversion, catalog, priority=PRIORITY_LOW)
+    if plan is None:
+        return None
+
+    raw_snapshot_id, partitions = plan
+    rows = 0
+    for start in range(0, len(partitions), PARTITIONS_PER_COMMIT):
+        batch = partitions[start : start + PARTITIONS_PER_COMMIT]
+        written = await iceberg_writer.run(
+            convert_partitions,
+            catalog,
+            batch,
+            raw_snapshot_id,
+            start + PARTITIONS_PER_COMMIT >= len(partitions),
+            priority=PRIORITY_LOW,
+        )
+        if written is None:
+            return None
+        rows += written
+
+    return {"raw_snapshot_id": raw_snapshot_id, "partitions": partitions, "rows": rows}
+
+
+async def run_transactions_standardization(
+    catalog, max_rounds: int = MAX_CONVERSION_ROUNDS
+) -> Optional[dict]:
+    """
+    Convert new raw.transactions data into standardized.transactions.
+
+    Changed partitions are rewritten in batches of PARTITIONS_PER_COMMIT on the
+    Iceberg writer at low priority; only the last batch records the raw
+    snapshot, so an interrupted run redoes its plan on the next run. Syncs
+    committing while a conversion runs are picked up by planning again, until
+    raw.transactions stops changing or max_rounds is reached. The derived
+    tables then merge the new transactions (see update_derived_tables()).
+
+    Args:
+        catalog: Iceberg catalog
+        max_rounds: Maximum conversion rounds
+
+    Returns:
+        Dictionary with raw_snapshot_id, partitions, rows and derived_rows, or
+        None on failure
+    """
+    summary = {"raw_snapshot_id": None, "partitions": 0, "rows": 0}
+    for _ in range(max_rounds):
+        converted = await _convert_changed_partitions(catalog)
+        if converted is None:
+            return None
+        if not converted["partitions"]:
+            break
+
+        summary["raw_snapshot_id"] = converted["raw_snapshot_id"]
+        summary["partitions"] += len(converted["partitions"])
+        summary["rows"] += converted["rows"]
+        logger.info(
+            f"Standardized {converted['rows']} transactions in "
+            f"{len(converted['partitions'])} partitions "
+            f"(raw snapshot {converted['raw_snapshot_id']})"
+        )
+
+    derived_rows = await update_derived_tables(catalog)
+    if derived_rows is None:
+        return None
+    summary["derived_rows"] = derived_rows
+    return summary
@@ -6,7 +6,7 @@ for different API modules and shared base functionality.
 """
 
 from .account import EtherscanAccountProvider, TransactionBatch
-from .base import EtherscanBaseProvider, EtherscanResponse
+from .base import EtherscanBaseProvider, EtherscanResponse, FetchInterruptedError
 from models import FetchMode, TimePeriod
 from .contract import EtherscanContractProvider
 from .logs import EtherscanLogsProvider, LogsBatch
@@ -30,6 +30,7 @@ __all__ = [
     # Base classes and utilities
     "EtherscanBaseProvider",
     "EtherscanResponse",
+    "FetchInterruptedError",
     # Enums and data classes
     "FetchMode",
     "TimePeriod",
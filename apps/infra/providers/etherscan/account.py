@@ -14,12 +14,12 @@ Supports both Ethereum mainnet and Base network.
 import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 import aiohttp
 from config.logging_config import get_logger
 
-from .base import EtherscanBaseProvider
+from .base import EtherscanBaseProvider, FetchInterruptedError
 from models import FetchMode, TimePeriod
 from .block import EtherscanBlockProvider
 
@@ -34,6 +34,7 @@ class TransactionBatch:
     transactions: List[Dict]
     last_block_number: int
     total_count: int
+    next_block: Optional[int] = None  # Block to resume from; None when complete
 
 
 class EtherscanAccountProvider(EtherscanBaseProvider):
@@ -204,37 +205,25 @@ class EtherscanAccountProvider(EtherscanBaseProvider):
 
         return unique_transactions
 
-    async def get_all_transactions(
+    async def resolve_start_block(
         self,
-        address: str,
         chain_id: int,
         mode: FetchMode = FetchMode.FULL_REFRESH,
         last_block_number: Optional[int] = None,
         time_period: Optional[TimePeriod] = None,
-    ) -> List:
+    ) -> int:
         """
-        Fetch all transactions for a given address.
+        Determine the first block to fetch for a fetch mode.
 
         Args:
-            address: Wallet/contract address to fetch transactions for
-            chain_id: Blockchain chain ID (1 for Ethereum mainnet)
+            chain_id: Blockchain chain ID
             mode: FetchMode.INCREMENTAL, FetchMode.FULL_REFRESH, or FetchMode.TIME_RANGE
-            last_block_number: Starting block number for incremental mode
+            last_block_number: Last processed block for incremental mode
             time_period: TimePeriod for TIME_RANGE mode (defaults to 7 days if not specified)
 
         Returns:
-            List of transaction hashes or full transaction objects
+            Starting block number
         """
-        logger.info(f"Starting transaction fetch for address: {address}")
-        logger.info(f"Mode: {mode.value}")
-        logger.info(f"Chain ID: {chain_id}")
-
-        if not self._validate_chain_id(chain_id):
-            raise ValueError(f"Unsupported chain ID: {chain_id}")
-
-        all_transactions = []
-
-        # Determine starting block
         if mode == FetchMode.INCREMENTAL and last_block_number is not None:
             next_block = last_block_number + 1
             logger.info(f"Starting from block: {next_block} (incremental mode)")
@@ -248,6 +237,40 @@ class EtherscanAccountProvider(EtherscanBaseProvider):
         else:
             next_block = 0
             logger.info("Starting from genesis block (full refresh mode)")
+        return next_block
+
+    async def iter_transaction_batches(
+        self,
+        address: str,
+        chain_id: int,
+        start_block: int,
+        end_block: str = "latest",
+    ) -> AsyncIterator[TransactionBatch]:
+        """
+        Page through transactions in ascending block order, one batch at a time.
+
+        Each yielded batch has `next_block` set to the block to resume from
+        (None after the final batch), so callers can commit and checkpoint
+        between pages. Rows repeated by the last_block - 1 overlap are dropped.
+
+        Args:
+            address: Wallet/contract address to fetch transactions for
+            chain_id: Blockchain chain ID
+            start_block: First block to fetch
+            end_block: Ending block number or "latest"
+
+        Yields:
+            TransactionBatch for each page
+
+        Raises:
+            FetchInterruptedError: If a page fails; carries the block to resume from
+        """
+        if not self._validate_chain_id(chain_id):
+            raise ValueError(f"Unsupported chain ID: {chain_id}")
+
+        next_block = start_block
+        previous_hashes = set()
+        fetched_count = 0
 
         async with aiohttp.ClientSession() as session:
             batch_count = 0
@@ -259,45 +282,101 @@ class EtherscanAccountProvider(EtherscanBaseProvider):
 
                 try:
                     batch = await self.fetch_transaction_batch(
-                        session, address, chain_id, next_block, "latest"
+                        session, address, chain_id, next_block, end_block
                     )
+                except Exception as e:
+                    logger.error(f"Error in batch {batch_count + 1}: {e}")
+                    raise FetchInterruptedError(
+                        f"Transaction fetch interrupted at block {next_block}: {e}",
+                        resume_block=next_block,
+                        fetched_count=fetched_count,
+                    ) from e
 
-                    if not batch.transactions:
-                        logger.info("No more transactions found. Fetching complete.")
-                        break
+                if not batch.transactions:
+                    logger.info("No more transactions found. Fetching complete.")
+                    return
 
-                    all_transactions.extend(batch.transactions)
-                    batch_count += 1
+                batch_count += 1
+                logger.info(
+                    f"Batch {batch_count}: Found {batch.total_count} transactions, "
+                    f"up to block {batch.last_block_number}"
+                )
 
+                # If we got fewer than max transactions, we've reached the end
+                is_last = batch.total_count < self.max_transactions_per_request
+                if is_last:
                     logger.info(
-                        f"Batch {batch_count}: Found {batch.total_count} transactions, "
-                        f"up to block {batch.last_block_number}"
+                        f"Last batch (less than {self.max_transactions_per_request} transactions). "
+                        f"Fetching complete."
                     )
-
-                    # If we got fewer than max transactions, we've reached the end
-                    if batch.total_count < self.max_transactions_per_request:
-                        logger.info(
-                            f"Last batch (less than {self.max_transactions_per_request} transactions). "
-                            f"Fetching complete."
-                        )
-                        break
-
-                    # Prepare for next batch
+                    batch.next_block = None
+                else:
                     # Follow Etherscan guide: set next block to last block - 1
                     # This handles cases where transactions from the last block were cut off by the limit
-                    next_block = batch.last_block_number - 1
-
+                    batch.next_block = batch.last_block_number - 1
                     logger.debug(
-                        f"Setting next batch start block to {next_block} "
+                        f"Setting next batch start block to {batch.next_block} "
                         f"(last_block - 1 = {batch.last_block_number} - 1)"
                     )
 
-                    # Rate limiting
-                    await asyncio.sleep(0.2)
+                # Drop rows already yielded by the overlapping previous page
+                hashes = {tx.get("hash") for tx in batch.transactions}
+                batch.transactions = [
+                    tx
+                    for tx in batch.transactions
+                    if tx.get("hash") not in previous_hashes
+                ]
+                previous_hashes = hashes
+                fetched_count += len(batch.transactions)
 
-                except Exception as e:
-                    logger.error(f"Error in batch {batch_count + 1}: {e}")
-                    break
+                yield batch
+
+                if is_last:
+                    return
+
+                next_block = batch.next_block
+
+                # Rate limiting
+                await asyncio.sleep(0.2)
+
+    async def get_all_transactions(
+        self,
+        address: str,
+        chain_id: int,
+        mode: FetchMode = FetchMode.FULL_REFRESH,
+        last_block_number: Optional[int] = None,
+        time_period: Optional[TimePeriod] = None,
+    ) -> List:
+        """
+        Fetch all transactions for a given address.
+
+        Args:
+            address: Wallet/contract address to fetch transactions for
+            chain_id: Blockchain chain ID (1 for Ethereum mainnet)
+            mode: FetchMode.INCREMENTAL, FetchMode.FULL_REFRESH, or FetchMode.TIME_RANGE
+            last_block_number: Starting block number for incremental mode
+            time_period: TimePeriod for TIME_RANGE mode (defaults to 7 days if not specified)
+
+        Returns:
+            List of transaction hashes or full transaction objects
+
+        Raises:
+            FetchInterruptedError: If a page fails part way through
+        """
+        logger.info(f"Starting transaction fetch for address: {address}")
+        logger.info(f"Mode: {mode.value}")
+        logger.info(f"Chain ID: {chain_id}")
+
+        if not self._validate_chain_id(chain_id):
+            raise ValueError(f"Unsupported chain ID: {chain_id}")
+
+        next_block = await self.resolve_start_block(
+            chain_id, mode, last_block_number, time_period
+        )
+
+        all_transactions = []
+        async for batch in self.iter_transaction_batches(address, chain_id, next_block):
+            all_transactions.extend(batch.transactions)
 
         total_transactions = len(all_transactions)
         logger.info(
@@ -30,6 +30,20 @@ class EtherscanResponse:
     result: Any
 
 
+class FetchInterruptedError(Exception):
+    """
+    Raised when paginated fetching fails part way through.
+
+    Carries the block to resume from so callers can checkpoint and retry
+    instead of silently keeping a partial result.
+    """
+
+    def __init__(self, message: str, resume_block: int, fetched_count: int = 0):
+        super().__init__(message)
+        self.resume_block = resume_block
+        self.fetched_count = fetched_count
+
+
 class EtherscanBaseProvider(ABC):
     """
     Base provider for Etherscan API operations.
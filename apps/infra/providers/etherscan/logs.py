@@ -12,12 +12,12 @@ Supports both Ethereum mainnet and Base network.
 
 import asyncio
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 import aiohttp
 from config.logging_config import get_logger
 
-from .base import EtherscanBaseProvider
+from .base import EtherscanBaseProvider, FetchInterruptedError
 from models import FetchMode
 
 # Create a logger for this module
@@ -31,6 +31,7 @@ class LogsBatch:
     logs: List[Dict]
     last_block_number: int
     total_count: int
+    next_block: Optional[int] = None  # Block to resume from; None when complete
 
 
 class EtherscanLogsProvider(EtherscanBaseProvider):
@@ -150,6 +151,7 @@ class EtherscanLogsProvider(EtherscanBaseProvider):
         topics: Optional[Dict[str, str]] = None,
         topic_operators: Optional[Dict[str, str]] = None,
         limit: int = 10000,
+        enhance: bool = True,
     ) -> LogsBatch:
         """
         Fetch a single batch of logs from Etherscan API.
@@ -163,6 +165,8 @@ class EtherscanLogsProvider(EtherscanBaseProvider):
             topics: Dictionary of topics to filter by (optional)
             topic_operators: Dictionary of topic operators (optional)
             limit: Maximum number of logs to fetch
+            enhance: If False, only convert keys to snake_case and add chain_id;
+                hex fields are left for a bulk (vectorized) conversion
 
         Returns:
             LogsBatch containing logs and metadata
@@ -191,11 +195,19 @@ class EtherscanLogsProvider(EtherscanBaseProvider):
             logger.info(f"Received {len(logs)} logs from API")
 
             # Enhance each log with additional fields
-            enhanced_logs = [self._enhance_log(log, chain_id) for log in logs]
+            if enhance:
+                enhanced_logs = [self._enhance_log(log, chain_id) for log in logs]
+            else:
+                enhanced_logs = [
+                    {**self._convert_keys_to_snake_case(log), "chain_id": chain_id}
+                    for log in logs
+                ]
 
             last_block = from_block
             if enhanced_logs:
-                last_block = int(enhanced_logs[-1]["block_number"])
+                last_block = enhanced_logs[-1]["block_number"]
+                if isinstance(last_block, str):
+                    last_block = int(last_block, 16)
                 logger.debug(f"Last block in batch: {last_block}")
 
             return LogsBatch(enhanced_logs, last_block, len(enhanced_logs))
@@ -242,6 +254,126 @@ class EtherscanLogsProvider(EtherscanBaseProvider):
 
         return unique_logs
 
+    def _log_key(self, log: Dict) -> tuple:
+        return (
+            log.get("transaction_hash"),
+            log.get("log_index"),
+            log.get("block_number"),
+        )
+
+    async def iter_logs_batches(
+        self,
+        chain_id: int,
+        from_block: int,
+        to_block: str = "latest",
+        address: Optional[str] = None,
+        topics: Optional[Dict[str, str]] = None,
+        topic_operators: Optional[Dict[str, str]] = None,
+        enhance: bool = True,
+    ) -> AsyncIterator[LogsBatch]:
+        """
+        Page through logs in ascending block order, one batch at a time.
+
+        Each yielded batch has `next_block` set to the block to resume from
+        (None after the final batch), so callers can commit and checkpoint
+        between pages. Logs repeated by the last_block - 1 overlap are dropped.
+
+        Args:
+            chain_id: Blockchain chain ID
+            from_block: First block to fetch
+            to_block: Ending block number or "latest"
+            address: Contract address to filter logs (optional)
+            topics: Dictionary of topics to filter by (optional)
+            topic_operators: Dictionary of topic operators (optional)
+            enhance: If False, yield logs with their hex fields unconverted
+                (see fetch_logs_batch)
+
+        Yields:
+            LogsBatch for each page
+
+        Raises:
+            FetchInterruptedError: If a page fails; carries the block to resume from
+        """
+        if not self._validate_chain_id(chain_id):
+            raise ValueError(f"Unsupported chain ID: {chain_id}")
+
+        next_block = from_block
+        previous_keys = set()
+        fetched_count = 0
+
+        async with aiohttp.ClientSession() as session:
+            batch_count = 0
+
+            while True:
+                logger.info(
+                    f"Fetching batch {batch_count + 1} starting from block {next_block}"
+                )
+
+                try:
+                    batch = await self.fetch_logs_batch(
+                        session=session,
+                        chain_id=chain_id,
+                        from_block=next_block,
+                        to_block=to_block,
+                        address=address,
+                        topics=topics,
+                        topic_operators=topic_operators,
+                        limit=self.max_logs_per_request,
+                        enhance=enhance,
+                    )
+                except Exception as e:
+                    logger.error(f"Error in batch {batch_count + 1}: {e}")
+                    raise FetchInterruptedError(
+                        f"Logs fetch interrupted at block {next_block}: {e}",
+                        resume_block=next_block,
+                        fetched_count=fetched_count,
+                    ) from e
+
+                if not batch.logs:
+                    logger.info("No more logs found. Fetching complete.")
+                    return
+
+                batch_count += 1
+                logger.info(
+                    f"Batch {batch_count}: Found {batch.total_count} logs, "
+                    f"up to block {batch.last_block_number}"
+                )
+
+                # If we got fewer than max logs, we've reached the end
+                is_last = batch.total_count < self.max_logs_per_request
+                if is_last:
+                    logger.info(
+                        f"Last batch (less than {self.max_logs_per_request} logs). "
+                        f"Fetching complete."
+                    )
+                    batch.next_block = None
+                else:
+                    # Follow Etherscan guide: set next block to last block - 1
+                    # This handles cases where logs from the last block were cut off by the limit
+                    batch.next_block = batch.last_block_number - 1
+                    logger.debug(
+                        f"Setting next batch start block to {batch.next_block} "
+                        f"(last_block - 1 = {batch.last_block_number} - 1)"
+                    )
+
+                # Drop logs already yielded by the overlapping previous page
+                keys = {self._log_key(log) for log in batch.logs}
+                batch.logs = [
+                    log for log in batch.logs if self._log_key(log) not in previous_keys
+                ]
+                previous_keys = keys
+                fetched_count += len(batch.logs)
+
+                yield batch
+
+                if is_last:
+                    return
+
+                next_block = batch.next_block
+
+                # Rate limiting
+                await asyncio.sleep(0.2)
+
     async def _get_logs_internal(
         self,
         chain_id: int,
@@ -273,7 +405,7 @@ class EtherscanLogsProvider(EtherscanBaseProvider):
 
         Raises:
             ValueError: If chain_id is not supported
-            Exception: If API request fails
+            FetchInterruptedError: If a page fails part way through
         """
         if not self._validate_chain_id(chain_id):
             raise ValueError(f"Unsupported chain ID: {chain_id}")
@@ -302,63 +434,15 @@ class EtherscanLogsProvider(EtherscanBaseProvider):
             logger.info(f"Starting from block: {next_block} (full refresh mode)")
 
         all_logs = []
-
-        async with aiohttp.ClientSession() as session:
-            batch_count = 0
-
-            while True:
-                logger.info(
-                    f"Fetching batch {batch_count + 1} starting from block {next_block}"
-                )
-
-                try:
-                    batch = await self.fetch_logs_batch(
-                        session=session,
-                        chain_id=chain_id,
-                        from_block=next_block,
-                        to_block=to_block,
-                        address=address,
-                        topics=topics,
-                        topic_operators=topic_operators,
-                        limit=self.max_logs_per_request,
-                    )
-
-                    if not batch.logs:
-                        logger.info("No more logs found. Fetching complete.")
-                        break
-
-                    all_logs.extend(batch.logs)
-                    batch_count += 1
-
-                    logger.info(
-                        f"Batch {batch_count}: Found {batch.total_count} logs, "
-                        f"up to block {batch.last_block_number}"
-                    )
-
-                    # If we got fewer than max logs, we've reached the end
-                    if batch.total_count < self.max_logs_per_request:
-                        logger.info(
-                            f"Last batch (less than {self.max_logs_per_request} logs). "
-                            f"Fetching complete."
-                        )
-                        break
-
-                    # Prepare for next batch
-                    # Follow Etherscan guide: set next block to last block - 1
-                    # This handles cases where logs from the last block were cut off by the limit
-                    next_block = batch.last_block_number - 1
-
-                    logger.debug(
-                        f"Setting next batch start block to {next_block} "
-                        f"(last_block - 1 = {batch.last_block_number} - 1)"
-                    )
-
-                    # Rate limiting
-                    await asyncio.sleep(0.2)
-
-                except Exception as e:
-                    logger.error(f"Error in batch {batch_count + 1}: {e}")
-                    break
+        async for batch in self.iter_logs_batches(
+            chain_id=chain_id,
+            from_block=next_block,
+            to_block=to_block,
+            address=address,
+            topics=topics,
+            topic_operators=topic_operators,
+        ):
+            all_logs.extend(batch.logs)
 
         total_logs = len(all_logs)
         logger.info(f"Fetching complete! Total logs before deduplication: {total_logs}")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Iceberg Table Maintenance CLI
+
+This script runs table maintenance against the Iceberg catalog:
+1. Bin-pack small data files per partition toward a target file size
+2. Expire old snapshots and delete files only they reference
+3. Rewrite manifests
+4. Optionally prune partitions older than a retention window
+5. Optionally partition on a bucket of the contract address, rewriting the
+   partitions written under the old spec a batch per run
+
+Before/after file counts and scan-planning times are printed for each table.
+
+Usage:
+    python scripts/maintain_tables.py [TABLE ...] [--no-compact] [--no-expire] [--no-rewrite]
+                  [--retention-days DAYS] [--target-file-size-mb MB]
+                  [--address-buckets N] [--bucket-column COLUMN] [--rewrite-partitions N]
+                  [--snapshot-retention-hours HOURS] [--keep-snapshots N]
+                  [--catalog CATALOG] [--bucket BUCKET] [--region REGION]
+
+Example:
+    python scripts/maintain_tables.py raw.transactions --target-file-size-mb 128
+    python scripts/maintain_tables.py raw.transactions standardized.transactions --address-buckets 16
+
+Requirements:
+- AWS credentials configured
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add parent directory to path when script is run directly
+if __name__ == "__main__":
+    parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    sys.path.insert(0, parent_dir)
+
+from config.aws_config import initialize_catalog
+from config.logging_config import get_logger
+from db.iceberg import load_table
+from db.maintenance import (
+    DEFAULT_MIN_SNAPSHOTS_TO_KEEP,
+    DEFAULT_SNAPSHOT_RETENTION_HOURS,
+    DEFAULT_TARGET_FILE_SIZE_BYTES,
+    get_maintenance_tables,
+    maintain_table,
+)
+from db.partitioning import DEFAULT_SPEC_REWRITE_PARTITIONS, add_address_buckets
+from dotenv import load_dotenv
+
+# Create a logger for this module
+logger = get_logger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Default AWS Configuration
+DEFAULT_REGION = "ap-southeast-1"
+DEFAULT_CATALOG = "s3tablescatalog"
+DEFAULT_TABLE_BUCKET = "suite"
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compact, expire snapshots and rewrite manifests of Iceberg tables"
+    )
+
+    parser.add_argument(
+        "tables",
+        nargs="*",
+        help="Tables to maintain as database.table "
+        "(default: ICEBERG_MAINTENANCE_TABLES or "
+        "raw.transactions,raw.cursor,standardized.transactions)",
+    )
+
+    # Maintenance steps
+    parser.add_argument(
+        "--no-compact", action="store_true", help="Skip small file compaction"
+    )
+    parser.add_argument("--no-expire", action="store_true", help="Skip snapshot expiry")
+    parser.add_argument(
+        "--no-rewrite", action="store_true", help="Skip manifest rewrite"
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=None,
+        help="Prune partitions older than this many days (default: keep all)",
+    )
+    parser.add_argument(
+        "--target-file-size-mb",
+        type=int,
+        default=DEFAULT_TARGET_FILE_SIZE_BYTES // (1024 * 1024),
+        help="Target size of compacted files in MB "
+        f"(default: {DEFAULT_TARGET_FILE_SIZE_BYTES // (1024 * 1024)})",
+    )
+    parser.add_argument(
+        "--snapshot-retention-hours",
+        type=int,
+        default=DEFAULT_SNAPSHOT_RETENTION_HOURS,
+        help="Expire snapshots older than this many hours "
+        f"(default: {DEFAULT_SNAPSHOT_RETENTION_HOURS})",
+    )
+    parser.add_argument(
+        "--keep-snapshots",
+        type=int,
+        default=DEFAULT_MIN_SNAPSHOTS_TO_KEEP,
+        help="Most recent snapshots always kept "
+        f"(default: {DEFAULT_MIN_SNAPSHOTS_TO_KEEP})",
+    )
+
+    # Address bucket partitioning
+    parser.add_argument(
+        "--address-buckets",
+        type=int,
+        default=None,
+        help="Partition the tables on this many buckets of --bucket-column "
+        "(default: leave the partition spec unchanged)",
+    )
+    parser.add_argument(
+        "--bucket-column",
+        default="to",
+        help="Address column to bucket (default: to)",
+    )
+    parser.add_argument(
+        "--rewrite-partitions",
+        type=int,
+        default=DEFAULT_SPEC_REWRITE_PARTITIONS,
+        help="Partitions of an older spec to rewrite in this run, -1 for all "
+        f"(default: {DEFAULT_SPEC_REWRITE_PARTITIONS})",
+    )
+
+    # AWS configuration
+    parser.add_argument(
+        "--catalog",
+        default=DEFAULT_CATALOG,
+        help=f"AWS Glue catalog name (default: {DEFAULT_CATALOG})",
+    )
+    parser.add_argument(
+        "--bucket",
+        default=DEFAULT_TABLE_BUCKET,
+        help=f"S3 bucket name (default: {DEFAULT_TABLE_BUCKET})",
+    )
+    parser.add_argument(
+        "--region",
+        default=DEFAULT_REGION,
+        help=f"AWS region (default: {DEFAULT_REGION})",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Run maintenance on each requested table and print the reports."""
+    args = parse_arguments()
+    logger.info(f"Starting table maintenance with arguments: {args}")
+
+    catalog = initialize_catalog(args.catalog, args.bucket, args.region)
+    if not catalog:
+        logger.error("Failed to initialize catalog")
+        sys.exit(1)
+
+    failed = False
+    for qualified_name in args.tables or get_maintenance_tables():
+        if "." not in qualified_name:
+            logger.error(f"Table must be given as database.table: {qualified_name}")
+            failed = True
+            continue
+
+        database, table_name = qualified_name.split(".", 1)
+        if args.address_buckets:
+            table = load_table(catalog, database, table_name, refresh=True)
+            if table is None or not add_address_buckets(
+                table, args.bucket_column, args.address_buckets
+            ):
+                failed = True
+                continue
+
+        report = maintain_table(
+            catalog,
+            database,
+            table_name,
+            compact=not args.no_compact,
+            expire=not args.no_expire,
+            rewrite=not args.no_rewrite,
+            retention_days=args.retention_days,
+            rewrite_partitions=(
+                None if args.rewrite_partitions < 0 else args.rewrite_partitions
+            ),
+            target_file_size_bytes=args.target_file_size_mb * 1024 * 1024,
+            snapshot_retention_hours=args.snapshot_retention_hours,
+            min_snapshots_to_keep=args.keep_snapshots,
+        )
+        if report is None:
+            failed = True
+            continue
+        print(json.dumps(report, indent=2, default=str))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
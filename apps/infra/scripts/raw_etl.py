@@ -35,18 +35,15 @@ if __name__ == "__main__":
 
 from config.aws_config import initialize_catalog
 from config.logging_config import get_logger
+from config.redis_config import redis_manager
 from db.iceberg import (
     load_table,
     read_table_data,
-    reorder_records,
 )
+from db.writer import iceberg_writer
 from dotenv import load_dotenv
-from pipelines.raw.cursor import (
-    get_cursor,
-    update_cursor,
-    calculate_time_based_start_block,
-)
-from pipelines.raw.transactions import load_transactions_with_safety
+from pipelines.raw.cursor import get_cursor
+from pipelines.raw.sync import run_checkpointed_sync
 from providers.etherscan import EtherscanProvider, FetchMode, TimePeriod
 from utils.blockchain import extract_block_range
 
@@ -191,7 +188,7 @@ def initialize_resources(args) -> Optional[ETLResources]:
 
     # Load the main table
     logger.info(f"Loading table: {args.database}.{args.table}")
-    table = load_table(catalog, args.database, args.table)
+    table = load_table(catalog, args.database, args.table, refresh=True)
     if not table:
         logger.error("Failed to load table")
         return None
@@ -202,7 +199,7 @@ def initialize_resources(args) -> Optional[ETLResources]:
     cursor_table = None
     if args.mode == "incremental":
         logger.info("Loading cursor table for incremental mode")
-        cursor_table = load_table(catalog, args.database, "cursor")
+        cursor_table = load_table(catalog, args.database, "cursor", refresh=True)
         if not cursor_table:
             logger.warning(
                 "Failed to load cursor table. Will fall back to full refresh mode."
@@ -360,86 +357,68 @@ def display_read_only_data(transactions: List[Dict[str, Any]]) -> None:
     logger.info("Read-only mode: Data not written to Iceberg table")
 
 
-async def process_transactions(
-    transactions: List[Dict[str, Any]],
-    highest_block_number: Optional[int],
+async def sync_transactions(
     resources: ETLResources,
     args,
     wallet_address: str,
     fetch_config: FetchConfig,
-) -> None:
+) -> bool:
     """
-    Process and write transactions to Iceberg table.
+    Fetch and write transactions in checkpointed chunks.
+
+    Progress is checkpointed in Redis after each committed chunk, so rerunning
+    the same command after a failure resumes where the previous run stopped.
 
     Args:
-        transactions: List of transaction dictionaries
-        highest_block_number: Highest block number in transactions
         resources: ETL resources
         args: Parsed command line arguments
         wallet_address: Wallet address
         fetch_config: Fetch configuration with mode and time period
+
+    Returns:
+        bool: True if the sync completed, False otherwise
     """
-    # Get block range for logging
-    lowest_block_number = None
-    if transactions and highest_block_number is not None:
-        try:
-            lowest_block_number, _ = extract_block_range(transactions)
-            if lowest_block_number is not None:
-                logger.info(
-                    f"Processing block range: {lowest_block_number} to {highest_block_number}"
-                )
-        except Exception as e:
-            logger.error(f"Error determining block range: {e}")
-            # Continue processing even if we can't determine the range
-            logger.info(f"Processing transactions up to block {highest_block_number}")
+    etherscan_api_key = os.getenv("ETHERSCAN_API_KEY")
+    if not etherscan_api_key:
+        logger.error("ETHERSCAN_API_KEY environment variable not set")
+        raise ValueError("ETHERSCAN_API_KEY environment variable not set")
 
-    # Process and insert data using consolidated safety function
-    logger.info(f"Processing {len(transactions)} transactions...")
-    processed_transactions = reorder_records(transactions, resources.schema)
+    # Checkpoints need Redis; without it the sync still commits per chunk
+    if not await redis_manager.connect():
+        logger.warning("Redis unavailable - sync will not be resumable")
 
-    # Use the consolidated function with automatic overlap detection
-    success = load_transactions_with_safety(
+    result = await run_checkpointed_sync(
         resources.catalog,
-        args.database,
+        EtherscanProvider(api_key=etherscan_api_key),
         args.chain_id,
         wallet_address,
-        processed_transactions,
+        fetch_config.mode,
+        last_block_number=fetch_config.last_block_number,
+        time_period=fetch_config.time_period,
+        redis_manager=redis_manager if redis_manager.connected else None,
     )
+    await redis_manager.disconnect()
+    await iceberg_writer.stop()
 
-    if not success:
-        logger.error("Failed to load transaction data")
-        return
-
-    # Update cursor with the highest block number
-    if highest_block_number is not None:
-        logger.info(f"Updating cursor with block number: {highest_block_number}")
-
-        # Calculate start_block based on fetch mode
-        start_block = None
-        if args.mode == "full":
-            start_block = "0"  # From genesis
-        elif args.mode == "time_range":
-            # Calculate time-based start block using the new flexible function
-            time_period = fetch_config.time_period or TimePeriod.DAYS_7
-            start_block = await calculate_time_based_start_block(
-                args.chain_id, time_period, "ETL script"
-            )
-        # For incremental mode, let update_cursor use previous end_block as start_block
-
-        await update_cursor(
-            resources.catalog,
-            args.database,
-            args.chain_id,
-            wallet_address,
-            highest_block_number,
-            start_block=start_block,
+    if result is None:
+        logger.error(
+            "Sync failed - rerun the same command to resume from the last checkpoint"
         )
+        return False
+
+    logger.info(
+        f"Synced {result.rows_committed} transactions in {result.chunks_committed} "
+        f"chunks up to block {result.end_block}"
+        f"{' (resumed from checkpoint)' if result.resumed else ''}"
+    )
 
     # Read and print table data (if not disabled)
     if not args.no_read:
         logger.info("Reading table data...")
         read_table_data(resources.table)
 
+    return True
+
 
 async def main():
     """
@@ -450,7 +429,7 @@ async def main():
     2. Initializing AWS resources
     3. Determining fetch mode and configuration
     4. Fetching transaction data from Etherscan
-    5. Processing and storing data (unless read-only mode)
+    5. Storing data in checkpointed chunks (unless read-only mode)
     """
     # Parse command-line arguments
     args = parse_arguments()
@@ -471,27 +450,17 @@ async def main():
             args, resources, wallet_address, args.chain_id
         )
 
-        # Fetch transactions
-        transactions, highest_block_number = await fetch_transactions(
-            wallet_address, args.chain_id, fetch_config
-        )
-
-        if not transactions:
-            logger.info("No transactions found. Exiting.")
-            return
-
         # Process data based on mode
         if args.read_only:
-            display_read_only_data(transactions)
-        else:
-            await process_transactions(
-                transactions,
-                highest_block_number,
-                resources,
-                args,
-                wallet_address,
-                fetch_config,
+            transactions, _ = await fetch_transactions(
+                wallet_address, args.chain_id, fetch_config
             )
+            if not transactions:
+                logger.info("No transactions found. Exiting.")
+                return
+            display_read_only_data(transactions)
+        elif not await sync_transactions(resources, args, wallet_address, fetch_config):
+            return
 
         logger.info("Operation completed successfully.")
 
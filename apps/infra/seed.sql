@@ -41,6 +41,119 @@ PARTITIONED BY (chain_id)
 TBLPROPERTIES ('table_type' = 'iceberg')
 ;
 
+-- Create the RAW transaction key index table (Bloom filter per transactions partition)
+CREATE TABLE IF NOT EXISTS `raw`.transaction_keys (
+  chain_id int,
+  block_date date,
+  bloom binary,
+  num_bits int,
+  num_hashes int,
+  key_count bigint,
+  updated_at timestamp
+)
+PARTITIONED BY (chain_id, block_date)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the RAW event logs table
+CREATE TABLE IF NOT EXISTS `raw`.logs (
+  chain_id int,
+  address string,
+  block_number bigint,
+  block_hash string,
+  block_time timestamp,
+  block_date date,
+  timestamp bigint,
+  transaction_hash string,
+  transaction_index int,
+  log_index int,
+  topic0 string,
+  topic1 string,
+  topic2 string,
+  topic3 string,
+  data string,
+  gas_price bigint,
+  gas_used bigint
+)
+PARTITIONED BY (chain_id, block_date)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the RAW logs cursor table (one row per address and topic filter)
+CREATE TABLE IF NOT EXISTS `raw`.logs_cursor (
+  chain_id int,
+  address string,
+  topic_filter string,
+  start_block bigint,
+  end_block bigint,
+  updated_at timestamp
+)
+PARTITIONED BY (chain_id)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the STANDARDIZED transactions table (typed copy of RAW transactions, one row per hash)
+CREATE TABLE IF NOT EXISTS `standardized`.transactions (
+  chain_id int,
+  block_number bigint,
+  block_hash string,
+  block_time timestamp,
+  block_date date,
+  timestamp bigint,
+  hash string,
+  nonce bigint,
+  transaction_index int,
+  from string,
+  to string,
+  value decimal(38,0),
+  gas bigint,
+  gas_price bigint,
+  gas_used bigint,
+  cumulative_gas_used bigint,
+  fee decimal(38,0),
+  input string,
+  method_id string,
+  function_name string,
+  contract_address string,
+  txreceipt_status int,
+  is_error boolean
+)
+PARTITIONED BY (chain_id, block_date)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the STANDARDIZED contract daily stats table (rollup of transactions per contract and day, with a HyperLogLog sketch of the senders)
+CREATE TABLE IF NOT EXISTS `standardized`.contract_daily_stats (
+  chain_id int,
+  contract_address string,
+  block_date date,
+  tx_count bigint,
+  total_value decimal(38,0),
+  total_fees decimal(38,0),
+  first_time timestamp,
+  last_time timestamp,
+  users_sketch binary
+)
+PARTITIONED BY (chain_id, block_date)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the STANDARDIZED interaction edges table (cumulative wallet-to-contract edges, stored once per lookup direction, bucketed and sorted on the lookup column)
+CREATE TABLE IF NOT EXISTS `standardized`.interaction_edges (
+  chain_id int,
+  lookup string,
+  lookup_bucket int,
+  address string,
+  contract string,
+  count bigint,
+  first_seen timestamp,
+  last_seen timestamp,
+  value decimal(38,0)
+)
+PARTITIONED BY (chain_id, lookup, lookup_bucket)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
 -- Create the STANDARDIZED contracts table
 CREATE TABLE IF NOT EXISTS `standardized`.contracts (
   chain_id int,
@@ -52,3 +165,72 @@ CREATE TABLE IF NOT EXISTS `standardized`.contracts (
 )
 PARTITIONED BY (chain_id)
 TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the STANDARDIZED contract users table (durable address import results)
+CREATE TABLE IF NOT EXISTS `standardized`.contract_users (
+  chain_id int,
+  contract_address string,
+  addresses array<string>,
+  total_addresses int,
+  blocks_processed bigint,
+  transactions_processed bigint,
+  start_block bigint,
+  end_block bigint,
+  last_updated timestamp,
+  updated_at timestamp
+)
+PARTITIONED BY (chain_id)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the STANDARDIZED decoded calls table (call arguments decoded with the contract ABI)
+CREATE TABLE IF NOT EXISTS `standardized`.decoded_calls (
+  chain_id int,
+  contract_address string,
+  block_number bigint,
+  block_time timestamp,
+  block_date date,
+  hash string,
+  from_address string,
+  selector string,
+  function_name string,
+  signature string,
+  args_json string,
+  decode_error string,
+  decoded_at timestamp
+)
+PARTITIONED BY (chain_id, block_date)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the STANDARDIZED decoded calls cursor table (one row per contract, the standardized.transactions snapshot its last decoding run read)
+CREATE TABLE IF NOT EXISTS `standardized`.decoded_calls_cursor (
+  chain_id int,
+  contract_address string,
+  source_snapshot_id bigint,
+  updated_at timestamp
+)
+PARTITIONED BY (chain_id)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;
+
+-- Create the STANDARDIZED token transfers table (ERC-20 Transfer logs decoded, append-only, stored sorted by sender and by receiver)
+CREATE TABLE IF NOT EXISTS `standardized`.token_transfers (
+  chain_id int,
+  token_address string,
+  block_number bigint,
+  block_time timestamp,
+  block_date date,
+  transaction_hash string,
+  log_index int,
+  from_address string,
+  to_address string,
+  amount_raw string,
+  amount double,
+  symbol string,
+  lookup string
+)
+PARTITIONED BY (chain_id, token_address, lookup)
+TBLPROPERTIES ('table_type' = 'iceberg')
+;